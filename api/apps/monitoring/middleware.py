@@ -10,13 +10,16 @@ It tracks:
 - IP addresses
 
 The middleware automatically creates log entries for both successful
-and failed requests.
+and failed requests. It runs natively in both the sync (WSGI) and the
+async (ASGI) request paths, so async views are not pushed to a thread.
 """
 
-import json
 import time
 from asyncio.log import logger
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from api.utils.json_utils import JSONDecodeError, loads
 from api.utils.logging_utils import log_exception
 
 from .models import ErrorLog, RequestLog
@@ -33,6 +36,9 @@ class MonitoringMiddleware:
     4. Tracks user and IP information
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         """
         Initialize the middleware.
@@ -41,6 +47,8 @@ class MonitoringMiddleware:
             get_response: The next middleware or view in the chain
         """
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     @log_exception
     def __call__(self, request):
@@ -53,58 +61,85 @@ class MonitoringMiddleware:
         Returns:
             response: The HTTP response object
         """
-        start_time = time.time()
-
-        # Attempt to parse request body as JSON
-        try:
-            request_data = json.loads(request.body) if request.body else None
-        except json.JSONDecodeError:
-            request_data = None
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
 
+        start_time = time.time()
+        request_data = self.parse_json(request.body)
         response = self.get_response(request)
+        duration = time.time() - start_time
 
-        # Attempt to parse response content as JSON
         try:
-            response_data = json.loads(response.content) if response.content else None
-        except json.JSONDecodeError:
-            response_data = None
+            user = request.user
+            model, fields = self.log_entry(
+                request, response, request_data, duration, user
+            )
+            model.objects.create(**fields)
+        except Exception as e:
+            # Log any errors in the monitoring process itself
+            logger.error(f"Error in MonitoringMiddleware: {str(e)}")
 
+        return response
+
+    async def __acall__(self, request):
+        """Async __call__, writing the log entry with the async ORM"""
+        start_time = time.time()
+        request_data = self.parse_json(request.body)
+        response = await self.get_response(request)
         duration = time.time() - start_time
 
         try:
-            # Log errors (status code >= 400)
-            if response.status_code >= 400:
-                ErrorLog.objects.create(
-                    error_type=str(response.status_code),
-                    error_message=getattr(response, "reason_phrase", "Unknown"),
-                    path=request.path,
-                    method=request.method,
-                    user_id=getattr(request.user, "id", None)
-                    if request.user.is_authenticated
-                    else None,
-                    request_data=request_data,
-                    url=request.build_absolute_uri(),
-                )
-            # Log successful requests
-            else:
-                RequestLog.objects.create(
-                    path=request.path,
-                    method=request.method,
-                    response_time=duration,
-                    status_code=response.status_code,
-                    user_id=getattr(request.user, "id", None)
-                    if request.user.is_authenticated
-                    else None,
-                    ip_address=self.get_client_ip(request),
-                    request_data=request_data,
-                    response_data=response_data,
-                )
+            user = await request.auser()
+            model, fields = self.log_entry(
+                request, response, request_data, duration, user
+            )
+            await model.objects.acreate(**fields)
         except Exception as e:
-            # Log any errors in the monitoring process itself
             logger.error(f"Error in MonitoringMiddleware: {str(e)}")
 
         return response
 
+    @staticmethod
+    def parse_json(content):
+        """Attempt to parse a request or response body as JSON"""
+        try:
+            return loads(content) if content else None
+        except (JSONDecodeError, UnicodeDecodeError):
+            return None
+
+    def log_entry(self, request, response, request_data, duration, user):
+        """
+        Build the log entry of a request.
+
+        Returns:
+            tuple: (ErrorLog for status codes >= 400 else RequestLog,
+                field values)
+        """
+        user_id = getattr(user, "id", None) if user.is_authenticated else None
+
+        # Log errors (status code >= 400)
+        if response.status_code >= 400:
+            return ErrorLog, {
+                "error_type": str(response.status_code),
+                "error_message": getattr(response, "reason_phrase", "Unknown"),
+                "path": request.path,
+                "method": request.method,
+                "user_id": user_id,
+                "request_data": request_data,
+                "url": request.build_absolute_uri(),
+            }
+        # Log successful requests
+        return RequestLog, {
+            "path": request.path,
+            "method": request.method,
+            "response_time": duration,
+            "status_code": response.status_code,
+            "user_id": user_id,
+            "ip_address": self.get_client_ip(request),
+            "request_data": request_data,
+            "response_data": self.parse_json(response.content),
+        }
+
     def get_client_ip(self, request):
         """
         Extract the client IP address from the request.
@@ -0,0 +1,70 @@
+"""
+Score Async Views Module
+
+This module provides the async implementation of the leaderboard top
+scores listing (LeaderBoardViewSet.list), served by the ASGI application
+(see api.asgi_urls) with the same bodies and status codes.
+
+Features:
+- Top scores read from the channel's Redis sorted set (see ranking),
+  or from the day and week rollup buckets (see windows)
+- Rate limiting with athrottle
+- Leaderboard creation still handled by the DRF viewset
+"""
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+
+from api.utils.asgi_utils import json_response
+from api.utils.throttling import athrottle
+
+from .ranking import aresolve_leaderboard, atop_scores
+from .viewsets import LeaderBoardViewSet
+from .windows import WINDOWS, awindow_top_scores
+
+create_leaderboard = LeaderBoardViewSet.as_view({"post": "create"})
+
+
+@csrf_exempt
+async def leaderboards(request):
+    """
+    List the top 10 scores of a channel.
+
+    GET /api/leaderboards/?channel=<discord channel>[&window=day|week|all]
+
+    Other methods go to the DRF viewset (POST creates a leaderboard).
+
+    Returns:
+        HttpResponse: Top scores as [{"name", "points"}]
+        HttpResponse: 400 without channel or for an unknown window, 404 if
+            no leaderboard exists
+    """
+    if request.method != "GET":
+        return await sync_to_async(create_leaderboard)(request)
+
+    throttled = await athrottle(request)
+    if throttled is not None:
+        return throttled
+
+    discord_channel = request.GET.get("channel") or request.GET.get("discord_channel")
+    if not discord_channel:
+        return json_response(
+            {"error": "channel or discord_channel query parameter is required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    window = request.GET.get("window", "all")
+    if window not in WINDOWS:
+        return json_response(
+            {"error": f"window must be one of: {', '.join(WINDOWS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    leaderboard_id = await aresolve_leaderboard(discord_channel)
+    if leaderboard_id is None:
+        return json_response(
+            {"error": "LeaderBoard not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    if window == "all":
+        return json_response(await atop_scores(leaderboard_id))
+    return json_response(await awindow_top_scores(leaderboard_id, window))
@@ -0,0 +1,41 @@
+"""
+Score Events Compaction Management Command
+
+This command deletes the score events and the day and week buckets older
+than the SCORE_HISTORY retention. It is meant to run daily (see
+compact_score_events_task in api.tasks.task).
+
+Features:
+- Deletes in small batches to keep locks short
+- Week buckets kept longer than day buckets and events
+- Deleted row counts and timing report
+
+Usage:
+    python manage.py compact_score_events
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.apps.score.windows import compact_score_events
+
+
+class Command(BaseCommand):
+    """
+    Django management command to compact the score history.
+    """
+
+    help = "Delete score events and leaderboard buckets past their retention"
+
+    def handle(self, *args, **options):
+        """Compact the history and report how many rows were deleted"""
+        started = time.perf_counter()
+        deleted = compact_score_events()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted['events']} events, {deleted['day']} day buckets "
+                f"and {deleted['week']} week buckets in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,38 @@
+"""
+Leaderboard Scores Flush Management Command
+
+This command moves the score changes recorded in the Redis leaderboards
+into the Score table. It is meant to run periodically (see
+flush_leaderboard_scores_task in api.tasks.task).
+
+Features:
+- One transaction of bulk upserts per leaderboard
+- Changes restored to Redis if a leaderboard fails
+- Change count and timing report
+
+Usage:
+    python manage.py flush_leaderboard_scores
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.apps.score.ranking import flush_scores
+
+
+class Command(BaseCommand):
+    """
+    Django management command to flush leaderboard score changes.
+    """
+
+    help = "Flush leaderboard score changes from Redis into the database"
+
+    def handle(self, *args, **options):
+        """Flush the changes and report how many were written"""
+        started = time.perf_counter()
+        flushed = flush_scores()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Flushed {flushed} score changes in {elapsed:.2f}s")
+        )
@@ -0,0 +1,61 @@
+"""
+Leaderboard Rebuild Management Command
+
+This command reloads the Redis leaderboards from the Score table, e.g.
+after Redis lost its data or after scores were written directly to the
+database while Redis was unavailable. Score changes not flushed yet are
+kept and applied on top of the reloaded rows.
+
+Features:
+- All leaderboards, or those of the given channels
+- Leaderboard and participant counts with timing report
+
+Usage:
+    python manage.py rebuild_leaderboards
+    python manage.py rebuild_leaderboards --channel general --channel quiz
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.apps.score.models import LeaderBoard
+from api.apps.score.ranking import rebuild_leaderboards
+
+
+class Command(BaseCommand):
+    """
+    Django management command to rebuild the Redis leaderboards.
+    """
+
+    help = "Reload the Redis leaderboards from the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--channel",
+            action="append",
+            dest="channels",
+            help="Discord channel of a leaderboard to rebuild (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        """Rebuild the leaderboards and report what was loaded"""
+        leaderboard_ids = None
+        if options["channels"]:
+            leaderboard_ids = list(
+                LeaderBoard.objects.filter(
+                    discord_channel__in=options["channels"]
+                ).values_list("id", flat=True)
+            )
+            if not leaderboard_ids:
+                raise CommandError("No leaderboard exists for the given channels")
+
+        started = time.perf_counter()
+        leaderboards, participants = rebuild_leaderboards(leaderboard_ids)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {leaderboards} leaderboards with {participants} "
+                f"participants in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:50
+
+from django.db import migrations, models
+from django.db.models import Count, Min, Sum
+
+
+def merge_duplicate_scores(apps, schema_editor):
+    """Merge scores of the same name and leaderboard into the oldest row"""
+    Score = apps.get_model("score", "Score")
+    duplicates = (
+        Score.objects.values("name", "leaderboard")
+        .annotate(rows=Count("id"), total=Sum("points"), keep=Min("id"))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        Score.objects.filter(id=duplicate["keep"]).update(points=duplicate["total"])
+        Score.objects.filter(
+            name=duplicate["name"], leaderboard=duplicate["leaderboard"]
+        ).exclude(id=duplicate["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("score", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_scores, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="score",
+            constraint=models.UniqueConstraint(
+                fields=("name", "leaderboard"), name="score_name_leaderboard_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("score", "0003_score_name_leaderboard_uniq"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="score",
+            index=models.Index(
+                fields=["leaderboard", "-points", "-name"],
+                name="score_leaderboard_rank_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.1.2 on 2026-10-17 02:10
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("score", "0004_score_leaderboard_rank_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScoreEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="name")),
+                ("points", models.IntegerField(verbose_name="points")),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Created"
+                    ),
+                ),
+                (
+                    "leaderboard",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_events",
+                        to="score.leaderboard",
+                        verbose_name="LeaderBoard",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["created_at"], name="score_event_created_idx")
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ScoreRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255, verbose_name="name")),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("day", "Day"), ("week", "Week")],
+                        max_length=4,
+                        verbose_name="Period",
+                    ),
+                ),
+                ("bucket_start", models.DateField(verbose_name="Bucket Start")),
+                ("points", models.IntegerField(verbose_name="points")),
+                (
+                    "leaderboard",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="score_rollups",
+                        to="score.leaderboard",
+                        verbose_name="LeaderBoard",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=[
+                            "leaderboard",
+                            "period",
+                            "bucket_start",
+                            "-points",
+                            "-name",
+                        ],
+                        name="score_rollup_rank_idx",
+                    ),
+                    models.Index(
+                        fields=["period", "bucket_start"],
+                        name="score_rollup_bucket_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("leaderboard", "period", "bucket_start", "name"),
+                        name="score_rollup_bucket_name_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
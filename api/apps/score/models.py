@@ -5,6 +5,8 @@ This module defines the database models for the scoring system.
 It includes models for:
 - LeaderBoard: Manages Discord channel leaderboards
 - Score: Tracks individual scores
+- ScoreEvent: Append-only history of points won
+- ScoreRollup: Points won per day and week
 - TriviaWinner: Records trivia game winners
 
 All models include proper string representations and meta configurations.
@@ -14,6 +16,7 @@ import uuid
 
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 
@@ -71,11 +74,109 @@ class Score(models.Model):
 
     class Meta:
         ordering = ["-points"]
+        constraints = [
+            # One running total per participant and leaderboard, which
+            # the upserts in services.py rely on
+            models.UniqueConstraint(
+                fields=["name", "leaderboard"], name="score_name_leaderboard_uniq"
+            ),
+        ]
+        indexes = [
+            # Rank and top scores reads without Redis (see ranking.py),
+            # ordered as the sorted sets: points, then name, descending
+            models.Index(
+                fields=["leaderboard", "-points", "-name"],
+                name="score_leaderboard_rank_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.points}"
 
 
+class ScoreEvent(models.Model):
+    """
+    Points won by a participant, one row per score update.
+
+    Rows are only ever inserted (by the leaderboard flush, see
+    api.apps.score.ranking) and deleted once older than the retention
+    period (see compact_score_events).
+
+    Attributes:
+        leaderboard (LeaderBoard): Leaderboard the points were won in
+        name (str): Name of the participant
+        points (int): Points won
+        created_at (datetime): When the points were won
+    """
+
+    leaderboard = models.ForeignKey(
+        LeaderBoard,
+        on_delete=models.CASCADE,
+        related_name="score_events",
+        verbose_name=_("LeaderBoard"),
+    )
+    name = models.CharField(_("name"), max_length=255)
+    points = models.IntegerField(_("points"))
+    created_at = models.DateTimeField(_("Created"), default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"], name="score_event_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} +{self.points}"
+
+
+class ScoreRollup(models.Model):
+    """
+    Points won by a participant in one day or week (UTC, weeks start
+    on Monday), kept up to date from score events.
+
+    Attributes:
+        leaderboard (LeaderBoard): Leaderboard the points were won in
+        name (str): Name of the participant
+        period (str): "day" or "week"
+        bucket_start (date): First day of the bucket
+        points (int): Points won in the bucket
+    """
+
+    PERIOD_CHOICES = [("day", _("Day")), ("week", _("Week"))]
+
+    leaderboard = models.ForeignKey(
+        LeaderBoard,
+        on_delete=models.CASCADE,
+        related_name="score_rollups",
+        verbose_name=_("LeaderBoard"),
+    )
+    name = models.CharField(_("name"), max_length=255)
+    period = models.CharField(_("Period"), max_length=4, choices=PERIOD_CHOICES)
+    bucket_start = models.DateField(_("Bucket Start"))
+    points = models.IntegerField(_("points"))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["leaderboard", "period", "bucket_start", "name"],
+                name="score_rollup_bucket_name_uniq",
+            ),
+        ]
+        indexes = [
+            # Top scores of a bucket, in the order of the Redis leaderboards
+            models.Index(
+                fields=["leaderboard", "period", "bucket_start", "-points", "-name"],
+                name="score_rollup_rank_idx",
+            ),
+            # Compaction of old buckets
+            models.Index(
+                fields=["period", "bucket_start"], name="score_rollup_bucket_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.points} ({self.period} {self.bucket_start})"
+
+
 class TriviaWinner(models.Model):
     """
     TriviaWinner model for recording trivia game winners.
@@ -0,0 +1,753 @@
+"""
+Score Ranking Module
+
+This module keeps leaderboards in Redis sorted sets, which serve every
+score read, and persists score changes to the Score table write-behind.
+
+Redis layout per leaderboard (by id):
+- scores: sorted set of points by participant name. A "" member at
+  -inf marks it as loaded, so a loaded empty leaderboard still exists.
+- deltas: hash of points added since the last flush, by name
+- totals: hash of totals set by "replace" since the last flush, by name
+- events: list of the points added since the last flush, with the time
+  they were won, for the day and week buckets (see windows)
+- lock: held while the sorted set is loaded or pending changes flushed
+
+Leaderboards with pending changes are listed in one "dirty" set, and
+discord channels are mapped to leaderboard ids in one hash.
+
+A sorted set missing from Redis (first use, restart) is loaded from the
+Score table and merged with the pending changes under the lock, so it
+always equals the database plus what has not been flushed yet.
+
+Features:
+- O(log n) score updates (ZINCRBY) and top N reads (ZREVRANGE)
+- Batches of points, across leaderboards, added in one atomic script
+- Player rank and neighbours with ZREVRANK, O(log n) at any size
+- Periodic flush with bulk upserts, restored to Redis if it fails
+- Direct database writes and reads while Redis is unavailable
+  (run rebuild_leaderboards once it is back)
+"""
+
+import uuid
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from itertools import islice
+from typing import Dict, List, Optional, Tuple, Union
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.utils.cache_utils import on_commit_once
+from api.utils.json_utils import dumps, loads
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_async_redis, get_redis, redis_key
+
+from .models import LeaderBoard, Score
+from .services import UPDATE_MODES, record_score_events, upsert_score, upsert_scores
+
+# Rows sent to Redis per command while loading a leaderboard
+RANKING_LOAD_BATCH_SIZE = 1000
+
+# Seconds a load or flush may hold a leaderboard lock, renewed per batch
+RANKING_LOCK_TIMEOUT = 60
+
+# Seconds a load waits for a flush of the same leaderboard to finish
+RANKING_LOCK_WAIT = 10
+
+LOADED_MARKER = ""
+
+# KEYS: scores, deltas, totals, dirty, events
+# ARGV: name, points, mode, leaderboard id, event
+# Returns the new total, or nil when the sorted set is not loaded
+UPDATE_SCRIPT = """
+if ARGV[3] == 'replace' then
+  redis.call('HDEL', KEYS[2], ARGV[1])
+  redis.call('HSET', KEYS[3], ARGV[1], ARGV[2])
+else
+  redis.call('HINCRBY', KEYS[2], ARGV[1], ARGV[2])
+  redis.call('RPUSH', KEYS[5], ARGV[5])
+end
+redis.call('SADD', KEYS[4], ARGV[4])
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return false
+end
+if ARGV[3] == 'replace' then
+  redis.call('ZADD', KEYS[1], ARGV[2], ARGV[1])
+  return ARGV[2]
+end
+return redis.call('ZINCRBY', KEYS[1], ARGV[2], ARGV[1])
+"""
+
+# KEYS: dirty, then the scores, deltas and events keys of each leaderboard
+# ARGV: leaderboard id of each key triple, then index/name/points/event
+# Returns the new total of each change, nil when the set is not loaded
+ADD_BATCH_SCRIPT = """
+local boards = (#KEYS - 1) / 3
+local totals = {}
+for i = boards + 1, #ARGV, 4 do
+  local board = tonumber(ARGV[i])
+  local scores, deltas = KEYS[board * 3 - 1], KEYS[board * 3]
+  redis.call('HINCRBY', deltas, ARGV[i + 1], ARGV[i + 2])
+  redis.call('RPUSH', KEYS[board * 3 + 1], ARGV[i + 3])
+  redis.call('SADD', KEYS[1], ARGV[board])
+  if redis.call('EXISTS', scores) == 1 then
+    totals[#totals + 1] = redis.call('ZINCRBY', scores, ARGV[i + 2], ARGV[i + 1])
+  else
+    totals[#totals + 1] = false
+  end
+end
+return totals
+"""
+
+# KEYS: scores
+# ARGV: name, neighbours on each side
+# Returns the first rank read and the name/points rows around the player,
+# nil when the player is not ranked or the set is not loaded
+RANK_SCRIPT = """
+local rank = redis.call('ZREVRANK', KEYS[1], ARGV[1])
+if not rank then
+  return false
+end
+local start = math.max(rank - tonumber(ARGV[2]), 0)
+local stop = rank + tonumber(ARGV[2])
+return {start, redis.call('ZREVRANGE', KEYS[1], start, stop, 'WITHSCORES')}
+"""
+
+# KEYS: staging, scores, deltas, totals
+# Applies pending changes to the rows loaded into staging, then swaps it in
+FINISH_LOAD_SCRIPT = """
+local totals = redis.call('HGETALL', KEYS[4])
+for i = 1, #totals, 2 do
+  redis.call('ZADD', KEYS[1], totals[i + 1], totals[i])
+end
+local deltas = redis.call('HGETALL', KEYS[3])
+for i = 1, #deltas, 2 do
+  redis.call('ZINCRBY', KEYS[1], deltas[i + 1], deltas[i])
+end
+redis.call('RENAME', KEYS[1], KEYS[2])
+redis.call('PERSIST', KEYS[2])
+return redis.call('ZCARD', KEYS[2]) - 1
+"""
+
+# KEYS: deltas, totals, dirty, events
+# ARGV: leaderboard id
+# Takes the pending changes, so changes landing during a flush are left
+# for the next one
+TAKE_SCRIPT = """
+local deltas = redis.call('HGETALL', KEYS[1])
+local totals = redis.call('HGETALL', KEYS[2])
+local events = redis.call('LRANGE', KEYS[4], 0, -1)
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[4])
+redis.call('SREM', KEYS[3], ARGV[1])
+return {deltas, totals, events}
+"""
+
+# KEYS: deltas, totals, dirty, events
+# ARGV: leaderboard id, number of totals, number of deltas, name/total
+# pairs, name/delta pairs, events
+# Puts taken changes back unless a newer "replace" superseded them
+RESTORE_SCRIPT = """
+local totals_end = 3 + tonumber(ARGV[2]) * 2
+local deltas_end = totals_end + tonumber(ARGV[3]) * 2
+local restored = {}
+for i = 4, totals_end, 2 do
+  if redis.call('HSETNX', KEYS[2], ARGV[i], ARGV[i + 1]) == 1 then
+    restored[ARGV[i]] = true
+  end
+end
+for i = totals_end + 1, deltas_end, 2 do
+  if restored[ARGV[i]] or redis.call('HEXISTS', KEYS[2], ARGV[i]) == 0 then
+    redis.call('HINCRBY', KEYS[1], ARGV[i], ARGV[i + 1])
+  end
+end
+for i = deltas_end + 1, #ARGV do
+  redis.call('RPUSH', KEYS[4], ARGV[i])
+end
+redis.call('SADD', KEYS[3], ARGV[1])
+"""
+
+
+def ranking_key(leaderboard_id, part: str) -> str:
+    """Redis key of one part (scores, deltas, totals, events, lock)"""
+    return redis_key("leaderboard", leaderboard_id, part)
+
+
+def ranking_keys(leaderboard_id) -> Tuple[str, str, str]:
+    """Keys of the scores sorted set and the deltas and totals hashes"""
+    return (
+        ranking_key(leaderboard_id, "scores"),
+        ranking_key(leaderboard_id, "deltas"),
+        ranking_key(leaderboard_id, "totals"),
+    )
+
+
+def dirty_key() -> str:
+    """Redis set of the leaderboards with pending changes"""
+    return redis_key("leaderboard", "dirty")
+
+
+def channels_key() -> str:
+    """Redis hash of leaderboard ids by discord channel"""
+    return redis_key("leaderboard", "channels")
+
+
+def events_key(leaderboard_id) -> str:
+    """Redis list of the points added to a leaderboard since the last flush"""
+    return ranking_key(leaderboard_id, "events")
+
+
+def encode_event(name: str, points: int, at: datetime) -> bytes:
+    return dumps([name, points, at.timestamp()])
+
+
+def decode_event(event: bytes) -> Tuple[str, int, datetime]:
+    name, points, timestamp = loads(event)
+    return name, points, datetime.fromtimestamp(timestamp, dt_timezone.utc)
+
+
+def ranking_lock(client, leaderboard_id, blocking_timeout=RANKING_LOCK_WAIT):
+    return client.lock(
+        ranking_key(leaderboard_id, "lock"),
+        timeout=RANKING_LOCK_TIMEOUT,
+        blocking_timeout=blocking_timeout,
+    )
+
+
+def parse_pairs(values: List[bytes]) -> Dict[str, int]:
+    """Decode a flat [name, value, ...] reply into a dict"""
+    return {name.decode(): int(value) for name, value in zip(values[::2], values[1::2])}
+
+
+def parse_ranking(rows, limit: int) -> List[dict]:
+    """Decode ZREVRANGE rows, leaving out the loaded marker"""
+    return [
+        {"name": name.decode(), "points": int(points)}
+        for name, points in rows
+        if name != LOADED_MARKER.encode()
+    ][:limit]
+
+
+def resolve_leaderboard(discord_channel: str) -> Optional[str]:
+    """
+    Get the id of a channel's leaderboard.
+
+    Returns:
+        str: Leaderboard id
+        None: If the channel has no leaderboard
+    """
+    client = get_redis()
+    try:
+        leaderboard_id = client.hget(channels_key(), discord_channel)
+        if leaderboard_id is not None:
+            return leaderboard_id.decode()
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable resolving a channel: {e}")
+
+    leaderboard_id = (
+        LeaderBoard.objects.filter(discord_channel=discord_channel)
+        .values_list("id", flat=True)
+        .first()
+    )
+    if leaderboard_id is None:
+        return None
+    try:
+        client.hset(channels_key(), discord_channel, str(leaderboard_id))
+    except RedisError:
+        pass
+    return str(leaderboard_id)
+
+
+async def aresolve_leaderboard(discord_channel: str) -> Optional[str]:
+    """Async resolve_leaderboard, reading through the asyncio client"""
+    client = get_async_redis()
+    try:
+        leaderboard_id = await client.hget(channels_key(), discord_channel)
+        if leaderboard_id is not None:
+            return leaderboard_id.decode()
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable resolving a channel: {e}")
+
+    leaderboard_id = await (
+        LeaderBoard.objects.filter(discord_channel=discord_channel)
+        .values_list("id", flat=True)
+        .afirst()
+    )
+    if leaderboard_id is None:
+        return None
+    try:
+        await client.hset(channels_key(), discord_channel, str(leaderboard_id))
+    except RedisError:
+        pass
+    return str(leaderboard_id)
+
+
+def load_leaderboard(leaderboard_id, rebuild: bool = False) -> Optional[int]:
+    """
+    Load a leaderboard's sorted set from the Score table.
+
+    Rows are written to a staging key in batches; pending changes are
+    then applied and the staging key renamed over the sorted set in one
+    script. The lock keeps flushes out meanwhile, so no change is
+    counted twice or missed.
+
+    Args:
+        leaderboard_id: Leaderboard to load
+        rebuild: Replace the sorted set even if it is already loaded
+
+    Returns:
+        int: Number of participants loaded
+        None: If the sorted set was already loaded
+
+    Raises:
+        RedisError: If Redis is unavailable or the lock is not acquired
+    """
+    client = get_redis()
+    scores_key, deltas_key, totals_key = ranking_keys(leaderboard_id)
+    staging_key = ranking_key(leaderboard_id, f"staging:{uuid.uuid4().hex}")
+
+    with ranking_lock(client, leaderboard_id) as lock:
+        if not rebuild and client.exists(scores_key):
+            return None
+
+        client.zadd(staging_key, {LOADED_MARKER: float("-inf")})
+        rows = (
+            Score.objects.filter(leaderboard_id=leaderboard_id)
+            .values_list("name", "points")
+            .iterator(chunk_size=RANKING_LOAD_BATCH_SIZE)
+        )
+        while batch := list(islice(rows, RANKING_LOAD_BATCH_SIZE)):
+            pipe = client.pipeline(transaction=False)
+            pipe.zadd(staging_key, dict(batch))
+            # Dropped if the load dies before swapping it in
+            pipe.expire(staging_key, RANKING_LOCK_TIMEOUT)
+            pipe.execute()
+            lock.reacquire()
+
+        finish = client.register_script(FINISH_LOAD_SCRIPT)
+        loaded: int = finish(keys=[staging_key, scores_key, deltas_key, totals_key])
+        return loaded
+
+
+def update_score(
+    leaderboard: LeaderBoard, name: str, points: int, mode: str = "add"
+) -> int:
+    """
+    Add points to a participant's score, or replace them.
+
+    The sorted set is updated right away; the Score table on the next
+    flush. Without Redis the Score table is written directly.
+
+    Args:
+        leaderboard: Leaderboard of the score
+        name: Participant name
+        points: Points to add ("add") or the new total ("replace")
+        mode: "add" or "replace"
+
+    Returns:
+        int: Points of the participant after the update
+
+    Raises:
+        ValueError: For an unknown mode or an empty name
+    """
+    if mode not in UPDATE_MODES:
+        raise ValueError(f"update_mode must be one of: {', '.join(UPDATE_MODES)}")
+    if name == LOADED_MARKER:
+        raise ValueError("name must not be empty")
+
+    now = timezone.now()
+    client = get_redis()
+    scores_key, deltas_key, totals_key = ranking_keys(leaderboard.pk)
+    try:
+        update = client.register_script(UPDATE_SCRIPT)
+        total = update(
+            keys=[
+                scores_key,
+                deltas_key,
+                totals_key,
+                dirty_key(),
+                events_key(leaderboard.pk),
+            ],
+            args=[
+                name,
+                points,
+                mode,
+                str(leaderboard.pk),
+                encode_event(name, points, now),
+            ],
+        )
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable, writing directly: {e}")
+        with transaction.atomic():
+            total = upsert_score(leaderboard, name, points, mode)
+            if mode == "add":
+                record_score_events(leaderboard, [(name, points, now)])
+        return total
+
+    if total is None:
+        # Loading merges the pending change just recorded
+        load_leaderboard(leaderboard.pk)
+        total = client.zscore(scores_key, name)
+    return int(float(total))
+
+
+def add_scores(
+    points: Dict[LeaderBoard, Dict[str, int]],
+) -> Dict[LeaderBoard, Dict[str, int]]:
+    """
+    Add points to several participants' scores, all or none.
+
+    Every change goes to Redis in one script, which Redis runs
+    atomically. Without Redis they are written to the Score table in
+    one transaction.
+
+    Args:
+        points: Points to add by participant name, by leaderboard
+
+    Returns:
+        dict: Points after the update, in the same shape
+
+    Raises:
+        ValueError: For an empty name
+    """
+    if any(LOADED_MARKER in names for names in points.values()):
+        raise ValueError("name must not be empty")
+
+    leaderboards = [leaderboard for leaderboard, names in points.items() if names]
+    changes = [
+        (index, leaderboard, name, value)
+        for index, leaderboard in enumerate(leaderboards, start=1)
+        for name, value in points[leaderboard].items()
+    ]
+    if not changes:
+        return {}
+
+    now = timezone.now()
+    client = get_redis()
+    keys = [dirty_key()]
+    for leaderboard in leaderboards:
+        keys.extend(ranking_keys(leaderboard.pk)[:2])
+        keys.append(events_key(leaderboard.pk))
+    args: List[Union[str, int, bytes]] = [
+        str(leaderboard.pk) for leaderboard in leaderboards
+    ]
+    for index, _, name, value in changes:
+        args.extend([index, name, value, encode_event(name, value, now)])
+    try:
+        add_batch = client.register_script(ADD_BATCH_SCRIPT)
+        # Each participant's new total, or None if the set is not loaded
+        new_totals: List[Optional[bytes]] = add_batch(keys=keys, args=args)
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable, writing directly: {e}")
+        return write_scores_directly(points, now)
+
+    totals: Dict[LeaderBoard, Dict[str, int]] = {
+        leaderboard: {} for leaderboard in leaderboards
+    }
+    loaded = set()
+    for (_, leaderboard, name, _), total in zip(changes, new_totals):
+        if total is None:
+            # Loading merges the pending changes just recorded
+            if leaderboard.pk not in loaded:
+                load_leaderboard(leaderboard.pk)
+                loaded.add(leaderboard.pk)
+            total = client.zscore(ranking_keys(leaderboard.pk)[0], name)
+        totals[leaderboard][name] = int(float(total))
+    return totals
+
+
+def write_scores_directly(
+    points: Dict[LeaderBoard, Dict[str, int]], now: datetime
+) -> Dict[LeaderBoard, Dict[str, int]]:
+    """add_scores fallback writing to the Score table in one transaction"""
+    with transaction.atomic():
+        for leaderboard, names in points.items():
+            upsert_scores(leaderboard, names, "add")
+            record_score_events(
+                leaderboard, [(name, value, now) for name, value in names.items()]
+            )
+    return {
+        leaderboard: dict(
+            Score.objects.filter(
+                leaderboard=leaderboard, name__in=list(names)
+            ).values_list("name", "points")
+        )
+        for leaderboard, names in points.items()
+        if names
+    }
+
+
+def top_scores(leaderboard_id, limit: int = 10) -> List[dict]:
+    """
+    Get the best scores of a leaderboard.
+
+    Returns:
+        list: Up to limit {"name", "points"} by descending points
+    """
+    scores_key = ranking_keys(leaderboard_id)[0]
+    client = get_redis()
+    try:
+        # One extra row in case the marker of a small leaderboard is read
+        rows = client.zrevrange(scores_key, 0, limit, withscores=True)
+        if not rows:
+            load_leaderboard(leaderboard_id)
+            rows = client.zrevrange(scores_key, 0, limit, withscores=True)
+        return parse_ranking(rows, limit)
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable, reading directly: {e}")
+    return list(
+        Score.objects.filter(leaderboard_id=leaderboard_id)
+        .order_by("-points", "-name")
+        .values("name", "points")[:limit]
+    )
+
+
+async def atop_scores(leaderboard_id, limit: int = 10) -> List[dict]:
+    """
+    Async top_scores, reading through the asyncio client.
+
+    A sorted set that is not loaded yet is loaded in a worker thread.
+    """
+    scores_key = ranking_keys(leaderboard_id)[0]
+    client = get_async_redis()
+    try:
+        rows = await client.zrevrange(scores_key, 0, limit, withscores=True)
+        if not rows:
+            await sync_to_async(load_leaderboard)(leaderboard_id)
+            rows = await client.zrevrange(scores_key, 0, limit, withscores=True)
+        return parse_ranking(rows, limit)
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable, reading directly: {e}")
+    return [
+        score
+        async for score in Score.objects.filter(leaderboard_id=leaderboard_id)
+        .order_by("-points", "-name")
+        .values("name", "points")[:limit]
+    ]
+
+
+def player_rank(leaderboard_id, name: str, neighbours: int = 2) -> Optional[dict]:
+    """
+    Get a participant's rank and the participants ranked around them.
+
+    Ranks start at 1 and follow the top scores order (points, then name,
+    descending), so equal points get consecutive ranks.
+
+    Args:
+        leaderboard_id: Leaderboard to look in
+        name: Participant name
+        neighbours: Participants listed on each side of the player
+
+    Returns:
+        dict: {"name", "points", "rank", "neighbours"}, neighbours being
+        {"rank", "name", "points"} from rank - neighbours to rank +
+        neighbours, the player included
+        None: If the participant has no score in the leaderboard
+    """
+    if name == LOADED_MARKER:
+        return None
+
+    scores_key = ranking_keys(leaderboard_id)[0]
+    client = get_redis()
+    rows: Optional[List[dict]]
+    try:
+        rank_script = client.register_script(RANK_SCRIPT)
+        found = rank_script(keys=[scores_key], args=[name, neighbours])
+        if found is None and load_leaderboard(leaderboard_id) is not None:
+            found = rank_script(keys=[scores_key], args=[name, neighbours])
+        if found is None:
+            return None
+        start, values = found
+        ranking = parse_ranking(zip(values[::2], values[1::2]), len(values))
+        rows = [{"rank": rank, **row} for rank, row in enumerate(ranking, start + 1)]
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable, reading directly: {e}")
+        rows = database_rank(leaderboard_id, name, neighbours)
+        if rows is None:
+            return None
+
+    player = next(row for row in rows if row["name"] == name)
+    return {
+        "name": name,
+        "points": player["points"],
+        "rank": player["rank"],
+        "neighbours": rows,
+    }
+
+
+def database_rank(leaderboard_id, name: str, neighbours: int) -> Optional[List[dict]]:
+    """
+    player_rank rows read from the Score table.
+
+    Counting the scores ahead walks score_leaderboard_rank_idx up to the
+    player, so the cost grows with the rank; only used while Redis is
+    unavailable.
+    """
+    scores = Score.objects.filter(leaderboard_id=leaderboard_id)
+    points = scores.filter(name=name).values_list("points", flat=True).first()
+    if points is None:
+        return None
+    ahead = scores.filter(
+        Q(points__gt=points) | Q(points=points, name__gt=name)
+    ).count()
+    start = max(ahead - neighbours, 0)
+    rows = scores.order_by("-points", "-name").values("name", "points")
+    return [
+        {"rank": rank, **row}
+        for rank, row in enumerate(rows[start : ahead + neighbours + 1], start + 1)
+    ]
+
+
+def persist_changes(
+    leaderboard_id,
+    totals: Dict[str, int],
+    deltas: Dict[str, int],
+    events: List[Tuple[str, int, datetime]],
+) -> None:
+    """
+    Write taken changes to the database in one transaction.
+
+    Replaced totals are written before added points, the order in which
+    they happened; the events of the added points go to the day and week
+    buckets. Changes of a deleted leaderboard are dropped.
+    """
+    leaderboard = (
+        LeaderBoard.objects.only("id", "discord_channel")
+        .filter(id=leaderboard_id)
+        .first()
+    )
+    if leaderboard is None:
+        return
+    with transaction.atomic():
+        upsert_scores(leaderboard, totals, "replace")
+        upsert_scores(leaderboard, deltas, "add")
+        record_score_events(leaderboard, events)
+
+
+def flush_scores() -> int:
+    """
+    Move pending changes of every dirty leaderboard to the Score table.
+
+    Leaderboards being loaded are skipped until the next flush. A leaderboard
+    whose changes cannot be saved keeps them in Redis for the next flush
+    without holding back the others.
+
+    Returns:
+        int: Number of flushed participant changes
+    """
+    client = get_redis()
+    take = client.register_script(TAKE_SCRIPT)
+    restore = client.register_script(RESTORE_SCRIPT)
+
+    flushed = 0
+    for member in client.sscan_iter(dirty_key()):
+        leaderboard_id = member.decode()
+        lock = ranking_lock(client, leaderboard_id)
+        if not lock.acquire(blocking=False):
+            continue
+        try:
+            _, deltas_key, totals_key = ranking_keys(leaderboard_id)
+            keys = [deltas_key, totals_key, dirty_key(), events_key(leaderboard_id)]
+            taken_deltas, taken_totals, taken_events = take(
+                keys=keys, args=[leaderboard_id]
+            )
+            deltas, totals = parse_pairs(taken_deltas), parse_pairs(taken_totals)
+            events = [decode_event(event) for event in taken_events]
+            try:
+                persist_changes(leaderboard_id, totals, deltas, events)
+            except Exception:
+                restore(
+                    keys=keys,
+                    args=[
+                        leaderboard_id,
+                        len(totals),
+                        len(deltas),
+                        *taken_totals,
+                        *taken_deltas,
+                        *taken_events,
+                    ],
+                )
+                logger.exception(f"Failed to flush leaderboard {leaderboard_id}")
+                continue
+            flushed += len(deltas) + len(totals)
+        finally:
+            lock.release()
+    return flushed
+
+
+def rebuild_leaderboards(leaderboard_ids=None) -> Tuple[int, int]:
+    """
+    Reload sorted sets from the Score table.
+
+    Args:
+        leaderboard_ids: Leaderboards to rebuild (defaults to all)
+
+    Returns:
+        tuple: (leaderboards rebuilt, participants loaded)
+    """
+    if leaderboard_ids is None:
+        leaderboard_ids = LeaderBoard.objects.values_list("id", flat=True)
+    leaderboards = participants = 0
+    for leaderboard_id in leaderboard_ids:
+        participants += load_leaderboard(leaderboard_id, rebuild=True) or 0
+        leaderboards += 1
+    return leaderboards, participants
+
+
+def drop_leaderboard(leaderboard_id, discord_channel: str) -> None:
+    """Remove a deleted leaderboard and its pending changes from Redis"""
+    try:
+        pipe = get_redis().pipeline()
+        pipe.delete(*ranking_keys(leaderboard_id), events_key(leaderboard_id))
+        pipe.srem(dirty_key(), str(leaderboard_id))
+        pipe.hdel(channels_key(), discord_channel)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable dropping {leaderboard_id}: {e}")
+
+
+def forget_channels(*discord_channels: str) -> None:
+    """Drop cached channel to leaderboard mappings, resolved again on use"""
+    try:
+        get_redis().hdel(channels_key(), *discord_channels)
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable forgetting channels: {e}")
+
+
+def forget_channels_on_commit(*discord_channels: str) -> None:
+    """
+    Drop channel mappings now and again once the transaction commits.
+
+    For leaderboards moved to another channel; the second drop discards
+    a mapping resolved from the rows before the commit.
+    """
+    forget_channels(*discord_channels)
+    on_commit_once(
+        f"leaderboard_channels:{'|'.join(sorted(discord_channels))}",
+        forget_channels,
+        *discord_channels,
+    )
+
+
+def unload_leaderboard(leaderboard_id) -> None:
+    """Drop a sorted set so it is loaded again, keeping pending changes"""
+    try:
+        get_redis().delete(ranking_keys(leaderboard_id)[0])
+    except RedisError as e:
+        logger.warning(f"Leaderboard store unavailable unloading {leaderboard_id}: {e}")
+
+
+def unload_leaderboard_on_commit(leaderboard_id) -> None:
+    """
+    Drop a sorted set now and again once the transaction commits.
+
+    For Score rows written through the ORM (admin, fixtures) rather than
+    update_score; the second drop discards a load that read the rows
+    before the commit.
+    """
+    unload_leaderboard(leaderboard_id)
+    on_commit_once(
+        f"leaderboard_unload:{leaderboard_id}", unload_leaderboard, leaderboard_id
+    )
@@ -0,0 +1,201 @@
+"""
+Score Services Module
+
+This module provides the database write path of scores.
+
+A participant has one Score row per leaderboard (unique on name and
+leaderboard). Points are applied with atomic statements, so concurrent
+updates of the same score never lose points. Points won are also kept
+as ScoreEvent rows and added to the ScoreRollup buckets of their day
+and week.
+
+Features:
+- "add" mode (increment) and "replace" mode (set the total)
+- MySQL: multi-row INSERT ... ON DUPLICATE KEY UPDATE statements
+- Other databases: atomic UPDATE with F() expressions, inserting on a
+  miss and retrying as an update if a concurrent insert won
+
+Reads are served from Redis by the ranking module, which persists its
+changes through upsert_scores and record_score_events.
+"""
+
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+
+from django.db import IntegrityError, connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import LeaderBoard, Score, ScoreEvent, ScoreRollup
+from .windows import PERIODS, bucket_start
+
+UPDATE_MODES = ("add", "replace")
+
+# Rows per multi-row upsert statement
+UPSERT_BATCH_SIZE = 500
+
+
+def _mysql_upsert(connection, model, rows: List[dict], mode):
+    quote = connection.ops.quote_name
+    # Creation timestamps are set here, as bulk_create does
+    stamped = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    fields = [model._meta.get_field(field) for field in rows[0]] + stamped
+    columns = ", ".join(quote(field.column) for field in fields)
+    points_column = quote(model._meta.get_field("points").column)
+    if mode == "add":
+        update = f"{points_column} = {points_column} + new.{points_column}"
+    else:
+        update = f"{points_column} = new.{points_column}"
+
+    now = timezone.now()
+    params = [
+        [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, [*row.values(), *[now] * len(stamped)])
+        ]
+        for row in rows
+    ]
+    placeholder = f"({', '.join(['%s'] * len(fields))})"
+    with connection.cursor() as cursor:
+        for start in range(0, len(params), UPSERT_BATCH_SIZE):
+            batch = params[start : start + UPSERT_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {quote(model._meta.db_table)} ({columns}) "
+                f"VALUES {', '.join([placeholder] * len(batch))} "
+                f"AS new ON DUPLICATE KEY UPDATE {update}",
+                [param for row in batch for param in row],
+            )
+
+
+def _orm_upsert(using, model, lookup: dict, points, mode):
+    rows = model.objects.using(using).filter(**lookup)
+    value = F("points") + points if mode == "add" else points
+    if rows.update(points=value):
+        return
+    try:
+        with transaction.atomic(using=using):
+            model.objects.using(using).bulk_create([model(**lookup, points=points)])
+    except IntegrityError:
+        # A concurrent request created the row first
+        rows.update(points=value)
+
+
+def _upsert(model, rows: List[dict], mode: str):
+    """
+    Add or set the points of rows found by their other (unique) fields.
+
+    Rows are dicts of the identifying field values keyed by attname, all
+    with the same keys, and a "points" value.
+    """
+    using = router.db_for_write(model)
+    connection = connections[using]
+    if connection.vendor == "mysql":
+        _mysql_upsert(connection, model, rows, mode)
+        return
+    for row in rows:
+        lookup = {field: value for field, value in row.items() if field != "points"}
+        _orm_upsert(using, model, lookup, row["points"], mode)
+
+
+def upsert_scores(
+    leaderboard: LeaderBoard, points: Dict[str, int], mode: str = "add"
+) -> None:
+    """
+    Add points to several participants' scores, or replace them.
+
+    Missing scores are created. Like bulk_create, no model signals are
+    sent.
+
+    Args:
+        leaderboard: Leaderboard of the scores
+        points: Points to add ("add") or new totals ("replace") by name
+        mode: "add" or "replace"
+
+    Raises:
+        ValueError: For an unknown mode
+    """
+    if mode not in UPDATE_MODES:
+        raise ValueError(f"update_mode must be one of: {', '.join(UPDATE_MODES)}")
+    if not points:
+        return
+
+    rows = [
+        {"leaderboard_id": leaderboard.pk, "name": name, "points": value}
+        for name, value in points.items()
+    ]
+    _upsert(Score, rows, mode)
+
+
+def upsert_score(
+    leaderboard: LeaderBoard, name: str, points: int, mode: str = "add"
+) -> int:
+    """
+    Add points to a participant's score, or replace them, atomically.
+
+    Args:
+        leaderboard: Leaderboard of the score
+        name: Participant name
+        points: Points to add ("add") or the new total ("replace")
+        mode: "add" or "replace"
+
+    Returns:
+        int: Points of the participant after the update
+
+    Raises:
+        ValueError: For an unknown mode
+    """
+    upsert_scores(leaderboard, {name: points}, mode)
+    return (
+        Score.objects.using(router.db_for_write(Score))
+        .filter(leaderboard=leaderboard, name=name)
+        .values_list("points", flat=True)
+        .get()
+    )
+
+
+def record_score_events(
+    leaderboard: LeaderBoard, events: List[Tuple[str, int, datetime]]
+) -> None:
+    """
+    Store points won and add them to their day and week buckets.
+
+    Replaced totals are corrections rather than points won, so callers
+    only record "add" updates.
+
+    Args:
+        leaderboard: Leaderboard the points were won in
+        events: (name, points, won at) per update
+    """
+    if not events:
+        return
+
+    ScoreEvent.objects.bulk_create(
+        [
+            ScoreEvent(
+                leaderboard_id=leaderboard.pk, name=name, points=points, created_at=at
+            )
+            for name, points, at in events
+        ],
+        batch_size=UPSERT_BATCH_SIZE,
+    )
+
+    buckets: Counter[Tuple[str, date, str]] = Counter()
+    for name, points, at in events:
+        for period in PERIODS:
+            buckets[period, bucket_start(period, at), name] += points
+    rows = [
+        {
+            "leaderboard_id": leaderboard.pk,
+            "period": period,
+            "bucket_start": start,
+            "name": name,
+            "points": points,
+        }
+        for (period, start, name), points in buckets.items()
+    ]
+    _upsert(ScoreRollup, rows, "add")
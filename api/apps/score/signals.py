@@ -0,0 +1,68 @@
+"""
+Score Signals Module
+
+This module connects model signals that keep cached leaderboard
+responses and the Redis leaderboards (see ranking) in sync.
+Handles:
+- Leaderboard listing invalidation on leaderboard changes
+- Redis leaderboard removal when a leaderboard is deleted
+- Channel mapping removal when a leaderboard changes channel
+- Redis leaderboard reload after Score rows change through the ORM
+
+Receivers are registered in ScoreConfig.ready().
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.utils.cache_utils import invalidate_tags_on_commit
+
+from .models import LeaderBoard, Score
+from .ranking import (
+    drop_leaderboard,
+    forget_channels_on_commit,
+    unload_leaderboard_on_commit,
+)
+
+
+@receiver([post_save, post_delete], sender=LeaderBoard)
+def leaderboard_changed(sender, instance, **kwargs):
+    """Invalidate leaderboard listings"""
+    invalidate_tags_on_commit("leaderboards")
+
+
+@receiver(pre_save, sender=LeaderBoard)
+def remember_leaderboard_channel(sender, instance, **kwargs):
+    """Remember the stored channel of a leaderboard about to change"""
+    instance._stored_channel = None
+    if not instance._state.adding:
+        instance._stored_channel = (
+            LeaderBoard.objects.filter(pk=instance.pk)
+            .values_list("discord_channel", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=LeaderBoard)
+def leaderboard_saved(sender, instance, **kwargs):
+    """Forget the channel mappings of a leaderboard moved to another channel"""
+    stored_channel = getattr(instance, "_stored_channel", None)
+    if stored_channel and stored_channel != instance.discord_channel:
+        forget_channels_on_commit(stored_channel, instance.discord_channel)
+
+
+@receiver(post_delete, sender=LeaderBoard)
+def leaderboard_deleted(sender, instance, **kwargs):
+    """Remove the leaderboard and its pending score changes from Redis"""
+    drop_leaderboard(instance.pk, instance.discord_channel)
+
+
+@receiver([post_save, post_delete], sender=Score)
+def score_changed(sender, instance, **kwargs):
+    """
+    Reload the leaderboard of a score written through the ORM.
+
+    Scores updated through ranking.update_score and its flush send no
+    signals, so this only runs for admin or fixture writes.
+    """
+    unload_leaderboard_on_commit(instance.leaderboard_id)
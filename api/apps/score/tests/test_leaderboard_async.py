@@ -0,0 +1,74 @@
+"""
+Leaderboard Async View Test Module
+
+This module contains integration tests for the async leaderboard view.
+Tests cover:
+- Top scores identical to the sync view
+- Cached body invalidated on score changes
+- Error handling
+- Leaderboard creation passed to the DRF viewset
+"""
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+
+from .factories import LeaderBoardFactory, ScoreFactory
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("api.asgi_urls")
+class TestLeaderboardAsync:
+    """
+    Tests for the async leaderboard view.
+    Runs with real commits so cache tags are bumped as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self):
+        """Setup for each test"""
+        self.url = "/api/leaderboards/"
+        self.client = AsyncClient()
+
+    def get(self, params):
+        return async_to_sync(self.client.get)(self.url, params)
+
+    def test_top_scores_match_sync_view(self, api_client, leaderboard_with_scores):
+        """Test the async view returns the sync top 10"""
+        params = {"channel": leaderboard_with_scores.discord_channel}
+
+        response = self.get(params)
+
+        assert response.status_code == 200
+        assert response.content == api_client.get(self.url, params).content
+        assert len(response.json()) == 10
+
+    def test_new_score_served_after_invalidation(self, test_user):
+        """Test a cached top 10 is rebuilt when a score changes"""
+        leaderboard = LeaderBoardFactory(created_by=test_user)
+        ScoreFactory(leaderboard=leaderboard, name="first", points=10)
+        params = {"channel": leaderboard.discord_channel}
+        assert [score["name"] for score in self.get(params).json()] == ["first"]
+
+        ScoreFactory(leaderboard=leaderboard, name="second", points=20)
+
+        names = [score["name"] for score in self.get(params).json()]
+        assert names == ["second", "first"]
+
+    def test_errors(self):
+        """Test missing channel and unknown leaderboard"""
+        assert self.get({}).status_code == 400
+        response = self.get({"channel": "nonexistent"})
+        assert response.status_code == 404
+        assert response.json() == {"error": "LeaderBoard not found"}
+
+    def test_create_goes_to_viewset(self, test_user):
+        """Test POST still creates leaderboards"""
+        response = async_to_sync(self.client.post)(
+            self.url,
+            {"discord_channel": "async-channel", "username": test_user.username},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert response.json()["discord_channel"] == "async-channel"
@@ -78,3 +78,14 @@ class TestLeaderboardOperations(BaseScoreTest, LeaderboardTestMixin):
         # Assert
         assert response.status_code == 200
         assert response.data["leaderboard_id"] == str(test_leaderboard.id)
+
+    def test_cached_leaderboard_reflects_new_score(self, api_client, test_leaderboard):
+        """Test the cached top scores are dropped when a score is added"""
+        url = f"{self.url}?channel={test_leaderboard.discord_channel}"
+        before = len(api_client.get(url).data)
+
+        ScoreFactory(leaderboard=test_leaderboard, points=10_000)
+
+        response = api_client.get(url)
+        assert len(response.data) == before + 1
+        assert response.data[0]["points"] == 10_000
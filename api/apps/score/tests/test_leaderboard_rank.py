@@ -0,0 +1,99 @@
+"""
+Leaderboard Rank Test Module
+
+This module contains tests for the player rank lookup.
+Tests cover:
+- Rank, points and neighbours around a player
+- Ties ranked in the top scores order
+- Database reads matching the sorted set without Redis
+- Error handling
+"""
+
+from unittest import mock
+
+import pytest
+
+from api.apps.score import ranking
+from api.apps.score.ranking import player_rank, top_scores, unload_leaderboard
+from api.utils.redis_utils import RedisError
+
+from .factories import ScoreFactory
+
+POINTS = {"ana": 50, "ben": 40, "cy": 30, "dee": 30, "eve": 20, "fay": 10}
+
+
+@pytest.mark.django_db
+class TestLeaderboardRank:
+    """Tests for GET /api/leaderboards/rank/"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_leaderboard):
+        """Setup for each test case"""
+        self.leaderboard = test_leaderboard
+        for name, points in POINTS.items():
+            ScoreFactory(leaderboard=test_leaderboard, name=name, points=points)
+        self.url = "/api/leaderboards/rank/"
+
+    def get(self, client, **params):
+        params.setdefault("channel", self.leaderboard.discord_channel)
+        return client.get(self.url, params)
+
+    def test_rank_with_neighbours(self, api_client):
+        """Test the player's rank and the players around them"""
+        response = self.get(api_client, name="cy", neighbours=1)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "name": "cy",
+            "points": 30,
+            "rank": 4,
+            "neighbours": [
+                {"rank": 3, "name": "dee", "points": 30},
+                {"rank": 4, "name": "cy", "points": 30},
+                {"rank": 5, "name": "eve", "points": 20},
+            ],
+        }
+
+    def test_ranks_follow_top_scores(self, api_client):
+        """Test ranks match the order of the top scores listing"""
+        names = [score["name"] for score in top_scores(self.leaderboard.id)]
+
+        for rank, name in enumerate(names, 1):
+            assert self.get(api_client, name=name).json()["rank"] == rank
+
+    def test_neighbours_clipped_at_edges(self, api_client):
+        """Test the first and last players list only existing neighbours"""
+        first = self.get(api_client, name="ana").json()
+        last = self.get(api_client, name="fay", neighbours=0).json()
+
+        assert [row["rank"] for row in first["neighbours"]] == [1, 2, 3]
+        assert last["neighbours"] == [{"rank": 6, "name": "fay", "points": 10}]
+
+    def test_rank_loads_leaderboard(self, api_client):
+        """Test a lookup on a leaderboard not loaded in Redis yet"""
+        unload_leaderboard(self.leaderboard.id)
+
+        assert self.get(api_client, name="ben").json()["rank"] == 2
+
+    @pytest.mark.parametrize("name", list(POINTS))
+    def test_database_rank_matches_redis(self, name):
+        """Test the database fallback ranks like the sorted set"""
+        expected = player_rank(self.leaderboard.id, name)
+        broken = mock.Mock(**{"register_script.side_effect": RedisError("down")})
+
+        with mock.patch.object(ranking, "get_redis", return_value=broken):
+            assert player_rank(self.leaderboard.id, name) == expected
+
+    @pytest.mark.parametrize(
+        "params, status",
+        [
+            ({"name": ""}, 400),
+            ({"name": "ana", "neighbours": "many"}, 400),
+            ({"name": "ana", "neighbours": 11}, 400),
+            ({"name": "ana", "channel": "nonexistent"}, 404),
+            ({"name": "nobody"}, 404),
+        ],
+    )
+    def test_errors(self, api_client, params, status):
+        """Test missing parameters, unknown channels and players"""
+        assert self.get(api_client, **params).status_code == status
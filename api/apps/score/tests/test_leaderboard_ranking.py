@@ -0,0 +1,280 @@
+"""
+Leaderboard Ranking Test Module
+
+This module contains tests for the Redis leaderboards.
+Tests cover:
+- Sorted set updates and top scores reads
+- Write-behind flush into the Score table
+- Lazy loads and rebuilds merged with pending changes
+- Failed flushes restored to Redis without blocking other leaderboards
+- Direct database access while Redis is unavailable
+- Flush and rebuild management commands
+"""
+
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.apps.score import ranking
+from api.apps.score.models import Score
+from api.apps.score.ranking import (
+    dirty_key,
+    flush_scores,
+    load_leaderboard,
+    ranking_keys,
+    ranking_lock,
+    resolve_leaderboard,
+    top_scores,
+    unload_leaderboard,
+    update_score,
+)
+from api.utils.redis_utils import RedisError, get_redis
+
+from .factories import LeaderBoardFactory, ScoreFactory
+
+
+def db_points(leaderboard):
+    return dict(
+        Score.objects.filter(leaderboard=leaderboard).values_list("name", "points")
+    )
+
+
+@pytest.mark.django_db
+class TestLeaderboardRanking:
+    """Tests for score updates and reads through Redis"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_leaderboard):
+        """Setup for each test case"""
+        self.leaderboard = test_leaderboard
+        self.redis = get_redis()
+
+    def test_updates_ranked_before_flush(self):
+        """Test top scores include updates the Score table has not seen"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "bob", 30)
+        assert update_score(self.leaderboard, "alice", 25) == 35
+
+        assert top_scores(self.leaderboard.id) == [
+            {"name": "alice", "points": 35},
+            {"name": "bob", "points": 30},
+        ]
+        assert db_points(self.leaderboard) == {}
+
+    def test_flush_persists_changes(self):
+        """Test a flush writes totals and clears the pending changes"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "alice", 5)
+        update_score(self.leaderboard, "bob", 7, mode="replace")
+
+        assert flush_scores() == 2
+        assert db_points(self.leaderboard) == {"alice": 15, "bob": 7}
+        assert not self.redis.sismember(dirty_key(), str(self.leaderboard.id))
+
+        update_score(self.leaderboard, "bob", 3)
+        flush_scores()
+        assert db_points(self.leaderboard) == {"alice": 15, "bob": 10}
+
+    def test_replace_then_add_flushed_in_order(self):
+        """Test points added after a replace are applied to the new total"""
+        ScoreFactory(leaderboard=self.leaderboard, name="alice", points=100)
+        update_score(self.leaderboard, "alice", 4, mode="replace")
+        update_score(self.leaderboard, "alice", 6)
+
+        flush_scores()
+
+        assert db_points(self.leaderboard) == {"alice": 10}
+
+    def test_lazy_load_merges_pending_changes(self):
+        """Test a sorted set loaded from the table includes pending changes"""
+        ScoreFactory(leaderboard=self.leaderboard, name="alice", points=10)
+        ScoreFactory(leaderboard=self.leaderboard, name="bob", points=20)
+        update_score(self.leaderboard, "alice", 15)
+        unload_leaderboard(self.leaderboard.id)
+
+        assert update_score(self.leaderboard, "bob", 1) == 21
+        assert top_scores(self.leaderboard.id) == [
+            {"name": "alice", "points": 25},
+            {"name": "bob", "points": 21},
+        ]
+
+        flush_scores()
+        assert db_points(self.leaderboard) == {"alice": 25, "bob": 21}
+
+    def test_empty_leaderboard_loaded_once(self):
+        """Test an empty leaderboard is not reloaded on every read"""
+        assert top_scores(self.leaderboard.id) == []
+
+        assert load_leaderboard(self.leaderboard.id) is None
+
+    def test_top_scores_limit(self, test_user):
+        """Test only the best scores are returned"""
+        leaderboard = LeaderBoardFactory(created_by=test_user)
+        for points in range(1, 13):
+            ScoreFactory(leaderboard=leaderboard, name=f"p{points}", points=points)
+
+        scores = top_scores(leaderboard.id)
+
+        assert [score["points"] for score in scores] == list(range(12, 2, -1))
+        assert top_scores(leaderboard.id, limit=2)[1] == {"name": "p11", "points": 11}
+
+    def test_invalid_updates_rejected(self):
+        """Test unknown modes and the reserved empty name"""
+        with pytest.raises(ValueError):
+            update_score(self.leaderboard, "alice", 1, mode="multiply")
+        with pytest.raises(ValueError):
+            update_score(self.leaderboard, "", 1)
+
+    def test_failed_flush_restored(self):
+        """Test changes of a failed flush are kept for the next one"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "bob", 5, mode="replace")
+
+        with mock.patch.object(
+            ranking, "persist_changes", side_effect=RuntimeError("db down")
+        ):
+            assert flush_scores() == 0
+
+        assert db_points(self.leaderboard) == {}
+        flush_scores()
+        assert db_points(self.leaderboard) == {"alice": 10, "bob": 5}
+
+    def test_failed_flush_skips_to_next(self, test_user):
+        """Test one leaderboard failing to save does not hold back the others"""
+        other = LeaderBoardFactory(created_by=test_user)
+        update_score(self.leaderboard, "alice", 10)
+        update_score(other, "bob", 5)
+        persist_changes = ranking.persist_changes
+
+        def fail_first(leaderboard_id, *args):
+            if str(leaderboard_id) == str(self.leaderboard.id):
+                raise RuntimeError("name too long")
+            persist_changes(leaderboard_id, *args)
+
+        with mock.patch.object(ranking, "persist_changes", side_effect=fail_first):
+            assert flush_scores() == 1
+
+        assert db_points(self.leaderboard) == {}
+        assert db_points(other) == {"bob": 5}
+        assert self.redis.smembers(dirty_key()) == {str(self.leaderboard.id).encode()}
+        flush_scores()
+        assert db_points(self.leaderboard) == {"alice": 10}
+
+    def test_restore_keeps_newer_replace(self):
+        """Test a replace made during a failed flush is not overwritten"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "bob", 5, mode="replace")
+
+        def replace_then_fail(*args):
+            update_score(self.leaderboard, "alice", 1, mode="replace")
+            update_score(self.leaderboard, "bob", 2, mode="replace")
+            raise RuntimeError("db down")
+
+        with mock.patch.object(
+            ranking, "persist_changes", side_effect=replace_then_fail
+        ):
+            flush_scores()
+        flush_scores()
+
+        assert db_points(self.leaderboard) == {"alice": 1, "bob": 2}
+
+    def test_locked_leaderboard_skipped(self):
+        """Test a leaderboard being loaded is flushed on the next run"""
+        update_score(self.leaderboard, "alice", 10)
+
+        with ranking_lock(self.redis, self.leaderboard.id):
+            assert flush_scores() == 0
+
+        assert flush_scores() == 1
+        assert db_points(self.leaderboard) == {"alice": 10}
+
+    def test_deleted_leaderboard_dropped(self):
+        """Test pending changes of a deleted leaderboard are discarded"""
+        leaderboard_id = self.leaderboard.id
+        update_score(self.leaderboard, "alice", 10)
+
+        self.leaderboard.delete()
+
+        assert not self.redis.exists(*ranking_keys(leaderboard_id))
+        assert flush_scores() == 0
+
+    def test_score_leaderboard_action_reads_redis(self, api_client):
+        """Test the score viewset leaderboard sees updates before the flush"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "bob", 30)
+
+        response = api_client.get(f"/api/score/{self.leaderboard.id}/leaderboard/")
+
+        assert response.status_code == 200
+        assert response.json()["scores"] == top_scores(self.leaderboard.id)
+        assert response.json()["scores"][0] == {"name": "bob", "points": 30}
+
+    def test_channel_change_forgets_mapping(self):
+        """Test a leaderboard moved to another channel resolves from there"""
+        old_channel = self.leaderboard.discord_channel
+        assert resolve_leaderboard(old_channel) == str(self.leaderboard.id)
+
+        self.leaderboard.discord_channel = "moved-channel"
+        self.leaderboard.save()
+
+        assert resolve_leaderboard(old_channel) is None
+        assert resolve_leaderboard("moved-channel") == str(self.leaderboard.id)
+
+    def test_redis_unavailable(self):
+        """Test updates and reads go to the database without Redis"""
+        broken = mock.Mock(
+            **{
+                "register_script.side_effect": RedisError("down"),
+                "zrevrange.side_effect": RedisError("down"),
+            }
+        )
+
+        with mock.patch.object(ranking, "get_redis", return_value=broken):
+            assert update_score(self.leaderboard, "alice", 10) == 10
+            assert update_score(self.leaderboard, "alice", 5) == 15
+            assert top_scores(self.leaderboard.id) == [{"name": "alice", "points": 15}]
+
+        assert db_points(self.leaderboard) == {"alice": 15}
+
+
+@pytest.mark.django_db
+class TestLeaderboardCommands:
+    """Tests for the flush and rebuild management commands"""
+
+    def test_flush_command(self, test_leaderboard):
+        """Test the flush command reports the flushed changes"""
+        update_score(test_leaderboard, "alice", 10)
+        out = StringIO()
+
+        call_command("flush_leaderboard_scores", stdout=out)
+
+        assert "Flushed 1 score changes" in out.getvalue()
+        assert db_points(test_leaderboard) == {"alice": 10}
+
+    def test_rebuild_reloads_database_rows(self, test_leaderboard):
+        """Test a rebuild picks up rows written directly to the table"""
+        update_score(test_leaderboard, "alice", 10)
+        Score.objects.bulk_create(
+            [Score(leaderboard=test_leaderboard, name="bob", points=50)]
+        )
+        out = StringIO()
+
+        call_command(
+            "rebuild_leaderboards",
+            channel=[test_leaderboard.discord_channel],
+            stdout=out,
+        )
+
+        assert "Rebuilt 1 leaderboards with 2 participants" in out.getvalue()
+        assert top_scores(test_leaderboard.id) == [
+            {"name": "bob", "points": 50},
+            {"name": "alice", "points": 10},
+        ]
+
+    def test_rebuild_unknown_channel(self):
+        """Test rebuilding an unknown channel fails"""
+        with pytest.raises(CommandError):
+            call_command("rebuild_leaderboards", channel=["nonexistent"])
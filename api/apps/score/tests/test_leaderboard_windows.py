@@ -0,0 +1,186 @@
+"""
+Leaderboard Windows Test Module
+
+This module contains tests for the daily and weekly leaderboards.
+Tests cover:
+- Day and week bucket boundaries
+- Events and buckets written by the flush
+- Windowed top scores from the sync and async views
+- Events recorded while Redis is unavailable
+- Compaction of old events and buckets
+"""
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import AsyncClient
+from django.utils import timezone
+
+from api.apps.score import ranking
+from api.apps.score.models import ScoreEvent, ScoreRollup
+from api.apps.score.ranking import flush_scores, update_score
+from api.apps.score.services import record_score_events
+from api.apps.score.windows import bucket_start, compact_score_events
+from api.utils.redis_utils import RedisError
+
+from .factories import LeaderBoardFactory
+
+
+def bucket_points(leaderboard, period):
+    return dict(
+        ScoreRollup.objects.filter(leaderboard=leaderboard, period=period).values_list(
+            "name", "points"
+        )
+    )
+
+
+@pytest.mark.django_db
+class TestBucketStart:
+    """Tests for the bucket boundaries"""
+
+    def test_day_is_utc(self):
+        """Test days are cut at UTC midnight"""
+        late = datetime(2024, 5, 8, 23, 30, tzinfo=dt_timezone(timedelta(hours=-2)))
+
+        assert bucket_start("day", late) == date(2024, 5, 9)
+
+    def test_week_starts_monday(self):
+        """Test every day of a week maps to its Monday"""
+        monday = datetime(2024, 5, 6, tzinfo=dt_timezone.utc)
+
+        for offset in range(7):
+            when = monday + timedelta(days=offset, hours=23)
+            assert bucket_start("week", when) == date(2024, 5, 6)
+        assert bucket_start("week", monday + timedelta(days=7)) == date(2024, 5, 13)
+
+
+@pytest.mark.django_db
+class TestLeaderboardWindows:
+    """Tests for GET /api/leaderboards/?window="""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_leaderboard):
+        """Setup for each test case"""
+        self.leaderboard = test_leaderboard
+        self.url = "/api/leaderboards/"
+
+    def get(self, client, window):
+        return client.get(
+            self.url, {"channel": self.leaderboard.discord_channel, "window": window}
+        )
+
+    def test_flush_records_events_and_buckets(self):
+        """Test added points become events and bucket totals, not replaces"""
+        update_score(self.leaderboard, "alice", 10)
+        update_score(self.leaderboard, "alice", 5)
+        update_score(self.leaderboard, "bob", 50, mode="replace")
+        update_score(self.leaderboard, "bob", 2)
+
+        flush_scores()
+
+        assert sorted(
+            ScoreEvent.objects.values_list("name", "points").order_by("id")
+        ) == [("alice", 5), ("alice", 10), ("bob", 2)]
+        assert bucket_points(self.leaderboard, "day") == {"alice": 15, "bob": 2}
+        assert bucket_points(self.leaderboard, "week") == {"alice": 15, "bob": 2}
+
+    def test_windowed_top_scores(self, api_client):
+        """Test the day and week windows rank points won in their bucket"""
+        now = timezone.now()
+        record_score_events(
+            self.leaderboard,
+            [("old", 100, now - timedelta(days=8)), ("alice", 3, now)],
+        )
+        update_score(self.leaderboard, "bob", 7)
+        flush_scores()
+
+        for window in ("day", "week"):
+            response = self.get(api_client, window)
+            assert response.status_code == 200
+            assert response.json() == [
+                {"name": "bob", "points": 7},
+                {"name": "alice", "points": 3},
+            ]
+        assert self.get(api_client, "all").json()[0] == {"name": "bob", "points": 7}
+
+    def test_invalid_window(self, api_client):
+        """Test unknown windows are rejected"""
+        response = self.get(api_client, "month")
+
+        assert response.status_code == 400
+        assert "window" in response.json()["error"]
+
+    def test_without_redis_records_events(self):
+        """Test the database fallback records added points"""
+        broken = mock.Mock(**{"register_script.side_effect": RedisError("down")})
+
+        with mock.patch.object(ranking, "get_redis", return_value=broken):
+            update_score(self.leaderboard, "alice", 4)
+            update_score(self.leaderboard, "alice", 9, mode="replace")
+
+        assert list(ScoreEvent.objects.values_list("name", "points")) == [("alice", 4)]
+        assert bucket_points(self.leaderboard, "week") == {"alice": 4}
+
+    def test_compaction(self, settings):
+        """Test events and buckets past their retention are deleted"""
+        settings.SCORE_HISTORY = {
+            "EVENT_RETENTION_DAYS": 10,
+            "DAY_BUCKET_RETENTION_DAYS": 20,
+            "WEEK_BUCKET_RETENTION_WEEKS": 8,
+        }
+        now = datetime(2024, 5, 8, 12, tzinfo=dt_timezone.utc)
+        record_score_events(
+            self.leaderboard,
+            [
+                ("alice", 1, now - timedelta(days=5)),
+                ("alice", 2, now - timedelta(days=15)),
+                ("alice", 4, now - timedelta(days=30)),
+                ("alice", 8, now - timedelta(weeks=12)),
+            ],
+        )
+
+        deleted = compact_score_events(now=now)
+
+        assert deleted == {"events": 3, "day": 2, "week": 1}
+        assert list(ScoreEvent.objects.values_list("points", flat=True)) == [1]
+        assert sorted(
+            ScoreRollup.objects.filter(period="day").values_list("points", flat=True)
+        ) == [1, 2]
+        assert sorted(
+            ScoreRollup.objects.filter(period="week").values_list("points", flat=True)
+        ) == [1, 2, 4]
+
+    def test_compact_command(self):
+        """Test the command reports the deleted rows"""
+        out = StringIO()
+
+        call_command("compact_score_events", stdout=out)
+
+        assert "Deleted 0 events, 0 day buckets and 0 week buckets" in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.urls("api.asgi_urls")
+class TestLeaderboardWindowsAsync:
+    """Tests for the window parameter of the async leaderboard view"""
+
+    def test_matches_sync_view(self, api_client, test_user):
+        """Test the async view returns the sync windowed scores"""
+        leaderboard = LeaderBoardFactory(created_by=test_user)
+        record_score_events(
+            leaderboard, [("alice", 3, timezone.now()), ("bob", 5, timezone.now())]
+        )
+        client = AsyncClient()
+        url = "/api/leaderboards/"
+
+        for window in ("day", "week", "year"):
+            params = {"channel": leaderboard.discord_channel, "window": window}
+            response = async_to_sync(client.get)(url, params)
+            expected = api_client.get(url, params)
+            assert response.status_code == expected.status_code
+            assert response.json() == expected.json()
@@ -0,0 +1,147 @@
+"""
+Score Batch Test Module
+
+This module contains tests for batched score submissions.
+Tests cover:
+- Totals of several participants and channels in one request
+- Validation of every change before any is applied
+- All or none application without Redis
+"""
+
+from unittest import mock
+
+import pytest
+
+from api.apps.score import ranking
+from api.apps.score.models import Score
+from api.apps.score.ranking import flush_scores, top_scores
+from api.apps.score.viewsets import SCORE_BATCH_MAX
+from api.utils.redis_utils import RedisError
+
+from .factories import LeaderBoardFactory
+
+
+@pytest.mark.django_db
+class TestScoreBatch:
+    """Tests for POST /api/score/batch/"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_leaderboard, test_user):
+        """Setup for each test case"""
+        self.leaderboard = test_leaderboard
+        self.other = LeaderBoardFactory(created_by=test_user)
+        self.url = "/api/score/batch/"
+
+    def change(self, name, points, leaderboard=None):
+        leaderboard = leaderboard or self.leaderboard
+        return {
+            "name": name,
+            "points": points,
+            "discord_channel": leaderboard.discord_channel,
+        }
+
+    def post(self, client, scores):
+        return client.post(self.url, {"scores": scores}, format="json")
+
+    def test_batch_returns_totals(self, api_client):
+        """Test repeated participants are summed and totals returned"""
+        self.post(api_client, [self.change("alice", 5)])
+
+        response = self.post(
+            api_client,
+            [
+                self.change("alice", 10),
+                self.change("bob", 3),
+                self.change("alice", 1),
+                self.change("alice", 7, self.other),
+            ],
+        )
+
+        assert response.status_code == 200
+        assert response.data["data"] == [
+            {
+                "name": "alice",
+                "discord_channel": self.leaderboard.discord_channel,
+                "points": 16,
+            },
+            {
+                "name": "bob",
+                "discord_channel": self.leaderboard.discord_channel,
+                "points": 3,
+            },
+            {
+                "name": "alice",
+                "discord_channel": self.other.discord_channel,
+                "points": 7,
+            },
+        ]
+        assert top_scores(self.leaderboard.id)[0] == {"name": "alice", "points": 16}
+
+        flush_scores()
+        assert (
+            Score.objects.get(leaderboard=self.leaderboard, name="alice").points == 16
+        )
+
+    @pytest.mark.parametrize(
+        "scores",
+        [
+            [{"name": "alice", "points": 5}],
+            [{"name": "", "points": 5, "discord_channel": "c"}],
+            [{"name": "a" * 256, "points": 5, "discord_channel": "c"}],
+            [{"name": "alice", "points": "many", "discord_channel": "c"}],
+            [{"name": "alice", "points": -1, "discord_channel": "c"}],
+            ["alice"],
+        ],
+    )
+    def test_invalid_change_rejected(self, api_client, scores):
+        """Test a batch with an invalid change is rejected"""
+        response = self.post(api_client, [self.change("bob", 1), *scores])
+
+        assert response.status_code == 400
+        assert "scores[1]" in response.data["error"]
+        assert top_scores(self.leaderboard.id) == []
+
+    def test_batch_size_limit(self, api_client):
+        """Test batches over the maximum are rejected"""
+        response = self.post(
+            api_client, [self.change("alice", 1)] * (SCORE_BATCH_MAX + 1)
+        )
+
+        assert response.status_code == 400
+        assert self.post(api_client, []).status_code == 400
+
+    def test_unknown_channel_applies_nothing(self, api_client):
+        """Test one unknown channel rejects the whole batch"""
+        response = self.post(
+            api_client,
+            [
+                self.change("alice", 5),
+                {"name": "bob", "points": 1, "discord_channel": "nonexistent"},
+            ],
+        )
+
+        assert response.status_code == 404
+        assert "nonexistent" in response.data["error"]
+        assert top_scores(self.leaderboard.id) == []
+
+    def test_without_redis_all_or_none(self, api_client):
+        """Test the database fallback rolls back a partly written batch"""
+        broken = mock.Mock(**{"register_script.side_effect": RedisError("down")})
+        upsert_scores = ranking.upsert_scores
+        calls = []
+
+        def fail_second(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("db down")
+            upsert_scores(*args)
+
+        batch = [self.change("alice", 5), self.change("bob", 2, self.other)]
+        with mock.patch.object(ranking, "get_redis", return_value=broken):
+            with mock.patch.object(ranking, "upsert_scores", side_effect=fail_second):
+                assert self.post(api_client, batch).status_code == 400
+            assert not Score.objects.exists()
+            response = self.post(api_client, batch)
+
+        assert [item["points"] for item in response.data["data"]] == [5, 2]
+        assert Score.objects.get(leaderboard=self.leaderboard, name="alice").points == 5
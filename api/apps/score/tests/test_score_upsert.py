@@ -0,0 +1,136 @@
+"""
+Score Upsert Test Module
+
+This module contains tests for the atomic score write path.
+Tests cover:
+- Add and replace modes
+- Participant names the Score table cannot store
+- One score row per participant and leaderboard
+- Exact totals under concurrent submissions
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.apps.score.models import Score
+from api.apps.score.ranking import flush_scores, top_scores
+from api.apps.score.services import upsert_score
+
+from .factories import LeaderBoardFactory, ScoreFactory
+
+
+@pytest.mark.django_db
+class TestScoreUpsert:
+    """Tests for upsert_score and the score endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_leaderboard):
+        """Setup for each test case"""
+        self.leaderboard = test_leaderboard
+        self.url = "/api/score/"
+
+    def post(self, client, points, **extra):
+        data = {
+            "name": "player",
+            "points": points,
+            "discord_channel": self.leaderboard.discord_channel,
+            **extra,
+        }
+        return client.post(self.url, data, format="json")
+
+    def test_add_mode_accumulates(self, api_client):
+        """Test points are added to the existing total"""
+        assert self.post(api_client, 10).data["data"]["points"] == 10
+
+        response = self.post(api_client, 5)
+
+        assert response.status_code == 200
+        assert response.data["data"] == {"name": "player", "points": 15}
+        flush_scores()
+        assert Score.objects.filter(leaderboard=self.leaderboard).count() == 1
+
+    def test_replace_mode_sets_total(self, api_client):
+        """Test replace mode overwrites the total"""
+        self.post(api_client, 10)
+
+        response = self.post(api_client, 3, update_mode="replace")
+
+        assert response.data["data"]["points"] == 3
+        flush_scores()
+        assert Score.objects.get(name="player").points == 3
+
+    def test_unknown_mode_rejected(self, api_client):
+        """Test an unknown update_mode is a validation error"""
+        response = self.post(api_client, 3, update_mode="multiply")
+
+        assert response.status_code == 400
+        assert not Score.objects.filter(name="player").exists()
+        with pytest.raises(ValueError):
+            upsert_score(self.leaderboard, "player", 3, mode="multiply")
+
+    @pytest.mark.parametrize("name", ["a" * 256, ["player"], 7])
+    def test_invalid_name_rejected(self, api_client, name):
+        """Test names the Score table cannot store never reach the leaderboard"""
+        response = self.post(api_client, 3, name=name)
+
+        assert response.status_code == 400
+        assert "name" in response.data["error"]
+        assert top_scores(self.leaderboard.id) == []
+
+    def test_duplicate_rows_rejected(self):
+        """Test the unique constraint on name and leaderboard"""
+        ScoreFactory(leaderboard=self.leaderboard, name="player")
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            ScoreFactory(leaderboard=self.leaderboard, name="player")
+
+    def test_same_name_on_other_leaderboard(self, test_user):
+        """Test participants are scored per leaderboard"""
+        other = LeaderBoardFactory(created_by=test_user)
+        upsert_score(self.leaderboard, "player", 10)
+
+        assert upsert_score(other, "player", 4) == 4
+        assert upsert_score(self.leaderboard, "player", 1) == 11
+
+    def test_update_query_count(self):
+        """Test an existing score is updated without a read-modify-write"""
+        upsert_score(self.leaderboard, "player", 10)
+
+        with CaptureQueriesContext(connection) as context:
+            total = upsert_score(self.leaderboard, "player", 5)
+
+        assert total == 15
+        # Atomic update + reading the total back
+        assert len(context.captured_queries) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+class TestScoreUpsertConcurrency:
+    """
+    Tests for concurrent score submissions.
+    Runs with real commits so requests race in separate connections.
+    """
+
+    def test_parallel_increments_exact_total(self, test_leaderboard, api_client):
+        """Test no points are lost when increments race"""
+        channel = test_leaderboard.discord_channel
+        requests, points = 20, 5
+
+        def submit(_):
+            return APIClient().post(
+                "/api/score/",
+                {"name": "racer", "points": points, "discord_channel": channel},
+                format="json",
+            )
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(submit, range(requests)))
+
+        assert [response.status_code for response in responses] == [200] * requests
+        flush_scores()
+        assert Score.objects.get(name="racer").points == requests * points
+        assert Score.objects.filter(name="racer").count() == 1
@@ -4,7 +4,8 @@ Score ViewSets Module
 This module provides API views for the scoring system.
 Includes viewsets for:
 - LeaderBoard management
-- Score tracking and updates
+- Score tracking and updates (Redis sorted sets, see ranking)
+- Batched score submissions applied all or none
 - Trivia winner management
 
 Features:
@@ -26,7 +27,26 @@ from api.utils.logging_utils import log_exception, logger
 from api.utils.throttling import CustomAnonRateThrottle, CustomUserRateThrottle
 
 from .models import LeaderBoard, Score, TriviaWinner
+from .ranking import (
+    add_scores,
+    player_rank,
+    resolve_leaderboard,
+    top_scores,
+    update_score,
+)
 from .serializers import LeaderBoardSerializer, ScoreSerializer, TriviaWinnerSerializer
+from .services import UPDATE_MODES
+from .windows import WINDOWS, window_top_scores
+
+# Score changes accepted per batch request
+SCORE_BATCH_MAX = 500
+
+# Longest participant name the Score table stores
+SCORE_NAME_MAX_LENGTH = Score._meta.get_field("name").max_length
+
+# Participants listed on each side of a ranked player
+RANK_NEIGHBOURS_DEFAULT = 2
+RANK_NEIGHBOURS_MAX = 10
 
 
 @method_decorator(csrf_exempt, name="dispatch")
@@ -38,6 +58,7 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
     - Creating/retrieving leaderboards
     - Listing all leaderboards
     - Getting top scores for a leaderboard
+    - Getting a player's rank and neighbours
 
     Features:
     - CSRF exemption
@@ -101,7 +122,7 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
             logger.error(f"Error creating leaderboard: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-    @cache_viewset_action()
+    @cache_viewset_action(tags=["leaderboards"])
     @action(detail=False, methods=["get"], url_path="all")
     def all_leaderboards(self, request):
         """
@@ -109,9 +130,9 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
         Cached to reduce database load for frequent leaderboard queries.
 
         Cache Strategy:
-        - TTL: 15 minutes
+        - TTL: 24 hours (CACHE_TAGGED_TTL)
         - Key: Global for all users
-        - Invalidated: When new leaderboards are created
+        - Invalidated: When leaderboards are created or deleted
         """
         try:
             leaderboards = LeaderBoard.objects.all()
@@ -130,16 +151,16 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
             logger.error(f"Error retrieving all leaderboards: {str(e)}")
             raise
 
-    @cache_viewset_action()
     def list(self, request, *args, **kwargs):
         """
         List top 10 scores for a specific channel.
-        Cached to optimize frequent leaderboard views.
 
-        Cache Strategy:
-        - TTL: 15 minutes
-        - Key: Based on channel parameter
-        - Invalidated: When scores are updated
+        GET /api/leaderboards/?channel=<discord channel>[&window=day|week|all]
+
+        All-time scores (the default) are read from the channel's Redis
+        sorted set (see ranking), which is updated with every score, so
+        no response cache is needed. The current day or week is read
+        from its rollup bucket (see windows).
         """
         discord_channel = request.query_params.get(
             "channel"
@@ -149,22 +170,78 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
                 {"error": "channel or discord_channel query parameter is required"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        window = request.query_params.get("window", "all")
+        if window not in WINDOWS:
+            return Response(
+                {"error": f"window must be one of: {', '.join(WINDOWS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         try:
-            leaderboard = LeaderBoard.objects.get(discord_channel=discord_channel)
-            top_scores = Score.objects.filter(leaderboard=leaderboard).order_by(
-                "-points"
-            )[:10]
+            leaderboard_id = resolve_leaderboard(discord_channel)
+            if leaderboard_id is None:
+                return Response(
+                    {"error": "LeaderBoard not found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
 
-            return Response(ScoreSerializer(top_scores, many=True).data)
-        except LeaderBoard.DoesNotExist:
+            if window == "all":
+                return Response(top_scores(leaderboard_id))
+            return Response(window_top_scores(leaderboard_id, window))
+        except Exception as e:
+            logger.error(f"Error retrieving leaderboard: {str(e)}")
+            raise
+
+    @action(detail=False, methods=["get"])
+    def rank(self, request):
+        """
+        GET /api/leaderboards/rank/?channel=<discord channel>&name=<player>
+        Optional: &neighbours=<participants on each side, default 2, max 10>
+
+        Read with a ZREVRANK on the channel's sorted set (see
+        ranking.player_rank), so the cost stays logarithmic in the number
+        of scores.
+
+        Returns:
+            200: {"name", "points", "rank", "neighbours": [{"rank", "name",
+                 "points"}]}, ranks starting at 1
+            400: Missing parameters or invalid neighbours
+            404: No leaderboard for the channel or no score for the player
+        """
+        discord_channel = request.query_params.get(
+            "channel"
+        ) or request.query_params.get("discord_channel")
+        name = request.query_params.get("name")
+        if not discord_channel or not name:
+            return Response(
+                {"error": "channel and name query parameters are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            neighbours = int(
+                request.query_params.get("neighbours", RANK_NEIGHBOURS_DEFAULT)
+            )
+        except ValueError:
+            neighbours = -1
+        if not 0 <= neighbours <= RANK_NEIGHBOURS_MAX:
+            return Response(
+                {"error": f"neighbours must be between 0 and {RANK_NEIGHBOURS_MAX}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        leaderboard_id = resolve_leaderboard(discord_channel)
+        if leaderboard_id is None:
             return Response(
                 {"error": "LeaderBoard not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        except Exception as e:
-            logger.error(f"Error retrieving leaderboard: {str(e)}")
-            raise
+        ranked = player_rank(leaderboard_id, name, neighbours)
+        if ranked is None:
+            return Response(
+                {"error": "No score for this player"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(ranked)
 
     @action(detail=False, methods=["get"])
     def get_leaderboard(self, request):
@@ -180,17 +257,16 @@ class LeaderBoardViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            leaderboard = LeaderBoard.objects.get(pk=leaderboard_id)
-            top_scores = Score.objects.filter(leaderboard=leaderboard).order_by(
-                "-points"
-            )[:10]
+            leaderboard = LeaderBoard.objects.select_related("created_by").get(
+                pk=leaderboard_id
+            )
 
             return Response(
                 {
                     "leaderboard_id": str(leaderboard.id),
                     "discord_channel": leaderboard.discord_channel,
                     "created_by": leaderboard.created_by.username,
-                    "scores": ScoreSerializer(top_scores, many=True).data,
+                    "scores": top_scores(leaderboard.id),
                 }
             )
         except LeaderBoard.DoesNotExist:
@@ -223,11 +299,35 @@ class ScoreViewSet(viewsets.ModelViewSet):
         return Score.objects.all()
 
     def create(self, request):
+        """
+        Add points to a participant's score, or replace them.
+
+        POST /api/score/
+
+        Request Body:
+            {
+                "name": "participant",
+                "points": 10,
+                "discord_channel": "channel_name",
+                "update_mode": "add" | "replace"  (default "add")
+            }
+
+        The update is a single atomic script on the channel's Redis
+        sorted set (see ranking.update_score), so concurrent submissions
+        for the same participant never lose points. The Score table is
+        updated by the next flush.
+
+        Returns:
+            200: Participant name and total points
+            400: Missing fields, negative points or unknown update_mode
+            404: No leaderboard for the channel
+        """
         try:
             data = request.data
             name = data.get("name")
             points = data.get("points")
             discord_channel = data.get("discord_channel")
+            update_mode = data.get("update_mode", "add")
 
             # Validate data
             if not all([name, points, discord_channel]):
@@ -236,6 +336,15 @@ class ScoreViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            if not isinstance(name, str) or len(name) > SCORE_NAME_MAX_LENGTH:
+                return Response(
+                    {
+                        "error": "name must be text of at most "
+                        f"{SCORE_NAME_MAX_LENGTH} characters"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
             # Validate negative points
             if int(points) < 0:
                 return Response(
@@ -243,40 +352,29 @@ class ScoreViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            if update_mode not in UPDATE_MODES:
+                return Response(
+                    {"error": f"update_mode must be one of: {', '.join(UPDATE_MODES)}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
             # Get the leaderboard
             try:
-                leaderboard = LeaderBoard.objects.get(discord_channel=discord_channel)
+                leaderboard = LeaderBoard.objects.only("id", "discord_channel").get(
+                    discord_channel=discord_channel
+                )
             except LeaderBoard.DoesNotExist:
                 return Response(
                     {"error": "No leaderboard exists for this channel"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # Check if user already has a score in this leaderboard
-            existing_score = Score.objects.filter(
-                name=name, leaderboard=leaderboard
-            ).first()
-
-            if existing_score:
-                # Update existing points
-                update_mode = data.get("update_mode", "add")  # 'add' o 'replace'
-
-                if update_mode == "add":
-                    existing_score.points += int(points)
-                else:
-                    existing_score.points = int(points)
-                existing_score.save()
-                score = existing_score
-            else:
-                # Create new score
-                score = Score.objects.create(
-                    name=name, points=int(points), leaderboard=leaderboard
-                )
+            total = update_score(leaderboard, name, int(points), update_mode)
 
             return Response(
                 {
                     "message": "Score updated successfully",
-                    "data": {"name": score.name, "points": score.points},
+                    "data": {"name": name, "points": total},
                 },
                 status=status.HTTP_200_OK,
             )
@@ -285,25 +383,138 @@ class ScoreViewSet(viewsets.ModelViewSet):
             logger.error(f"Error updating score: {str(e)}")
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Add points to several participants' scores at once.
+
+        POST /api/score/batch/
+
+        Request Body:
+            {
+                "scores": [
+                    {"name": "participant", "points": 10, "discord_channel": "c"},
+                    ...
+                ]
+            }
+
+        Changes are validated first and then applied all or none in one
+        atomic update (see ranking.add_scores); repeated participants
+        are summed.
+
+        Returns:
+            200: Total points of each participant, in first-seen order
+                by leaderboard
+            400: Invalid or too many changes
+            404: No leaderboard for one of the channels
+        """
+        scores = request.data.get("scores") if isinstance(request.data, dict) else None
+        if not isinstance(scores, list) or not scores:
+            return Response(
+                {"error": "scores must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(scores) > SCORE_BATCH_MAX:
+            return Response(
+                {"error": f"At most {SCORE_BATCH_MAX} scores per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        changes = []
+        for index, item in enumerate(scores):
+            try:
+                name = item["name"]
+                discord_channel = item["discord_channel"]
+                points = int(item["points"])
+            except (KeyError, TypeError, ValueError):
+                return Response(
+                    {
+                        "error": f"scores[{index}]: name, points and discord_channel "
+                        "are required"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not isinstance(name, str) or not name or not discord_channel:
+                return Response(
+                    {
+                        "error": f"scores[{index}]: name and discord_channel "
+                        "must not be empty"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if len(name) > SCORE_NAME_MAX_LENGTH:
+                return Response(
+                    {
+                        "error": f"scores[{index}]: name must be at most "
+                        f"{SCORE_NAME_MAX_LENGTH} characters"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if points < 0:
+                return Response(
+                    {"error": f"scores[{index}]: Points cannot be negative"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            changes.append((str(discord_channel), name, points))
+
+        channels = {discord_channel for discord_channel, _, _ in changes}
+        leaderboards = {
+            leaderboard.discord_channel: leaderboard
+            for leaderboard in LeaderBoard.objects.only("id", "discord_channel").filter(
+                discord_channel__in=channels
+            )
+        }
+        missing = sorted(channels - leaderboards.keys())
+        if missing:
+            return Response(
+                {"error": f"No leaderboard exists for: {', '.join(missing)}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        points_by_leaderboard = {}
+        for discord_channel, name, points in changes:
+            names = points_by_leaderboard.setdefault(leaderboards[discord_channel], {})
+            names[name] = names.get(name, 0) + points
+
+        try:
+            totals = add_scores(points_by_leaderboard)
+        except Exception as e:
+            logger.error(f"Error updating scores: {str(e)}")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "message": "Scores updated successfully",
+                "data": [
+                    {
+                        "name": name,
+                        "discord_channel": leaderboard.discord_channel,
+                        "points": totals[leaderboard][name],
+                    }
+                    for leaderboard, names in points_by_leaderboard.items()
+                    for name in names
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
     @log_exception
     @action(detail=True, methods=["get"])
     def leaderboard(self, request, pk=None):
         """
         Gets the top 10 scores for a specific leaderboard.
         GET /api/scores/leaderboard/{leaderboard_id}/
+
+        Scores are read from the Redis sorted set (see ranking), like the
+        leaderboard listing and rank lookup.
         """
         try:
             leaderboard = LeaderBoard.objects.get(pk=pk)
-            scores = Score.objects.filter(leaderboard=leaderboard).order_by("-points")[
-                :10
-            ]
-            serializer = self.get_serializer(scores, many=True)
-
             return Response(
                 {
-                    "leaderboard_name": leaderboard.name,
-                    "created_by": str(leaderboard.created_by.id),
-                    "scores": serializer.data,
+                    "leaderboard_name": leaderboard.discord_channel,
+                    "created_by": str(leaderboard.created_by_id),
+                    "scores": top_scores(leaderboard.pk),
                 }
             )
         except LeaderBoard.DoesNotExist:
@@ -330,7 +541,10 @@ class ScoreViewSet(viewsets.ModelViewSet):
             {
                 "message": "Score API endpoint",
                 "csrf_token": csrf_token,  # Optional: send the token in the body
-                "endpoints": {"update_score": "/api/score/update_score/"},
+                "endpoints": {
+                    "update_score": "/api/score/update_score/",
+                    "update_scores": "/api/score/batch/",
+                },
             },
             status=status.HTTP_200_OK,
         )
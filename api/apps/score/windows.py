@@ -0,0 +1,128 @@
+"""
+Score Windows Module
+
+This module provides the daily and weekly leaderboards, read from the
+ScoreRollup buckets that the leaderboard flush keeps up to date (see
+services.record_score_events). The all-time leaderboard is served by
+the ranking module.
+
+Buckets are UTC days and weeks starting on Monday. Points reach them
+with the flush, so windowed leaderboards lag by up to one flush interval.
+
+Features:
+- Top N of the current day or week from one index range scan
+- Compaction of old events and buckets (see compact_score_events)
+"""
+
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ScoreEvent, ScoreRollup
+
+PERIODS = ("day", "week")
+
+# Values of the leaderboard window query parameter
+WINDOWS = ("all", *PERIODS)
+
+# Rows deleted per statement while compacting
+COMPACT_BATCH_SIZE = 1000
+
+
+def bucket_start(period: str, when: datetime) -> date:
+    """
+    First day of the bucket containing a moment.
+
+    Args:
+        period: "day" or "week"
+        when: Aware datetime
+
+    Returns:
+        date: The UTC day, or the Monday of the UTC week
+    """
+    day = when.astimezone(dt_timezone.utc).date()
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def current_bucket(leaderboard_id, period: str):
+    """Rollup rows of a leaderboard in the current day or week bucket"""
+    return ScoreRollup.objects.filter(
+        leaderboard_id=leaderboard_id,
+        period=period,
+        bucket_start=bucket_start(period, timezone.now()),
+    )
+
+
+def window_top_scores(leaderboard_id, period: str, limit: int = 10) -> List[dict]:
+    """
+    Get the best scores of the current day or week.
+
+    Returns:
+        list: Up to limit {"name", "points"} by descending points
+    """
+    return list(
+        current_bucket(leaderboard_id, period)
+        .order_by("-points", "-name")
+        .values("name", "points")[:limit]
+    )
+
+
+async def awindow_top_scores(
+    leaderboard_id, period: str, limit: int = 10
+) -> List[dict]:
+    """Async window_top_scores"""
+    return [
+        score
+        async for score in current_bucket(leaderboard_id, period)
+        .order_by("-points", "-name")
+        .values("name", "points")[:limit]
+    ]
+
+
+def delete_in_batches(queryset) -> int:
+    """Delete the rows of a queryset COMPACT_BATCH_SIZE at a time"""
+    deleted = 0
+    while ids := list(queryset.values_list("id", flat=True)[:COMPACT_BATCH_SIZE]):
+        count, _ = queryset.model.objects.filter(id__in=ids).delete()
+        deleted += count
+    return deleted
+
+
+def compact_score_events(now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Delete events and buckets older than the SCORE_HISTORY retention.
+
+    Old events are no longer needed: their points stay in the Score
+    totals and in the week buckets, which outlive the day buckets.
+
+    Args:
+        now: Reference time (defaults to now)
+
+    Returns:
+        dict: Deleted rows by kind ("events", "day", "week")
+    """
+    now = now or timezone.now()
+    retention = settings.SCORE_HISTORY
+    event_threshold = now - timedelta(days=retention["EVENT_RETENTION_DAYS"])
+    day_threshold = bucket_start(
+        "day", now - timedelta(days=retention["DAY_BUCKET_RETENTION_DAYS"])
+    )
+    week_threshold = bucket_start(
+        "week", now - timedelta(weeks=retention["WEEK_BUCKET_RETENTION_WEEKS"])
+    )
+    return {
+        "events": delete_in_batches(
+            ScoreEvent.objects.filter(created_at__lt=event_threshold)
+        ),
+        "day": delete_in_batches(
+            ScoreRollup.objects.filter(period="day", bucket_start__lt=day_threshold)
+        ),
+        "week": delete_in_batches(
+            ScoreRollup.objects.filter(period="week", bucket_start__lt=week_threshold)
+        ),
+    }
@@ -19,3 +19,7 @@ class TriviaConfig(AppConfig):
 
     default_auto_field = "django.db.models.BigAutoField"
     name = "api.apps.trivia"
+
+    def ready(self):
+        """Register signal receivers"""
+        from . import signals  # noqa: F401
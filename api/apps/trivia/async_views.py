@@ -0,0 +1,162 @@
+"""
+Trivia Async Views Module
+
+This module provides async implementations of the trivia read hot path,
+served by the ASGI application (see api.asgi_urls). They answer with the
+same bodies, status codes and ETags as the DRF views they stand in for,
+but wait on MySQL and Redis without holding a worker thread.
+Includes views for:
+- Question retrieval (GetQuestions)
+- Catalog filtering (TriviaViewSet.filter_trivias)
+- Theme listing (ThemeViewSet.list)
+
+Features:
+- Async ORM queries and asyncio Redis reads
+- Rate limiting with athrottle
+- Tag based ETags and cached bodies shared with the sync views' tags
+"""
+
+import uuid
+
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_GET
+from rest_framework import status
+
+from api.utils.asgi_utils import json_response
+from api.utils.cache_utils import acache_body, atag_etag, etag_matches
+from api.utils.compression import accepted_encoding
+from api.utils.json_utils import dumps
+from api.utils.logging_utils import logger
+from api.utils.throttling import athrottle
+
+from .bundles import aget_or_build_bundle
+from .catalog import afilter_public_trivias
+from .models import Theme
+
+THEMES_TAGS = ["themes"]
+
+
+@require_GET
+async def get_questions(request, trivia_id: str):
+    """
+    Get questions for a specific trivia.
+
+    GET /api/questions/<trivia_id>/
+
+    Returns:
+        HttpResponse: Pre-encoded questions with a strong ETag
+        HttpResponseNotModified: If the client already has this version
+        HttpResponse: 400 for an invalid UUID, 404 if not found
+    """
+    throttled = await athrottle(request)
+    if throttled is not None:
+        return throttled
+
+    try:
+        trivia_uuid = uuid.UUID(trivia_id)
+    except ValueError:
+        logger.warning(f"Access attempt with invalid UUID: {trivia_id}")
+        return json_response(
+            {"error": "Invalid UUID format"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    bundle = await aget_or_build_bundle(trivia_uuid, accepted_encoding(request))
+    if bundle is None:
+        logger.warning(f"Access attempt to non-existent trivia: {trivia_id}")
+        return json_response(
+            {"error": "Trivia not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    # Client already has this version
+    if etag_matches(request, bundle.etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(bundle.body, content_type="application/json")
+        response.compressed = bundle.compressed
+    response["ETag"] = bundle.etag
+    return response
+
+
+@require_GET
+async def filter_trivias(request):
+    """
+    Filter trivias by theme and difficulty.
+
+    GET /api/trivias/filter/?theme=<uuid>&difficulty=2&order=measured
+
+    Returns:
+        HttpResponse: Filtered trivia list
+        HttpResponse: 400 if parameters invalid, 404 if the theme is missing
+    """
+    theme = request.GET.get("theme")
+    difficulty = request.GET.get("difficulty")
+    order = request.GET.get("order", "title")
+
+    if order not in ("title", "measured"):
+        return json_response(
+            {"error": "The 'order' parameter must be 'title' or 'measured'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if not theme or not difficulty:
+        return json_response(
+            {"error": "The parameters 'theme' and 'difficulty' are required"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        difficulty = int(difficulty)
+        uuid.UUID(theme)
+    except ValueError:
+        logger.error(
+            f"Invalid filter parameter format: theme={theme}, difficulty={difficulty}"
+        )
+        return json_response(
+            {"error": "The 'difficulty' parameter must be a number"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    trivias = await afilter_public_trivias(
+        theme, difficulty, by_measured=order == "measured"
+    )
+    if trivias is None:
+        logger.warning(f"Filtering attempt with non-existent theme: {theme}")
+        return json_response(
+            {"error": "Theme not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    return json_response([{**trivia, "id": str(trivia["id"])} for trivia in trivias])
+
+
+async def render_themes() -> bytes:
+    """Encode the theme list as ThemeSerializer would"""
+    themes = [
+        {"id": str(theme_id), "name": name}
+        async for theme_id, name in Theme.objects.values_list("id", "name")
+    ]
+    return dumps(themes)
+
+
+@require_GET
+async def list_themes(request):
+    """
+    List all themes.
+
+    GET /api/themes/
+
+    Cache Strategy:
+    - Store: Encoded body in Redis under the "themes" tag generation
+    - Invalidated: When a theme is saved or deleted
+    - Validation: Strong ETag, equal to the sync view's
+
+    Returns:
+        HttpResponse: Theme list
+        HttpResponseNotModified: If the client already has this version
+    """
+    etag = await atag_etag(THEMES_TAGS)
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        body = await acache_body("themes", THEMES_TAGS, render_themes)
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
@@ -0,0 +1,300 @@
+"""
+Trivia Availability Module
+
+This module maintains the theme × difficulty availability matrix: the
+number of public trivias for every (theme, difficulty) pair. Players are
+only offered combinations that actually have content.
+
+The matrix lives in a Redis hash with one field per non-empty cell.
+It is built once from a single GROUP BY query and then maintained
+incrementally: after a trivia enters or leaves a cell (public theme and
+difficulty), only the cells it left and joined are recounted (each an
+index range scan on trivia_catalog_idx).
+
+Every cell also has a pool: a Redis set of the public trivia ids of the
+cell, used to sample random trivias without ORDER BY RAND() (see
+api.apps.trivia.sampling). A moved trivia is removed from and added to
+pools one id at a time.
+
+Features:
+- One Redis round trip per read
+- Saves that keep a trivia in its cell (e.g. title edits) skip it all
+- Per cell recount and pool SREM/SADD on commit after cell changes
+- Per cell id pools, built lazily on first use
+- Database fallback when Redis is unavailable
+- Cache tag "availability" bumped on every change (ETag validation)
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count
+
+from api.utils.cache_utils import invalidate_tags, on_commit_once
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_redis, redis_key
+
+from .models import Trivia
+
+# Marks a built matrix, so an empty catalog is not mistaken for a miss
+BUILT_FIELD = "_built"
+
+# Writes a cell only into a built matrix; a missing matrix is rebuilt
+# in full on the next read instead of starting out partial
+UPDATE_CELL_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+else
+    redis.call('HDEL', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# Adds an id only to a stored pool; a missing pool is built in full on
+# first use instead of starting out partial
+ADD_TO_POOL_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+return redis.call('SADD', KEYS[1], ARGV[1])
+"""
+
+Cell = Tuple[str, int]
+
+
+def availability_key() -> str:
+    """Redis key holding the availability matrix"""
+    return redis_key("trivia", "availability")
+
+
+def pool_key(theme_id, difficulty) -> str:
+    """Redis key holding the id pool of a cell"""
+    return redis_key("trivia", "pool", theme_id, difficulty)
+
+
+def cell_field(theme_id, difficulty) -> str:
+    """Hash field of a (theme, difficulty) cell"""
+    return f"{theme_id}:{difficulty}"
+
+
+def count_cells() -> Dict[str, int]:
+    """
+    Count public trivias per (theme, difficulty) in the database.
+
+    Returns:
+        dict: Non-empty cells as {"<theme_id>:<difficulty>": count}
+    """
+    rows = (
+        Trivia.objects.filter(is_public=True)
+        .values("theme_id", "difficulty")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    return {
+        cell_field(row["theme_id"], row["difficulty"]): row["count"] for row in rows
+    }
+
+
+def to_matrix(cells: Dict[str, int]) -> Dict[str, Dict[int, int]]:
+    """Group flat cells into {theme_id: {difficulty: count}}"""
+    matrix: Dict[str, Dict[int, int]] = defaultdict(dict)
+    for field, count in cells.items():
+        theme_id, difficulty = field.rsplit(":", 1)
+        matrix[theme_id][int(difficulty)] = int(count)
+    return dict(matrix)
+
+
+def build_availability() -> Dict[str, int]:
+    """
+    Count every cell in the database and store the whole matrix.
+
+    Returns:
+        dict: Non-empty cells as {"<theme_id>:<difficulty>": count}
+    """
+    cells = count_cells()
+    key = availability_key()
+    try:
+        pipe = get_redis().pipeline()
+        pipe.delete(key)
+        pipe.hset(key, mapping={BUILT_FIELD: 1, **cells})
+        pipe.expire(key, settings.TRIVIA_AVAILABILITY_TTL)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable rebuilding: {e}")
+    return cells
+
+
+def public_cell(theme_id, difficulty, is_public) -> Optional[Cell]:
+    """
+    Cell a trivia is counted in.
+
+    Returns:
+        tuple: (theme_id, difficulty) of a public trivia
+        None: If the trivia is not public or has no theme or difficulty
+    """
+    if not is_public or theme_id is None or difficulty is None:
+        return None
+    return (str(theme_id), int(difficulty))
+
+
+def stored_cell(trivia_id) -> Optional[Cell]:
+    """Read the cell of a trivia from the database (None if deleted)"""
+    row = (
+        Trivia.objects.filter(id=trivia_id)
+        .values_list("theme_id", "difficulty", "is_public")
+        .first()
+    )
+    return public_cell(*row) if row else None
+
+
+def count_cell(theme_id, difficulty) -> int:
+    """Count the public trivias of a cell in the database"""
+    return Trivia.objects.filter(
+        theme_id=theme_id, difficulty=difficulty, is_public=True
+    ).count()
+
+
+def cell_ids(theme_id, difficulty) -> List[str]:
+    """Read the public trivia ids of a cell from the database"""
+    return [
+        str(trivia_id)
+        for trivia_id in Trivia.objects.filter(
+            theme_id=theme_id, difficulty=difficulty, is_public=True
+        ).values_list("id", flat=True)
+    ]
+
+
+def store_pool(pipe, theme_id, difficulty, ids: List[str]) -> None:
+    """Queue the replacement of a cell pool on a Redis pipeline"""
+    key = pool_key(theme_id, difficulty)
+    pipe.delete(key)
+    if ids:
+        pipe.sadd(key, *ids)
+        pipe.expire(key, settings.TRIVIA_AVAILABILITY_TTL)
+
+
+def load_pool(theme_id, difficulty) -> List[str]:
+    """
+    Build and store the pool of a cell from the database.
+
+    Returns:
+        list: Public trivia ids of the cell
+    """
+    ids = cell_ids(theme_id, difficulty)
+    try:
+        pipe = get_redis().pipeline()
+        store_pool(pipe, theme_id, difficulty, ids)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable writing pool: {e}")
+    return ids
+
+
+def drop_pools() -> None:
+    """Remove every stored cell pool, they are rebuilt on demand"""
+    client = get_redis()
+    keys = list(client.scan_iter(match=pool_key("*", "*"), count=500))
+    if keys:
+        client.delete(*keys)
+
+
+def rebuild_availability(batch_size=None) -> int:
+    """
+    Rebuild the availability matrix (rebuild_trivia_indexes entry point).
+
+    Args:
+        batch_size: Unused, the matrix is built with a single query
+
+    Returns:
+        int: Number of non-empty cells
+    """
+    cells = build_availability()
+    try:
+        drop_pools()
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable dropping pools: {e}")
+    # The stored matrix may have drifted from what clients validated
+    invalidate_tags("availability")
+    return len(cells)
+
+
+def get_availability() -> Dict[str, Dict[int, int]]:
+    """
+    Read the availability matrix, building it on a miss.
+
+    Returns:
+        dict: {theme_id: {difficulty: public trivia count}} for
+        non-empty cells only
+    """
+    try:
+        cells = get_redis().hgetall(availability_key())
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable reading: {e}")
+        return to_matrix(count_cells())
+
+    if not cells:
+        return to_matrix(build_availability())
+
+    cells = {field.decode(): count for field, count in cells.items()}
+    cells.pop(BUILT_FIELD, None)
+    return to_matrix(cells)
+
+
+def move_trivia(trivia_id, old_cell: Optional[Cell]) -> None:
+    """
+    Move a trivia from the cell it was in to the cell it is in now.
+
+    The trivia id is removed from the old pool and added to the new one,
+    and both cells are recounted. Nothing is done if the trivia ended up
+    back in its old cell.
+
+    Args:
+        trivia_id: UUID of the trivia
+        old_cell: Cell of the trivia before the transaction
+    """
+    new_cell = stored_cell(trivia_id)
+    if new_cell == old_cell:
+        return
+
+    trivia_id = str(trivia_id)
+    counts = {cell: count_cell(*cell) for cell in (old_cell, new_cell) if cell}
+    try:
+        client = get_redis()
+        update_cell = client.register_script(UPDATE_CELL_SCRIPT)
+        add_to_pool = client.register_script(ADD_TO_POOL_SCRIPT)
+        pipe = client.pipeline()
+        if old_cell:
+            pipe.srem(pool_key(*old_cell), trivia_id)
+        if new_cell:
+            add_to_pool(keys=[pool_key(*new_cell)], args=[trivia_id], client=pipe)
+        for cell, count in counts.items():
+            update_cell(
+                keys=[availability_key()],
+                args=[BUILT_FIELD, cell_field(*cell), count],
+                client=pipe,
+            )
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable moving {trivia_id}: {e}")
+    invalidate_tags("availability")
+
+
+def schedule_availability_update(
+    trivia_id, old_cell: Optional[Cell], new_cell: Optional[Cell]
+) -> None:
+    """
+    Move a trivia between cells once the current transaction commits.
+
+    Saves that keep the trivia in its cell are ignored. Several changes
+    to the same trivia inside one transaction move it only once, from
+    the cell it had before the first change.
+    """
+    if old_cell == new_cell:
+        return
+    on_commit_once(
+        f"trivia_availability:{trivia_id}", move_trivia, str(trivia_id), old_cell
+    )
@@ -0,0 +1,450 @@
+"""
+Trivia Bundles Module
+
+This module provides the shared loader and the Redis store for trivia
+bundles. A bundle is a trivia together with its theme, questions and
+answers, which is everything the read endpoints need to emit nested
+questions.
+
+Features:
+- Fixed query count (trivia + questions + answers)
+- Stable question and answer ordering
+- Pre-encoded questions payloads stored in Redis with an ETag
+- Payloads embedded in larger responses without re-encoding
+- Batch reads in one Redis round trip, batch builds in fixed queries
+- Refresh on commit after trivia, question or answer changes
+- Generation check on writes, so a reader that rendered the graph before
+  a change cannot overwrite the bundle refreshed after it
+- Async reads for the async views
+- Compressed variants stored next to the payload, so hot bundles are
+  not compressed again on every response
+"""
+
+import hashlib
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch
+
+from api.utils.cache_utils import on_commit_once
+from api.utils.compression import compress_variants
+from api.utils.json_utils import dumps
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_async_redis, get_redis, redis_key
+
+from .models import Answer, Question, Trivia
+
+# Bump when the payload format changes so stale bundles are never served
+BUNDLE_SCHEMA_VERSION = 1
+
+# Replace a bundle only if the trivia generation is still the one read
+# before rendering it.
+# KEYS: bundle, generation. ARGV: generation, ttl, field/value pairs
+STORE_SCRIPT = """
+local current = redis.call("GET", KEYS[2]) or "0"
+if current ~= ARGV[1] then
+    return 0
+end
+redis.call("DEL", KEYS[1])
+redis.call("HSET", KEYS[1], unpack(ARGV, 3))
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class TriviaBundle(NamedTuple):
+    """
+    Pre-encoded questions payload of a trivia and its strong ETag.
+
+    compressed holds the payload compressed by encoding ("gzip", "br");
+    reads only load the variant that was asked for.
+    """
+
+    etag: str
+    body: bytes
+    compressed: Mapping[str, bytes] = MappingProxyType({})
+
+
+def bundle_queryset(queryset=None):
+    """
+    Attach eager loading of the full trivia graph to a queryset.
+
+    The resulting queryset costs three queries no matter how many
+    questions or answers each trivia has: one for the trivias (with
+    their theme joined), one for all questions and one for all answers.
+
+    Args:
+        queryset: Optional trivia queryset to extend (defaults to all trivias)
+
+    Returns:
+        QuerySet: Trivia queryset with questions and answers prefetched
+    """
+    if queryset is None:
+        queryset = Trivia.objects.all()
+
+    answers = Answer.objects.order_by("id")
+    questions = Question.objects.order_by("id").prefetch_related(
+        Prefetch("answers", queryset=answers)
+    )
+    return queryset.select_related("theme").prefetch_related(
+        Prefetch("questions", queryset=questions)
+    )
+
+
+def load_trivia_bundle(trivia_id, queryset=None):
+    """
+    Load a single trivia with all its questions and answers.
+
+    Args:
+        trivia_id: UUID of the trivia
+        queryset: Optional trivia queryset used to restrict visibility
+
+    Returns:
+        Trivia: Trivia instance with its graph prefetched
+
+    Raises:
+        Trivia.DoesNotExist: If no trivia matches the given id
+    """
+    return bundle_queryset(queryset).get(id=trivia_id)
+
+
+def bundle_key(trivia_id) -> str:
+    """Redis key holding the bundle of a trivia"""
+    return redis_key("trivia", "bundle", f"v{BUNDLE_SCHEMA_VERSION}", trivia_id)
+
+
+def generation_key(trivia_id) -> str:
+    """Redis key counting the refreshes of a trivia bundle"""
+    return redis_key("trivia", "bundle", "generation", trivia_id)
+
+
+def render_bundle(trivia) -> TriviaBundle:
+    """
+    Serialize the questions of a loaded trivia once into JSON bytes.
+
+    Args:
+        trivia: Trivia instance, ideally loaded with load_trivia_bundle
+
+    Returns:
+        TriviaBundle: Encoded payload and its ETag
+    """
+    # Imported here to keep serializers free to import from this module
+    from .serializers import QuestionSerializer
+
+    data = QuestionSerializer(trivia.questions.all(), many=True).data
+    body = dumps(data)
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+    return TriviaBundle(etag=etag, body=body, compressed=compress_variants(body))
+
+
+def embed_bundle(fields: dict, bundle: TriviaBundle) -> bytes:
+    """
+    Encode an object of fields plus the pre-encoded questions of a bundle.
+
+    The questions are spliced in as stored, without decoding them.
+
+    Returns:
+        bytes: JSON object {**fields, "questions": [...]}
+    """
+    head = dumps(fields)[:-1]
+    separator = b"," if fields else b""
+    return head + separator + b'"questions":' + bundle.body + b"}"
+
+
+def compressed_field(encoding: str) -> str:
+    """Hash field holding the payload compressed with an encoding"""
+    return f"body.{encoding}"
+
+
+def _bundle_fields(encoding: Optional[str]) -> list:
+    fields = ["etag", "body"]
+    if encoding:
+        fields.append(compressed_field(encoding))
+    return fields
+
+
+def _bundle_from(values: list, encoding: Optional[str]) -> Optional[TriviaBundle]:
+    etag, body = values[:2]
+    if etag is None or body is None:
+        return None
+    # Bundles smaller than the compression threshold have no variants
+    compressed = {encoding: values[2]} if encoding and values[2] is not None else {}
+    return TriviaBundle(etag=etag.decode(), body=body, compressed=compressed)
+
+
+def get_bundle(trivia_id, encoding: Optional[str] = None) -> Optional[TriviaBundle]:
+    """
+    Read a stored bundle with a single Redis round trip.
+
+    Args:
+        trivia_id: UUID of the trivia
+        encoding: Compressed variant to read along ("gzip", "br")
+
+    Returns:
+        TriviaBundle: Stored bundle
+        None: If the bundle is not stored or Redis is unavailable
+    """
+    try:
+        values = get_redis().hmget(bundle_key(trivia_id), *_bundle_fields(encoding))
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable reading {trivia_id}: {e}")
+        return None
+    return _bundle_from(values, encoding)
+
+
+async def aget_bundle(
+    trivia_id, encoding: Optional[str] = None
+) -> Optional[TriviaBundle]:
+    """Async get_bundle, reading through the asyncio client"""
+    try:
+        values = await get_async_redis().hmget(
+            bundle_key(trivia_id), *_bundle_fields(encoding)
+        )
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable reading {trivia_id}: {e}")
+        return None
+    return _bundle_from(values, encoding)
+
+
+def get_bundles(trivia_ids: Iterable) -> Dict[str, TriviaBundle]:
+    """
+    Read several stored bundles with a single Redis round trip.
+
+    Returns:
+        dict: Stored bundles by trivia id; missing ones are left out
+    """
+    trivia_ids = [str(trivia_id) for trivia_id in trivia_ids]
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for trivia_id in trivia_ids:
+            pipe.hmget(bundle_key(trivia_id), "etag", "body")
+        results = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable reading a batch: {e}")
+        return {}
+    return {
+        trivia_id: TriviaBundle(etag=etag.decode(), body=body)
+        for trivia_id, (etag, body) in zip(trivia_ids, results)
+        if etag is not None and body is not None
+    }
+
+
+def bundle_generations(trivia_ids: List[str]) -> Optional[List[str]]:
+    """
+    Read the current generation of several trivias before rendering them.
+
+    Returns:
+        list: Generations in the order of trivia_ids ("0" if never bumped)
+        None: If Redis is unavailable
+    """
+    try:
+        values = get_redis().mget([generation_key(i) for i in trivia_ids])
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable reading generations: {e}")
+        return None
+    return [value.decode() if value is not None else "0" for value in values]
+
+
+def bump_generation(trivia_id) -> Optional[str]:
+    """
+    Start a new generation of a trivia bundle.
+
+    Bundles rendered under an older generation are no longer stored.
+
+    Returns:
+        str: New generation
+        None: If Redis is unavailable
+    """
+    key = generation_key(trivia_id)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.incr(key)
+        pipe.expire(key, settings.TRIVIA_BUNDLE_TTL)
+        generation, _ = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable bumping {trivia_id}: {e}")
+        return None
+    return str(generation)
+
+
+def queue_store_bundle(
+    pipe, script, trivia_id, bundle: TriviaBundle, generation: str
+) -> None:
+    """
+    Queue the replacement of a stored bundle on a Redis pipeline.
+
+    The bundle is only written if the trivia is still at generation.
+    """
+    fields = {
+        "etag": bundle.etag,
+        "body": bundle.body,
+        **{
+            compressed_field(encoding): body
+            for encoding, body in bundle.compressed.items()
+        },
+    }
+    script(
+        keys=[bundle_key(trivia_id), generation_key(trivia_id)],
+        args=[
+            generation,
+            settings.TRIVIA_BUNDLE_TTL,
+            *[item for pair in fields.items() for item in pair],
+        ],
+        client=pipe,
+    )
+
+
+def store_bundle(trivia_id, bundle: TriviaBundle, generation: str) -> None:
+    """Write a bundle rendered at generation, unless a newer one started"""
+    try:
+        client = get_redis()
+        pipe = client.pipeline()
+        queue_store_bundle(
+            pipe, client.register_script(STORE_SCRIPT), trivia_id, bundle, generation
+        )
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable writing {trivia_id}: {e}")
+
+
+def invalidate_bundle(trivia_id) -> None:
+    """Remove the stored bundle of a trivia"""
+    try:
+        get_redis().delete(bundle_key(trivia_id))
+    except RedisError as e:
+        logger.warning(f"Bundle store unavailable invalidating {trivia_id}: {e}")
+
+
+def _render_and_store(trivia_id, generation: Optional[str]):
+    try:
+        trivia = load_trivia_bundle(trivia_id)
+    except Trivia.DoesNotExist:
+        invalidate_bundle(trivia_id)
+        return None
+
+    bundle = render_bundle(trivia)
+    if generation is not None:
+        store_bundle(trivia_id, bundle, generation)
+    return bundle
+
+
+def refresh_bundle(trivia_id) -> Optional[TriviaBundle]:
+    """
+    Render the bundle of a trivia from the database and store it.
+
+    Runs after changes commit. It starts a new generation first, so
+    bundles rendered by concurrent readers before the change are not
+    stored over it.
+
+    Returns:
+        TriviaBundle: Freshly rendered bundle
+        None: If the trivia does not exist (any stored bundle is dropped)
+    """
+    return _render_and_store(trivia_id, bump_generation(trivia_id))
+
+
+def build_bundle(trivia_id) -> Optional[TriviaBundle]:
+    """
+    Render and store the bundle of a trivia missing from Redis.
+
+    The bundle is stored only if no refresh started since its generation
+    was read.
+
+    Returns:
+        TriviaBundle: Rendered bundle
+        None: If the trivia does not exist
+    """
+    generations = bundle_generations([str(trivia_id)])
+    generation: Optional[str] = generations[0] if generations else None
+    return _render_and_store(trivia_id, generation)
+
+
+def get_or_build_bundle(
+    trivia_id, encoding: Optional[str] = None
+) -> Optional[TriviaBundle]:
+    """
+    Get a bundle from Redis, rendering and storing it on a miss.
+
+    Args:
+        trivia_id: UUID of the trivia
+        encoding: Compressed variant to read along, see get_bundle
+
+    Returns:
+        TriviaBundle: Bundle of the trivia
+        None: If the trivia does not exist
+    """
+    bundle = get_bundle(trivia_id, encoding)
+    if bundle is None:
+        bundle = build_bundle(trivia_id)
+    return bundle
+
+
+async def aget_or_build_bundle(
+    trivia_id, encoding: Optional[str] = None
+) -> Optional[TriviaBundle]:
+    """
+    Async get_or_build_bundle.
+
+    Stored bundles are read without leaving the event loop; a miss is
+    rendered by the sync loader in a worker thread.
+    """
+    bundle = await aget_bundle(trivia_id, encoding)
+    if bundle is None:
+        bundle = await sync_to_async(build_bundle)(trivia_id)
+    return bundle
+
+
+def get_or_build_bundles(trivia_ids: Iterable) -> Dict[str, TriviaBundle]:
+    """
+    Get several bundles, building all misses together.
+
+    Stored bundles cost one Redis round trip in total. Misses are loaded
+    with bundle_queryset (three queries however many there are) and
+    stored back in one pipeline, under the generations read before
+    loading them.
+
+    Returns:
+        dict: Bundles by trivia id; trivias that do not exist are left out
+    """
+    trivia_ids = [str(trivia_id) for trivia_id in trivia_ids]
+    bundles = get_bundles(trivia_ids)
+    missing = [trivia_id for trivia_id in trivia_ids if trivia_id not in bundles]
+    if not missing:
+        return bundles
+
+    generations = bundle_generations(missing)
+    built = {
+        str(trivia.id): render_bundle(trivia)
+        for trivia in bundle_queryset(Trivia.objects.filter(id__in=missing))
+    }
+    if generations is not None:
+        generation_by_id = dict(zip(missing, generations))
+        try:
+            client = get_redis()
+            script = client.register_script(STORE_SCRIPT)
+            pipe = client.pipeline()
+            for trivia_id, bundle in built.items():
+                queue_store_bundle(
+                    pipe, script, trivia_id, bundle, generation_by_id[trivia_id]
+                )
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Bundle store unavailable writing a batch: {e}")
+
+    bundles.update(built)
+    return bundles
+
+
+def schedule_bundle_refresh(trivia_id) -> None:
+    """
+    Re-render the bundle of a trivia once the current transaction commits.
+
+    The stored bundle is dropped right away so readers fall back to the
+    database until the refresh runs. Several changes to the same trivia
+    inside one transaction (e.g. nested creation) render it only once.
+    """
+    trivia_id = str(trivia_id)
+    invalidate_bundle(trivia_id)
+    on_commit_once(f"trivia_bundle:{trivia_id}", refresh_bundle, trivia_id)
@@ -0,0 +1,173 @@
+"""
+Trivia Difficulty Calibration Module
+
+This module measures how hard questions and trivias actually are from
+the answer statistics recorded during games (see api.apps.trivia.stats).
+
+The difficulty score is the posterior miss rate under a Beta prior
+centered on the global success rate: every question starts with
+TRIVIA_CALIBRATION_PRIOR_WEIGHT pseudo-responses at that rate, so a
+question answered twice is not rated impossible or trivial. A trivia is
+scored the same way over the pooled responses of its questions and
+bucketed into the 1-3 difficulty levels once it has enough responses.
+
+Runs are incremental: a question is recalibrated only when its counts
+changed since the last run (updated_at past calibrated_at), and only
+the trivias of those questions are rescored.
+
+Features:
+- Bayesian shrinkage towards the global success rate
+- Incremental runs over changed statistics only
+- Keyset batches written with bulk_update
+- Measured levels usable by catalog ordering and quick play
+"""
+
+from typing import Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import F, Q, Sum
+
+from .models import QuestionStats, Trivia
+
+CALIBRATION_BATCH_SIZE = 500
+
+# Pooled responses a trivia needs before it is given a measured level
+CALIBRATION_MIN_ATTEMPTS = 30
+
+# Upper score bounds of the Beginner and Intermediate levels
+LEVEL_BOUNDS = (0.35, 0.65)
+
+
+def prior_success_rate() -> float:
+    """Success rate over every recorded response, 0.5 when there are none"""
+    totals = QuestionStats.objects.aggregate(
+        attempts=Sum("attempts"), corrects=Sum("corrects")
+    )
+    if not totals["attempts"]:
+        return 0.5
+    return totals["corrects"] / totals["attempts"]
+
+
+def difficulty_score(
+    corrects: int, attempts: int, prior: float, weight: Optional[float] = None
+) -> float:
+    """
+    Posterior miss rate of a question or trivia.
+
+    Args:
+        corrects: Correct responses
+        attempts: All responses
+        prior: Prior success rate
+        weight: Prior strength in pseudo-responses
+            (defaults to TRIVIA_CALIBRATION_PRIOR_WEIGHT)
+
+    Returns:
+        float: Between 0 (always answered) and 1 (never answered)
+    """
+    if weight is None:
+        weight = settings.TRIVIA_CALIBRATION_PRIOR_WEIGHT
+    return round(1 - (corrects + weight * prior) / (attempts + weight), 4)
+
+
+def measured_level(score: float) -> int:
+    """Difficulty level (1-3) of a difficulty score"""
+    for level, bound in enumerate(LEVEL_BOUNDS, start=1):
+        if score < bound:
+            return level
+    return len(LEVEL_BOUNDS) + 1
+
+
+def pending_stats(full: bool = False):
+    """Question statistics changed since their last calibration"""
+    queryset = QuestionStats.objects.all()
+    if not full:
+        queryset = queryset.filter(
+            Q(calibrated_at__isnull=True) | Q(updated_at__gt=F("calibrated_at"))
+        )
+    return queryset.select_related("question").only(
+        "question_id",
+        "question__trivia_id",
+        "attempts",
+        "corrects",
+        "updated_at",
+        "difficulty_score",
+        "calibrated_at",
+    )
+
+
+def calibrate_trivias(trivia_ids: Iterable, prior: float) -> int:
+    """
+    Rescore trivias from the pooled statistics of their questions.
+
+    Returns:
+        int: Number of trivias updated
+    """
+    totals = (
+        QuestionStats.objects.filter(question__trivia_id__in=list(trivia_ids))
+        .values("question__trivia_id")
+        .annotate(attempts=Sum("attempts"), corrects=Sum("corrects"))
+    )
+    trivias = []
+    for row in totals:
+        score = difficulty_score(row["corrects"], row["attempts"], prior)
+        trivias.append(
+            Trivia(
+                id=row["question__trivia_id"],
+                measured_difficulty=score,
+                measured_level=(
+                    measured_level(score)
+                    if row["attempts"] >= CALIBRATION_MIN_ATTEMPTS
+                    else None
+                ),
+            )
+        )
+    Trivia.objects.bulk_update(trivias, ["measured_difficulty", "measured_level"])
+    return len(trivias)
+
+
+def calibrate_difficulty(
+    full: bool = False, batch_size=CALIBRATION_BATCH_SIZE
+) -> Tuple[int, int]:
+    """
+    Recompute measured difficulties from the answer statistics.
+
+    Args:
+        full: Recalibrate every question, not only the changed ones
+            (use after changing the prior weight)
+        batch_size: Questions read and written per batch
+
+    Returns:
+        tuple: (questions calibrated, trivias rescored)
+    """
+    prior = prior_success_rate()
+    queryset = pending_stats(full).order_by("question_id")
+
+    questions = 0
+    rescored: Set[UUID] = set()
+    last_id = None
+    while True:
+        batch = (
+            queryset if last_id is None else queryset.filter(question_id__gt=last_id)
+        )
+        batch = list(batch[:batch_size])
+        if not batch:
+            return questions, len(rescored)
+
+        for stats in batch:
+            stats.difficulty_score = difficulty_score(
+                stats.corrects, stats.attempts, prior
+            )
+            # The calibrated version, so counts flushed meanwhile stay pending
+            stats.calibrated_at = stats.updated_at
+        QuestionStats.objects.bulk_update(batch, ["difficulty_score", "calibrated_at"])
+
+        trivia_ids = {
+            stats.question.trivia_id
+            for stats in batch
+            if stats.question.trivia_id is not None
+        } - rescored
+        calibrate_trivias(trivia_ids, prior)
+        rescored |= trivia_ids
+        questions += len(batch)
+        last_id = batch[-1].question_id
@@ -0,0 +1,91 @@
+"""
+Trivia Catalog Module
+
+This module provides the read queries behind catalog browsing
+(theme and difficulty selection).
+
+Features:
+- Theme existence check and trivia filtering in a single query
+- Index-only reads through trivia_catalog_idx
+- Optional ordering by measured difficulty, easiest first
+- Async variant for the async views
+"""
+
+from typing import Dict, List, Optional
+
+from django.db.models import F, FilteredRelation, Q
+
+from .models import Theme
+
+
+def catalog_queryset(theme_id, difficulty: int, by_measured: bool = False):
+    """
+    Build the catalog query for a theme and difficulty.
+
+    The theme is LEFT JOINed to its matching trivias, so a missing theme
+    yields no row and an existing theme without matches yields one row
+    of NULLs. The join condition matches the leading columns of
+    trivia_catalog_idx and only id and title are read, which the index
+    covers (InnoDB secondary indexes carry the primary key).
+
+    Ordering by measured difficulty reads the matched rows too, which is
+    cheap for the few trivias of one catalog cell.
+
+    Args:
+        theme_id: UUID of the theme
+        difficulty: Difficulty level
+        by_measured: Order by measured difficulty (unmeasured last)
+
+    Returns:
+        QuerySet: (trivia id, title) rows ordered by title, or
+        (trivia id, title, measured difficulty) rows ordered by
+        measured difficulty
+    """
+    queryset = Theme.objects.filter(id=theme_id).annotate(
+        match=FilteredRelation(
+            "trivias",
+            condition=Q(trivias__difficulty=difficulty, trivias__is_public=True),
+        )
+    )
+    if not by_measured:
+        return queryset.order_by("match__title").values_list(
+            "match__id", "match__title"
+        )
+    return queryset.order_by(
+        F("match__measured_difficulty").asc(nulls_last=True), "match__title"
+    ).values_list("match__id", "match__title", "match__measured_difficulty")
+
+
+def filter_public_trivias(
+    theme_id, difficulty: int, by_measured: bool = False
+) -> Optional[List[Dict]]:
+    """
+    List the public trivias of a theme and difficulty in one query.
+
+    Args:
+        theme_id: UUID of the theme
+        difficulty: Difficulty level
+        by_measured: Order by measured difficulty, easiest first
+
+    Returns:
+        list: Dicts with id and title (and measured_difficulty when
+        ordered by it)
+        None: If the theme does not exist
+    """
+    return catalog_entries(list(catalog_queryset(theme_id, difficulty, by_measured)))
+
+
+async def afilter_public_trivias(
+    theme_id, difficulty: int, by_measured: bool = False
+) -> Optional[List[Dict]]:
+    """Async filter_public_trivias through the async ORM"""
+    rows = [row async for row in catalog_queryset(theme_id, difficulty, by_measured)]
+    return catalog_entries(rows)
+
+
+def catalog_entries(rows) -> Optional[List[Dict]]:
+    """Turn catalog rows into entries, None if the theme row is missing"""
+    if not rows:
+        return None
+    fields = ("id", "title", "measured_difficulty")
+    return [dict(zip(fields, row)) for row in rows if row[0] is not None]
@@ -0,0 +1,307 @@
+"""
+Trivia Duplicates Module
+
+This module detects near-duplicate questions, the same question asked
+again with small wording changes.
+
+Question titles are normalized (lowercase, accents and punctuation
+removed) and split into character shingles. Each shingle set is reduced
+to a MinHash signature, and the signature is cut into bands; every band
+hashes to one QuestionBucket row. Two questions share at least one
+bucket with high probability when their shingle similarity is above
+the threshold, so candidates are found with one indexed lookup on the
+buckets of the new questions instead of a scan over every question.
+Candidates are then confirmed with their exact shingle similarity.
+
+Questions that differ in a number ("... in 1998?" / "... in 2002?")
+are never considered duplicates.
+
+Features:
+- Pure Python MinHash with LSH banding (NUM_BANDS x BAND_ROWS)
+- Incremental bucket refresh on commit after question changes
+- Candidate lookup in one query for a whole trivia
+- Corpus wide duplicate clusters for reporting
+"""
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from api.utils.cache_utils import on_commit_once
+
+from .models import Question, QuestionBucket
+from .search import TOKEN_PATTERN, fold
+
+SHINGLE_SIZE = 4
+NUM_BANDS = 16
+BAND_ROWS = 4
+NUM_PERMUTATIONS = NUM_BANDS * BAND_ROWS
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+# Universal hashing h(x) = (a * x + b) mod p stands in for a random
+# permutation; the seed is fixed so stored buckets stay comparable
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+class DuplicateMatch(NamedTuple):
+    """Existing question found similar to a submitted one"""
+
+    question_id: int
+    question_title: str
+    trivia_id: str
+    trivia_title: str
+    similarity: float
+
+
+def normalize(text: str) -> str:
+    """Fold case and accents and keep only words, single spaced"""
+    return " ".join(TOKEN_PATTERN.findall(fold(text or "")))
+
+
+def shingles(text: str) -> Set[str]:
+    """Character shingles of a normalized text"""
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def numbers(text: str) -> FrozenSet[str]:
+    """Numbers appearing in a text"""
+    return frozenset(NUMBER_PATTERN.findall(text or ""))
+
+
+def similarity(first: str, second: str) -> float:
+    """
+    Jaccard similarity of the shingles of two texts.
+
+    Returns:
+        float: Between 0 and 1; 0 when the texts contain different numbers
+    """
+    if numbers(first) != numbers(second):
+        return 0.0
+    a, b = shingles(first), shingles(second)
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(values: Set[str]) -> List[int]:
+    """MinHash signature of a shingle set"""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        for value in values
+    ]
+    return [
+        min((a * value + b) % MERSENNE_PRIME for value in hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+
+def question_buckets(text: str) -> List[int]:
+    """
+    LSH buckets of a question title, one per band.
+
+    Returns:
+        list: Signed 64-bit bucket hashes (empty for blank titles)
+    """
+    values = shingles(text)
+    if not values:
+        return []
+    signature = minhash(values)
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * BAND_ROWS : (band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(
+            f"{band}:{','.join(map(str, rows))}".encode(), digest_size=8
+        ).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def bucket_rows(questions: Iterable) -> List[QuestionBucket]:
+    """Bucket rows for (question_id, question_title) pairs"""
+    return [
+        QuestionBucket(bucket=bucket, question_id=question_id)
+        for question_id, title in questions
+        for bucket in set(question_buckets(title))
+    ]
+
+
+def index_trivia_questions(trivia_id) -> int:
+    """
+    Replace the buckets of the questions of a trivia.
+
+    Returns:
+        int: Number of indexed questions
+    """
+    questions = list(
+        Question.objects.filter(trivia_id=trivia_id, is_active=True).values_list(
+            "id", "question_title"
+        )
+    )
+    with transaction.atomic():
+        QuestionBucket.objects.filter(question__trivia_id=trivia_id).delete()
+        QuestionBucket.objects.bulk_create(bucket_rows(questions))
+    return len(questions)
+
+
+def schedule_duplicate_index(trivia_id) -> None:
+    """Refresh the question buckets of a trivia once the transaction commits"""
+    trivia_id = str(trivia_id)
+    on_commit_once(f"trivia_duplicates:{trivia_id}", index_trivia_questions, trivia_id)
+
+
+def rebuild_duplicate_index(batch_size=500) -> int:
+    """
+    Rebuild the buckets of every question in batches.
+
+    Returns:
+        int: Number of indexed questions
+    """
+    indexed = 0
+    questions = Question.objects.order_by("id").values_list(
+        "id", "question_title", "is_active"
+    )
+    last_id = None
+    while True:
+        batch = questions if last_id is None else questions.filter(id__gt=last_id)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return indexed
+
+        active = [(pk, title) for pk, title, is_active in batch if is_active]
+        with transaction.atomic():
+            QuestionBucket.objects.filter(
+                question_id__in=[pk for pk, _, _ in batch]
+            ).delete()
+            QuestionBucket.objects.bulk_create(bucket_rows(active), batch_size=1000)
+
+        indexed += len(active)
+        last_id = batch[-1][0]
+
+
+def find_near_duplicates(
+    titles: List[str], exclude_trivia=None, threshold: Optional[float] = None
+) -> Dict[int, DuplicateMatch]:
+    """
+    Find stored questions similar to each of the given titles.
+
+    Args:
+        titles: Question titles to check
+        exclude_trivia: Trivia whose own questions are ignored (on updates)
+        threshold: Minimum similarity (defaults to TRIVIA_DUPLICATE_THRESHOLD)
+
+    Returns:
+        dict: Most similar match by position in titles, for the titles
+        that have one
+    """
+    if threshold is None:
+        threshold = settings.TRIVIA_DUPLICATE_THRESHOLD
+    buckets = {
+        index: set(question_buckets(title)) for index, title in enumerate(titles)
+    }
+    wanted = set().union(*buckets.values())
+    if not wanted:
+        return {}
+
+    candidates = QuestionBucket.objects.filter(bucket__in=wanted)
+    if exclude_trivia is not None:
+        candidates = candidates.exclude(question__trivia_id=exclude_trivia)
+    by_bucket = defaultdict(set)
+    for bucket, *question in candidates.values_list(
+        "bucket",
+        "question_id",
+        "question__question_title",
+        "question__trivia_id",
+        "question__trivia__title",
+    ):
+        by_bucket[bucket].add(tuple(question))
+
+    matches = {}
+    for index, title in enumerate(titles):
+        found = set().union(*(by_bucket[bucket] for bucket in buckets[index]))
+        scored = [
+            DuplicateMatch(pk, other, str(trivia_id), trivia_title, score)
+            for pk, other, trivia_id, trivia_title in found
+            if (score := similarity(title, other)) >= threshold
+        ]
+        if scored:
+            matches[index] = max(scored, key=lambda match: match.similarity)
+    return matches
+
+
+def find_duplicate_clusters(
+    threshold: Optional[float] = None, chunk_size=1000
+) -> List[List[int]]:
+    """
+    Group every indexed question with its near-duplicates.
+
+    Candidate pairs come from buckets holding more than one question;
+    pairs above the threshold are joined into clusters.
+
+    Returns:
+        list: Clusters of question ids, largest first
+    """
+    if threshold is None:
+        threshold = settings.TRIVIA_DUPLICATE_THRESHOLD
+    shared = list(
+        QuestionBucket.objects.values("bucket")
+        .annotate(size=Count("id"))
+        .filter(size__gt=1)
+        .values_list("bucket", flat=True)
+    )
+
+    pairs: Set[Tuple[int, int]] = set()
+    for start in range(0, len(shared), chunk_size):
+        members = defaultdict(list)
+        for bucket, question_id in QuestionBucket.objects.filter(
+            bucket__in=shared[start : start + chunk_size]
+        ).values_list("bucket", "question_id"):
+            members[bucket].append(question_id)
+        for question_ids in members.values():
+            pairs.update(combinations(sorted(question_ids), 2))
+
+    ids = sorted({question_id for pair in pairs for question_id in pair})
+    titles: Dict[int, str] = {}
+    for start in range(0, len(ids), chunk_size):
+        titles.update(
+            Question.objects.filter(id__in=ids[start : start + chunk_size]).values_list(
+                "id", "question_title"
+            )
+        )
+
+    # Union-find over the confirmed pairs
+    parent: Dict[int, int] = {}
+
+    def root(question_id):
+        parent.setdefault(question_id, question_id)
+        while parent[question_id] != question_id:
+            parent[question_id] = parent[parent[question_id]]
+            question_id = parent[question_id]
+        return question_id
+
+    for first, second in pairs:
+        if similarity(titles.get(first, ""), titles.get(second, "")) >= threshold:
+            parent[root(first)] = root(second)
+
+    clusters = defaultdict(list)
+    for question_id in list(parent):
+        clusters[root(question_id)].append(question_id)
+    return sorted(
+        (sorted(cluster) for cluster in clusters.values() if len(cluster) > 1),
+        key=lambda cluster: (-len(cluster), cluster[0]),
+    )
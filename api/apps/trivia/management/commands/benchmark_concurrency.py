@@ -0,0 +1,237 @@
+"""
+Concurrency Benchmark Management Command
+
+This command compares the read hot path served by the WSGI application
+(sync DRF views, one worker thread per in-flight request) with the ASGI
+application (async views, see api.asgi_urls) under many concurrent
+clients. Both applications are called in process, without a server in
+front, so the difference measured is the request handling itself.
+
+Each simulated client sends its requests one after another from its
+own IP address (so rate limits apply per client as in production).
+WSGI requests run on a pool of --workers threads, like a threaded WSGI
+server; ASGI requests run on the event loop.
+
+Features:
+- Questions, catalog filter, themes and leaderboard endpoints
+- Requests per second and p50/p99 latency per endpoint and path
+- Uses existing data; nothing is written except request logs
+
+Usage:
+    python manage.py benchmark_concurrency
+    python manage.py benchmark_concurrency --clients 200 --requests 4000
+    python manage.py benchmark_concurrency --endpoint questions --workers 16
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+from api.apps.score.models import LeaderBoard
+from api.apps.trivia.models import Trivia
+from api.utils.asgi_utils import AsyncRoutesASGIHandler
+
+from .benchmark_trivias import percentile
+
+
+class Command(BaseCommand):
+    """
+    Django management command to benchmark WSGI against ASGI.
+    """
+
+    help = "Benchmark the read hot path under WSGI and ASGI with concurrent clients"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--endpoint",
+            nargs="+",
+            choices=["questions", "filter", "themes", "leaderboard"],
+            help="Endpoints to benchmark (default: all with data)",
+        )
+        parser.add_argument(
+            "--clients", type=int, default=200, help="Concurrent clients"
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=2000,
+            help="Requests per endpoint and path",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=8,
+            help="WSGI worker threads, as in a threaded WSGI server",
+        )
+
+    def handle(self, *args, **options):
+        """Run every endpoint through both applications and report"""
+        self.options = options
+        self.host = next(
+            (
+                host
+                for host in settings.ALLOWED_HOSTS
+                if host != "*" and not host.startswith(".")
+            ),
+            "localhost",
+        )
+        endpoints = self.endpoints()
+        selected = options["endpoint"] or list(endpoints)
+        missing = [name for name in selected if name not in endpoints]
+        if missing:
+            raise CommandError(f"No data to benchmark: {', '.join(missing)}")
+
+        wsgi = WSGIHandler()
+        asgi = AsyncRoutesASGIHandler()
+        self.stdout.write(
+            f"{options['clients']} clients, {options['requests']} requests, "
+            f"{options['workers']} WSGI workers"
+        )
+        for name in selected:
+            path, query = endpoints[name]
+            wsgi_result = asyncio.run(self.run_wsgi(wsgi, path, query))
+            asgi_result = asyncio.run(self.run_asgi(asgi, path, query))
+            self.report(name, "wsgi", *wsgi_result)
+            self.report(name, "asgi", *asgi_result)
+            self.stdout.write(
+                f"  {name:<12} asgi/wsgi rps: {asgi_result[0] / wsgi_result[0]:.2f}x"
+            )
+
+    def endpoints(self):
+        """Request (path, query) of each endpoint that has data"""
+        endpoints = {}
+        trivia = (
+            Trivia.objects.filter(is_public=True, questions__isnull=False)
+            .values("id", "theme_id", "difficulty")
+            .first()
+        )
+        if trivia:
+            endpoints["questions"] = (f"/api/questions/{trivia['id']}/", "")
+            endpoints["filter"] = (
+                "/api/trivias/filter/",
+                urlencode(
+                    {"theme": trivia["theme_id"], "difficulty": trivia["difficulty"]}
+                ),
+            )
+        endpoints["themes"] = ("/api/themes/", "")
+        channel = LeaderBoard.objects.values_list("discord_channel", flat=True).first()
+        if channel:
+            endpoints["leaderboard"] = (
+                "/api/leaderboards/",
+                urlencode({"channel": channel}),
+            )
+        return endpoints
+
+    def client_ip(self, client: int) -> str:
+        return f"10.{client // 65536 % 256}.{client // 256 % 256}.{client % 256}"
+
+    async def run_clients(self, request):
+        """
+        Run the clients concurrently until all requests are sent.
+
+        Args:
+            request: Coroutine function (client number) -> status code
+
+        Returns:
+            tuple: (requests per second, latencies in ms, error count)
+        """
+        clients = self.options["clients"]
+        remaining = self.options["requests"]
+        latencies, errors = [], 0
+
+        async def client(number):
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                status = await request(number)
+                latencies.append((time.perf_counter() - started) * 1000)
+                if status not in (200, 304):
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(number) for number in range(clients)))
+        elapsed = time.perf_counter() - started
+        return len(latencies) / elapsed, latencies, errors
+
+    async def run_wsgi(self, application, path, query):
+        """Serve the requests with the WSGI application on a thread pool"""
+
+        def call(number):
+            environ = {
+                "REQUEST_METHOD": "GET",
+                "PATH_INFO": path,
+                "QUERY_STRING": query,
+                "SERVER_NAME": self.host,
+                "SERVER_PORT": "443",
+                "SERVER_PROTOCOL": "HTTP/1.1",
+                "HTTP_HOST": self.host,
+                "REMOTE_ADDR": self.client_ip(number),
+                "wsgi.input": BytesIO(),
+                "wsgi.url_scheme": "https",
+                "wsgi.errors": BytesIO(),
+            }
+            status = []
+            body = application(
+                environ, lambda line, headers: status.append(int(line.split()[0]))
+            )
+            b"".join(body)
+            body.close()
+            return status[0]
+
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(self.options["workers"]) as pool:
+            return await self.run_clients(
+                lambda number: loop.run_in_executor(pool, call, number)
+            )
+
+    async def run_asgi(self, application, path, query):
+        """Serve the requests with the ASGI application on the event loop"""
+
+        async def call(number):
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "https",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": query.encode(),
+                "headers": [(b"host", self.host.encode())],
+                "server": (self.host, 443),
+                "client": (self.client_ip(number), 0),
+            }
+            received = False
+            status = []
+
+            async def receive():
+                nonlocal received
+                if not received:
+                    received = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                # The client stays connected until the response is sent
+                await asyncio.Future()
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            await application(scope, receive, send)
+            return status[0]
+
+        return await self.run_clients(call)
+
+    def report(self, endpoint, path, rps, latencies, errors):
+        self.stdout.write(
+            f"  {endpoint:<12} {path}  {rps:8.1f} req/s  "
+            f"p50={statistics.median(latencies):8.2f} ms  "
+            f"p99={percentile(latencies, 99):8.2f} ms  errors={errors}"
+        )
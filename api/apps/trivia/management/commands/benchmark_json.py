@@ -0,0 +1,132 @@
+"""
+JSON Codec Benchmark Management Command
+
+This command compares the API JSON codec (api.utils.json_utils) with
+DRF's stock JSONRenderer and the json module on payloads shaped like
+the API's hot responses. Payloads are built in memory, so no data is
+needed.
+
+Payloads:
+- bundle: questions of a full trivia, as served by GET /api/questions/
+- catalog: trivia rows with native UUIDs and datetimes
+- leaderboard: scores of a leaderboard with their timestamps
+
+Features:
+- Encode and decode timings per payload
+- p50/p95 latency and the speedup over the stock implementation
+
+Usage:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --questions 50 --rows 1000 --repeat 500
+"""
+
+import json
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from api.utils.json_utils import CODEC, FastJSONRenderer, loads
+
+from .benchmark_trivias import percentile
+
+
+class Command(BaseCommand):
+    """
+    Django management command to benchmark the JSON codec.
+    """
+
+    help = "Benchmark the API JSON codec against DRF's JSONRenderer"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--questions", type=int, default=20, help="Questions per trivia bundle"
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=500,
+            help="Rows of the catalog and leaderboard payloads",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Samples per measurement"
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        stock, fast = JSONRenderer(), FastJSONRenderer()
+
+        self.stdout.write(f"Codec: {CODEC}")
+        for name, data in self.payloads().items():
+            body = stock.render(data)
+            self.stdout.write(f"\n{name} ({len(body)} bytes)")
+            self.compare(
+                "encode",
+                lambda: stock.render(data),
+                lambda: fast.render(data),
+            )
+            self.compare("decode", lambda: json.loads(body), lambda: loads(body))
+
+    def payloads(self):
+        """Payloads keyed by name, with the types the renderer receives"""
+        now = timezone.now()
+        bundle = [
+            {
+                "id": question,
+                "question_title": f"¿Pregunta número {question} del trivia?",
+                "points": 10,
+                "answers": [
+                    {
+                        "id": question * 4 + answer,
+                        "answer_title": f"Respuesta {answer}",
+                        "is_correct": answer == 0,
+                    }
+                    for answer in range(4)
+                ],
+            }
+            for question in range(self.options["questions"])
+        ]
+        catalog = [
+            {
+                "id": uuid.uuid4(),
+                "title": f"Trivia {row}",
+                "difficulty": row % 3 + 1,
+                "theme": uuid.uuid4(),
+                "created_at": now - timedelta(minutes=row),
+            }
+            for row in range(self.options["rows"])
+        ]
+        leaderboard = [
+            {
+                "name": f"player{row}",
+                "points": 10_000 - row,
+                "created_at": now - timedelta(seconds=row),
+            }
+            for row in range(self.options["rows"])
+        ]
+        return {"bundle": bundle, "catalog": catalog, "leaderboard": leaderboard}
+
+    def measure(self, func):
+        """Run func repeatedly and return latencies in microseconds"""
+        samples = []
+        for _ in range(self.options["repeat"]):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1_000_000)
+        return samples
+
+    def compare(self, operation, stock, fast):
+        stock_samples = self.measure(stock)
+        fast_samples = self.measure(fast)
+        for label, samples in (("stock", stock_samples), ("codec", fast_samples)):
+            self.stdout.write(
+                f"  {operation:<7} {label:<6} "
+                f"p50={statistics.median(samples):10.1f} us  "
+                f"p95={percentile(samples, 95):10.1f} us"
+            )
+        speedup = statistics.median(stock_samples) / statistics.median(fast_samples)
+        self.stdout.write(f"  {operation:<7} speedup {speedup:.1f}x")
@@ -0,0 +1,193 @@
+"""
+Trivia Benchmark Management Command
+
+This command measures trivia read paths against synthetic datasets of
+increasing size. Seed data is written inside a transaction that is
+rolled back at the end, so the database is left untouched.
+
+Features:
+- Synthetic datasets seeded with bulk inserts
+- Several sizes measured in one run (e.g. 10k and 100k trivias)
+- p50/p95 latency per scenario and dataset size
+
+Scenarios:
+- list: keyset pages vs OFFSET pages at the start, middle and end
+- filter: theme/difficulty catalog filter, with its EXPLAIN plan
+
+Usage:
+    python manage.py benchmark_trivias
+    python manage.py benchmark_trivias --sizes 10000 100000 --repeat 50
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.apps.trivia.catalog import catalog_queryset, filter_public_trivias
+from api.apps.trivia.models import Theme, Trivia
+from api.apps.trivia.pagination import KeysetPagination, encode_cursor
+from api.apps.trivia.serializers import TriviaListSerializer
+
+SEED_BATCH_SIZE = 5000
+SEED_THEMES = 20
+
+
+class Rollback(Exception):
+    """Raised to discard the seeded dataset"""
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    """
+    Django management command to benchmark trivia read paths.
+
+    Each scenario receives the current dataset and returns rows of
+    (label, list of latency samples in milliseconds).
+    """
+
+    help = "Benchmark trivia read paths on synthetic datasets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            nargs="+",
+            choices=sorted(self.scenarios()),
+            help="Scenarios to run (default: all)",
+        )
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10_000, 100_000],
+            help="Number of seeded trivias for each measurement round",
+        )
+        parser.add_argument(
+            "--page-size", type=int, default=50, help="Rows per listed page"
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Samples per measurement"
+        )
+
+    @classmethod
+    def scenarios(cls):
+        return {
+            "list": cls.bench_list,
+            "filter": cls.bench_filter,
+        }
+
+    def handle(self, *args, **options):
+        """Seed each dataset size, run the scenarios and roll back"""
+        self.options = options
+        scenarios = options["scenario"] or sorted(self.scenarios())
+
+        try:
+            with transaction.atomic():
+                self.themes = [
+                    Theme.objects.get_or_create(name=f"Benchmark {n}")[0]
+                    for n in range(SEED_THEMES)
+                ]
+                seeded = 0
+                for size in sorted(options["sizes"]):
+                    seeded = self.seed(seeded, size)
+                    self.stdout.write(f"\n{size} trivias")
+                    for name in scenarios:
+                        for label, samples in self.scenarios()[name](self):
+                            self.report(name, label, samples)
+                raise Rollback
+        except Rollback:
+            self.stdout.write(self.style.SUCCESS("\nBenchmark data rolled back"))
+
+    def seed(self, start, stop):
+        """Bulk insert benchmark trivias numbered from start to stop"""
+        for first in range(start, stop, SEED_BATCH_SIZE):
+            Trivia.objects.bulk_create(
+                Trivia(
+                    title=f"Benchmark trivia {n}",
+                    difficulty=n % 3 + 1,
+                    theme=self.themes[n % SEED_THEMES],
+                    is_public=True,
+                )
+                for n in range(first, min(first + SEED_BATCH_SIZE, stop))
+            )
+        return stop
+
+    def measure(self, func):
+        """Run func repeatedly and return latencies in milliseconds"""
+        samples = []
+        for _ in range(self.options["repeat"]):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    def report(self, scenario, label, samples):
+        self.stdout.write(
+            f"  {scenario:<8} {label:<24} "
+            f"p50={statistics.median(samples):8.2f} ms  "
+            f"p95={percentile(samples, 95):8.2f} ms"
+        )
+
+    def bench_list(self):
+        """Keyset pages against OFFSET pages at increasing depth"""
+        limit = self.options["page_size"]
+        queryset = Trivia.objects.filter(is_public=True).select_related(
+            "theme", "created_by"
+        )
+        ordered = queryset.order_by(*KeysetPagination.ordering)
+        total = ordered.count()
+        factory = APIRequestFactory()
+
+        for position, offset in (
+            ("start", 0),
+            ("middle", total // 2),
+            ("end", max(0, total - limit)),
+        ):
+            params = {"limit": limit}
+            if offset:
+                previous = ordered.values("created_at", "id")[offset - 1]
+                params["cursor"] = encode_cursor(previous["created_at"], previous["id"])
+            request = Request(factory.get("/api/trivias/", params))
+
+            def keyset_page(request=request):
+                page = KeysetPagination().paginate_queryset(queryset, request)
+                return TriviaListSerializer(page, many=True).data
+
+            def offset_page(offset=offset):
+                page = ordered[offset : offset + limit]
+                return TriviaListSerializer(page, many=True).data
+
+            yield f"keyset {position}", self.measure(keyset_page)
+            yield f"offset {position}", self.measure(offset_page)
+
+    def bench_filter(self):
+        """Catalog filter: separate existence check vs folded single query"""
+        theme_id = self.themes[0].id
+
+        def separate_queries():
+            if not Theme.objects.filter(id=theme_id).exists():
+                return None
+            return list(
+                Trivia.objects.filter(
+                    theme=theme_id, difficulty=1, is_public=True
+                ).values("id", "title")
+            )
+
+        def folded_query():
+            return filter_public_trivias(theme_id, 1)
+
+        self.stdout.write("  EXPLAIN folded filter query:")
+        for line in catalog_queryset(theme_id, 1).explain().splitlines():
+            self.stdout.write(f"    {line}")
+
+        yield "separate queries", self.measure(separate_queries)
+        yield "folded query", self.measure(folded_query)
@@ -0,0 +1,58 @@
+"""
+Difficulty Calibration Management Command
+
+This command measures question and trivia difficulty from the flushed
+answer statistics (see api.apps.trivia.calibration). It is meant to run
+periodically after flush_answer_stats (see calibrate_difficulty_task in
+api.tasks.task) and only reads statistics changed since the last run.
+
+Features:
+- Incremental by default, full recalibration on demand
+- Configurable batch size
+- Question, trivia and timing report
+
+Usage:
+    python manage.py calibrate_difficulty
+    python manage.py calibrate_difficulty --full --batch-size 1000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.apps.trivia.calibration import CALIBRATION_BATCH_SIZE, calibrate_difficulty
+
+
+class Command(BaseCommand):
+    """
+    Django management command to calibrate measured difficulty.
+    """
+
+    help = "Measure question and trivia difficulty from answer statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recalibrate every question, not only those with new answers",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=CALIBRATION_BATCH_SIZE,
+            help="Number of questions written per batch",
+        )
+
+    def handle(self, *args, **options):
+        """Run the calibration and report what was rescored"""
+        started = time.perf_counter()
+        questions, trivias = calibrate_difficulty(
+            full=options["full"], batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Calibrated {questions} questions and {trivias} trivias "
+                f"in {elapsed:.2f}s"
+            )
+        )
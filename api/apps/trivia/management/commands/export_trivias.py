@@ -0,0 +1,120 @@
+"""
+Trivia Export Management Command
+
+This command streams every trivia with its questions and answers to an
+NDJSON file, one trivia per line, in the format read by import_trivias.
+
+Features:
+- Constant memory: trivias are read in chunks with iterator()
+- Rows per second progress after every chunk
+- Checkpoint after every chunk; --resume continues a failed export
+
+Usage:
+    python manage.py export_trivias trivias.ndjson
+    python manage.py export_trivias trivias.ndjson --chunk-size 2000
+    python manage.py export_trivias trivias.ndjson --resume
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.apps.trivia.pagination import encode_cursor
+from api.apps.trivia.transfer import (
+    TRANSFER_BATCH_SIZE,
+    clear_checkpoint,
+    iter_export,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django management command to export trivias as NDJSON.
+
+    The checkpoint holds the byte offset written so far and a cursor
+    after the last exported trivia; resuming truncates anything written
+    after the checkpoint and continues after that trivia.
+    """
+
+    help = "Export trivias with their questions and answers as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to write")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=TRANSFER_BATCH_SIZE,
+            help="Number of trivias loaded and checkpointed at a time",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file (default: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue from the checkpoint of a failed export",
+        )
+
+    def handle(self, *args, **options):
+        """Write trivias to the file, checkpointing every chunk"""
+        path = options["path"]
+        chunk_size = options["chunk_size"]
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+
+        checkpoint = {"offset": 0, "rows": 0, "cursor": None}
+        if options["resume"]:
+            checkpoint = read_checkpoint(checkpoint_path)
+            if checkpoint is None:
+                raise CommandError(f"No checkpoint found at {checkpoint_path}")
+            stream = open(path, "r+b")
+            stream.truncate(checkpoint["offset"])
+            stream.seek(checkpoint["offset"])
+            self.stdout.write(f"Resuming after {checkpoint['rows']} trivias")
+        else:
+            stream = open(path, "wb")
+
+        rows = 0
+        started = time.perf_counter()
+        with stream:
+            for trivia, line in iter_export(checkpoint["cursor"], chunk_size):
+                stream.write(line)
+                rows += 1
+                if rows % chunk_size == 0:
+                    self.save_checkpoint(
+                        stream, checkpoint_path, checkpoint, rows, trivia
+                    )
+                    self.report(checkpoint["rows"], rows, started)
+            stream.flush()
+
+        clear_checkpoint(checkpoint_path)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {rows} trivias to {path} in {elapsed:.2f}s "
+                f"({rows / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
+
+    @staticmethod
+    def save_checkpoint(stream, checkpoint_path, checkpoint, rows, trivia):
+        """Flush written lines, then record them in the checkpoint"""
+        stream.flush()
+        write_checkpoint(
+            checkpoint_path,
+            {
+                "offset": stream.tell(),
+                "rows": checkpoint["rows"] + rows,
+                "cursor": encode_cursor(trivia.created_at, trivia.id),
+            },
+        )
+
+    def report(self, previous, rows, started):
+        """Write a progress line with the current rate"""
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"Exported {previous + rows} trivias "
+            f"({rows / max(elapsed, 1e-9):.0f} rows/s)"
+        )
@@ -0,0 +1,47 @@
+"""
+Answer Statistics Flush Management Command
+
+This command moves the per-question answer counters recorded in Redis
+during games into the QuestionStats and AnswerStats tables. It is meant
+to run periodically (see flush_answer_stats_task in api.tasks.task).
+
+Features:
+- Counters taken and written in batches, one transaction each
+- Counters restored to Redis if a batch fails
+- Counter count and timing report
+
+Usage:
+    python manage.py flush_answer_stats
+    python manage.py flush_answer_stats --batch-size 1000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.apps.trivia.stats import STATS_FLUSH_BATCH_SIZE, flush_answer_stats
+
+
+class Command(BaseCommand):
+    """
+    Django management command to flush answer statistics counters.
+    """
+
+    help = "Flush answer statistics counters from Redis into the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=STATS_FLUSH_BATCH_SIZE,
+            help="Number of counters written per transaction",
+        )
+
+    def handle(self, *args, **options):
+        """Flush the counters and report how many were written"""
+        started = time.perf_counter()
+        flushed = flush_answer_stats(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(f"Flushed {flushed} answer counters in {elapsed:.2f}s")
+        )
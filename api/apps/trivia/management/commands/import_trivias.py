@@ -0,0 +1,145 @@
+"""
+Trivia Import Management Command
+
+This command loads trivias with their questions and answers from an
+NDJSON file written by export_trivias (one trivia per line).
+
+Features:
+- Constant memory: the file is read one batch of lines at a time
+- One transaction with bulk inserts per batch
+- Trivias whose id or title already exist are skipped, so reruns are safe
+- Rows per second progress after every batch
+- Checkpoint after every committed batch; --resume continues a failed import
+- Derived indexes rebuilt once at the end, including after a resume that
+  only had batches committed by the failed run
+
+Usage:
+    python manage.py import_trivias trivias.ndjson
+    python manage.py import_trivias trivias.ndjson --batch-size 1000
+    python manage.py import_trivias trivias.ndjson --resume
+"""
+
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from api.apps.trivia.transfer import (
+    TRANSFER_BATCH_SIZE,
+    clear_checkpoint,
+    import_records,
+    parse_record,
+    read_batches,
+    read_checkpoint,
+    write_checkpoint,
+)
+
+
+class Command(BaseCommand):
+    """
+    Django management command to import trivias from NDJSON.
+
+    The checkpoint holds the byte offset after the last committed batch,
+    the number of lines read up to it and the trivias created so far. A
+    failing batch is rolled back as a whole, so resuming starts exactly
+    at its first line.
+    """
+
+    help = "Import trivias with their questions and answers from NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file to read")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=TRANSFER_BATCH_SIZE,
+            help="Number of trivias written per transaction",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file (default: <path>.checkpoint)",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue from the checkpoint of a failed import",
+        )
+        parser.add_argument(
+            "--skip-indexes",
+            action="store_true",
+            help="Do not rebuild derived trivia indexes after the import",
+        )
+
+    def handle(self, *args, **options):
+        """Import the file batch by batch, checkpointing each commit"""
+        path = options["path"]
+        checkpoint_path = options["checkpoint"] or f"{path}.checkpoint"
+
+        checkpoint = {"offset": 0, "lines": 0, "created": 0}
+        if options["resume"]:
+            checkpoint = read_checkpoint(checkpoint_path)
+            if checkpoint is None:
+                raise CommandError(f"No checkpoint found at {checkpoint_path}")
+            self.stdout.write(f"Resuming after line {checkpoint['lines']}")
+
+        # Created by the failed run, whose indexes were never rebuilt
+        created_before = checkpoint.get("created", 0)
+        created = skipped = 0
+        line_number = checkpoint["lines"]
+        started = time.perf_counter()
+        with open(path, "rb") as stream:
+            stream.seek(checkpoint["offset"])
+            for lines, offset in read_batches(stream, options["batch_size"]):
+                records = []
+                for line in lines:
+                    line_number += 1
+                    try:
+                        record = parse_record(line)
+                    except ValueError as e:
+                        raise CommandError(self.failure(line_number, e))
+                    if record is not None:
+                        records.append(record)
+
+                try:
+                    batch_created, batch_skipped = import_records(records)
+                except (ValueError, DatabaseError) as e:
+                    raise CommandError(self.failure(line_number, e))
+                created += batch_created
+                skipped += batch_skipped
+
+                write_checkpoint(
+                    checkpoint_path,
+                    {
+                        "offset": offset,
+                        "lines": line_number,
+                        "created": created_before + created,
+                    },
+                )
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"Imported {created} trivias, skipped {skipped} "
+                    f"({(created + skipped) / max(elapsed, 1e-9):.0f} rows/s)"
+                )
+
+        clear_checkpoint(checkpoint_path)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {created} trivias, skipped {skipped} existing "
+                f"in {elapsed:.2f}s "
+                f"({(created + skipped) / max(elapsed, 1e-9):.0f} rows/s)"
+            )
+        )
+
+        # Bulk inserts skip the signals that keep these up to date
+        if (created_before or created) and not options["skip_indexes"]:
+            call_command("rebuild_trivia_indexes", stdout=self.stdout)
+
+    @staticmethod
+    def failure(line_number, error):
+        """Describe a failed batch and how to continue"""
+        return (
+            f"Import stopped in the batch ending at line {line_number}: {error}. "
+            "Earlier batches are committed; fix the file and rerun with --resume"
+        )
@@ -0,0 +1,70 @@
+"""
+Trivia Index Rebuild Management Command
+
+This command rebuilds the derived trivia indexes from the database.
+Indexes are kept in sync by signals during normal operation; run this
+after deploying a new index, bulk imports or manual database edits.
+
+Features:
+- Rebuild all indexes or a selection
+- Batch processing to avoid memory overload
+- Per index counts and timings
+
+Usage:
+    python manage.py rebuild_trivia_indexes
+    python manage.py rebuild_trivia_indexes --only search
+    python manage.py rebuild_trivia_indexes --only availability
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from api.apps.trivia.availability import rebuild_availability
+from api.apps.trivia.duplicates import rebuild_duplicate_index
+from api.apps.trivia.quiz import rebuild_question_pools
+from api.apps.trivia.search import rebuild_search_index
+
+INDEXES = {
+    "search": rebuild_search_index,
+    "availability": rebuild_availability,
+    "questions": rebuild_question_pools,
+    "duplicates": rebuild_duplicate_index,
+}
+
+
+class Command(BaseCommand):
+    """
+    Django management command to rebuild derived trivia indexes.
+
+    Each index builder receives the batch size and returns the number of
+    processed items.
+    """
+
+    help = "Rebuild derived trivia indexes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=sorted(INDEXES),
+            help="Indexes to rebuild (default: all)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of trivias processed per batch",
+        )
+
+    def handle(self, *args, **options):
+        """Rebuild the selected indexes and report counts"""
+        for name in options["only"] or INDEXES:
+            started = time.perf_counter()
+            count = INDEXES[name](batch_size=options["batch_size"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Rebuilt {name} index: {count} items in {elapsed:.2f}s"
+                )
+            )
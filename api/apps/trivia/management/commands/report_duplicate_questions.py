@@ -0,0 +1,66 @@
+"""
+Duplicate Question Report Management Command
+
+This command lists clusters of near-duplicate questions across all
+trivias, using the LSH buckets kept by api.apps.trivia.duplicates.
+Run rebuild_trivia_indexes --only duplicates first if the buckets were
+never built.
+
+Features:
+- Clusters joined from candidate pairs confirmed by shingle similarity
+- Configurable similarity threshold
+- Largest clusters first
+
+Usage:
+    python manage.py report_duplicate_questions
+    python manage.py report_duplicate_questions --threshold 0.8 --limit 50
+"""
+
+from django.core.management.base import BaseCommand
+
+from api.apps.trivia.duplicates import find_duplicate_clusters
+from api.apps.trivia.models import Question
+
+
+class Command(BaseCommand):
+    """
+    Django management command to report near-duplicate question clusters.
+    """
+
+    help = "Report clusters of near-duplicate questions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            help="Minimum similarity (default: TRIVIA_DUPLICATE_THRESHOLD)",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=20, help="Number of clusters listed"
+        )
+
+    def handle(self, *args, **options):
+        """Find clusters and print the largest ones"""
+        clusters = find_duplicate_clusters(options["threshold"])
+        shown = clusters[: options["limit"]]
+        questions = Question.objects.select_related("trivia").in_bulk(
+            [question_id for cluster in shown for question_id in cluster]
+        )
+
+        for number, cluster in enumerate(shown, start=1):
+            self.stdout.write(f"\nCluster {number} ({len(cluster)} questions)")
+            for question_id in cluster:
+                question = questions.get(question_id)
+                if question is None:
+                    continue
+                trivia = question.trivia.title if question.trivia else "-"
+                self.stdout.write(
+                    f"  #{question.id} {question.question_title} [{trivia}]"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nFound {len(clusters)} duplicate clusters covering "
+                f"{sum(len(cluster) for cluster in clusters)} questions"
+            )
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.2 on 2026-10-17 00:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TriviaSearchTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64, verbose_name="Term")),
+                (
+                    "weight",
+                    models.PositiveIntegerField(default=1, verbose_name="Weight"),
+                ),
+                (
+                    "trivia",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_terms",
+                        to="trivia.trivia",
+                        verbose_name="Trivia",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("term", "trivia"), name="unique_search_term_trivia"
+                    )
+                ],
+            },
+        ),
+    ]
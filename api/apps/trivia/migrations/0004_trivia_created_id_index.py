@@ -0,0 +1,20 @@
+# Generated by Django 5.1.2 on 2026-10-17 00:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0003_trivia_search_term"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="trivia",
+            index=models.Index(
+                fields=["created_at", "id"], name="trivia_created_id_idx"
+            ),
+        ),
+    ]
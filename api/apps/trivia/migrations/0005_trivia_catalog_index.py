@@ -0,0 +1,21 @@
+# Generated by Django 5.1.2 on 2026-10-17 00:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0004_trivia_created_id_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="trivia",
+            index=models.Index(
+                fields=["theme", "difficulty", "is_public", "title"],
+                name="trivia_catalog_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0005_trivia_catalog_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bucket", models.BigIntegerField(verbose_name="Bucket")),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="buckets",
+                        to="trivia.question",
+                        verbose_name="Question",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bucket", "question"), name="unique_question_bucket"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0006_question_bucket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnswerStats",
+            fields=[
+                (
+                    "answer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="trivia.answer",
+                        verbose_name="Answer",
+                    ),
+                ),
+                ("picks", models.PositiveIntegerField(default=0, verbose_name="Picks")),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated"),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="QuestionStats",
+            fields=[
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="trivia.question",
+                        verbose_name="Question",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Attempts"),
+                ),
+                (
+                    "corrects",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Correct Answers"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Updated"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.2 on 2026-10-17 01:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("trivia", "0007_answer_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="questionstats",
+            name="calibrated_at",
+            field=models.DateTimeField(null=True, verbose_name="Calibrated"),
+        ),
+        migrations.AddField(
+            model_name="questionstats",
+            name="difficulty_score",
+            field=models.FloatField(null=True, verbose_name="Difficulty Score"),
+        ),
+        migrations.AddField(
+            model_name="trivia",
+            name="measured_difficulty",
+            field=models.FloatField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="Measured Difficulty",
+            ),
+        ),
+        migrations.AddField(
+            model_name="trivia",
+            name="measured_level",
+            field=models.IntegerField(
+                blank=True,
+                choices=[(1, "Beginner"), (2, "Intermediate"), (3, "Advanced")],
+                editable=False,
+                null=True,
+                verbose_name="Measured Level",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="trivia",
+            index=models.Index(
+                fields=["measured_level", "is_public"], name="trivia_measured_level_idx"
+            ),
+        ),
+    ]
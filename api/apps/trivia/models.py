@@ -7,6 +7,9 @@ Includes models for:
 - Theme categorization
 - Question handling
 - Answer tracking
+- Search term indexing
+- Near-duplicate question buckets
+- Per-question answer statistics
 
 Features:
 - UUID primary keys
@@ -28,7 +31,7 @@ class Trivia(models.Model):
     Model for trivia games.
 
     Features:
-    - Difficulty levels
+    - Difficulty levels, hand-picked and measured
     - Public/private access
     - Theme categorization
     - Question limits
@@ -58,6 +61,18 @@ class Trivia(models.Model):
         help_text=_("Determines if the trivia is visible to all users"),
     )
     difficulty = models.IntegerField(_("Difficulty"), choices=DIFFICULTY_CHOICES)
+    # Written by the calibration job from recorded answers
+    # (see api.apps.trivia.calibration)
+    measured_difficulty = models.FloatField(
+        _("Measured Difficulty"), null=True, blank=True, editable=False
+    )
+    measured_level = models.IntegerField(
+        _("Measured Level"),
+        choices=DIFFICULTY_CHOICES,
+        null=True,
+        blank=True,
+        editable=False,
+    )
     theme = models.ForeignKey(
         "Theme",
         on_delete=models.CASCADE,
@@ -102,6 +117,21 @@ class Trivia(models.Model):
         constraints = [
             models.UniqueConstraint(fields=["title"], name="unique_trivia_title")
         ]
+        indexes = [
+            # Keyset pagination order (see api.apps.trivia.pagination)
+            models.Index(fields=["created_at", "id"], name="trivia_created_id_idx"),
+            # Catalog filter (see api.apps.trivia.catalog); title makes it
+            # covering since InnoDB secondary indexes also carry the id
+            models.Index(
+                fields=["theme", "difficulty", "is_public", "title"],
+                name="trivia_catalog_idx",
+            ),
+            # Quick play by measured level (see api.apps.trivia.sampling)
+            models.Index(
+                fields=["measured_level", "is_public"],
+                name="trivia_measured_level_idx",
+            ),
+        ]
 
 
 class Theme(models.Model):
@@ -198,3 +228,127 @@ class Language(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class TriviaSearchTerm(models.Model):
+    """
+    Inverted index entry mapping a normalized term to a trivia.
+
+    Rows are derived from the trivia title, question titles and answer
+    titles (see api.apps.trivia.search) and rebuilt whenever the trivia
+    changes.
+
+    Attributes:
+        term (str): Normalized token
+        trivia (Trivia): Trivia containing the term
+        weight (int): Sum of field weights over all occurrences
+    """
+
+    term = models.CharField(_("Term"), max_length=64)
+    trivia = models.ForeignKey(
+        Trivia,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+        verbose_name=_("Trivia"),
+    )
+    weight = models.PositiveIntegerField(_("Weight"), default=1)
+
+    def __str__(self):
+        return f"{self.term} - {self.trivia_id}"
+
+    class Meta:
+        constraints = [
+            # Leading term column doubles as the lookup index for searches
+            models.UniqueConstraint(
+                fields=["term", "trivia"], name="unique_search_term_trivia"
+            )
+        ]
+
+
+class QuestionBucket(models.Model):
+    """
+    LSH bucket entry of a question fingerprint.
+
+    Every question title is MinHashed and its signature split into bands;
+    each band hashes to one bucket (see api.apps.trivia.duplicates).
+    Questions sharing a bucket are candidate near-duplicates.
+
+    Attributes:
+        bucket (int): Hash of one band of the question signature
+        question (Question): Question in the bucket
+    """
+
+    bucket = models.BigIntegerField(_("Bucket"))
+    question = models.ForeignKey(
+        Question,
+        on_delete=models.CASCADE,
+        related_name="buckets",
+        verbose_name=_("Question"),
+    )
+
+    def __str__(self):
+        return f"{self.bucket} - {self.question_id}"
+
+    class Meta:
+        constraints = [
+            # Leading bucket column doubles as the candidate lookup index
+            models.UniqueConstraint(
+                fields=["bucket", "question"], name="unique_question_bucket"
+            )
+        ]
+
+
+class QuestionStats(models.Model):
+    """
+    Aggregated answer statistics of a question.
+
+    Counters are recorded in Redis during games and added here by the
+    periodic flush (see api.apps.trivia.stats).
+
+    Attributes:
+        question (Question): Question the counts belong to
+        attempts (int): Recorded responses, including unanswered timeouts
+        corrects (int): Responses picking a correct answer
+        difficulty_score (float): Posterior miss rate from the last
+            calibration (see api.apps.trivia.calibration)
+        calibrated_at (datetime): updated_at of the counts last calibrated
+    """
+
+    question = models.OneToOneField(
+        Question,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name=_("Question"),
+    )
+    attempts = models.PositiveIntegerField(_("Attempts"), default=0)
+    corrects = models.PositiveIntegerField(_("Correct Answers"), default=0)
+    difficulty_score = models.FloatField(_("Difficulty Score"), null=True)
+    calibrated_at = models.DateTimeField(_("Calibrated"), null=True)
+    updated_at = models.DateTimeField(_("Updated"), auto_now=True)
+
+    def __str__(self):
+        return f"{self.question_id}: {self.corrects}/{self.attempts}"
+
+
+class AnswerStats(models.Model):
+    """
+    Aggregated pick count of an answer.
+
+    Attributes:
+        answer (Answer): Answer the count belongs to
+        picks (int): Times players chose this answer
+    """
+
+    answer = models.OneToOneField(
+        Answer,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name=_("Answer"),
+    )
+    picks = models.PositiveIntegerField(_("Picks"), default=0)
+    updated_at = models.DateTimeField(_("Updated"), auto_now=True)
+
+    def __str__(self):
+        return f"{self.answer_id}: {self.picks}"
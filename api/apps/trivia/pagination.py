@@ -0,0 +1,142 @@
+"""
+Trivia Pagination Module
+
+This module provides keyset pagination for trivia listings.
+
+Pages are ordered by (created_at, id) and continue strictly after the
+last row of the previous page, so every page costs one index range scan
+no matter how deep the client has paged, and rows inserted meanwhile
+never shift or duplicate results.
+
+Features:
+- Opaque, URL safe cursors
+- Stable ordering with the id as tie breaker
+- Opt-in: requests without cursor or limit keep the unpaginated response
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from collections import OrderedDict
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+def encode_cursor(created_at, pk) -> str:
+    """Encode the position after a row into an opaque cursor"""
+    payload = json.dumps([created_at.isoformat(), str(pk)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Returns:
+        tuple: (created_at, id) of the last row of the previous page
+
+    Raises:
+        ParseError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = parse_datetime(created_at)
+        pk = uuid.UUID(pk)
+    except (
+        binascii.Error,
+        ValueError,
+        TypeError,
+        AttributeError,
+        UnicodeDecodeError,
+    ):
+        raise ParseError("Invalid cursor")
+    if created_at is None:
+        raise ParseError("Invalid cursor")
+    return created_at, pk
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over (created_at, id).
+
+    GET /api/trivias/?limit=50
+    GET /api/trivias/?limit=50&cursor=<next_cursor>
+
+    Response:
+        {"results": [...], "next_cursor": "..." or null}
+    """
+
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 50
+    max_limit = 200
+    ordering = ("created_at", "id")
+
+    def get_limit(self, request):
+        """Read the page size, clamped to max_limit"""
+        value = request.query_params.get(self.limit_query_param)
+        if value is None:
+            return self.default_limit
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ParseError("The 'limit' parameter must be a number")
+        return max(1, min(limit, self.max_limit))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if (
+            self.cursor_query_param not in params
+            and self.limit_query_param not in params
+        ):
+            return None
+
+        self.limit = self.get_limit(request)
+        queryset = queryset.order_by(*self.ordering)
+
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            created_at, pk = decode_cursor(cursor)
+            # The redundant lower bound lets the database seek the
+            # (created_at, id) index instead of scanning the OR branches
+            queryset = queryset.filter(created_at__gte=created_at).filter(
+                Q(created_at__gt=created_at) | Q(id__gt=pk)
+            )
+
+        # One extra row tells whether another page exists
+        rows = list(queryset[: self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        self.page = rows[: self.limit]
+        return self.page
+
+    def get_next_cursor(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        return encode_cursor(last.created_at, last.pk)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("results", data),
+                    ("next_cursor", self.get_next_cursor()),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "results": schema,
+                "next_cursor": {"type": "string", "nullable": True},
+            },
+        }
@@ -0,0 +1,206 @@
+"""
+Trivia Quiz Module
+
+This module builds ad-hoc quizzes of questions sampled across all the
+public trivias of a (theme, difficulty) cell.
+
+Each cell has a question pool: a Redis set of the ids of its active
+questions. A quiz of N questions costs one SRANDMEMBER of N ids and one
+primary key lookup, no matter how many questions the cell holds.
+
+Pools are built lazily from the database on first use and then kept
+current incrementally: new questions are added when their trivia
+changes. Ids that stopped qualifying (deleted or deactivated questions,
+trivias made private or moved to another cell) are dropped the first
+time they are drawn, and the draw is topped up, which keeps the sample
+uniform over the questions that do qualify.
+
+Features:
+- O(N) sampling independent of the cell size
+- Incremental pool updates on commit
+- Database fallback when Redis is unavailable
+"""
+
+import random
+import uuid
+from typing import List
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from api.utils.cache_utils import on_commit_once
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_redis, redis_key
+
+from .availability import count_cells
+from .models import Answer, Question, Trivia
+
+QUIZ_DEFAULT_QUESTIONS = 10
+QUIZ_MAX_QUESTIONS = 30
+POOL_BUILD_CHUNK_SIZE = 2000
+
+# Rounds of drawing replacements for ids that no longer qualify
+MAX_SAMPLE_ROUNDS = 3
+
+# Adds members only to a pool that exists; a missing pool is built in
+# full on first use instead of starting out partial
+ADD_IF_EXISTS_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+return redis.call('SADD', KEYS[1], unpack(ARGV))
+"""
+
+
+def question_pool_key(theme_id, difficulty) -> str:
+    """Redis key holding the question pool of a cell"""
+    return redis_key("trivia", "question_pool", theme_id, difficulty)
+
+
+def cell_questions(theme_id, difficulty):
+    """Active questions of the public trivias of a cell"""
+    return Question.objects.filter(
+        trivia__theme_id=theme_id,
+        trivia__difficulty=difficulty,
+        trivia__is_public=True,
+        is_active=True,
+    )
+
+
+def load_question_pool(theme_id, difficulty, chunk_size=POOL_BUILD_CHUNK_SIZE) -> int:
+    """
+    Build and store the question pool of a cell from the database.
+
+    Returns:
+        int: Number of pooled questions
+    """
+    key = question_pool_key(theme_id, difficulty)
+    # Filled under a private key and renamed, so readers never see it partial
+    building_key = f"{key}:building:{uuid.uuid4().hex}"
+    ids = (
+        cell_questions(theme_id, difficulty)
+        .values_list("id", flat=True)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    client = get_redis()
+    total, chunk = 0, []
+    for question_id in ids:
+        chunk.append(question_id)
+        if len(chunk) == chunk_size:
+            client.sadd(building_key, *chunk)
+            total, chunk = total + len(chunk), []
+    if chunk:
+        client.sadd(building_key, *chunk)
+        total += len(chunk)
+
+    if not total:
+        client.delete(key)
+        return 0
+    client.expire(building_key, settings.TRIVIA_AVAILABILITY_TTL)
+    client.rename(building_key, key)
+    return total
+
+
+def rebuild_question_pools(batch_size=POOL_BUILD_CHUNK_SIZE) -> int:
+    """
+    Rebuild the question pool of every non-empty cell.
+
+    Returns:
+        int: Number of pooled questions
+    """
+    total = 0
+    for field in count_cells():
+        theme_id, difficulty = field.rsplit(":", 1)
+        total += load_question_pool(theme_id, int(difficulty), chunk_size=batch_size)
+    return total
+
+
+def add_trivia_questions(trivia_id) -> None:
+    """Add the active questions of a public trivia to its cell pool"""
+    trivia = (
+        Trivia.objects.filter(id=trivia_id, is_public=True)
+        .values("theme_id", "difficulty")
+        .first()
+    )
+    if trivia is None:
+        return
+    ids = list(
+        Question.objects.filter(trivia_id=trivia_id, is_active=True).values_list(
+            "id", flat=True
+        )
+    )
+    if not ids:
+        return
+    try:
+        client = get_redis()
+        add_if_exists = client.register_script(ADD_IF_EXISTS_SCRIPT)
+        add_if_exists(
+            keys=[question_pool_key(trivia["theme_id"], trivia["difficulty"])],
+            args=ids,
+        )
+    except RedisError as e:
+        logger.warning(f"Question pool unavailable adding {trivia_id}: {e}")
+
+
+def schedule_question_pool_update(trivia_id) -> None:
+    """Add the questions of a trivia to its pool once the transaction commits"""
+    trivia_id = str(trivia_id)
+    on_commit_once(f"trivia_question_pool:{trivia_id}", add_trivia_questions, trivia_id)
+
+
+def load_questions(theme_id, difficulty, ids) -> List[Question]:
+    """Load the drawn questions that still qualify, with trivia and answers"""
+    return list(
+        cell_questions(theme_id, difficulty)
+        .filter(id__in=ids)
+        .select_related("trivia")
+        .prefetch_related(Prefetch("answers", queryset=Answer.objects.order_by("id")))
+    )
+
+
+def sample_questions(theme_id, difficulty, count: int) -> List[Question]:
+    """
+    Draw up to count distinct questions uniformly from a cell.
+
+    Args:
+        theme_id: Theme UUID
+        difficulty: Difficulty level
+        count: Number of questions wanted
+
+    Returns:
+        list: Questions with their trivia and answers loaded, in random
+        order; shorter than count when the cell has fewer questions
+    """
+    try:
+        client = get_redis()
+        key = question_pool_key(theme_id, difficulty)
+        if not client.exists(key) and not load_question_pool(theme_id, difficulty):
+            return []
+
+        picked: List[Question] = []
+        for _ in range(MAX_SAMPLE_ROUNDS):
+            needed = count - len(picked)
+            seen = {question.id for question in picked}
+            # count distinct ids hold at least `needed` not picked yet
+            members = {int(member) for member in client.srandmember(key, count)}
+            drawn = list(members - seen)[:needed]
+            if not drawn:
+                break
+
+            questions = load_questions(theme_id, difficulty, drawn)
+            stale = set(drawn) - {question.id for question in questions}
+            if stale:
+                client.srem(key, *stale)
+            picked.extend(questions)
+            if not stale or len(picked) >= count:
+                break
+    except RedisError as e:
+        logger.warning(f"Question pool unavailable sampling: {e}")
+        ids = list(cell_questions(theme_id, difficulty).values_list("id", flat=True))
+        picked = load_questions(
+            theme_id, difficulty, random.sample(ids, min(count, len(ids)))
+        )
+
+    random.shuffle(picked)
+    return picked
@@ -0,0 +1,148 @@
+"""
+Trivia Sampling Module
+
+This module picks random public trivias for quick play without
+ORDER BY RAND(), which would sort the whole candidate set per request.
+
+A (theme, difficulty) cell is drawn from the availability matrix with
+probability proportional to its trivia count, then a trivia is drawn
+from the cell's id pool with SRANDMEMBER. Together this is a uniform
+draw over every eligible trivia.
+
+Features:
+- Optional theme and difficulty filters
+- Exclude list of recently played trivias
+- Random offset on the catalog index when Redis is unavailable
+- Draws by measured difficulty level (see api.apps.trivia.calibration)
+"""
+
+import random
+from typing import Iterable, List, Optional, Tuple
+
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_redis
+
+from .availability import Cell, get_availability, load_pool, pool_key
+from .models import Trivia
+
+
+def candidate_cells(theme_id=None, difficulty=None) -> List[Tuple[Cell, int]]:
+    """
+    List the non-empty cells matching the filters with their counts.
+
+    Args:
+        theme_id: Optional theme UUID
+        difficulty: Optional difficulty level
+
+    Returns:
+        list: ((theme_id, difficulty), count) pairs
+    """
+    cells = []
+    for cell_theme, difficulties in get_availability().items():
+        if theme_id is not None and cell_theme != str(theme_id):
+            continue
+        for level, count in difficulties.items():
+            if difficulty is not None and level != difficulty:
+                continue
+            cells.append(((cell_theme, level), count))
+    return cells
+
+
+def sample_pool(theme_id, difficulty, size: int) -> List[str]:
+    """
+    Draw up to size distinct trivia ids from a cell.
+
+    The pool is built from the database when it is not stored yet.
+    """
+    try:
+        members = get_redis().srandmember(pool_key(theme_id, difficulty), size)
+    except RedisError as e:
+        logger.warning(f"Availability store unavailable sampling: {e}")
+        return sample_database(theme_id, difficulty, size)
+
+    if members:
+        return [member.decode() for member in members]
+
+    ids = load_pool(theme_id, difficulty)
+    return random.sample(ids, min(size, len(ids)))
+
+
+def sample_database(theme_id, difficulty, size: int) -> List[str]:
+    """Draw ids at one random offset of the catalog index"""
+    queryset = Trivia.objects.filter(
+        theme_id=theme_id, difficulty=difficulty, is_public=True
+    ).order_by("title")
+    total = queryset.count()
+    if not total:
+        return []
+    offset = random.randrange(max(1, total - size + 1))
+    return [
+        str(trivia_id)
+        for trivia_id in queryset.values_list("id", flat=True)[offset : offset + size]
+    ]
+
+
+def pick_random_trivia(
+    theme_id=None, difficulty=None, exclude: Iterable = ()
+) -> Optional[str]:
+    """
+    Pick a random public trivia.
+
+    Args:
+        theme_id: Optional theme UUID
+        difficulty: Optional difficulty level
+        exclude: Trivia ids that must not be picked (e.g. recently played)
+
+    Returns:
+        str: Id of the picked trivia
+        None: If no eligible trivia is left
+    """
+    exclude = {str(trivia_id) for trivia_id in exclude}
+    cells = candidate_cells(theme_id, difficulty)
+
+    while cells:
+        index = random.choices(range(len(cells)), weights=[n for _, n in cells])[0]
+        (cell_theme, level), _ = cells.pop(index)
+
+        # One more id than excluded guarantees an eligible one if it exists
+        ids = sample_pool(cell_theme, level, len(exclude) + 1)
+        eligible = [trivia_id for trivia_id in ids if trivia_id not in exclude]
+        if eligible:
+            return random.choice(eligible)
+
+    return None
+
+
+def pick_measured_trivia(
+    theme_id=None, level=None, exclude: Iterable = ()
+) -> Optional[str]:
+    """
+    Pick a random public trivia by measured difficulty level.
+
+    Measured levels change with every calibration, so they have no
+    pools; the draw is one random offset on trivia_measured_level_idx.
+
+    Args:
+        theme_id: Optional theme UUID
+        level: Optional measured level; without it any measured trivia
+        exclude: Trivia ids that must not be picked
+
+    Returns:
+        str: Id of the picked trivia
+        None: If no eligible trivia is left
+    """
+    queryset = Trivia.objects.filter(is_public=True).exclude(id__in=list(exclude))
+    if level is None:
+        queryset = queryset.filter(measured_level__isnull=False)
+    else:
+        queryset = queryset.filter(measured_level=level)
+    if theme_id is not None:
+        queryset = queryset.filter(theme_id=theme_id)
+
+    total = queryset.count()
+    if not total:
+        return None
+    trivia_id = queryset.order_by("id").values_list("id", flat=True)[
+        random.randrange(total)
+    ]
+    return str(trivia_id)
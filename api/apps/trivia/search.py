@@ -0,0 +1,283 @@
+"""
+Trivia Search Module
+
+This module provides the in-app inverted index behind trivia search.
+Each trivia is analyzed into normalized terms stored in TriviaSearchTerm,
+so a search is a single indexed lookup on the terms of the query.
+
+Features:
+- Language aware analysis (accent folding, stopwords, plural stripping)
+- Weighted fields (title > question > answer)
+- Reindex once per transaction after trivia changes
+- Ranking by matched query terms, then accumulated weight
+"""
+
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import List
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from api.utils.cache_utils import on_commit_once
+
+from .models import Answer, Question, Trivia, TriviaSearchTerm
+
+TITLE_WEIGHT = 5
+QUESTION_WEIGHT = 2
+ANSWER_WEIGHT = 1
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = TriviaSearchTerm._meta.get_field("term").max_length
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+STOPWORDS = {
+    "en": {
+        "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+        "in", "is", "it", "of", "on", "or", "that", "the", "this", "to", "was",
+        "what", "when", "where", "which", "who", "why", "with",
+    },
+    "es": {
+        "a", "al", "como", "con", "cual", "de", "del", "donde", "el", "en",
+        "es", "la", "las", "lo", "los", "para", "por", "que", "quien", "se",
+        "su", "un", "una", "uno", "y",
+    },
+}  # fmt: skip
+
+VOWELS = set("aeiou")
+
+
+def stem_en(token: str) -> str:
+    """Strip English plural endings (Porter step 1a)"""
+    if token.endswith("sses"):
+        return token[:-2]
+    if token.endswith("ies") and len(token) > 4:
+        return token[:-3] + "y"
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def stem_es(token: str) -> str:
+    """Strip Spanish plural endings"""
+    if len(token) > 4 and token.endswith("es") and token[-3] not in VOWELS:
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+STEMMERS = {"en": stem_en, "es": stem_es}
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip accents so "País" and "pais" match"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def analyze(text, language=None):
+    """
+    Split text into normalized search terms.
+
+    Args:
+        text: Text to analyze
+        language: Language code (defaults to TRIVIA_SEARCH_LANGUAGE)
+
+    Returns:
+        list: Terms in order of appearance, stopwords removed
+    """
+    if not text:
+        return []
+
+    language = language or settings.TRIVIA_SEARCH_LANGUAGE
+    stopwords = STOPWORDS.get(language, set())
+    stem = STEMMERS.get(language)
+
+    terms = []
+    for token in TOKEN_PATTERN.findall(fold(text)):
+        if len(token) < MIN_TERM_LENGTH or token in stopwords:
+            continue
+        if stem and not token.isdigit():
+            token = stem(token)
+        terms.append(token[:MAX_TERM_LENGTH])
+    return terms
+
+
+def analyze_query(query, language=None):
+    """
+    Analyze a search query.
+
+    Without an explicit language the query is analyzed with every
+    supported analyzer, so it matches trivias indexed in any language.
+
+    Returns:
+        set: Distinct query terms
+    """
+    if language:
+        return set(analyze(query, language))
+
+    terms = set()
+    for code in STEMMERS:
+        terms.update(analyze(query, code))
+    return terms
+
+
+def build_terms(trivia, question_titles, answer_titles):
+    """
+    Compute the weighted terms of a trivia.
+
+    Returns:
+        Counter: Weight of every term
+    """
+    language = trivia.language.code if trivia.language_id else None
+    weights = Counter()
+    for term in analyze(trivia.title, language):
+        weights[term] += TITLE_WEIGHT
+    for title in question_titles:
+        for term in analyze(title, language):
+            weights[term] += QUESTION_WEIGHT
+    for title in answer_titles:
+        for term in analyze(title, language):
+            weights[term] += ANSWER_WEIGHT
+    return weights
+
+
+def reindex_trivia(trivia_id) -> int:
+    """
+    Rebuild the index entries of a single trivia.
+
+    Returns:
+        int: Number of indexed terms (0 if the trivia no longer exists)
+    """
+    trivia = Trivia.objects.select_related("language").filter(id=trivia_id).first()
+
+    with transaction.atomic():
+        TriviaSearchTerm.objects.filter(trivia_id=trivia_id).delete()
+        if trivia is None:
+            return 0
+
+        weights = build_terms(
+            trivia,
+            Question.objects.filter(trivia=trivia).values_list(
+                "question_title", flat=True
+            ),
+            Answer.objects.filter(question__trivia=trivia).values_list(
+                "answer_title", flat=True
+            ),
+        )
+        TriviaSearchTerm.objects.bulk_create(
+            [
+                TriviaSearchTerm(term=term, trivia=trivia, weight=weight)
+                for term, weight in weights.items()
+            ]
+        )
+    return len(weights)
+
+
+def rebuild_search_index(batch_size=500) -> int:
+    """
+    Rebuild the index of every trivia in batches.
+
+    Each batch loads its trivias, questions and answers with three
+    queries and replaces their index entries in one transaction.
+
+    Returns:
+        int: Number of indexed trivias
+    """
+    indexed = 0
+    trivias = Trivia.objects.select_related("language").order_by("id")
+    last_id = None
+    while True:
+        batch = trivias if last_id is None else trivias.filter(id__gt=last_id)
+        batch = list(batch[:batch_size])
+        if not batch:
+            return indexed
+
+        ids = [trivia.id for trivia in batch]
+        question_titles = defaultdict(list)
+        for trivia_id, title in Question.objects.filter(trivia_id__in=ids).values_list(
+            "trivia_id", "question_title"
+        ):
+            question_titles[trivia_id].append(title)
+        answer_titles = defaultdict(list)
+        for trivia_id, title in Answer.objects.filter(
+            question__trivia_id__in=ids
+        ).values_list("question__trivia_id", "answer_title"):
+            answer_titles[trivia_id].append(title)
+
+        entries: List[TriviaSearchTerm] = []
+        for trivia in batch:
+            weights = build_terms(
+                trivia, question_titles[trivia.id], answer_titles[trivia.id]
+            )
+            entries.extend(
+                TriviaSearchTerm(term=term, trivia=trivia, weight=weight)
+                for term, weight in weights.items()
+            )
+
+        with transaction.atomic():
+            TriviaSearchTerm.objects.filter(trivia_id__in=ids).delete()
+            TriviaSearchTerm.objects.bulk_create(entries, batch_size=1000)
+
+        indexed += len(batch)
+        last_id = ids[-1]
+
+
+def schedule_reindex(trivia_id) -> None:
+    """Reindex a trivia once the current transaction commits"""
+    trivia_id = str(trivia_id)
+    on_commit_once(f"trivia_search:{trivia_id}", reindex_trivia, trivia_id)
+
+
+def search_trivias(query, queryset=None, language=None, limit=20):
+    """
+    Rank trivias matching a query.
+
+    Trivias matching more distinct query terms rank first, ties are
+    broken by the accumulated field weight of the matches.
+
+    Args:
+        query: Free text query
+        queryset: Trivias the caller is allowed to see
+        language: Optional language code used to analyze the query
+        limit: Maximum number of results
+
+    Returns:
+        list: Dicts with id, title, difficulty, theme and score
+    """
+    terms = analyze_query(query, language)
+    if not terms:
+        return []
+
+    matches = TriviaSearchTerm.objects.filter(term__in=terms)
+    if queryset is not None:
+        matches = matches.filter(trivia__in=queryset.values("id"))
+    ranked = list(
+        matches.values("trivia_id")
+        .annotate(hits=Count("term"), score=Sum("weight"))
+        .order_by("-hits", "-score", "trivia_id")[:limit]
+    )
+    if not ranked:
+        return []
+
+    trivias = {
+        trivia["id"]: trivia
+        for trivia in Trivia.objects.filter(
+            id__in=[match["trivia_id"] for match in ranked]
+        ).values("id", "title", "difficulty", "theme__name")
+    }
+    return [
+        {
+            "id": str(match["trivia_id"]),
+            "title": trivias[match["trivia_id"]]["title"],
+            "difficulty": trivias[match["trivia_id"]]["difficulty"],
+            "theme": trivias[match["trivia_id"]]["theme__name"],
+            "score": match["score"],
+        }
+        for match in ranked
+        if match["trivia_id"] in trivias
+    ]
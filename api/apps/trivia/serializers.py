@@ -12,13 +12,19 @@ Features:
 - Data validation
 - Nested serialization
 - Custom field handling
+- Near-duplicate questions reported on create and update
 """
 
+from itertools import combinations
+
+from django.conf import settings
 from rest_framework import serializers
 
 from api.utils.jwt_utils import get_user_id_by_username
 
+from .duplicates import find_near_duplicates, normalize, similarity
 from .models import Answer, Question, Theme, Trivia
+from .updates import apply_question_updates, bulk_create_questions
 
 
 class ThemeSerializer(serializers.ModelSerializer):
@@ -67,6 +73,21 @@ class QuestionSerializer(serializers.ModelSerializer):
         fields = ["id", "question_title", "points", "answers"]
 
 
+class QuizQuestionSerializer(QuestionSerializer):
+    """
+    Serializer for questions of a mixed quiz.
+
+    Features:
+    - Source trivia of each question
+    """
+
+    trivia_id = serializers.UUIDField(read_only=True)
+    trivia_title = serializers.CharField(source="trivia.title", read_only=True)
+
+    class Meta(QuestionSerializer.Meta):
+        fields = QuestionSerializer.Meta.fields + ["trivia_id", "trivia_title"]
+
+
 class TriviaListSerializer(serializers.ModelSerializer):
     """
     Serializer for trivia list endpoint.
@@ -199,8 +220,48 @@ class TriviaSerializer(serializers.ModelSerializer):
                     " must have at least one correct answer",
                 )
 
+        titles = [question.get("question_title") or "" for question in value]
+        seen = set()
+        for title in titles:
+            key = normalize(title)
+            if key in seen:
+                raise serializers.ValidationError(
+                    f"The question '{title}' is repeated in this trivia"
+                )
+            seen.add(key)
+
+        # Similar questions are reported with the response, not rejected:
+        # distinct questions such as the gold and silver symbols score high
+        self.near_duplicates = [
+            {"question": first, "similar_to": second, "similarity": round(score, 2)}
+            for first, second in combinations(titles, 2)
+            if (score := similarity(first, second))
+            >= settings.TRIVIA_DUPLICATE_THRESHOLD
+        ]
+        # Sub-linear lookup in the LSH buckets of every stored question
+        duplicates = find_near_duplicates(
+            titles, exclude_trivia=self.instance.id if self.instance else None
+        )
+        self.near_duplicates.extend(
+            {
+                "question": titles[index],
+                "similar_to": match.question_title,
+                "trivia": match.trivia_title,
+                "similarity": round(match.similarity, 2),
+            }
+            for index, match in sorted(duplicates.items())
+        )
+
         return value
 
+    def to_representation(self, instance):
+        """Add the near-duplicates found while validating a write"""
+        data = super().to_representation(instance)
+        near_duplicates = getattr(self, "near_duplicates", None)
+        if near_duplicates is not None:
+            data["near_duplicates"] = near_duplicates
+        return data
+
     def validate_title(self, value):
         """
         Validate trivia title uniqueness.
@@ -247,16 +308,34 @@ class TriviaSerializer(serializers.ModelSerializer):
                 theme, _ = Theme.objects.get_or_create(name=theme_data)
 
         trivia = Trivia.objects.create(theme=theme, **validated_data)
+        self.create_questions(trivia, questions_data)
 
-        # Create questions and answers
-        for question_data in questions_data:
-            answers_data = question_data.pop("answers", [])
-            question = Question.objects.create(trivia=trivia, **question_data)
+        return trivia
+
+    def create_questions(self, trivia, questions_data):
+        """
+        Bulk create questions and their answers for a trivia.
 
-            for answer_data in answers_data:
-                Answer.objects.create(question=question, trivia=trivia, **answer_data)
+        Runs one INSERT for all questions and one for all answers instead
+        of one per row. Bulk inserts skip model signals, which is fine
+        since the trivia save already schedules its bundle refresh for
+        the end of the transaction.
 
-        return trivia
+        Args:
+            trivia: Trivia owning the questions
+            questions_data: Validated question dicts with nested answers
+
+        Returns:
+            list: Created questions in input order
+        """
+        questions = []
+        answers = []
+        for question_data in questions_data:
+            question_data = dict(question_data)
+            answers_data = question_data.pop("answers", [])
+            questions.append(Question(trivia=trivia, **question_data))
+            answers.append([Answer(**answer_data) for answer_data in answers_data])
+        return bulk_create_questions(trivia, questions, answers)
 
     def update(self, instance, validated_data):
         """Update trivia and related data"""
@@ -291,30 +370,5 @@ class TriviaSerializer(serializers.ModelSerializer):
         return instance
 
     def update_questions(self, instance, questions_data):
-        """Update questions and their answers"""
-        for question_data in questions_data:
-            question_id = question_data.get("id")
-            if question_id:
-                question = Question.objects.get(id=question_id, trivia=instance)
-                for attr, value in question_data.items():
-                    if attr != "answers":
-                        setattr(question, attr, value)
-                question.save()
-                if "answers" in question_data:
-                    self.update_answers(question, question_data["answers"])
-            else:
-                new_question = Question.objects.create(trivia=instance, **question_data)
-                if "answers" in question_data:
-                    self.create_answers(new_question, question_data["answers"])
-
-    def update_answers(self, question, answers_data):
-        """Update answers for a question"""
-        for answer_data in answers_data:
-            answer_id = answer_data.get("id")
-            if answer_id:
-                answer = Answer.objects.get(id=answer_id, question=question)
-                for attr, value in answer_data.items():
-                    setattr(answer, attr, value)
-                answer.save()
-            else:
-                Answer.objects.create(question=question, **answer_data)
+        """Update questions and their answers in a single bulk pass"""
+        apply_question_updates(instance, questions_data)
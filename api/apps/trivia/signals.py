@@ -0,0 +1,105 @@
+"""
+Trivia Signals Module
+
+This module connects model signals that keep derived trivia data in sync.
+Handles:
+- Bundle store refresh on trivia, question and answer changes
+- Cache tag invalidation for trivia and theme responses
+- Search index refresh on trivia, question and answer changes
+- Availability matrix refresh on trivia changes
+- Question pool updates on trivia, question and answer changes
+- Near-duplicate bucket refresh on trivia, question and answer changes
+
+Receivers are registered in TriviaConfig.ready().
+"""
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from api.utils.cache_utils import invalidate_tags_on_commit
+
+from .availability import public_cell, schedule_availability_update, stored_cell
+from .bundles import schedule_bundle_refresh
+from .duplicates import schedule_duplicate_index
+from .models import Answer, Question, Theme, Trivia
+from .quiz import schedule_question_pool_update
+from .search import schedule_reindex
+
+
+def get_answer_trivia_id(answer):
+    """
+    Resolve the trivia of an answer.
+
+    Answers created through updates may lack the denormalized trivia FK,
+    in which case it is read from the question.
+    """
+    if answer.trivia_id:
+        return answer.trivia_id
+    return (
+        Question.objects.filter(id=answer.question_id)
+        .values_list("trivia_id", flat=True)
+        .first()
+    )
+
+
+def trivia_content_changed(trivia_id):
+    """
+    Refresh everything derived from a trivia.
+
+    Also called directly after bulk writes, which skip model signals.
+    """
+    schedule_bundle_refresh(trivia_id)
+    schedule_reindex(trivia_id)
+    schedule_question_pool_update(trivia_id)
+    schedule_duplicate_index(trivia_id)
+    invalidate_tags_on_commit(f"trivia:{trivia_id}")
+
+
+def instance_cell(trivia):
+    """Availability cell of an in-memory trivia"""
+    return public_cell(trivia.theme_id, trivia.difficulty, trivia.is_public)
+
+
+@receiver(pre_save, sender=Trivia)
+def remember_trivia_cell(sender, instance, **kwargs):
+    """Remember the stored availability cell of a trivia about to change"""
+    instance._stored_cell = None
+    if not instance._state.adding:
+        instance._stored_cell = stored_cell(instance.id)
+
+
+@receiver(post_save, sender=Trivia)
+def trivia_saved(sender, instance, **kwargs):
+    """Refresh the bundle of a saved trivia and move it between cells"""
+    trivia_content_changed(instance.id)
+    schedule_availability_update(
+        instance.id, getattr(instance, "_stored_cell", None), instance_cell(instance)
+    )
+
+
+@receiver(post_delete, sender=Trivia)
+def trivia_deleted(sender, instance, **kwargs):
+    """Refresh the bundle of a deleted trivia and take it out of its cell"""
+    trivia_content_changed(instance.id)
+    schedule_availability_update(instance.id, instance_cell(instance), None)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def question_changed(sender, instance, **kwargs):
+    """Refresh the bundle of the trivia owning a question"""
+    if instance.trivia_id:
+        trivia_content_changed(instance.trivia_id)
+
+
+@receiver([post_save, post_delete], sender=Answer)
+def answer_changed(sender, instance, **kwargs):
+    """Refresh the bundle of the trivia owning an answer"""
+    trivia_id = get_answer_trivia_id(instance)
+    if trivia_id:
+        trivia_content_changed(trivia_id)
+
+
+@receiver([post_save, post_delete], sender=Theme)
+def theme_changed(sender, instance, **kwargs):
+    """Invalidate cached theme listings"""
+    invalidate_tags_on_commit("themes")
@@ -0,0 +1,295 @@
+"""
+Trivia Answer Statistics Module
+
+This module records how players answer each question and keeps
+per-question and per-answer aggregates in the database.
+
+Recording is a write-behind counter: every response increments a field
+of one Redis hash ("q:<question id>" for attempts, "a:<answer id>" for
+picks), one pipelined round trip per batch of responses. A periodic
+flush takes the counters out of Redis a chunk at a time and adds them
+to QuestionStats and AnswerStats with bulk_update. Correct answers are
+derived at flush time from the picks of answers marked correct, so
+clients only report what was picked.
+
+Reads come from the aggregate tables and never touch raw events.
+
+Features:
+- Responses checked against the database before they are counted
+- O(1) Redis work per recorded response
+- Chunked atomic take of counters, restored if the database write fails
+- Direct database write when Redis is unavailable
+- Per trivia statistics in two queries
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from api.utils.logging_utils import logger
+from api.utils.redis_utils import RedisError, get_redis, redis_key
+
+from .models import Answer, AnswerStats, Question, QuestionStats
+
+STATS_FLUSH_BATCH_SIZE = 500
+
+# Largest id of an auto-increment primary key
+MAX_ID = 2**63 - 1
+
+# Reads and deletes a set of counters in one step, so increments landing
+# during a flush are either taken now or left for the next one
+TAKE_FIELDS_SCRIPT = """
+local values = redis.call('HMGET', KEYS[1], unpack(ARGV))
+redis.call('HDEL', KEYS[1], unpack(ARGV))
+return values
+"""
+
+
+def stats_key() -> str:
+    """Redis hash holding the counters not flushed yet"""
+    return redis_key("trivia", "answer_stats")
+
+
+def count_responses(
+    responses: Iterable[Tuple[int, Optional[int]]],
+) -> Tuple[Counter[int], Counter[int]]:
+    """
+    Count attempts per question and picks per answer.
+
+    Args:
+        responses: (question_id, answer_id or None for no answer) pairs
+
+    Returns:
+        tuple: (attempts by question id, picks by answer id)
+    """
+    attempts: Counter[int] = Counter()
+    picks: Counter[int] = Counter()
+    for question_id, answer_id in responses:
+        attempts[question_id] += 1
+        if answer_id is not None:
+            picks[answer_id] += 1
+    return attempts, picks
+
+
+def check_responses(responses: List[Tuple[int, Optional[int]]]) -> None:
+    """
+    Check that responses refer to existing questions and answers.
+
+    Runs two queries. Picked answers must belong to the question they
+    were posted with, otherwise their correct picks would be counted
+    for another question than the attempt.
+
+    Args:
+        responses: (question_id, answer_id or None for no answer) pairs
+
+    Raises:
+        ValueError: Describing the first invalid response
+    """
+    for question_id, answer_id in responses:
+        for pk in (question_id, answer_id):
+            if pk is not None and not 0 < pk <= MAX_ID:
+                raise ValueError(f"Invalid id: {pk}")
+
+    question_ids = {question_id for question_id, _ in responses}
+    found = set(
+        Question.objects.filter(id__in=question_ids).values_list("id", flat=True)
+    )
+    missing = sorted(question_ids - found)
+    if missing:
+        raise ValueError(f"Question not found: {missing[0]}")
+
+    answer_ids = {answer_id for _, answer_id in responses if answer_id is not None}
+    answers = dict(
+        Answer.objects.filter(id__in=answer_ids).values_list("id", "question_id")
+    )
+    for question_id, answer_id in responses:
+        if answer_id is not None and answers.get(answer_id) != question_id:
+            raise ValueError(
+                f"Answer {answer_id} does not belong to question {question_id}"
+            )
+
+
+def record_answers(responses: Iterable[Tuple[int, Optional[int]]]) -> None:
+    """
+    Record player responses in the Redis counters.
+
+    Responses are expected to have passed check_responses.
+
+    Args:
+        responses: (question_id, answer_id or None for no answer) pairs
+    """
+    attempts, picks = count_responses(responses)
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        for question_id, count in attempts.items():
+            pipe.hincrby(stats_key(), f"q:{question_id}", count)
+        for answer_id, count in picks.items():
+            pipe.hincrby(stats_key(), f"a:{answer_id}", count)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Answer stats store unavailable, writing directly: {e}")
+        apply_answer_counts(attempts, picks)
+
+
+def apply_answer_counts(attempts: Dict[int, int], picks: Dict[int, int]) -> int:
+    """
+    Add counters to the aggregate tables.
+
+    Counts of questions or answers that no longer exist are dropped.
+    Missing aggregate rows are created, then every row is locked, added
+    to and written back with one bulk_update per table.
+
+    Returns:
+        int: Number of questions updated
+    """
+    with transaction.atomic():
+        answers = {
+            answer_id: (question_id, is_correct)
+            for answer_id, question_id, is_correct in Answer.objects.filter(
+                id__in=list(picks)
+            ).values_list("id", "question_id", "is_correct")
+        }
+        corrects: Counter[int] = Counter()
+        for answer_id, (question_id, is_correct) in answers.items():
+            if is_correct:
+                corrects[question_id] += picks[answer_id]
+
+        question_ids = list(
+            Question.objects.filter(id__in=set(attempts) | set(corrects)).values_list(
+                "id", flat=True
+            )
+        )
+        now = timezone.now()
+
+        QuestionStats.objects.bulk_create(
+            [QuestionStats(question_id=question_id) for question_id in question_ids],
+            ignore_conflicts=True,
+        )
+        question_stats = list(
+            QuestionStats.objects.select_for_update().filter(
+                question_id__in=question_ids
+            )
+        )
+        for stats in question_stats:
+            stats.attempts += attempts.get(stats.question_id, 0)
+            stats.corrects += corrects.get(stats.question_id, 0)
+            stats.updated_at = now
+        QuestionStats.objects.bulk_update(
+            question_stats, ["attempts", "corrects", "updated_at"]
+        )
+
+        AnswerStats.objects.bulk_create(
+            [AnswerStats(answer_id=answer_id) for answer_id in answers],
+            ignore_conflicts=True,
+        )
+        answer_stats = list(
+            AnswerStats.objects.select_for_update().filter(answer_id__in=list(answers))
+        )
+        for stats in answer_stats:
+            stats.picks += picks[stats.answer_id]
+            stats.updated_at = now
+        AnswerStats.objects.bulk_update(answer_stats, ["picks", "updated_at"])
+
+    return len(question_stats)
+
+
+def parse_counters(
+    fields: List[bytes], values: List
+) -> Tuple[Counter[int], Counter[int]]:
+    """Split taken hash fields into question attempts and answer picks"""
+    attempts: Counter[int] = Counter()
+    picks: Counter[int] = Counter()
+    for field, value in zip(fields, values):
+        if value is None:
+            continue
+        kind, _, pk = field.decode().partition(":")
+        counter = attempts if kind == "q" else picks
+        counter[int(pk)] += int(value)
+    return attempts, picks
+
+
+def restore_counters(client, attempts: Counter[int], picks: Counter[int]) -> None:
+    """Put taken counters back after a failed flush"""
+    pipe = client.pipeline(transaction=False)
+    for question_id, count in attempts.items():
+        pipe.hincrby(stats_key(), f"q:{question_id}", count)
+    for answer_id, count in picks.items():
+        pipe.hincrby(stats_key(), f"a:{answer_id}", count)
+    pipe.execute()
+
+
+def flush_answer_stats(batch_size=STATS_FLUSH_BATCH_SIZE) -> int:
+    """
+    Move the Redis counters into the aggregate tables.
+
+    Counters are scanned and taken batch_size fields at a time; each
+    batch is written in its own transaction.
+
+    Returns:
+        int: Number of flushed counters
+    """
+    client = get_redis()
+    take = client.register_script(TAKE_FIELDS_SCRIPT)
+    key = stats_key()
+
+    flushed, cursor = 0, 0
+    while True:
+        cursor, found = client.hscan(key, cursor, count=batch_size)
+        if found:
+            fields = list(found)
+            attempts, picks = parse_counters(fields, take(keys=[key], args=fields))
+            try:
+                apply_answer_counts(attempts, picks)
+            except Exception:
+                restore_counters(client, attempts, picks)
+                raise
+            flushed += len(fields)
+        if cursor == 0:
+            return flushed
+
+
+def get_trivia_stats(trivia_id) -> List[dict]:
+    """
+    Answer statistics of every question of a trivia.
+
+    Returns:
+        list: Questions in order with attempts, corrects, correct_rate
+        and the picks of each answer
+    """
+    answers = Answer.objects.select_related("stats").order_by("id")
+    questions = (
+        Question.objects.filter(trivia_id=trivia_id)
+        .select_related("stats")
+        .prefetch_related(Prefetch("answers", queryset=answers))
+        .order_by("id")
+    )
+
+    results = []
+    for question in questions:
+        stats = getattr(question, "stats", None)
+        attempts = stats.attempts if stats else 0
+        corrects = stats.corrects if stats else 0
+        results.append(
+            {
+                "id": question.id,
+                "question_title": question.question_title,
+                "attempts": attempts,
+                "corrects": corrects,
+                "correct_rate": round(corrects / attempts, 4) if attempts else None,
+                "answers": [
+                    {
+                        "id": answer.id,
+                        "answer_title": answer.answer_title,
+                        "is_correct": answer.is_correct,
+                        "picks": (
+                            answer.stats.picks if getattr(answer, "stats", None) else 0
+                        ),
+                    }
+                    for answer in question.answers.all()
+                ],
+            }
+        )
+    return results
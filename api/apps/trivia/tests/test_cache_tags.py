@@ -0,0 +1,119 @@
+"""
+Cache Tags Test Module
+
+This module contains test cases for:
+- Tag generation counters
+- Tagged trivia responses invalidated on edit
+- Tagged theme listings invalidated on theme changes
+- Saves going through while the cache server is down
+- Commit callbacks scheduled once per transaction
+"""
+
+from unittest import mock
+
+import pytest
+from django.db import transaction
+from django_redis.exceptions import ConnectionInterrupted
+
+from api.utils.cache_utils import get_tag_versions, invalidate_tags, on_commit_once
+
+from .factories import QuestionFactory, ThemeFactory
+from .test_trivia_base import TestTriviaBase
+
+
+@pytest.mark.django_db
+class TestCacheTags(TestTriviaBase):
+    """Test cases for tag based cache invalidation"""
+
+    def test_invalidate_bumps_version(self):
+        """Test bumping a tag only changes its own generation"""
+        before = get_tag_versions(["tests:a", "tests:b"])
+
+        invalidate_tags("tests:a")
+
+        after = get_tag_versions(["tests:a", "tests:b"])
+        assert after != before
+        assert after.split(".")[1] == before.split(".")[1]
+
+    def test_get_trivia_reflects_edit(self, api_client, test_trivia):
+        """Test cached trivia details are dropped when the trivia changes"""
+        url = f"/api/trivias/get_trivia/?id={test_trivia.id}"
+        assert api_client.get(url).json()["title"] == test_trivia.title
+
+        test_trivia.title = "Renamed trivia"
+        test_trivia.save()
+
+        assert api_client.get(url).json()["title"] == "Renamed trivia"
+
+    def test_get_trivia_reflects_new_question(self, api_client, test_trivia):
+        """Test cached trivia details are dropped when a question is added"""
+        url = f"/api/trivias/get_trivia/?id={test_trivia.id}"
+        before = len(api_client.get(url).json()["questions"])
+
+        QuestionFactory(trivia=test_trivia)
+
+        assert len(api_client.get(url).json()["questions"]) == before + 1
+
+    def test_theme_list_reflects_new_theme(self, api_client, test_theme):
+        """Test cached theme listing is dropped when a theme is created"""
+        before = len(api_client.get("/api/themes/").json())
+
+        ThemeFactory(name="Brand new theme")
+
+        names = [theme["name"] for theme in api_client.get("/api/themes/").json()]
+        assert len(names) == before + 1
+        assert "Brand new theme" in names
+
+    def test_save_while_cache_down(self, test_trivia):
+        """Test tag invalidation errors do not fail model saves"""
+        down = ConnectionInterrupted(connection=None)
+
+        with mock.patch("api.utils.cache_utils.cache.incr", side_effect=down):
+            test_trivia.title = "Saved without cache"
+            test_trivia.save()
+
+        test_trivia.refresh_from_db()
+        assert test_trivia.title == "Saved without cache"
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOnCommitOnce:
+    """Test cases for callbacks deduplicated per transaction"""
+
+    def test_runs_once_per_transaction(self):
+        """Test repeated ids run once, and again in the next transaction"""
+        calls = []
+
+        for _ in range(2):
+            with transaction.atomic():
+                for value in range(3):
+                    on_commit_once("tests:once", calls.append, value)
+                on_commit_once("tests:other", calls.append, "other")
+
+        assert calls == [0, "other", 0, "other"]
+
+    def test_rolled_back_savepoint_reschedules(self):
+        """Test an id dropped by a savepoint rollback can be scheduled again"""
+        calls = []
+
+        with transaction.atomic():
+            on_commit_once("tests:kept", calls.append, "kept")
+            try:
+                with transaction.atomic():
+                    on_commit_once("tests:once", calls.append, "dropped")
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            on_commit_once("tests:once", calls.append, "rescheduled")
+            on_commit_once("tests:kept", calls.append, "duplicate")
+
+        assert calls == ["kept", "rescheduled"]
+
+    def test_runs_immediately_outside_transaction(self):
+        """Test callbacks run right away in autocommit mode"""
+        calls = []
+
+        on_commit_once("tests:once", calls.append, 1)
+        on_commit_once("tests:once", calls.append, 2)
+
+        assert calls == [1, 2]
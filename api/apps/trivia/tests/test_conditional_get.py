@@ -0,0 +1,93 @@
+"""
+Conditional GET Test Module
+
+This module contains test cases for:
+- ETags on trivia details, retrieval and theme listings
+- 304 responses that skip the database
+- New ETags after trivia, question and theme changes
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .factories import PrivateTriviaFactory, QuestionFactory, ThemeFactory
+from .test_trivia_base import TestTriviaBase
+
+
+@pytest.mark.django_db
+class TestConditionalGet(TestTriviaBase):
+    """Test cases for tag based ETag validation"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_trivia):
+        """Set up test environment"""
+        self.trivia = test_trivia
+        self.urls = [
+            f"/api/trivias/get_trivia/?id={test_trivia.id}",
+            f"/api/trivias/{test_trivia.id}/",
+            "/api/themes/",
+        ]
+
+    def test_responses_carry_etag(self, api_client):
+        """Test successful responses include a strong ETag"""
+        for url in self.urls:
+            response = api_client.get(url)
+            assert response.status_code == 200
+            assert response["ETag"].startswith('"')
+
+    def test_if_none_match_returns_not_modified(self, api_client):
+        """Test a matching validator returns 304 without touching trivia tables"""
+        for url in self.urls:
+            etag = api_client.get(url)["ETag"]
+
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+            assert response.status_code == 304
+            assert response["ETag"] == etag
+            assert response.content == b""
+            assert not [
+                query for query in context.captured_queries if "trivia_" in query["sql"]
+            ]
+
+    def test_question_change_renews_etag(self, api_client):
+        """Test adding a question invalidates the trivia validators"""
+        url = f"/api/trivias/{self.trivia.id}/"
+        etag = api_client.get(url)["ETag"]
+
+        QuestionFactory(trivia=self.trivia)
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_theme_change_renews_etag(self, api_client):
+        """Test creating a theme invalidates the theme listing validator"""
+        etag = api_client.get("/api/themes/")["ETag"]
+
+        ThemeFactory(name="Conditional theme")
+
+        response = api_client.get("/api/themes/", HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert "Conditional theme" in [theme["name"] for theme in response.json()]
+
+    def test_error_responses_have_no_etag(self, api_client, test_user):
+        """Test hidden or missing trivias are not given a validator"""
+        private = PrivateTriviaFactory(created_by=test_user)
+
+        response = api_client.get(f"/api/trivias/{private.id}/")
+
+        assert response.status_code == 404
+        assert not response.has_header("ETag")
+
+    def test_retrieve_etag_is_per_user(self, api_client, test_user):
+        """Test a validator obtained by one user does not validate for another"""
+        url = f"/api/trivias/{self.trivia.id}/"
+        anonymous_etag = api_client.get(url)["ETag"]
+
+        api_client.force_authenticate(user=test_user)
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=anonymous_etag)
+
+        assert response.status_code == 200
+        assert response["ETag"] != anonymous_etag
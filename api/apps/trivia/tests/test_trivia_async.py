@@ -0,0 +1,151 @@
+"""
+Trivia Async Views Test Module
+
+This module contains test cases for:
+- Async questions, catalog filter and theme views served under ASGI
+- Responses identical to the sync DRF views
+- Async rate limiting
+- ASGI routing and async capable middleware
+"""
+
+import uuid
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import AsyncClient
+from django.urls import reverse
+
+from api.apps.monitoring.models import RequestLog
+from api.apps.trivia.bundles import bundle_key
+from api.utils.asgi_utils import AsyncRoutesASGIHandler
+from api.utils.cache_utils import invalidate_tags
+from api.utils.redis_utils import get_redis
+
+from .factories import ThemeFactory, TriviaFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.urls("api.asgi_urls")
+class TestAsyncViews:
+    """Test cases for the async read hot path"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.theme = test_theme
+        self.trivia = TriviaFactory.create_with_questions(
+            theme=test_theme, created_by=test_user, difficulty=2
+        )
+        get_redis().delete(bundle_key(self.trivia.id))
+        self.client = AsyncClient()
+
+    def get(self, url, data=None, **headers):
+        return async_to_sync(self.client.get)(url, data, headers=headers)
+
+    def test_questions_match_sync_view(self, api_client):
+        """Test the async view returns the sync body and ETag"""
+        url = reverse("get-questions", args=[self.trivia.id])
+
+        response = self.get(url)
+        expected = api_client.get(url)
+
+        assert response.status_code == 200
+        assert response.content == expected.content
+        assert response["ETag"] == expected["ETag"]
+        assert self.get(url, If_None_Match=response["ETag"]).status_code == 304
+
+    def test_questions_errors(self):
+        """Test invalid and unknown ids are rejected like the sync view"""
+        assert self.get("/api/questions/not-a-uuid/").status_code == 400
+        response = self.get(f"/api/questions/{uuid.uuid4()}/")
+        assert response.status_code == 404
+        assert response.json() == {"error": "Trivia not found"}
+
+    def test_batch_route_kept(self):
+        """Test the batch questions route is not taken for a trivia id"""
+        response = async_to_sync(self.client.post)(
+            "/api/questions/batch/",
+            {"ids": [str(self.trivia.id)]},
+            content_type="application/json",
+        )
+
+        assert response.status_code == 200
+        assert str(self.trivia.id) in response.json()["questions"]
+
+    def test_filter_matches_sync_view(self, api_client):
+        """Test the async catalog filter returns the sync body"""
+        url = reverse("trivia-filter-trivias")
+        params = {"theme": str(self.theme.id), "difficulty": 2}
+
+        response = self.get(url, params)
+
+        assert response.status_code == 200
+        assert response.content == api_client.get(url, params).content
+        assert response.json()[0]["id"] == str(self.trivia.id)
+        assert self.get(url, {"theme": self.theme.id}).status_code == 400
+        assert self.get(url, {**params, "difficulty": "x"}).status_code == 400
+        missing = {"theme": str(uuid.uuid4()), "difficulty": 2}
+        assert self.get(url, missing).status_code == 404
+
+    def test_themes_cached_until_invalidated(self, api_client):
+        """Test themes are served from the cached body and ETag validated"""
+        url = reverse("theme-list")
+
+        response = self.get(url)
+        assert response.content == api_client.get(url).content
+        assert response["ETag"] == api_client.get(url)["ETag"]
+        assert self.get(url, If_None_Match=response["ETag"]).status_code == 304
+
+        ThemeFactory(name="Async astronomy")
+        invalidate_tags("themes")
+
+        names = [theme["name"] for theme in self.get(url).json()]
+        assert "Async astronomy" in names
+
+    def test_rate_limited(self, settings):
+        """Test anonymous callers are limited to the anon rate"""
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"anon": "2/hour", "user": "2/hour"},
+        }
+        url = reverse("get-questions", args=[self.trivia.id])
+
+        statuses = [self.get(url).status_code for _ in range(3)]
+
+        assert statuses == [200, 200, 429]
+        assert "Rate limit exceeded" in self.get(url).json()["message"]
+
+    def test_invalid_token_rejected(self):
+        """Test a bad bearer token is refused as by JWT authentication"""
+        url = reverse("get-questions", args=[self.trivia.id])
+
+        response = self.get(url, Authorization="Bearer not-a-token")
+
+        assert response.status_code == 401
+
+    def test_requests_logged_from_async_path(self):
+        """Test the monitoring middleware logs async requests"""
+        self.get("/api/themes/")
+
+        assert RequestLog.objects.filter(path="/api/themes/").exists()
+
+
+@pytest.mark.django_db
+class TestAsgiRouting:
+    """Test cases for the ASGI handler"""
+
+    def test_requests_use_asgi_urlconf(self):
+        """Test the ASGI handler resolves with ASGI_URLCONF"""
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/themes/",
+            "query_string": b"",
+            "headers": [],
+        }
+
+        request, error = AsyncRoutesASGIHandler().create_request(scope, None)
+
+        assert error is None
+        assert request.urlconf == settings.ASGI_URLCONF
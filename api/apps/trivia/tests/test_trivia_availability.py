@@ -0,0 +1,152 @@
+"""
+Trivia Availability Test Module
+
+This module contains test cases for:
+- Theme × difficulty availability matrix endpoint
+- Incremental matrix maintenance on trivia save and delete
+- Pools updated one id at a time, untouched by in-cell edits
+- Matrix rebuild after a miss and through the rebuild command
+"""
+
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from api.apps.trivia.availability import (
+    availability_key,
+    get_availability,
+    load_pool,
+    pool_key,
+)
+from api.utils.redis_utils import get_redis
+
+from .factories import PrivateTriviaFactory, ThemeFactory, TriviaFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTriviaAvailability:
+    """
+    Test cases for the availability matrix.
+    Runs with real commits so cell refreshes fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user):
+        """Set up test environment"""
+        self.user = test_user
+        self.url = reverse("trivia-availability")
+        self.history = ThemeFactory(name="Availability history")
+        self.science = ThemeFactory(name="Availability science")
+        get_redis().delete(availability_key())
+
+    def create_trivia(self, theme, difficulty, factory=TriviaFactory):
+        return factory(theme=theme, difficulty=difficulty, created_by=self.user)
+
+    def test_matrix_lists_non_empty_public_cells(self, api_client):
+        """Test only themes and difficulties with public trivias are listed"""
+        self.create_trivia(self.history, 1)
+        self.create_trivia(self.history, 1)
+        self.create_trivia(self.history, 3)
+        self.create_trivia(self.science, 2, factory=PrivateTriviaFactory)
+        ThemeFactory(name="Availability empty")
+
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {
+                "id": str(self.history.id),
+                "name": "Availability history",
+                "difficulties": {"1": 2, "3": 1},
+            }
+        ]
+
+    def test_cells_follow_trivia_changes(self):
+        """Test saves and deletes update only the affected cells"""
+        trivia = self.create_trivia(self.history, 1)
+        assert get_availability() == {str(self.history.id): {1: 1}}
+
+        # Built matrix is now updated cell by cell
+        self.create_trivia(self.science, 2)
+        trivia.difficulty = 3
+        trivia.save()
+        assert get_availability() == {
+            str(self.history.id): {3: 1},
+            str(self.science.id): {2: 1},
+        }
+
+        trivia.is_public = False
+        trivia.save()
+        assert get_availability() == {str(self.science.id): {2: 1}}
+
+        trivia.delete()
+        assert get_availability() == {str(self.science.id): {2: 1}}
+
+    def test_theme_move_updates_both_cells(self):
+        """Test moving a trivia to another theme recounts both themes"""
+        trivia = self.create_trivia(self.history, 2)
+        get_availability()
+
+        trivia.theme = self.science
+        trivia.save()
+
+        assert get_availability() == {str(self.science.id): {2: 1}}
+
+    def test_in_cell_edit_skips_refresh(self):
+        """Test saves that keep the trivia in its cell do not touch Redis"""
+        trivia = self.create_trivia(self.history, 1)
+
+        with mock.patch("api.apps.trivia.availability.move_trivia") as move:
+            trivia.title = "Renamed"
+            trivia.save()
+
+        move.assert_not_called()
+
+    def test_pools_updated_by_id(self):
+        """Test moves add and remove single ids of stored pools only"""
+        first = self.create_trivia(self.history, 1)
+        load_pool(str(self.history.id), 1)
+        client = get_redis()
+        client.delete(pool_key(self.history.id, 2))
+
+        second = self.create_trivia(self.history, 1)
+        assert client.smembers(pool_key(self.history.id, 1)) == {
+            str(first.id).encode(),
+            str(second.id).encode(),
+        }
+
+        first.difficulty = 2
+        first.save()
+        assert client.smembers(pool_key(self.history.id, 1)) == {
+            str(second.id).encode()
+        }
+        # A missing pool is left to be built in full on first use
+        assert not client.exists(pool_key(self.history.id, 2))
+        assert get_availability()[str(self.history.id)] == {1: 1, 2: 1}
+
+    def test_not_modified_until_matrix_changes(self, api_client):
+        """Test the matrix ETag only changes when a cell changes"""
+        self.create_trivia(self.history, 1)
+        etag = api_client.get(self.url)["ETag"]
+
+        assert api_client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        self.create_trivia(self.history, 2)
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()[0]["difficulties"] == {"1": 1, "2": 1}
+
+    def test_rebuild_command_restores_matrix(self):
+        """Test the rebuild command recreates a dropped matrix"""
+        self.create_trivia(self.history, 1)
+        self.create_trivia(self.science, 2)
+        get_redis().delete(availability_key())
+
+        out = StringIO()
+        call_command("rebuild_trivia_indexes", "--only", "availability", stdout=out)
+
+        assert "Rebuilt availability index: 2 items" in out.getvalue()
+        assert get_redis().hlen(availability_key()) == 3
@@ -0,0 +1,271 @@
+"""
+Trivia Bundle Test Module
+
+This module contains test cases for:
+- Trivia bundle loading (trivia + questions + answers)
+- Query count stability of nested question endpoints
+- Redis bundle store (ETag, 304, refresh on change, stale writes dropped)
+- Batch questions endpoint for several trivias
+"""
+
+import uuid
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia.bundles import (
+    bundle_generations,
+    bundle_key,
+    get_bundle,
+    load_trivia_bundle,
+    render_bundle,
+    store_bundle,
+)
+from api.apps.trivia.views import QUESTIONS_BATCH_MAX
+from api.utils.redis_utils import get_redis
+
+from .factories import AnswerFactory, QuestionFactory, TriviaFactory
+from .test_trivia_base import TestTriviaBase
+
+
+@pytest.mark.django_db
+class TestTriviaBundles(TestTriviaBase):
+    """Test cases for the shared trivia bundle loader"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+
+    def create_trivia(self, question_count, answers_per_question=3):
+        """Create a trivia with the given number of questions"""
+        return TriviaFactory.create_with_specific_questions(
+            question_count,
+            answers_per_question=answers_per_question,
+            theme=self.theme,
+            created_by=self.user,
+        )
+
+    @staticmethod
+    def count_queries(func):
+        """Run func and return the number of executed queries"""
+        with CaptureQueriesContext(connection) as context:
+            func()
+        return len(context.captured_queries)
+
+    def test_load_bundle_fixed_query_count(self):
+        """Test bundle loading runs trivia, questions and answers queries only"""
+        trivia = self.create_trivia(5)
+
+        def load():
+            bundle = load_trivia_bundle(trivia.id)
+            for question in bundle.questions.all():
+                list(question.answers.all())
+            return bundle.theme.name
+
+        assert self.count_queries(load) == 3
+
+    def test_load_bundle_keeps_order(self):
+        """Test questions and answers come back in creation order"""
+        trivia = self.create_trivia(3)
+
+        bundle = load_trivia_bundle(trivia.id)
+
+        question_ids = [question.id for question in bundle.questions.all()]
+        assert question_ids == sorted(question_ids)
+        for question in bundle.questions.all():
+            answer_ids = [answer.id for answer in question.answers.all()]
+            assert answer_ids == sorted(answer_ids)
+
+    @pytest.mark.parametrize(
+        "url_name",
+        ["get-questions", "trivia-questions", "trivia-detail"],
+    )
+    def test_query_count_independent_of_size(self, api_client, url_name):
+        """Test nested question endpoints cost the same for 3 or 5 questions"""
+        small = self.create_trivia(3, answers_per_question=2)
+        large = self.create_trivia(5, answers_per_question=5)
+
+        counts = []
+        for trivia in (small, large):
+            url = reverse(url_name, args=[trivia.id])
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.get(url)
+            assert response.status_code == 200
+            counts.append(len(context.captured_queries))
+
+        assert counts[0] == counts[1]
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTriviaBundleStore:
+    """
+    Test cases for the pre-rendered bundle store behind GetQuestions.
+    Runs with real commits so bundle refreshes fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.trivia = TriviaFactory.create_with_specific_questions(
+            3, theme=test_theme, created_by=test_user
+        )
+        self.url = reverse("get-questions", args=[self.trivia.id])
+
+    def test_questions_served_with_etag(self, api_client):
+        """Test questions response carries a strong ETag"""
+        response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert response["Content-Type"] == "application/json"
+        assert response["ETag"].startswith('"')
+        assert len(response.json()) == 3
+        assert get_bundle(self.trivia.id).etag == response["ETag"]
+
+    def test_if_none_match_returns_not_modified(self, api_client):
+        """Test a matching validator returns 304 without a body"""
+        etag = api_client.get(self.url)["ETag"]
+
+        response = api_client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+        assert response.content == b""
+
+    def test_stored_bundle_skips_database(self, api_client):
+        """Test a stored bundle is served without querying trivia tables"""
+        api_client.get(self.url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(self.url)
+
+        assert response.status_code == 200
+        assert not [
+            query for query in context.captured_queries if "trivia_" in query["sql"]
+        ]
+
+    def test_edit_refreshes_bundle(self, api_client):
+        """Test saving a question re-renders the bundle on commit"""
+        old_etag = api_client.get(self.url)["ETag"]
+        question = self.trivia.questions.first()
+
+        with transaction.atomic():
+            question.question_title = "Edited question"
+            question.save()
+            AnswerFactory(question=question, trivia=self.trivia)
+
+        bundle = get_bundle(self.trivia.id)
+        assert bundle is not None
+        assert bundle.etag != old_etag
+
+        response = api_client.get(self.url)
+        titles = [item["question_title"] for item in response.json()]
+        assert "Edited question" in titles
+
+    def test_stale_render_not_stored_after_refresh(self, api_client):
+        """Test a bundle rendered before a change cannot replace the refresh"""
+        get_redis().delete(bundle_key(self.trivia.id))
+        (generation,) = bundle_generations([str(self.trivia.id)])
+        stale = render_bundle(load_trivia_bundle(self.trivia.id))
+
+        question = self.trivia.questions.first()
+        question.question_title = "Edited question"
+        question.save()
+        refreshed = get_bundle(self.trivia.id)
+        store_bundle(self.trivia.id, stale, generation)
+
+        assert get_bundle(self.trivia.id).etag == refreshed.etag != stale.etag
+        titles = [item["question_title"] for item in api_client.get(self.url).json()]
+        assert "Edited question" in titles
+
+    def test_refresh_runs_once_per_transaction(self):
+        """Test nested changes render the bundle a single time"""
+        with mock.patch("api.apps.trivia.bundles.refresh_bundle") as refresh:
+            with transaction.atomic():
+                question = QuestionFactory(trivia=self.trivia)
+                AnswerFactory.create_batch(3, question=question, trivia=self.trivia)
+
+        refresh.assert_called_once_with(str(self.trivia.id))
+
+    def test_deleted_trivia_not_found(self, api_client):
+        """Test deleting a trivia stops serving its bundle"""
+        api_client.get(self.url)
+
+        self.trivia.delete()
+
+        response = api_client.get(self.url)
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQuestionsBatch:
+    """Test cases for the batch questions endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.trivias = [
+            TriviaFactory.create_with_specific_questions(
+                count, theme=test_theme, created_by=test_user
+            )
+            for count in (1, 2, 3, 4)
+        ]
+        self.ids = [str(trivia.id) for trivia in self.trivias]
+        self.url = reverse("get-questions-batch")
+        get_redis().delete(*[bundle_key(trivia_id) for trivia_id in self.ids])
+
+    def post(self, api_client, ids):
+        return api_client.post(self.url, {"ids": ids}, format="json")
+
+    @staticmethod
+    def trivia_queries(context):
+        return [
+            query for query in context.captured_queries if "trivia_" in query["sql"]
+        ]
+
+    def test_returns_questions_by_trivia(self, api_client):
+        """Test every requested trivia comes back with its questions"""
+        missing = str(uuid.uuid4())
+
+        response = self.post(api_client, self.ids + [missing, self.ids[0]])
+
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data["questions"]) == self.ids
+        assert [len(data["questions"][i]) for i in self.ids] == [1, 2, 3, 4]
+        assert data["missing"] == [missing]
+
+    def test_cold_batch_has_constant_query_count(self, api_client):
+        """Test building misses costs the same for two or four trivias"""
+        with CaptureQueriesContext(connection) as context:
+            self.post(api_client, self.ids[:2])
+        small = len(self.trivia_queries(context))
+
+        with CaptureQueriesContext(connection) as context:
+            self.post(api_client, self.ids[2:] + [str(uuid.uuid4())])
+        large = len(self.trivia_queries(context))
+
+        assert small == large == 3
+
+    def test_stored_bundles_skip_database(self, api_client):
+        """Test a fully stored batch is served from Redis only"""
+        self.post(api_client, self.ids)
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.post(api_client, self.ids)
+
+        assert response.status_code == 200
+        assert not self.trivia_queries(context)
+        assert get_bundle(self.ids[3]) is not None
+
+    def test_invalid_requests_rejected(self, api_client):
+        """Test malformed, empty and oversized id lists"""
+        assert self.post(api_client, ["nope"]).status_code == 400
+        assert self.post(api_client, []).status_code == 400
+        assert api_client.post(self.url, {}, format="json").status_code == 400
+        too_many = [str(uuid.uuid4()) for _ in range(QUESTIONS_BATCH_MAX + 1)]
+        assert self.post(api_client, too_many).status_code == 400
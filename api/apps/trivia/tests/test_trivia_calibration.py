@@ -0,0 +1,155 @@
+"""
+Trivia Difficulty Calibration Test Module
+
+This module contains test cases for:
+- Bayesian difficulty scores and level buckets
+- Incremental calibration of changed statistics
+- Catalog ordering by measured difficulty
+- Quick play by measured level
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from api.apps.trivia.calibration import (
+    CALIBRATION_MIN_ATTEMPTS,
+    calibrate_difficulty,
+    difficulty_score,
+    measured_level,
+)
+from api.apps.trivia.models import QuestionStats, Trivia
+from api.apps.trivia.stats import apply_answer_counts
+
+from .factories import TriviaFactory
+
+
+@pytest.mark.django_db
+class TestDifficultyScore:
+    """Test cases for the scoring functions"""
+
+    def test_few_responses_stay_near_prior(self):
+        """Test a question missed twice is not rated impossible"""
+        assert difficulty_score(0, 2, prior=0.6, weight=20) < 0.5
+        assert difficulty_score(0, 2000, prior=0.6, weight=20) > 0.95
+        assert difficulty_score(0, 0, prior=0.6, weight=20) == 0.4
+
+    def test_levels(self):
+        """Test scores are bucketed into the three difficulty levels"""
+        assert [measured_level(score) for score in (0.1, 0.5, 0.9)] == [1, 2, 3]
+
+
+@pytest.mark.django_db
+class TestCalibration:
+    """Test cases for the calibration job"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.theme = test_theme
+        self.easy = TriviaFactory.create_with_specific_questions(
+            3, theme=test_theme, created_by=test_user, difficulty=3
+        )
+        self.hard = TriviaFactory.create_with_specific_questions(
+            3, theme=test_theme, created_by=test_user, difficulty=3
+        )
+        self.unplayed = TriviaFactory(
+            theme=test_theme, created_by=test_user, difficulty=3
+        )
+
+    def record(self, trivia, attempts, corrects):
+        """Store the same statistics for every question of a trivia"""
+        QuestionStats.objects.bulk_create(
+            [
+                QuestionStats(question=question, attempts=attempts, corrects=corrects)
+                for question in trivia.questions.all()
+            ]
+        )
+
+    def test_scores_written_back(self):
+        """Test questions and trivias get scores and levels"""
+        self.record(self.easy, attempts=40, corrects=38)
+        self.record(self.hard, attempts=40, corrects=4)
+
+        assert calibrate_difficulty() == (6, 2)
+
+        easy, hard = (
+            Trivia.objects.get(id=self.easy.id),
+            Trivia.objects.get(id=self.hard.id),
+        )
+        assert easy.measured_difficulty < 0.35 < 0.65 < hard.measured_difficulty
+        assert (easy.measured_level, hard.measured_level) == (1, 3)
+        assert Trivia.objects.get(id=self.unplayed.id).measured_level is None
+        assert not QuestionStats.objects.filter(difficulty_score__isnull=True).exists()
+
+    def test_level_needs_enough_responses(self):
+        """Test trivias with few responses are scored but not levelled"""
+        self.record(self.hard, attempts=CALIBRATION_MIN_ATTEMPTS // 3 - 1, corrects=0)
+
+        calibrate_difficulty()
+
+        hard = Trivia.objects.get(id=self.hard.id)
+        assert hard.measured_difficulty is not None
+        assert hard.measured_level is None
+
+    def test_runs_are_incremental(self):
+        """Test only statistics changed since the last run are recalibrated"""
+        self.record(self.easy, attempts=40, corrects=38)
+        self.record(self.hard, attempts=40, corrects=4)
+        calibrate_difficulty()
+
+        assert calibrate_difficulty() == (0, 0)
+
+        question = self.hard.questions.first()
+        apply_answer_counts({question.id: 10}, {})
+        assert calibrate_difficulty() == (1, 1)
+        assert calibrate_difficulty(full=True) == (6, 2)
+
+    def test_command(self):
+        """Test the command reports what was calibrated"""
+        self.record(self.easy, attempts=40, corrects=38)
+        out = StringIO()
+
+        call_command("calibrate_difficulty", "--batch-size", "2", stdout=out)
+
+        assert "Calibrated 3 questions and 1 trivias" in out.getvalue()
+
+    def test_catalog_ordered_by_measured_difficulty(self, api_client):
+        """Test the filter endpoint sorts easiest first, unmeasured last"""
+        self.record(self.easy, attempts=40, corrects=38)
+        self.record(self.hard, attempts=40, corrects=4)
+        calibrate_difficulty()
+        url = reverse("trivia-filter-trivias")
+        params = {"theme": self.theme.id, "difficulty": 3}
+
+        response = api_client.get(url, {**params, "order": "measured"})
+
+        assert response.status_code == 200
+        assert [trivia["id"] for trivia in response.json()] == [
+            str(self.easy.id),
+            str(self.hard.id),
+            str(self.unplayed.id),
+        ]
+        assert response.json()[2]["measured_difficulty"] is None
+        assert "measured_difficulty" not in api_client.get(url, params).json()[0]
+        assert api_client.get(url, {**params, "order": "x"}).status_code == 400
+
+    def test_quick_play_by_measured_level(self, api_client):
+        """Test quick play draws from the measured level"""
+        self.record(self.easy, attempts=40, corrects=38)
+        self.record(self.hard, attempts=40, corrects=4)
+        calibrate_difficulty()
+        url = reverse("trivia-random")
+
+        for _ in range(5):
+            response = api_client.get(url, {"difficulty": 1, "measured": 1})
+            assert response.status_code == 200
+            assert response.json()["id"] == str(self.easy.id)
+            assert response.json()["measured_difficulty"] < 0.35
+
+        response = api_client.get(
+            url, {"difficulty": 3, "measured": 1, "exclude": str(self.hard.id)}
+        )
+        assert response.status_code == 404
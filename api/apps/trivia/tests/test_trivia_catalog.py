@@ -0,0 +1,102 @@
+"""
+Trivia Catalog Test Module
+
+This module contains test cases for:
+- Theme and difficulty filtering in a single query
+- Missing themes and empty results
+- Benchmark command execution
+"""
+
+import uuid
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia.models import Trivia
+
+from .factories import PrivateTriviaFactory, ThemeFactory, TriviaFactory
+from .test_trivia_base import TestTriviaBase
+
+
+@pytest.mark.django_db
+class TestTriviaCatalog(TestTriviaBase):
+    """Test cases for TriviaViewSet.filter_trivias"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+        self.url = reverse("trivia-filter-trivias")
+
+    def test_filter_returns_matching_public_trivias(self, api_client):
+        """Test only public trivias of the theme and difficulty are listed"""
+        match = TriviaFactory(
+            title="Match", theme=self.theme, difficulty=2, created_by=self.user
+        )
+        TriviaFactory(theme=self.theme, difficulty=1, created_by=self.user)
+        other_theme = ThemeFactory(name="Other catalog theme")
+        TriviaFactory(theme=other_theme, difficulty=2, created_by=self.user)
+        PrivateTriviaFactory(theme=self.theme, difficulty=2, created_by=self.user)
+
+        response = api_client.get(self.url, {"theme": self.theme.id, "difficulty": 2})
+
+        assert response.status_code == 200
+        assert response.data == [{"id": str(match.id), "title": "Match"}]
+
+    def test_filter_runs_single_query(self, api_client):
+        """Test the theme check and the listing share one query"""
+        TriviaFactory.create_batch(
+            3, theme=self.theme, difficulty=1, created_by=self.user
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.get(
+                self.url, {"theme": self.theme.id, "difficulty": 1}
+            )
+
+        # The request log middleware writes its own row
+        catalog_queries = [
+            query
+            for query in context.captured_queries
+            if "monitoring_requestlog" not in query["sql"]
+        ]
+        assert len(response.data) == 3
+        assert len(catalog_queries) == 1
+
+    def test_filter_theme_without_matches(self, api_client):
+        """Test an existing theme without matches returns an empty list"""
+        response = api_client.get(self.url, {"theme": self.theme.id, "difficulty": 3})
+
+        assert response.status_code == 200
+        assert response.data == []
+
+    def test_filter_missing_theme(self, api_client):
+        """Test an unknown theme still returns 404"""
+        response = api_client.get(self.url, {"theme": uuid.uuid4(), "difficulty": 1})
+
+        assert response.status_code == 404
+        assert response.data["error"] == "Theme not found"
+
+    def test_benchmark_command_reports_filter(self):
+        """Test the benchmark command explains and measures the filter"""
+        out = StringIO()
+        call_command(
+            "benchmark_trivias",
+            "--scenario",
+            "filter",
+            "--sizes",
+            "40",
+            "--repeat",
+            "2",
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        assert "EXPLAIN folded filter query" in output
+        assert "folded query" in output
+        assert not Trivia.objects.filter(title__startswith="Benchmark trivia")
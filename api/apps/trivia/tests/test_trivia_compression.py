@@ -0,0 +1,140 @@
+"""
+Response Compression Test Module
+
+This module contains test cases for:
+- Accept-Encoding negotiation
+- Compression above the size threshold only
+- Compressed variants stored with trivia bundles
+- Conditional GET with the weak ETag of compressed responses
+- Compression in the async request path
+"""
+
+import gzip
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, RequestFactory
+from django.urls import reverse
+
+from api.apps.trivia.bundles import bundle_key, compressed_field, get_bundle
+from api.utils import compression
+from api.utils.compression import ENCODINGS, accepted_encoding
+from api.utils.redis_utils import get_redis
+
+from .factories import TriviaFactory
+
+
+@pytest.mark.django_db
+class TestEncodingNegotiation:
+    """Test cases for accepted_encoding"""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("", None),
+            ("gzip, deflate", "gzip"),
+            ("deflate", None),
+            ("gzip;q=0", None),
+            ("*", ENCODINGS[0]),
+            ("*, gzip;q=0", "br" if "br" in ENCODINGS else None),
+        ],
+    )
+    def test_accepted_encoding(self, header, expected):
+        """Test the best supported encoding the client accepts is chosen"""
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=header)
+
+        assert accepted_encoding(request) == expected
+
+
+@pytest.mark.django_db(transaction=True)
+class TestResponseCompression:
+    """
+    Test cases for CompressionMiddleware.
+    Runs with real commits so bundles are stored as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, settings, test_user, test_theme):
+        """Set up test environment"""
+        settings.COMPRESSION_MIN_SIZE = 200
+        self.trivia = TriviaFactory.create_with_specific_questions(
+            5, theme=test_theme, created_by=test_user
+        )
+        self.url = reverse("get-questions", args=[self.trivia.id])
+
+    def test_bundle_served_compressed(self, api_client):
+        """Test a large payload is gzipped with a weak ETag"""
+        plain = api_client.get(self.url)
+
+        response = api_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert response.status_code == 200
+        assert response["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response["Vary"]
+        assert gzip.decompress(response.content) == plain.content
+        assert response["ETag"] == f"W/{plain['ETag']}"
+        assert int(response["Content-Length"]) < len(plain.content)
+
+    def test_stored_variant_not_recompressed(self, api_client):
+        """Test the bundle store's compressed bytes are served as is"""
+        api_client.get(self.url)
+        key = bundle_key(self.trivia.id)
+        assert get_redis().hexists(key, compressed_field("gzip"))
+
+        with mock.patch.object(compression, "compress") as compress:
+            response = api_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        compress.assert_not_called()
+        stored = get_bundle(self.trivia.id, "gzip").compressed["gzip"]
+        assert response.content == stored
+
+    def test_weak_etag_validates(self, api_client):
+        """Test the weak ETag of a compressed response gets a 304"""
+        etag = api_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        response = api_client.get(
+            self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == 304
+
+    def test_small_payload_sent_plain(self, api_client, settings):
+        """Test payloads under the threshold are not compressed"""
+        settings.COMPRESSION_MIN_SIZE = 1_000_000
+
+        response = api_client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+
+        assert not response.has_header("Content-Encoding")
+        assert response["ETag"].startswith('"')
+
+    def test_not_accepted_sent_plain(self, api_client):
+        """Test clients without an accepted encoding get plain bodies"""
+        response = api_client.get(self.url)
+
+        assert not response.has_header("Content-Encoding")
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_composed_response_compressed(self, api_client):
+        """Test responses built per request are compressed on the fly"""
+        response = api_client.post(
+            reverse("get-questions-batch"),
+            {"ids": [str(self.trivia.id)]},
+            format="json",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+
+        assert response["Content-Encoding"] == "gzip"
+        assert str(self.trivia.id).encode() in gzip.decompress(response.content)
+
+    @pytest.mark.urls("api.asgi_urls")
+    def test_async_path_compressed(self):
+        """Test the async questions view is compressed the same way"""
+        client = AsyncClient()
+
+        response = async_to_sync(client.get)(
+            self.url, headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response["Content-Encoding"] == "gzip"
+        assert response.content == get_bundle(self.trivia.id, "gzip").compressed["gzip"]
@@ -0,0 +1,205 @@
+"""
+Trivia Duplicates Test Module
+
+This module contains test cases for:
+- Shingle similarity and MinHash bucket collisions
+- Question buckets refreshed on commit
+- Near-duplicates reported and exact repeats rejected in trivia validation
+- Duplicate cluster report command
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia.duplicates import (
+    find_near_duplicates,
+    question_buckets,
+    similarity,
+)
+from api.apps.trivia.models import QuestionBucket
+
+from .factories import QuestionFactory, TriviaFactory
+
+ORIGINAL = "What is the capital of France?"
+REWORDED = "What is the capital city of France ?"
+
+
+@pytest.mark.django_db
+class TestQuestionSimilarity:
+    """Test cases for the fingerprinting functions"""
+
+    def test_rewording_is_similar(self):
+        """Test small wording changes keep a high similarity"""
+        assert similarity(ORIGINAL, REWORDED) >= 0.7
+        assert similarity(ORIGINAL, "Qué es la capital de Francia?") < 0.7
+
+    def test_different_numbers_never_match(self):
+        """Test questions differing in a number are distinct"""
+        assert (
+            similarity("Who won the 1998 World Cup?", "Who won the 2002 World Cup?")
+            == 0
+        )
+
+    def test_similar_questions_share_buckets(self):
+        """Test near-duplicates land in a common LSH bucket"""
+        assert set(question_buckets(ORIGINAL)) & set(question_buckets(REWORDED))
+        assert question_buckets(ORIGINAL) == question_buckets(ORIGINAL.upper())
+        assert question_buckets("   ") == []
+
+
+@pytest.mark.django_db(transaction=True)
+class TestDuplicateIndex:
+    """
+    Test cases for the question bucket index.
+    Runs with real commits so bucket refreshes fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+
+    def payload(self, *titles):
+        """Trivia creation data with the given question titles"""
+        return {
+            "title": "Duplicate check",
+            "difficulty": 1,
+            "theme": self.theme.id,
+            "username": self.user.username,
+            "questions": [
+                {
+                    "question_title": title,
+                    "answers": [
+                        {"answer_title": "Yes", "is_correct": True},
+                        {"answer_title": "No", "is_correct": False},
+                    ],
+                }
+                for title in titles
+            ],
+        }
+
+    def create_trivia(self, *titles, **kwargs):
+        trivia = TriviaFactory(theme=self.theme, created_by=self.user, **kwargs)
+        for title in titles:
+            QuestionFactory(trivia=trivia, question_title=title)
+        return trivia
+
+    def test_buckets_follow_question_changes(self):
+        """Test questions are indexed on commit and reindexed on edit"""
+        trivia = self.create_trivia(ORIGINAL)
+        question = trivia.questions.get()
+        assert find_near_duplicates([REWORDED])[0].question_id == question.id
+
+        question.question_title = "Which river crosses Paris?"
+        question.save()
+
+        assert find_near_duplicates([REWORDED]) == {}
+        assert 0 in find_near_duplicates(["Which river crosses Paris ?"])
+
+    def test_lookup_is_one_query(self):
+        """Test candidates for a whole trivia come from a single query"""
+        for n in range(5):
+            self.create_trivia(f"Question {n} about the weather", f"Fact {n}")
+
+        with CaptureQueriesContext(connection) as context:
+            matches = find_near_duplicates([ORIGINAL, "Question 3 about the weather?"])
+
+        assert len(context.captured_queries) == 1
+        assert list(matches) == [1]
+
+    def test_own_trivia_excluded(self):
+        """Test updates do not match the questions being updated"""
+        trivia = self.create_trivia(ORIGINAL)
+
+        assert find_near_duplicates([ORIGINAL], exclude_trivia=trivia.id) == {}
+
+    def test_validation_reports_near_duplicates(self, api_client_authenticated):
+        """Test a trivia similar to a stored question is created and reported"""
+        self.create_trivia(ORIGINAL, title="Geography basics")
+        data = self.payload(REWORDED, "Who wrote Hamlet?", "How old is Rome?")
+
+        response = api_client_authenticated.post(
+            reverse("trivia-list"), data, format="json"
+        )
+
+        assert response.status_code == 201
+        [match] = response.data["near_duplicates"]
+        assert match["question"] == REWORDED
+        assert match["similar_to"] == ORIGINAL
+        assert match["trivia"] == "Geography basics"
+
+    def test_close_but_distinct_questions_accepted(self, api_client_authenticated):
+        """Test similar wording with a different subject is not rejected"""
+        gold = "What is the chemical symbol for gold?"
+        silver = "What is the chemical symbol for silver?"
+        assert similarity(gold, silver) >= 0.7
+        data = self.payload(gold, silver, "Who wrote Hamlet?")
+
+        response = api_client_authenticated.post(
+            reverse("trivia-list"), data, format="json"
+        )
+
+        assert response.status_code == 201
+        assert response.data["near_duplicates"][0]["question"] == gold
+
+    def test_update_with_similar_stored_question(self, api_client_authenticated):
+        """Test an update is not rejected because another trivia is similar"""
+        self.create_trivia(REWORDED, title="Geography basics")
+        trivia = self.create_trivia(ORIGINAL, "Who wrote Hamlet?", "Where is Peru?")
+        data = self.payload(ORIGINAL, "Who wrote Hamlet?", "Where is Peru?")
+
+        url = reverse("trivia-detail", args=[trivia.id])
+        response = api_client_authenticated.patch(
+            f"{url}?username={self.user.username}",
+            {"questions": data["questions"]},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        assert response.data["near_duplicates"][0]["trivia"] == "Geography basics"
+
+    def test_validation_rejects_repeats_within_trivia(self, api_client_authenticated):
+        """Test the same question twice in one submission fails"""
+        data = self.payload(ORIGINAL, "what is the CAPITAL of France", "Who?")
+
+        response = api_client_authenticated.post(
+            reverse("trivia-list"), data, format="json"
+        )
+
+        assert response.status_code == 400
+        assert "repeated" in str(response.data)
+
+    def test_distinct_questions_accepted(self, api_client_authenticated):
+        """Test a trivia without repeated questions is created"""
+        self.create_trivia(ORIGINAL, title="Geography basics")
+        data = self.payload("Who wrote Hamlet?", "How old is Rome?", "Where is Peru?")
+
+        response = api_client_authenticated.post(
+            reverse("trivia-list"), data, format="json"
+        )
+
+        assert response.status_code == 201
+
+    def test_cluster_report(self):
+        """Test the report groups duplicates across trivias"""
+        self.create_trivia(ORIGINAL, "Who painted the Mona Lisa?")
+        self.create_trivia(REWORDED, "Who painted the Mona Lisa")
+        self.create_trivia("what is the capital of france", "How tall is Everest?")
+        QuestionBucket.objects.all().delete()
+        call_command(
+            "rebuild_trivia_indexes", "--only", "duplicates", stdout=StringIO()
+        )
+
+        out = StringIO()
+        call_command("report_duplicate_questions", stdout=out)
+
+        output = out.getvalue()
+        assert "Cluster 1 (3 questions)" in output
+        assert "Cluster 2 (2 questions)" in output
+        assert "Found 2 duplicate clusters covering 5 questions" in output
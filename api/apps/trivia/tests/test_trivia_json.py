@@ -0,0 +1,81 @@
+"""
+JSON Codec Test Module
+
+This module contains test cases for:
+- Encoding identical to DRF's JSONRenderer
+- Native UUID and datetime encoding
+- Values orjson rejects encoded by the standard library
+- Request bodies parsed with the codec
+"""
+
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from api.utils.json_utils import FastJSONRenderer, dumps, loads
+
+
+@pytest.mark.django_db
+class TestJsonCodec:
+    """Test cases for the codec functions"""
+
+    def test_matches_drf_renderer(self):
+        """Test the codec encodes like DRF's stock renderer"""
+        data = {
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "title": "¿Qué planeta es el más grande?",
+            "created_at": datetime(2024, 5, 1, 12, 30, 5, 123456, timezone.utc),
+            "day": date(2024, 5, 1),
+            "score": Decimal("1.5"),
+            "label": gettext_lazy("points"),
+            "answers": [{"id": 1, "is_correct": True}, {"id": 2, "points": None}],
+        }
+
+        body = dumps(data)
+
+        assert body == JSONRenderer().render(data)
+        assert loads(body)["created_at"] == "2024-05-01T12:30:05.123456Z"
+
+    def test_values_rejected_by_orjson(self):
+        """Test non string keys and big integers are still encoded"""
+        body = dumps({1: "a", "big": 2**70})
+
+        assert body == b'{"1":"a","big":1180591620717411303424}'
+
+    def test_line_separators_escaped(self):
+        """Test U+2028 and U+2029 are escaped as by DRF"""
+        assert dumps("a\u2028b\u2029") == b'"a\\u2028b\\u2029"'
+
+    def test_indent_left_to_drf(self):
+        """Test indented output is still available"""
+        body = FastJSONRenderer().render({"a": 1}, "application/json; indent=2")
+
+        assert body == b'{\n  "a": 1\n}'
+
+
+@pytest.mark.django_db
+class TestJsonParsing:
+    """Test cases for request bodies parsed by FastJSONParser"""
+
+    url = "/api/questions/batch/"
+
+    def test_body_parsed(self, api_client):
+        """Test a JSON body reaches the view"""
+        response = api_client.post(
+            self.url, b'{"ids": []}', content_type="application/json"
+        )
+
+        assert response.status_code == 400
+        assert response.json() == {"error": "ids must be a non-empty list"}
+
+    @pytest.mark.parametrize("body", [b'{"ids": [', b'{"ids": NaN}'])
+    def test_invalid_body_rejected(self, api_client, body):
+        """Test malformed JSON and NaN are rejected"""
+        response = api_client.post(self.url, body, content_type="application/json")
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("JSON parse error")
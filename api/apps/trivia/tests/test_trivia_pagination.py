@@ -0,0 +1,150 @@
+"""
+Trivia Pagination Test Module
+
+This module contains test cases for:
+- Keyset pagination of the trivia list
+- Cursor stability with identical creation times
+- Query count of listed pages
+- Benchmark command execution
+"""
+
+import base64
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from api.apps.trivia.models import Trivia
+
+from .factories import ThemeFactory, TriviaFactory, UserFactory
+from .test_trivia_base import TestTriviaBase
+
+
+@pytest.mark.django_db
+class TestTriviaPagination(TestTriviaBase):
+    """Test cases for keyset pagination on TriviaViewSet.list"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user):
+        """Set up test environment"""
+        self.user = test_user
+        self.url = reverse("trivia-list")
+
+    def collect_pages(self, client, params):
+        """Follow next_cursor until the last page"""
+        ids, cursor, pages = [], None, 0
+        while True:
+            page_params = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = client.get(self.url, page_params)
+            assert response.status_code == 200
+            ids.extend(item["id"] for item in response.data["results"])
+            pages += 1
+            cursor = response.data["next_cursor"]
+            if not cursor:
+                return ids, pages
+
+    def test_list_without_limit_is_unpaginated(self, api_client):
+        """Test clients not asking for pages keep the plain list"""
+        TriviaFactory.create_batch(3, created_by=self.user)
+
+        response = api_client.get(self.url)
+
+        assert isinstance(response.data, list)
+        assert len(response.data) == 3
+
+    def test_pages_cover_every_trivia_once(self, api_client):
+        """Test paging returns every trivia once in creation order"""
+        trivias = TriviaFactory.create_batch(7, created_by=self.user)
+        # Identical timestamps must still page deterministically by id
+        Trivia.objects.update(created_at=timezone.now())
+
+        ids, pages = self.collect_pages(api_client, {"limit": 3})
+
+        assert pages == 3
+        assert len(ids) == len(set(ids)) == 7
+        assert set(ids) == {str(trivia.id) for trivia in trivias}
+        assert ids == sorted(ids)
+
+    def test_rows_created_while_paging_are_not_duplicated(self, api_client):
+        """Test a new trivia does not shift the remaining pages"""
+        TriviaFactory.create_batch(4, created_by=self.user)
+        first = api_client.get(self.url, {"limit": 2}).data
+
+        TriviaFactory(created_by=self.user)
+        second = api_client.get(
+            self.url, {"limit": 2, "cursor": first["next_cursor"]}
+        ).data
+
+        first_ids = {item["id"] for item in first["results"]}
+        assert not first_ids & {item["id"] for item in second["results"]}
+
+    def test_page_query_count_independent_of_size(self, api_client):
+        """Test theme and creator are joined instead of queried per row"""
+        theme = ThemeFactory()
+        counts = []
+        for size in (2, 10):
+            Trivia.objects.all().delete()
+            for n in range(size):
+                creator = UserFactory(username=f"creator_{size}_{n}")
+                TriviaFactory(theme=theme, created_by=creator)
+            with CaptureQueriesContext(connection) as context:
+                response = api_client.get(self.url, {"limit": 10})
+            assert len(response.data["results"]) == size
+            counts.append(len(context.captured_queries))
+
+        assert counts[0] == counts[1]
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            None,
+            '["2024-01-01T00:00:00+00:00","zzz"]',
+            '["2024-01-01T00:00:00+00:00",5]',
+            '["yesterday","00000000-0000-0000-0000-000000000000"]',
+        ],
+    )
+    def test_invalid_cursor_rejected(self, api_client, payload):
+        """Test a tampered cursor returns 400"""
+        cursor = "not-a-cursor"
+        if payload is not None:
+            cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        response = api_client.get(self.url, {"cursor": cursor})
+        assert response.status_code == 400
+
+    def test_username_listing_is_paginated(self, api_client):
+        """Test the username branch pages like the default listing"""
+        TriviaFactory.create_batch(3, created_by=self.user)
+        TriviaFactory(created_by=UserFactory.create_other_user())
+
+        ids, pages = self.collect_pages(
+            api_client, {"username": self.user.username, "limit": 2}
+        )
+
+        assert pages == 2
+        assert len(ids) == 3
+
+    def test_benchmark_command_reports_pages(self):
+        """Test the benchmark command measures keyset and offset pages"""
+        out = StringIO()
+        call_command(
+            "benchmark_trivias",
+            "--scenario",
+            "list",
+            "--sizes",
+            "20",
+            "40",
+            "--page-size",
+            "5",
+            "--repeat",
+            "2",
+            stdout=out,
+        )
+
+        output = out.getvalue()
+        assert "keyset end" in output
+        assert "offset middle" in output
+        assert not Trivia.objects.filter(title__startswith="Benchmark trivia")
@@ -82,12 +82,13 @@ class TestTriviaQueries(TestTriviaBase):
         url = reverse("get-questions", args=[trivia.id])
         response = api_client.get(url)
 
-        # Verify response
+        # Verify response (served as pre-rendered JSON bytes)
         assert response.status_code == 200
-        assert isinstance(response.data, list)
-        assert len(response.data) > 0
+        data = response.json()
+        assert isinstance(data, list)
+        assert len(data) > 0
         # Verify question fields
-        question_data = response.data[0]
+        question_data = data[0]
         assert "question_title" in question_data
         assert "points" in question_data
         assert "answers" in question_data
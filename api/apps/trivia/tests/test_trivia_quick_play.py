@@ -0,0 +1,143 @@
+"""
+Trivia Quick Play Test Module
+
+This module contains test cases for:
+- Random trivia endpoint with theme and difficulty filters
+- Exclude list of recently played trivias
+- Cell id pools maintained on trivia changes
+- Database fallback sampling
+"""
+
+from collections import Counter
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia import sampling
+from api.apps.trivia.availability import availability_key, pool_key
+from api.utils.redis_utils import RedisError, get_redis
+
+from .factories import PrivateTriviaFactory, ThemeFactory, TriviaFactory
+
+
+@pytest.mark.django_db(transaction=True)
+class TestQuickPlay:
+    """
+    Test cases for the random trivia endpoint.
+    Runs with real commits so pool refreshes fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user):
+        """Set up test environment"""
+        self.user = test_user
+        self.url = reverse("trivia-random")
+        self.theme = ThemeFactory(name="Quick play science")
+        self.other_theme = ThemeFactory(name="Quick play history")
+        client = get_redis()
+        client.delete(availability_key())
+        for key in client.scan_iter(match=pool_key("*", "*")):
+            client.delete(key)
+
+    def create_trivia(self, theme=None, difficulty=2, **kwargs):
+        return TriviaFactory.create_with_questions(
+            theme=theme or self.theme,
+            difficulty=difficulty,
+            created_by=self.user,
+            **kwargs,
+        )
+
+    def test_returns_trivia_with_questions(self, api_client):
+        """Test a full game payload is returned in one response"""
+        trivia = self.create_trivia(title="Quick physics")
+
+        response = api_client.get(self.url, {"theme": self.theme.id, "difficulty": 2})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == str(trivia.id)
+        assert data["title"] == "Quick physics"
+        assert data["theme"] == "Quick play science"
+        assert len(data["questions"]) == 1
+        assert len(data["questions"][0]["answers"]) == 2
+
+    def test_filters_restrict_candidates(self):
+        """Test only trivias of the requested cell are picked"""
+        wanted = self.create_trivia(difficulty=3)
+        self.create_trivia(difficulty=1)
+        self.create_trivia(theme=self.other_theme, difficulty=3)
+        PrivateTriviaFactory(theme=self.theme, difficulty=3, created_by=self.user)
+
+        picked = {sampling.pick_random_trivia(self.theme.id, 3) for _ in range(10)}
+
+        assert picked == {str(wanted.id)}
+
+    def test_exclude_list_is_respected(self, api_client):
+        """Test recently played trivias are never returned"""
+        trivias = [self.create_trivia() for _ in range(3)]
+        played = [str(trivia.id) for trivia in trivias[:2]]
+
+        for _ in range(5):
+            assert sampling.pick_random_trivia(exclude=played) == str(trivias[2].id)
+
+        response = api_client.get(self.url, {"exclude": ",".join(played)})
+        assert response.json()["id"] == str(trivias[2].id)
+
+        response = api_client.get(
+            self.url, {"exclude": ",".join(str(t.id) for t in trivias)}
+        )
+        assert response.status_code == 404
+
+    def test_draw_is_spread_across_cells(self):
+        """Test unfiltered draws reach every eligible trivia"""
+        trivias = [
+            self.create_trivia(),
+            self.create_trivia(difficulty=1),
+            self.create_trivia(theme=self.other_theme),
+        ]
+
+        counts = Counter(sampling.pick_random_trivia() for _ in range(60))
+
+        assert set(counts) == {str(trivia.id) for trivia in trivias}
+
+    def test_pool_follows_trivia_changes(self, api_client):
+        """Test hidden trivias leave the pool on commit"""
+        trivia = self.create_trivia()
+        api_client.get(self.url)
+        assert get_redis().scard(pool_key(self.theme.id, 2)) == 1
+
+        trivia.is_public = False
+        trivia.save()
+
+        assert get_redis().scard(pool_key(self.theme.id, 2)) == 0
+        assert api_client.get(self.url).status_code == 404
+
+    def test_no_random_ordering(self, api_client):
+        """Test the pick never sorts candidates randomly in the database"""
+        self.create_trivia()
+
+        with CaptureQueriesContext(connection) as context:
+            api_client.get(self.url)
+
+        for query in context.captured_queries:
+            sql = query["sql"].upper()
+            assert "RAND()" not in sql and "RANDOM()" not in sql
+
+    def test_database_fallback_without_redis(self):
+        """Test sampling falls back to a random index offset"""
+        trivia = self.create_trivia()
+
+        with mock.patch.object(sampling, "get_redis", side_effect=RedisError("down")):
+            picked = sampling.pick_random_trivia(self.theme.id, 2)
+
+        assert picked == str(trivia.id)
+
+    def test_invalid_parameters(self, api_client):
+        """Test malformed filters are rejected"""
+        assert api_client.get(self.url, {"theme": "nope"}).status_code == 400
+        assert api_client.get(self.url, {"difficulty": "hard"}).status_code == 400
+        for params in ({"exclude": "foo"}, {"exclude": "foo", "measured": 1}):
+            assert api_client.get(self.url, params).status_code == 400
@@ -0,0 +1,144 @@
+"""
+Trivia Quiz Test Module
+
+This module contains test cases for:
+- Mixed quiz endpoint across the trivias of a theme and difficulty
+- Question pools built lazily and updated on commit
+- Stale pool entries dropped on draw
+- Pool rebuild command
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia.quiz import question_pool_key, sample_questions
+from api.utils.redis_utils import get_redis
+
+from .factories import (
+    AnswerFactory,
+    PrivateTriviaFactory,
+    QuestionFactory,
+    ThemeFactory,
+    TriviaFactory,
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTriviaQuiz:
+    """
+    Test cases for mixed quizzes.
+    Runs with real commits so pool updates fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user):
+        """Set up test environment"""
+        self.user = test_user
+        self.url = reverse("trivia-quiz")
+        self.theme = ThemeFactory(name="Quiz geography")
+        self.key = question_pool_key(self.theme.id, 2)
+        get_redis().delete(self.key)
+
+    def create_trivia(self, questions=3, factory=TriviaFactory, **kwargs):
+        """Create a trivia of the quiz cell with questions and answers"""
+        trivia = factory(
+            theme=self.theme,
+            difficulty=kwargs.pop("difficulty", 2),
+            created_by=self.user,
+            **kwargs,
+        )
+        for _ in range(questions):
+            question = QuestionFactory(trivia=trivia)
+            AnswerFactory(question=question, trivia=trivia, is_correct=True)
+            AnswerFactory(question=question, trivia=trivia)
+        return trivia
+
+    def test_quiz_mixes_questions_across_trivias(self, api_client):
+        """Test questions come from several trivias with their answers"""
+        trivias = [self.create_trivia() for _ in range(4)]
+
+        response = api_client.get(
+            self.url, {"theme": self.theme.id, "difficulty": 2, "count": 12}
+        )
+
+        assert response.status_code == 200
+        questions = response.json()["questions"]
+        assert len(questions) == 12
+        assert len({question["id"] for question in questions}) == 12
+        assert {question["trivia_id"] for question in questions} == {
+            str(trivia.id) for trivia in trivias
+        }
+        assert all(len(question["answers"]) == 2 for question in questions)
+
+    def test_only_public_active_questions_of_cell(self):
+        """Test private trivias, other cells and inactive questions are left out"""
+        wanted = self.create_trivia(questions=2)
+        self.create_trivia(factory=PrivateTriviaFactory)
+        self.create_trivia(difficulty=1)
+        QuestionFactory(trivia=wanted, is_active=False)
+
+        questions = sample_questions(self.theme.id, 2, 10)
+
+        assert {question.trivia_id for question in questions} == {wanted.id}
+        assert len(questions) == 2
+
+    def test_sampling_cost_independent_of_cell_size(self):
+        """Test a quiz loads only the drawn questions"""
+        for _ in range(10):
+            self.create_trivia()
+        sample_questions(self.theme.id, 2, 1)
+
+        with CaptureQueriesContext(connection) as context:
+            questions = sample_questions(self.theme.id, 2, 5)
+
+        assert len(questions) == 5
+        # Questions with their trivia, then their answers
+        assert len(context.captured_queries) == 2
+
+    def test_new_questions_join_pool_on_commit(self):
+        """Test questions added to a trivia become drawable"""
+        trivia = self.create_trivia(questions=1)
+        sample_questions(self.theme.id, 2, 1)
+        assert get_redis().scard(self.key) == 1
+
+        QuestionFactory(trivia=trivia)
+
+        assert get_redis().scard(self.key) == 2
+
+    def test_stale_entries_dropped_and_topped_up(self):
+        """Test questions that no longer qualify are removed when drawn"""
+        hidden = self.create_trivia(questions=3)
+        visible = self.create_trivia(questions=3)
+        sample_questions(self.theme.id, 2, 1)
+        assert get_redis().scard(self.key) == 6
+
+        hidden.is_public = False
+        hidden.save()
+
+        questions = sample_questions(self.theme.id, 2, 6)
+
+        assert {question.trivia_id for question in questions} == {visible.id}
+        assert len(questions) == 3
+        assert get_redis().scard(self.key) == 3
+
+    def test_missing_parameters_and_empty_cell(self, api_client):
+        """Test invalid requests and combinations without questions"""
+        assert api_client.get(self.url, {"theme": self.theme.id}).status_code == 400
+        response = api_client.get(self.url, {"theme": self.theme.id, "difficulty": 3})
+        assert response.status_code == 404
+
+    def test_rebuild_command_restores_pools(self):
+        """Test the rebuild command recreates dropped pools"""
+        self.create_trivia(questions=2)
+        get_redis().delete(self.key)
+
+        out = StringIO()
+        call_command("rebuild_trivia_indexes", "--only", "questions", stdout=out)
+
+        assert "Rebuilt questions index: 2 items" in out.getvalue()
+        assert get_redis().scard(self.key) == 2
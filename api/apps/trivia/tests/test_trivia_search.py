@@ -0,0 +1,152 @@
+"""
+Trivia Search Test Module
+
+This module contains test cases for:
+- Language aware term analysis
+- Search index maintenance through signals
+- Ranked search endpoint and visibility rules
+- Index rebuild command
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from api.apps.trivia.models import Language, TriviaSearchTerm
+from api.apps.trivia.search import analyze, analyze_query
+
+from .factories import (
+    AnswerFactory,
+    PrivateTriviaFactory,
+    QuestionFactory,
+    TriviaFactory,
+)
+
+
+@pytest.mark.django_db
+class TestSearchAnalysis:
+    """Test cases for the search analyzers"""
+
+    def test_accents_and_case_are_folded(self):
+        """Test accented and uppercase tokens normalize to the same term"""
+        assert analyze("PAÍS", "es") == analyze("pais", "es")
+
+    def test_stopwords_depend_on_language(self):
+        """Test stopwords are removed for the analyzed language only"""
+        assert analyze("la capital de Francia", "es") == ["capital", "francia"]
+        assert "la" in analyze("la capital de Francia", "en")
+
+    def test_plurals_share_terms(self):
+        """Test singular and plural forms index to the same term"""
+        assert analyze("countries", "en") == analyze("country", "en")
+        assert analyze("ciudades", "es") == analyze("ciudad", "es")
+
+    def test_query_without_language_uses_all_analyzers(self):
+        """Test an unqualified query yields the terms of every analyzer"""
+        terms = analyze_query("ciudades")
+        assert {"ciudad", "ciudade"} <= terms
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTriviaSearch:
+    """
+    Test cases for the search endpoint.
+    Runs with real commits so index refreshes fire as in production.
+    """
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+        self.url = reverse("trivia-search")
+
+    def create_trivia(self, title, question_title="Generic question", **kwargs):
+        """Create a trivia with one question and one answer"""
+        trivia = TriviaFactory(
+            title=title, theme=self.theme, created_by=self.user, **kwargs
+        )
+        question = QuestionFactory(trivia=trivia, question_title=question_title)
+        AnswerFactory(question=question, trivia=trivia, answer_title="Paris")
+        return trivia
+
+    def test_search_requires_query(self, api_client):
+        """Test a missing query is rejected"""
+        response = api_client.get(self.url)
+        assert response.status_code == 400
+
+    def test_search_matches_all_fields(self, api_client):
+        """Test titles, questions and answers are all searchable"""
+        trivia = self.create_trivia("European capitals", "Largest river")
+
+        for query in ("capital", "rivers", "paris"):
+            response = api_client.get(self.url, {"q": query})
+            assert response.status_code == 200
+            assert [item["id"] for item in response.json()] == [str(trivia.id)]
+
+    def test_title_matches_rank_first(self, api_client):
+        """Test a title match outranks a question match"""
+        in_question = self.create_trivia("Geography", "Which volcano erupted?")
+        in_title = self.create_trivia("Volcano legends")
+
+        response = api_client.get(self.url, {"q": "volcano"})
+
+        ids = [item["id"] for item in response.json()]
+        assert ids == [str(in_title.id), str(in_question.id)]
+
+    def test_more_matched_terms_rank_first(self, api_client):
+        """Test trivias matching more query terms rank higher"""
+        partial = self.create_trivia("Space missions")
+        full = self.create_trivia("Space history", "First moon landing")
+
+        response = api_client.get(self.url, {"q": "space moon"})
+
+        assert response.json()[0]["id"] == str(full.id)
+        assert {item["id"] for item in response.json()} == {
+            str(full.id),
+            str(partial.id),
+        }
+
+    def test_language_aware_index(self, api_client):
+        """Test trivias are analyzed with their own language"""
+        spanish = Language.objects.create(name="Spanish", code="es")
+        trivia = self.create_trivia("Las ciudades de España", language=spanish)
+
+        response = api_client.get(self.url, {"q": "ciudad espana", "lang": "es"})
+
+        assert response.json()[0]["id"] == str(trivia.id)
+        assert not TriviaSearchTerm.objects.filter(trivia=trivia, term="las")
+
+    def test_edits_update_index(self, api_client):
+        """Test renaming a trivia replaces its indexed terms"""
+        trivia = self.create_trivia("Ancient Rome")
+
+        trivia.title = "Ancient Egypt"
+        trivia.save()
+
+        assert api_client.get(self.url, {"q": "rome"}).json() == []
+        assert api_client.get(self.url, {"q": "egypt"}).json()[0]["id"] == str(
+            trivia.id
+        )
+
+    def test_private_trivias_hidden_from_anonymous(self, api_client):
+        """Test search only returns trivias visible to the caller"""
+        PrivateTriviaFactory(
+            title="Secret dinosaurs", theme=self.theme, created_by=self.user
+        )
+
+        assert api_client.get(self.url, {"q": "dinosaurs"}).json() == []
+
+    def test_rebuild_command_restores_index(self, api_client):
+        """Test the rebuild command recreates missing index entries"""
+        trivia = self.create_trivia("Olympic sports")
+        TriviaSearchTerm.objects.all().delete()
+
+        out = StringIO()
+        call_command("rebuild_trivia_indexes", "--only", "search", stdout=out)
+
+        assert "Rebuilt search index" in out.getvalue()
+        response = api_client.get(self.url, {"q": "olympic"})
+        assert response.json()[0]["id"] == str(trivia.id)
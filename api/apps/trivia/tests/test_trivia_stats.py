@@ -0,0 +1,213 @@
+"""
+Trivia Answer Statistics Test Module
+
+This module contains test cases for:
+- Recording answers into Redis counters
+- Unknown ids and answers of other questions rejected before counting
+- Flushing counters into the aggregate tables with bulk_update
+- Counters restored when a flush fails
+- Per trivia statistics endpoint
+"""
+
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.apps.trivia import stats
+from api.apps.trivia.models import Answer, AnswerStats, QuestionStats
+from api.utils.redis_utils import RedisError, get_redis
+
+from .factories import TriviaFactory
+
+
+@pytest.mark.django_db
+class TestAnswerStats:
+    """Test cases for answer statistics"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        get_redis().delete(stats.stats_key())
+        self.trivia = TriviaFactory.create_with_specific_questions(
+            3, answers_per_question=3, theme=test_theme, created_by=test_user
+        )
+        self.questions = list(self.trivia.questions.order_by("id"))
+        self.answers = {
+            question.id: list(question.answers.order_by("id"))
+            for question in self.questions
+        }
+        Answer.objects.filter(
+            id__in=[answers[0].id for answers in self.answers.values()]
+        ).update(is_correct=True)
+        self.record_url = reverse("trivia-answers")
+        self.stats_url = reverse("trivia-stats", args=[self.trivia.id])
+
+    def correct(self, question):
+        return self.answers[question.id][0].id
+
+    def wrong(self, question):
+        return self.answers[question.id][1].id
+
+    def test_recording_writes_only_redis(self, api_client):
+        """Test the hot path checks ids in two reads and writes only counters"""
+        first, second, _ = self.questions
+        payload = {
+            "answers": [
+                {"question": first.id, "answer": self.correct(first)},
+                {"question": first.id, "answer": self.wrong(first)},
+                {"question": second.id, "answer": None},
+            ]
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(self.record_url, payload, format="json")
+
+        assert response.status_code == 202
+        assert response.json() == {"recorded": 3}
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if "trivia_" in query["sql"]
+        ]
+        assert len(queries) == 2
+        assert all(sql.startswith("SELECT") for sql in queries)
+        counters = get_redis().hgetall(stats.stats_key())
+        assert counters[f"q:{first.id}".encode()] == b"2"
+        assert counters[f"q:{second.id}".encode()] == b"1"
+        assert counters[f"a:{self.correct(first)}".encode()] == b"1"
+
+    def test_flush_accumulates_into_tables(self):
+        """Test flushes add to existing rows and empty the counters"""
+        first, second, _ = self.questions
+        stats.record_answers([(first.id, self.correct(first))] * 3)
+        stats.record_answers([(first.id, self.wrong(first)), (second.id, None)])
+
+        out = StringIO()
+        call_command("flush_answer_stats", stdout=out)
+        stats.record_answers([(first.id, self.correct(first))])
+        stats.flush_answer_stats()
+
+        assert "Flushed 4 answer counters" in out.getvalue()
+        first_stats = QuestionStats.objects.get(question=first)
+        assert (first_stats.attempts, first_stats.corrects) == (5, 4)
+        second_stats = QuestionStats.objects.get(question=second)
+        assert (second_stats.attempts, second_stats.corrects) == (1, 0)
+        assert AnswerStats.objects.get(answer_id=self.correct(first)).picks == 4
+        assert get_redis().hlen(stats.stats_key()) == 0
+
+    def test_flush_query_count_is_constant(self):
+        """Test a flush batch costs the same queries for 1 or 3 questions"""
+        counts = []
+        for questions in (self.questions[:1], self.questions):
+            stats.record_answers(
+                [(question.id, self.correct(question)) for question in questions]
+            )
+            with CaptureQueriesContext(connection) as context:
+                stats.flush_answer_stats()
+            counts.append(len(context.captured_queries))
+
+        assert counts[0] == counts[1]
+
+    def test_failed_flush_restores_counters(self):
+        """Test counters survive a database error during the flush"""
+        question = self.questions[0]
+        stats.record_answers([(question.id, self.correct(question))])
+
+        with mock.patch.object(
+            stats, "apply_answer_counts", side_effect=RuntimeError("db down")
+        ):
+            with pytest.raises(RuntimeError):
+                stats.flush_answer_stats()
+
+        assert get_redis().hlen(stats.stats_key()) == 2
+        stats.flush_answer_stats()
+        assert QuestionStats.objects.get(question=question).corrects == 1
+
+    def test_recording_without_redis_writes_directly(self):
+        """Test responses reach the tables when Redis is unavailable"""
+        question = self.questions[0]
+
+        with mock.patch.object(stats, "get_redis", side_effect=RedisError("down")):
+            stats.record_answers([(question.id, self.wrong(question))])
+
+        assert QuestionStats.objects.get(question=question).attempts == 1
+        assert AnswerStats.objects.get(answer_id=self.wrong(question)).picks == 1
+
+    def test_unknown_ids_are_dropped(self):
+        """Test counters of deleted questions and answers are discarded"""
+        stats.record_answers([(999999, 888888)])
+
+        stats.flush_answer_stats()
+
+        assert not QuestionStats.objects.exists()
+        assert not AnswerStats.objects.exists()
+
+    def test_stats_endpoint(self, api_client):
+        """Test the endpoint reports attempts, rate and picks per answer"""
+        first = self.questions[0]
+        stats.record_answers(
+            [(first.id, self.correct(first))] * 3 + [(first.id, self.wrong(first))]
+        )
+        stats.flush_answer_stats()
+
+        response = api_client.get(self.stats_url)
+
+        assert response.status_code == 200
+        questions = response.json()["questions"]
+        assert [question["id"] for question in questions] == [
+            question.id for question in self.questions
+        ]
+        assert questions[0]["attempts"] == 4
+        assert questions[0]["correct_rate"] == 0.75
+        picks = {answer["id"]: answer["picks"] for answer in questions[0]["answers"]}
+        assert picks[self.correct(first)] == 3
+        assert picks[self.wrong(first)] == 1
+        assert questions[1]["attempts"] == 0
+        assert questions[1]["correct_rate"] is None
+
+    def test_invalid_payloads_rejected(self, api_client):
+        """Test malformed answer lists are refused"""
+        for payload in (
+            {},
+            {"answers": []},
+            {"answers": [{"answer": 1}]},
+            {"answers": [{"question": "x", "answer": 1}]},
+        ):
+            response = api_client.post(self.record_url, payload, format="json")
+            assert response.status_code == 400
+
+    def test_mismatched_answer_rejected(self, api_client):
+        """Test answers posted with another question are refused uncounted"""
+        first, second, _ = self.questions
+        payload = {
+            "answers": [
+                {"question": first.id, "answer": None},
+                {"question": first.id, "answer": self.correct(second)},
+            ]
+        }
+
+        response = api_client.post(self.record_url, payload, format="json")
+
+        assert response.status_code == 400
+        assert "does not belong" in response.json()["error"]
+        assert not get_redis().exists(stats.stats_key())
+
+    @pytest.mark.parametrize(
+        "question, answer",
+        [(999999, None), ("self", 888888), (0, None), (2**70, None)],
+    )
+    def test_unknown_ids_rejected(self, api_client, question, answer):
+        """Test ids without a row never become Redis counters"""
+        if question == "self":
+            question = self.questions[0].id
+        payload = {"answers": [{"question": question, "answer": answer}]}
+
+        response = api_client.post(self.record_url, payload, format="json")
+
+        assert response.status_code == 400
+        assert not get_redis().exists(stats.stats_key())
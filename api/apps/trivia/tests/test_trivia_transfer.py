@@ -0,0 +1,254 @@
+"""
+Trivia Transfer Test Module
+
+This module contains test cases for:
+- NDJSON export of trivias with questions and answers
+- Batched import with a fixed query count per batch
+- Skipping trivias that already exist
+- Checkpoints and resuming failed imports and exports
+- Invalid values and database errors reported with the resume hint
+"""
+
+import json
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+
+from api.apps.trivia.management.commands import export_trivias, import_trivias
+from api.apps.trivia.models import Answer, Question, Theme, Trivia
+from api.apps.trivia.transfer import (
+    import_records,
+    iter_export,
+    parse_record,
+    read_checkpoint,
+)
+
+from .factories import TriviaFactory
+
+
+@pytest.mark.django_db
+class TestTriviaTransfer:
+    """Test cases for the export_trivias and import_trivias commands"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme, tmp_path):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+        self.path = str(tmp_path / "trivias.ndjson")
+        self.checkpoint = f"{self.path}.checkpoint"
+
+    def create_trivias(self, count):
+        return [
+            TriviaFactory.create_with_specific_questions(
+                3, theme=self.theme, created_by=self.user, title=f"Transfer {n}"
+            )
+            for n in range(count)
+        ]
+
+    def record(self, n, questions=3):
+        """Build an NDJSON record for a new trivia"""
+        return {
+            "title": f"Imported {n}",
+            "difficulty": 2,
+            "theme": "Imported theme",
+            "questions": [
+                {
+                    "question_title": f"Question {n}.{q}",
+                    "answers": [
+                        {"answer_title": "Right", "is_correct": True},
+                        {"answer_title": "Wrong"},
+                    ],
+                }
+                for q in range(questions)
+            ],
+        }
+
+    def write_lines(self, lines):
+        with open(self.path, "w") as f:
+            f.writelines(line + "\n" for line in lines)
+
+    def test_export_import_round_trip(self):
+        """Test a trivia graph survives export, deletion and import"""
+        trivias = self.create_trivias(3)
+        expected = {
+            trivia.title: sorted(
+                (question.question_title, answer.answer_title, answer.is_correct)
+                for question in trivia.questions.all()
+                for answer in question.answers.all()
+            )
+            for trivia in trivias
+        }
+        out = StringIO()
+        call_command("export_trivias", self.path, "--chunk-size", "2", stdout=out)
+        assert "Exported 3 trivias" in out.getvalue()
+        assert "rows/s" in out.getvalue()
+
+        Trivia.objects.all().delete()
+        out = StringIO()
+        call_command("import_trivias", self.path, "--skip-indexes", stdout=out)
+
+        assert "Imported 3 trivias, skipped 0" in out.getvalue()
+        for trivia in Trivia.objects.filter(title__in=expected):
+            assert trivia.created_by == self.user
+            assert trivia.theme == self.theme
+            assert (
+                sorted(
+                    (
+                        answer.question.question_title,
+                        answer.answer_title,
+                        answer.is_correct,
+                    )
+                    for answer in Answer.objects.filter(trivia=trivia)
+                )
+                == expected[trivia.title]
+            )
+        assert not read_checkpoint(self.checkpoint)
+
+    def test_import_is_idempotent(self):
+        """Test trivias with an existing id or title are skipped"""
+        self.create_trivias(2)
+        call_command("export_trivias", self.path, stdout=StringIO())
+
+        out = StringIO()
+        call_command("import_trivias", self.path, "--skip-indexes", stdout=out)
+
+        assert "Imported 0 trivias, skipped 2" in out.getvalue()
+        assert Trivia.objects.count() == 2
+        assert Question.objects.count() == 6
+
+    def test_batch_query_count_is_constant(self):
+        """Test a batch costs the same queries for 2 or 20 trivias"""
+        Theme.objects.create(name="Imported theme")
+        counts = []
+        for first, size in ((0, 2), (100, 20)):
+            records = [
+                parse_record(json.dumps(self.record(n)).encode())
+                for n in range(first, first + size)
+            ]
+            with CaptureQueriesContext(connection) as context:
+                assert import_records(records) == (size, 0)
+            counts.append(len(context.captured_queries))
+
+        assert counts[0] == counts[1]
+
+    def test_failed_import_resumes_from_checkpoint(self):
+        """Test committed batches survive a bad line and resume skips them"""
+        lines = [json.dumps(self.record(n)) for n in range(5)]
+        lines[3] = '{"title": "Broken", "difficulty": 7, "theme": "x"}'
+        self.write_lines(lines)
+
+        with pytest.raises(CommandError, match="line 4"):
+            call_command(
+                "import_trivias",
+                self.path,
+                "--batch-size",
+                "2",
+                "--skip-indexes",
+                stdout=StringIO(),
+            )
+        assert Trivia.objects.filter(title__startswith="Imported").count() == 2
+        assert read_checkpoint(self.checkpoint)["lines"] == 2
+
+        lines[3] = json.dumps(self.record(3))
+        self.write_lines(lines)
+        out = StringIO()
+        call_command(
+            "import_trivias",
+            self.path,
+            "--batch-size",
+            "2",
+            "--resume",
+            "--skip-indexes",
+            stdout=out,
+        )
+
+        assert "Resuming after line 2" in out.getvalue()
+        assert "Imported 3 trivias, skipped 0" in out.getvalue()
+        assert Trivia.objects.filter(title__startswith="Imported").count() == 5
+
+    def test_export_resumes_after_checkpoint(self):
+        """Test a resumed export drops partial output and writes every trivia once"""
+        self.create_trivias(5)
+        call_command("export_trivias", self.path, stdout=StringIO())
+        with open(self.path, "rb") as f:
+            complete = f.read()
+
+        def crash_after_three(*args, **kwargs):
+            for n, item in enumerate(iter_export(*args, **kwargs)):
+                if n == 3:
+                    raise RuntimeError("connection lost")
+                yield item
+
+        with mock.patch.object(export_trivias, "iter_export", crash_after_three):
+            with pytest.raises(RuntimeError):
+                call_command(
+                    "export_trivias", self.path, "--chunk-size", "2", stdout=StringIO()
+                )
+        assert read_checkpoint(self.checkpoint)["rows"] == 2
+
+        out = StringIO()
+        call_command("export_trivias", self.path, "--resume", stdout=out)
+
+        assert "Resuming after 2 trivias" in out.getvalue()
+        with open(self.path, "rb") as f:
+            assert f.read() == complete
+        assert not read_checkpoint(self.checkpoint)
+
+    def test_rebuilds_indexes_after_import(self):
+        """Test derived indexes are rebuilt once imported trivias are written"""
+        self.write_lines([json.dumps(self.record(0))])
+
+        out = StringIO()
+        call_command("import_trivias", self.path, stdout=out)
+
+        assert "Rebuilt search index" in out.getvalue()
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            {"question_title": "x" * 251},
+            {"question_title": "Points", "points": "many"},
+            {"question_title": "Answers", "answers": [{"is_correct": "maybe"}]},
+            {"question_title": "Answers", "answers": ["Right"]},
+        ],
+    )
+    def test_invalid_values_rejected(self, question):
+        """Test values the database would refuse stop the import cleanly"""
+        record = self.record(0)
+        record["questions"].append(question)
+        self.write_lines([json.dumps(record)])
+
+        with pytest.raises(CommandError, match="rerun with --resume"):
+            call_command("import_trivias", self.path, stdout=StringIO())
+        assert not Trivia.objects.filter(title="Imported 0").exists()
+
+    def test_database_error_reported(self):
+        """Test a batch failing in the database stops with the resume hint"""
+        self.write_lines([json.dumps(self.record(0))])
+        failing = mock.Mock(side_effect=IntegrityError("duplicate"))
+
+        with mock.patch.object(import_trivias, "import_records", failing):
+            with pytest.raises(CommandError, match="line 1: duplicate"):
+                call_command("import_trivias", self.path, stdout=StringIO())
+
+    def test_resume_rebuilds_indexes_of_failed_run(self):
+        """Test a resume creating nothing still indexes the earlier batches"""
+        lines = [json.dumps(self.record(0)), "not json"]
+        self.write_lines(lines)
+        with pytest.raises(CommandError):
+            call_command(
+                "import_trivias", self.path, "--batch-size", "1", stdout=StringIO()
+            )
+        assert read_checkpoint(self.checkpoint)["created"] == 1
+
+        self.write_lines(lines[:1] + [""])
+        out = StringIO()
+        call_command("import_trivias", self.path, "--resume", stdout=out)
+
+        assert "Imported 0 trivias" in out.getvalue()
+        assert "Rebuilt search index" in out.getvalue()
@@ -9,11 +9,13 @@ This module contains test cases for:
 """
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from api.apps.trivia.models import Trivia
 
-from .factories import UserFactory
+from .factories import TriviaFactory, UserFactory
 from .test_data import ERROR_MESSAGES, TEST_TRIVIA_DATA
 from .test_trivia_base import TestTriviaBase
 
@@ -88,3 +90,173 @@ class TestTriviaUpdates(TestTriviaBase):
         assert response.status_code == 200
         question.refresh_from_db()
         assert question.question_title == "Updated Question"
+
+
+@pytest.mark.django_db
+class TestBulkQuestionUpdates(TestTriviaBase):
+    """Test cases for the single pass update_questions engine"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme, api_client):
+        """Set up test environment"""
+        self.trivia = TriviaFactory.create_with_specific_questions(
+            3, answers_per_question=3, theme=test_theme, created_by=test_user
+        )
+        self.questions = list(self.trivia.questions.order_by("id"))
+        self.url = reverse("trivia-update-questions", args=[self.trivia.id])
+        api_client.force_authenticate(user=test_user)
+        self.client = api_client
+
+    def answers_of(self, question):
+        """Answers of a question in creation order"""
+        return list(question.answers.order_by("id"))
+
+    def test_updates_use_one_statement_per_table(self):
+        """Test edits across questions are written with one UPDATE per table"""
+        payload = {
+            "questions": [
+                {
+                    "id": str(question.id),
+                    "question_title": f"Edited {index}",
+                    "answers": [
+                        {
+                            "id": str(self.answers_of(question)[0].id),
+                            "answer_title": f"Edited answer {index}",
+                        }
+                    ],
+                }
+                for index, question in enumerate(self.questions)
+            ]
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data["questions_updated"] == 3
+        assert response.data["answers_updated"] == 3
+        updates = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        assert len(updates) == 2
+        for index, question in enumerate(self.questions):
+            question.refresh_from_db()
+            assert question.question_title == f"Edited {index}"
+            assert self.answers_of(question)[0].answer_title == f"Edited answer {index}"
+
+    def test_unchanged_values_are_not_written(self):
+        """Test sending current values issues no UPDATE"""
+        question = self.questions[0]
+        payload = {
+            "questions": [
+                {"id": question.id, "question_title": question.question_title}
+            ]
+        }
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data["questions_updated"] == 0
+        assert not [
+            query for query in context.captured_queries if "UPDATE" in query["sql"]
+        ]
+
+    def test_unknown_question_fails_whole_request(self):
+        """Test a bad question id rejects the request before any write"""
+        payload = {
+            "questions": [
+                {"id": self.questions[0].id, "question_title": "Should not stick"},
+                {"id": 999999, "question_title": "Missing"},
+            ]
+        }
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 404
+        self.questions[0].refresh_from_db()
+        assert self.questions[0].question_title != "Should not stick"
+
+    def test_answer_of_other_question_fails_whole_request(self):
+        """Test answers are only accepted under their own question"""
+        first, second = self.questions[:2]
+        foreign_answer = self.answers_of(second)[0]
+        payload = {
+            "questions": [
+                {
+                    "id": first.id,
+                    "question_title": "Should not stick",
+                    "answers": [{"id": foreign_answer.id, "answer_title": "Moved"}],
+                }
+            ]
+        }
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 404
+        first.refresh_from_db()
+        foreign_answer.refresh_from_db()
+        assert first.question_title != "Should not stick"
+        assert foreign_answer.answer_title != "Moved"
+
+    def test_invalid_value_fails_whole_request(self):
+        """Test an invalid value rejects the request before any write"""
+        payload = {
+            "questions": [
+                {"id": self.questions[0].id, "question_title": "Should not stick"},
+                {"id": self.questions[1].id, "points": "many"},
+            ]
+        }
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 400
+        self.questions[0].refresh_from_db()
+        assert self.questions[0].question_title != "Should not stick"
+
+    @pytest.mark.parametrize(
+        "field, value",
+        [
+            ("question_title", "x" * 251),
+            ("points", "many"),
+            ("question_title", ""),
+            ("is_active", "sometimes"),
+        ],
+    )
+    def test_field_constraints_rejected(self, field, value):
+        """Test values the database would refuse are rejected as 400"""
+        payload = {
+            "questions": [
+                {"id": self.questions[0].id, "question_title": "Should not stick"},
+                {"id": self.questions[1].id, field: value},
+            ]
+        }
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 400
+        assert response.data["error"].startswith(f"{field}:")
+        self.questions[0].refresh_from_db()
+        assert self.questions[0].question_title != "Should not stick"
+
+    def test_new_answers_are_created(self):
+        """Test answers without an id are added to their question"""
+        question = self.questions[0]
+        payload = {
+            "questions": [
+                {
+                    "id": question.id,
+                    "answers": [{"answer_title": "Brand new", "is_correct": False}],
+                }
+            ]
+        }
+
+        response = self.client.patch(self.url, payload, format="json")
+
+        assert response.status_code == 200
+        assert response.data["answers_created"] == 1
+        new_answer = self.answers_of(question)[-1]
+        assert new_answer.answer_title == "Brand new"
+        assert new_answer.trivia_id == self.trivia.id
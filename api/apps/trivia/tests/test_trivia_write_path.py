@@ -0,0 +1,149 @@
+"""
+Trivia Write Path Test Module
+
+This module contains test cases for:
+- Bulk creation of nested questions and answers
+- Primary key linkage between bulk created questions and answers
+- INSERT count and wall time benchmark for a 5x5 trivia
+"""
+
+import time
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.apps.trivia.models import Answer, Question, Trivia
+from api.apps.trivia.serializers import TriviaSerializer
+from api.utils.logging_utils import logger
+
+from .test_data import MAX_ANSWERS, MAX_QUESTIONS
+from .test_trivia_base import TestTriviaBase
+
+BENCHMARK_ROUNDS = 20
+
+
+def build_trivia_data(title, theme, questions=MAX_QUESTIONS, answers=MAX_ANSWERS):
+    """Build serializer input for a trivia of the given shape"""
+    return {
+        "title": title,
+        "difficulty": 1,
+        "theme": theme.name,
+        "questions": [
+            {
+                "question_title": f"Question {q}",
+                "points": 1,
+                "answers": [
+                    {"answer_title": f"Answer {q}.{a}", "is_correct": a == 0}
+                    for a in range(answers)
+                ],
+            }
+            for q in range(questions)
+        ],
+    }
+
+
+def create_row_by_row(validated_data):
+    """Previous write path: one INSERT per question and per answer"""
+    questions_data = validated_data.pop("questions", [])
+    trivia = Trivia.objects.create(**validated_data)
+    for question_data in questions_data:
+        answers_data = question_data.pop("answers", [])
+        question = Question.objects.create(trivia=trivia, **question_data)
+        for answer_data in answers_data:
+            Answer.objects.create(question=question, trivia=trivia, **answer_data)
+    return trivia
+
+
+def count_inserts(queries):
+    """Count INSERT statements in captured queries"""
+    return sum(1 for query in queries if query["sql"].startswith("INSERT"))
+
+
+@pytest.mark.django_db
+class TestTriviaWritePath(TestTriviaBase):
+    """Test cases for the bulk insert trivia write path"""
+
+    @pytest.fixture(autouse=True)
+    def setup_method(self, test_user, test_theme):
+        """Set up test environment"""
+        self.user = test_user
+        self.theme = test_theme
+
+    def create_with_serializer(self, title):
+        """Create a 5x5 trivia through TriviaSerializer"""
+        serializer = TriviaSerializer(data=build_trivia_data(title, self.theme))
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            return serializer.save(created_by=self.user)
+
+    def run_row_by_row(self, title):
+        """Create a 5x5 trivia with the previous per-row inserts"""
+        serializer = TriviaSerializer(data=build_trivia_data(title, self.theme))
+        serializer.is_valid(raise_exception=True)
+        validated_data = {**serializer.validated_data, "theme": self.theme}
+        with transaction.atomic():
+            return create_row_by_row({**validated_data, "created_by": self.user})
+
+    def test_bulk_create_links_answers_to_questions(self):
+        """Test every answer belongs to the question it was sent with"""
+        trivia = self.create_with_serializer("Linked trivia")
+
+        questions = list(trivia.questions.order_by("id"))
+        assert len(questions) == MAX_QUESTIONS
+        for index, question in enumerate(questions):
+            assert question.question_title == f"Question {index}"
+            titles = list(
+                question.answers.order_by("id").values_list("answer_title", flat=True)
+            )
+            assert titles == [f"Answer {index}.{a}" for a in range(MAX_ANSWERS)]
+            assert question.answers.filter(trivia=trivia).count() == MAX_ANSWERS
+
+    def test_bulk_create_without_returned_keys(self):
+        """Test answers are linked when the backend returns no keys (MySQL)"""
+        with mock.patch.object(
+            type(connection.features),
+            "can_return_rows_from_bulk_insert",
+            new_callable=mock.PropertyMock,
+            return_value=False,
+        ):
+            trivia = self.create_with_serializer("MySQL style trivia")
+
+        for index, question in enumerate(trivia.questions.order_by("id")):
+            first_answer = question.answers.order_by("id").first()
+            assert first_answer.answer_title == f"Answer {index}.0"
+
+    def test_bulk_create_insert_count(self):
+        """Test a 5x5 trivia needs one INSERT per table"""
+        with CaptureQueriesContext(connection) as context:
+            self.create_with_serializer("Counted trivia")
+
+        # Trivia, all questions, all answers
+        assert count_inserts(context.captured_queries) == 3
+
+    def test_benchmark_against_row_by_row(self):
+        """Benchmark INSERT count and wall time before and after bulk inserts"""
+        results = {}
+        for name, create in (
+            ("row_by_row", self.run_row_by_row),
+            ("bulk", self.create_with_serializer),
+        ):
+            inserts = 0
+            started = time.perf_counter()
+            for round_number in range(BENCHMARK_ROUNDS):
+                with CaptureQueriesContext(connection) as context:
+                    create(f"{name} trivia {round_number}")
+                inserts = count_inserts(context.captured_queries)
+            elapsed_ms = (time.perf_counter() - started) * 1000 / BENCHMARK_ROUNDS
+            results[name] = (inserts, elapsed_ms)
+
+        for name, (inserts, elapsed_ms) in results.items():
+            logger.info(
+                f"5x5 trivia create [{name}]: "
+                f"{inserts} INSERTs, {elapsed_ms:.2f} ms per trivia"
+            )
+
+        expected_rows = 1 + MAX_QUESTIONS + MAX_QUESTIONS * MAX_ANSWERS
+        assert results["row_by_row"][0] == expected_rows
+        assert results["bulk"][0] == 3
@@ -0,0 +1,353 @@
+"""
+Trivia Transfer Module
+
+This module streams trivias in and out of the database as NDJSON, one
+trivia graph (trivia, questions and answers) per line, so datasets can be
+seeded or copied without creating trivias one API call at a time.
+
+Exports walk trivias in (created_at, id) order with iterator(), holding
+a single chunk of trivias with their questions and answers in memory.
+Imports write each batch of lines with one bulk_create per table inside
+one transaction.
+
+Both directions record a checkpoint after every batch: the byte offset
+reached in the file, the rows done and, for exports, a keyset cursor
+after the last exported trivia. A failed run continues from there.
+
+Features:
+- Constant memory whatever the file size
+- One transaction and a fixed number of queries per import batch
+- Idempotent imports: trivias whose id or title already exist are skipped
+- Resumable from a checkpoint offset
+"""
+
+import json
+import os
+import uuid
+from collections import defaultdict
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import Prefetch, Q
+
+from api.utils.cache_utils import invalidate_tags_on_commit
+from api.utils.json_utils import dumps, loads
+
+from .models import Answer, Language, Question, Theme, Trivia
+from .pagination import decode_cursor
+
+TRANSFER_BATCH_SIZE = 500
+
+DIFFICULTIES = {level for level, _ in Trivia.DIFFICULTY_CHOICES}
+
+# Record values written as is, checked against their model field
+TRIVIA_FIELDS = ("title", "is_public", "url")
+QUESTION_FIELDS = ("question_title", "points", "is_active")
+ANSWER_FIELDS = ("answer_title", "is_correct", "is_active")
+
+
+def export_queryset(cursor: Optional[str] = None):
+    """
+    Trivias to export with their whole graph, in keyset order.
+
+    Args:
+        cursor: Optional checkpoint cursor; only later trivias are returned
+    """
+    queryset = Trivia.objects.order_by("created_at", "id")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+        )
+
+    answers = Answer.objects.order_by("id")
+    questions = Question.objects.order_by("id").prefetch_related(
+        Prefetch("answers", queryset=answers)
+    )
+    return queryset.select_related("theme", "language", "created_by").prefetch_related(
+        Prefetch("questions", queryset=questions)
+    )
+
+
+def serialize_trivia(trivia) -> dict:
+    """Convert a trivia loaded by export_queryset into an NDJSON record"""
+    return {
+        "id": str(trivia.id),
+        "title": trivia.title,
+        "difficulty": trivia.difficulty,
+        "is_public": trivia.is_public,
+        "theme": trivia.theme.name,
+        "language": trivia.language.code if trivia.language else None,
+        "url": trivia.url,
+        "created_by": trivia.created_by.username if trivia.created_by else None,
+        "questions": [
+            {
+                "question_title": question.question_title,
+                "points": question.points,
+                "is_active": question.is_active,
+                "answers": [
+                    {
+                        "answer_title": answer.answer_title,
+                        "is_correct": answer.is_correct,
+                        "is_active": answer.is_active,
+                    }
+                    for answer in question.answers.all()
+                ],
+            }
+            for question in trivia.questions.all()
+        ],
+    }
+
+
+def iter_export(
+    cursor: Optional[str] = None, chunk_size=TRANSFER_BATCH_SIZE
+) -> Iterator[Tuple[Trivia, bytes]]:
+    """
+    Stream trivias as encoded NDJSON lines.
+
+    Yields:
+        tuple: (trivia, line) with the line terminated by a newline
+    """
+    for trivia in export_queryset(cursor).iterator(chunk_size=chunk_size):
+        yield trivia, dumps(serialize_trivia(trivia)) + b"\n"
+
+
+def read_batches(
+    stream: IO[bytes], batch_size=TRANSFER_BATCH_SIZE
+) -> Iterator[Tuple[List[bytes], int]]:
+    """
+    Read lines from a binary stream in batches.
+
+    Yields:
+        tuple: (lines, offset) where offset is the byte position right
+        after the batch, the checkpoint to resume from
+    """
+    lines = []
+    for line in iter(stream.readline, b""):
+        lines.append(line)
+        if len(lines) == batch_size:
+            yield lines, stream.tell()
+            lines = []
+    if lines:
+        yield lines, stream.tell()
+
+
+def clean_values(model, data: dict, fields, label: str) -> None:
+    """
+    Validate and convert the values of a record with their model fields.
+
+    Catches what the database would refuse (wrong types, too long,
+    out of range) before the batch is written.
+
+    Raises:
+        ValueError: Naming the first invalid field
+    """
+    for name in fields:
+        field = model._meta.get_field(name)
+        value = data.get(name)
+        if value is None and (field.null or name not in data):
+            continue
+        try:
+            data[name] = field.clean(value, None)
+        except ValidationError as e:
+            raise ValueError(f"Invalid {label}{name}: {' '.join(e.messages)}")
+
+
+def parse_record(line: bytes) -> Optional[dict]:
+    """
+    Decode and validate one NDJSON line.
+
+    Returns:
+        dict: Trivia record
+        None: For blank lines
+
+    Raises:
+        ValueError: If the line is not a valid trivia record
+    """
+    if not line.strip():
+        return None
+    record = loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Expected a JSON object")
+    if not isinstance(record.get("title"), str) or not record["title"].strip():
+        raise ValueError("Missing title")
+    if record.get("difficulty") not in DIFFICULTIES:
+        raise ValueError(f"Invalid difficulty: {record.get('difficulty')!r}")
+    if not isinstance(record.get("theme"), str) or not record["theme"].strip():
+        raise ValueError("Missing theme")
+    if record.get("id") is not None:
+        record["id"] = uuid.UUID(str(record["id"]))
+    clean_values(Trivia, record, TRIVIA_FIELDS, "")
+    clean_values(Theme, {"name": record["theme"]}, ["name"], "theme ")
+
+    questions = record.setdefault("questions", [])
+    if not isinstance(questions, list):
+        raise ValueError("questions must be a list")
+    for q, question in enumerate(questions):
+        if not isinstance(question, dict) or not isinstance(
+            question.setdefault("answers", []), list
+        ):
+            raise ValueError("Each question must be an object with a list of answers")
+        clean_values(Question, question, QUESTION_FIELDS, f"questions[{q}].")
+        for a, answer in enumerate(question["answers"]):
+            if not isinstance(answer, dict):
+                raise ValueError("Each answer must be an object")
+            clean_values(Answer, answer, ANSWER_FIELDS, f"questions[{q}].answers[{a}].")
+    return record
+
+
+def resolve_themes(names) -> Dict[str, uuid.UUID]:
+    """Get the ids of themes by name, creating the missing ones"""
+    themes = dict(Theme.objects.filter(name__in=names).values_list("name", "id"))
+    missing = set(names) - set(themes)
+    if missing:
+        Theme.objects.bulk_create(
+            [Theme(name=name) for name in missing], ignore_conflicts=True
+        )
+        themes.update(Theme.objects.filter(name__in=missing).values_list("name", "id"))
+        invalidate_tags_on_commit("themes")
+    return themes
+
+
+def assign_question_ids(questions: List[Question]) -> None:
+    """
+    Set the primary keys of bulk inserted questions where the backend
+    does not return them (MySQL).
+
+    All questions of the new trivias were inserted by this batch, in
+    order, so the n-th id of a trivia belongs to its n-th question.
+    """
+    by_trivia = defaultdict(list)
+    for question in questions:
+        by_trivia[question.trivia_id].append(question)
+    stored = defaultdict(list)
+    for trivia_id, question_id in (
+        Question.objects.filter(trivia_id__in=by_trivia)
+        .order_by("trivia_id", "id")
+        .values_list("trivia_id", "id")
+    ):
+        stored[trivia_id].append(question_id)
+    for trivia_id, trivia_questions in by_trivia.items():
+        for question, question_id in zip(trivia_questions, stored[trivia_id]):
+            question.id = question_id
+
+
+def import_records(records: List[dict]) -> Tuple[int, int]:
+    """
+    Insert a batch of trivia records in one transaction.
+
+    Themes are created on demand; languages are matched by code and
+    creators by username (unknown creators are left empty). Bulk inserts
+    skip model signals, so derived indexes must be rebuilt afterwards.
+
+    Returns:
+        tuple: (created, skipped) trivia counts
+
+    Raises:
+        ValueError: If a record references an unknown language
+    """
+    ids = [record["id"] for record in records if record.get("id")]
+    titles = [record["title"] for record in records]
+    codes = {record["language"] for record in records if record.get("language")}
+    usernames = {record["created_by"] for record in records if record.get("created_by")}
+
+    with transaction.atomic():
+        existing = Trivia.objects.filter(Q(id__in=ids) | Q(title__in=titles))
+        taken_ids, taken_titles = set(), set()
+        for trivia_id, title in existing.values_list("id", "title"):
+            taken_ids.add(trivia_id)
+            taken_titles.add(title)
+
+        languages = dict(
+            Language.objects.filter(code__in=codes).values_list("code", "id")
+        )
+        unknown = codes - set(languages)
+        if unknown:
+            raise ValueError(f"Unknown language codes: {sorted(unknown)}")
+        users = dict(
+            get_user_model()
+            .objects.filter(username__in=usernames)
+            .values_list("username", "id")
+        )
+
+        new = []
+        for record in records:
+            if record.get("id") in taken_ids or record["title"] in taken_titles:
+                continue
+            if record.get("id"):
+                taken_ids.add(record["id"])
+            taken_titles.add(record["title"])
+            new.append(record)
+        themes = resolve_themes({record["theme"] for record in new})
+
+        trivias = Trivia.objects.bulk_create(
+            Trivia(
+                id=record.get("id") or uuid.uuid4(),
+                title=record["title"],
+                difficulty=record["difficulty"],
+                is_public=record.get("is_public", True),
+                theme_id=themes[record["theme"]],
+                language_id=languages.get(record.get("language")),
+                url=record.get("url"),
+                created_by_id=users.get(record.get("created_by")),
+            )
+            for record in new
+        )
+
+        questions, answers = [], []
+        for trivia, record in zip(trivias, new):
+            for data in record["questions"]:
+                questions.append(
+                    Question(
+                        trivia=trivia,
+                        question_title=data.get("question_title"),
+                        points=data.get("points", 10),
+                        is_active=data.get("is_active", True),
+                    )
+                )
+                answers.append(data["answers"])
+        Question.objects.bulk_create(questions)
+        connection = connections[router.db_for_write(Question)]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            assign_question_ids(questions)
+
+        Answer.objects.bulk_create(
+            Answer(
+                trivia_id=question.trivia_id,
+                question=question,
+                answer_title=data.get("answer_title"),
+                is_correct=data.get("is_correct", False),
+                is_active=data.get("is_active", True),
+            )
+            for question, question_answers in zip(questions, answers)
+            for data in question_answers
+        )
+
+    return len(trivias), len(records) - len(trivias)
+
+
+def read_checkpoint(path: str) -> Optional[dict]:
+    """Load a checkpoint, or None if there is none"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path: str, checkpoint: dict) -> None:
+    """Replace a checkpoint atomically, so a crash never leaves it partial"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(temporary, path)
+
+
+def clear_checkpoint(path: str) -> None:
+    """Remove the checkpoint of a finished run"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,264 @@
+"""
+Trivia Updates Module
+
+This module provides the bulk write engine for the questions and answers
+of a trivia.
+
+Features:
+- Bulk creation of questions and answers with linked primary keys
+- All referenced questions and answers loaded up front
+- Every id and value validated with its model field (type, length,
+  range) before anything is written
+- bulk_update restricted to the fields that actually changed
+- One atomic block, so a bad id or value fails the whole request
+- Edited questions and answers locked from read to write, so concurrent
+  updates of a trivia never overwrite each other's edits
+"""
+
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .models import Answer, Question
+from .signals import trivia_content_changed
+
+QUESTION_FIELDS = ("question_title", "points", "is_active")
+ANSWER_FIELDS = ("answer_title", "is_correct", "is_active")
+
+
+def bulk_create_questions(trivia, questions, answers):
+    """
+    Insert new questions and their answers with one INSERT per table.
+
+    Bulk inserts skip model signals, so callers are responsible for
+    refreshing data derived from the trivia.
+
+    Args:
+        trivia: Trivia owning the questions
+        questions: Unsaved Question instances
+        answers: Unsaved Answer instances for each question, in the same order
+
+    Returns:
+        list: Created questions with their primary keys set
+    """
+    questions = Question.objects.bulk_create(questions)
+
+    connection = connections[router.db_for_write(Question)]
+    if not connection.features.can_return_rows_from_bulk_insert:
+        # MySQL does not report generated keys for multi-row inserts.
+        # Auto-increment keys of one INSERT are consecutive, so the newest
+        # questions of this trivia come back in insertion order.
+        question_ids = list(
+            Question.objects.filter(trivia=trivia)
+            .order_by("-id")
+            .values_list("id", flat=True)[: len(questions)]
+        )
+        for question, question_id in zip(questions, reversed(question_ids)):
+            question.id = question_id
+
+    new_answers = []
+    for question, question_answers in zip(questions, answers):
+        for answer in question_answers:
+            answer.question = question
+            answer.trivia = trivia
+            new_answers.append(answer)
+    Answer.objects.bulk_create(new_answers)
+    return questions
+
+
+def parse_id(value, model):
+    """
+    Convert a submitted id to an integer primary key.
+
+    Raises:
+        ValidationError: If the id is not an integer
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValidationError(f"Invalid {model._meta.model_name} id: {value}")
+
+
+def apply_values(instance, data, fields):
+    """
+    Apply submitted values to an instance and report what changed.
+
+    Values are cleaned with the model field, so "3" and 3 compare equal
+    and values the database would refuse (too long, out of range) are
+    rejected. Keys other than the editable fields, the id and nested
+    answers are rejected.
+
+    Returns:
+        set: Names of the fields whose value changed
+
+    Raises:
+        ValidationError: On unknown fields or invalid values
+    """
+    unknown = set(data) - set(fields) - {"id", "answers"}
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    changed = set()
+    for name in fields:
+        if name not in data:
+            continue
+        field = instance._meta.get_field(name)
+        value = data[name]
+        if value is not None or not field.null:
+            try:
+                value = field.clean(value, instance)
+            except ValidationError as e:
+                raise ValidationError(f"{name}: {' '.join(e.messages)}")
+        if getattr(instance, name) != value:
+            setattr(instance, name, value)
+            changed.add(name)
+    return changed
+
+
+def load_questions(trivia, questions_data):
+    """
+    Load every question and answer referenced by a payload.
+
+    Runs two queries regardless of the payload size: one for the
+    questions of the trivia and one for their referenced answers. Both
+    lock their rows, so callers must run inside a transaction.
+
+    Returns:
+        dict: Questions by id, each with an answers_by_id dict
+
+    Raises:
+        Question.DoesNotExist: If a question id is not part of the trivia
+        Answer.DoesNotExist: If an answer id is not part of its question
+        ValidationError: If an id is malformed
+    """
+    question_ids, answer_ids = set(), set()
+    for question_data in questions_data:
+        if question_data.get("id") is not None:
+            question_ids.add(parse_id(question_data["id"], Question))
+        for answer_data in question_data.get("answers", []):
+            if answer_data.get("id") is not None:
+                answer_ids.add(parse_id(answer_data["id"], Answer))
+
+    questions = {}
+    if question_ids:
+        answers = (
+            Answer.objects.filter(id__in=answer_ids).order_by("id").select_for_update()
+        )
+        queryset = (
+            Question.objects.filter(trivia=trivia, id__in=question_ids)
+            .order_by("id")
+            .select_for_update()
+            .prefetch_related(Prefetch("answers", queryset=answers))
+        )
+        for question in queryset:
+            question.answers_by_id = {a.id: a for a in question.answers.all()}
+            questions[question.id] = question
+
+    missing = sorted(question_ids - set(questions))
+    if missing:
+        raise Question.DoesNotExist(
+            f"Question not found: {', '.join(map(str, missing))}"
+        )
+
+    for question_data in questions_data:
+        question = None
+        if question_data.get("id") is not None:
+            question = questions[int(question_data["id"])]
+        for answer_data in question_data.get("answers", []):
+            if answer_data.get("id") is None:
+                continue
+            answer_id = int(answer_data["id"])
+            if question is None or answer_id not in question.answers_by_id:
+                raise Answer.DoesNotExist(f"Answer not found: {answer_id}")
+
+    return questions
+
+
+def apply_question_updates(trivia, questions_data):
+    """
+    Apply a questions payload to a trivia in a single pass.
+
+    Questions and answers with an id are updated, entries without an id
+    are created. Nothing is written unless every id and value is valid.
+
+    Args:
+        trivia: Trivia being edited
+        questions_data: List of question dicts with optional nested answers
+
+    Returns:
+        dict: Number of updated and created questions and answers
+
+    Raises:
+        Question.DoesNotExist: If a question id is not part of the trivia
+        Answer.DoesNotExist: If an answer id is not part of its question
+        ValidationError: On malformed ids, unknown fields or invalid values
+    """
+    with transaction.atomic():
+        questions = load_questions(trivia, questions_data)
+
+        updated_questions, question_fields = [], set()
+        updated_answers, answer_fields = [], set()
+        new_questions, new_question_answers, new_answers = [], [], []
+
+        for question_data in questions_data:
+            if question_data.get("id") is None:
+                question = Question(trivia=trivia)
+                apply_values(question, question_data, QUESTION_FIELDS)
+                new_questions.append(question)
+                question_answers = []
+                for answer_data in question_data.get("answers", []):
+                    answer = Answer()
+                    apply_values(answer, answer_data, ANSWER_FIELDS)
+                    question_answers.append(answer)
+                new_question_answers.append(question_answers)
+                continue
+
+            question = questions[int(question_data["id"])]
+            changed = apply_values(question, question_data, QUESTION_FIELDS)
+            if changed:
+                updated_questions.append(question)
+                question_fields |= changed
+
+            for answer_data in question_data.get("answers", []):
+                if answer_data.get("id") is None:
+                    answer = Answer(question=question, trivia=trivia)
+                    apply_values(answer, answer_data, ANSWER_FIELDS)
+                    new_answers.append(answer)
+                    continue
+
+                answer = question.answers_by_id[int(answer_data["id"])]
+                changed = apply_values(answer, answer_data, ANSWER_FIELDS)
+                if changed:
+                    updated_answers.append(answer)
+                    answer_fields |= changed
+
+        # bulk_update does not touch auto_now fields on its own
+        now = timezone.now()
+        if updated_questions:
+            for question in updated_questions:
+                question.updated_at = now
+            Question.objects.bulk_update(
+                updated_questions, [*sorted(question_fields), "updated_at"]
+            )
+        if updated_answers:
+            for answer in updated_answers:
+                answer.updated_at = now
+            Answer.objects.bulk_update(
+                updated_answers, [*sorted(answer_fields), "updated_at"]
+            )
+        if new_questions:
+            bulk_create_questions(trivia, new_questions, new_question_answers)
+        if new_answers:
+            Answer.objects.bulk_create(new_answers)
+
+        if updated_questions or updated_answers or new_questions or new_answers:
+            trivia_content_changed(trivia.id)
+
+    return {
+        "questions_updated": len(updated_questions),
+        "answers_updated": len(updated_answers),
+        "questions_created": len(new_questions),
+        "answers_created": len(new_answers)
+        + sum(len(answers) for answers in new_question_answers),
+    }
@@ -11,21 +11,26 @@ Features:
 - UUID validation
 - Logging
 - Response standardization
+- Pre-rendered bundles with ETag validation
+- Batch retrieval of several bundles in one response
 """
 
 from uuid import UUID
 
+from django.http import HttpResponse, HttpResponseNotModified
 from rest_framework import status
 from rest_framework.permissions import BasePermission
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from api.utils.cache_utils import cache_response
+from api.utils.cache_utils import etag_matches
+from api.utils.compression import accepted_encoding
 from api.utils.logging_utils import log_exception, logger
 from api.utils.throttling import CustomAnonRateThrottle, CustomUserRateThrottle
 
-from .models import Trivia
-from .serializers import TriviaSerializer
+from .bundles import get_or_build_bundle, get_or_build_bundles
+
+QUESTIONS_BATCH_MAX = 50
 
 
 class GetQuestions(APIView):
@@ -43,16 +48,17 @@ class GetQuestions(APIView):
     throttle_classes = [CustomUserRateThrottle, CustomAnonRateThrottle]
 
     @log_exception
-    @cache_response()
     def get(self, request, trivia_id: str, format=None):
         """
         Get questions for a specific trivia.
-        Cached to improve performance and reduce database load.
+        Served from the bundle store to avoid ORM and serializer work.
 
         Cache Strategy:
-        - TTL: 15 minutes
+        - Store: Pre-encoded JSON bytes in Redis, with compressed variants
         - Key: Based on trivia_id
-        - Invalidated: When questions are updated
+        - Invalidated: Re-rendered when the trivia, its questions or
+          answers are saved or deleted
+        - Validation: Strong ETag, If-None-Match answered with 304
 
         Args:
             request: HTTP request
@@ -60,7 +66,7 @@ class GetQuestions(APIView):
             format: Response format (optional)
 
         Returns:
-            Response: List of questions if found
+            HttpResponse: List of questions if found
             Response: Error details if not found or invalid
         """
         try:
@@ -74,20 +80,26 @@ class GetQuestions(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Try to get trivia
-            try:
-                trivia = Trivia.objects.get(id=trivia_uuid)
-            except Trivia.DoesNotExist:
+            # Try to get the trivia bundle
+            bundle = get_or_build_bundle(trivia_uuid, accepted_encoding(request))
+            if bundle is None:
                 logger.warning(f"Access attempt to non-existent trivia: {trivia_id}")
                 return Response(
                     {"error": "Trivia not found"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            # Get questions
-            serializer_trivia = TriviaSerializer(trivia)
-            questions = serializer_trivia.data.get("questions", [])
-            return Response(questions)
+            # Client already has this version
+            if etag_matches(request, bundle.etag):
+                response = HttpResponseNotModified()
+                response["ETag"] = bundle.etag
+                return response
+
+            response = HttpResponse(bundle.body, content_type="application/json")
+            response["ETag"] = bundle.etag
+            # Stored variants, served by CompressionMiddleware as is
+            response.compressed = bundle.compressed
+            return response
 
         except Exception as e:
             logger.error(
@@ -96,3 +108,78 @@ class GetQuestions(APIView):
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+
+class GetQuestionsBatch(APIView):
+    """
+    View for retrieving the questions of several trivias at once.
+
+    Features:
+    - Public access
+    - Up to QUESTIONS_BATCH_MAX ids per request
+    - Constant query count whatever the batch size
+    - Rate limiting
+    """
+
+    permission_classes: list[BasePermission] = []
+    throttle_classes = [CustomUserRateThrottle, CustomAnonRateThrottle]
+
+    @log_exception
+    def post(self, request, format=None):
+        """
+        Get questions for a list of trivias.
+        Stored bundles are read in one Redis round trip and all misses are
+        built together, so the cost does not grow with one query per id.
+
+        Args:
+            request: HTTP request with {"ids": [trivia UUIDs]}
+
+        Returns:
+            HttpResponse: {"questions": {id: [...]}, "missing": [ids]}
+            Response: Error details if the id list is invalid
+        """
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response(
+                {"error": "ids must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(ids) > QUESTIONS_BATCH_MAX:
+            return Response(
+                {"error": f"At most {QUESTIONS_BATCH_MAX} ids per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            # Validate UUIDs, keeping the first occurrence of each
+            trivia_ids = list(dict.fromkeys(str(UUID(str(value))) for value in ids))
+        except ValueError:
+            logger.warning(f"Batch access attempt with invalid UUIDs: {ids}")
+            return Response(
+                {"error": "Invalid UUID format"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            bundles = get_or_build_bundles(trivia_ids)
+
+            # Stored bodies are spliced in as they are, never re-encoded
+            found = [
+                b'"%s":%s' % (trivia_id.encode(), bundles[trivia_id].body)
+                for trivia_id in trivia_ids
+                if trivia_id in bundles
+            ]
+            missing = ",".join(
+                f'"{trivia_id}"' for trivia_id in trivia_ids if trivia_id not in bundles
+            )
+            body = b'{"questions":{%s},"missing":[%s]}' % (
+                b",".join(found),
+                missing.encode(),
+            )
+            return HttpResponse(body, content_type="application/json")
+
+        except Exception as e:
+            logger.error(f"Error retrieving questions batch: Error={str(e)}")
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
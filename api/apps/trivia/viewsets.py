@@ -21,25 +21,48 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.utils import IntegrityError
+from django.http import HttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.response import Response
 
-from api.utils.cache_utils import cache_viewset_action
+from api.utils.cache_utils import cache_viewset_action, etag_viewset_action
 from api.utils.jwt_utils import get_user_id_by_username
 from api.utils.logging_utils import log_exception, logger
 
+from .availability import get_availability
+from .bundles import (
+    bundle_queryset,
+    embed_bundle,
+    get_or_build_bundle,
+    load_trivia_bundle,
+)
+from .catalog import filter_public_trivias
 from .models import Answer, Question, Theme, Trivia
+from .pagination import KeysetPagination
+from .quiz import QUIZ_DEFAULT_QUESTIONS, QUIZ_MAX_QUESTIONS, sample_questions
+from .sampling import pick_measured_trivia, pick_random_trivia
+from .search import search_trivias
 from .serializers import (
     QuestionSerializer,
+    QuizQuestionSerializer,
     ThemeSerializer,
     TriviaListSerializer,
     TriviaSerializer,
 )
+from .stats import check_responses, get_trivia_stats, record_answers
+from .updates import apply_question_updates
 
 User = get_user_model()
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+RANDOM_MAX_EXCLUDE = 100
+RANDOM_PICK_ATTEMPTS = 3
+ANSWERS_MAX_RECORDS = 200
+
 
 class TriviaViewSet(viewsets.ModelViewSet):
     """
@@ -50,8 +73,11 @@ class TriviaViewSet(viewsets.ModelViewSet):
     - Custom serializer selection
     - Permission-based access
     - Query filtering
+    - Keyset pagination on list (opt-in with ?limit or ?cursor)
     """
 
+    pagination_class = KeysetPagination
+
     def get_serializer_class(self):
         """Select appropriate serializer based on action"""
         if self.action == "list":
@@ -66,6 +92,23 @@ class TriviaViewSet(viewsets.ModelViewSet):
         """
         Filter queryset based on user permissions.
 
+        Actions that emit nested questions get the full trivia bundle
+        eagerly loaded.
+
+        Returns:
+            QuerySet: Filtered trivia objects
+        """
+        queryset = self.get_visible_queryset()
+        if self.action in ("retrieve", "questions"):
+            return bundle_queryset(queryset)
+        if self.action == "list":
+            return queryset.select_related("theme", "created_by")
+        return queryset
+
+    def get_visible_queryset(self):
+        """
+        Get the trivias visible to the current user.
+
         Returns:
             QuerySet: Filtered trivia objects
         """
@@ -106,7 +149,8 @@ class TriviaViewSet(viewsets.ModelViewSet):
             logger.error(f"Error creating trivia: User={username}, " f"Error={str(e)}")
             raise
 
-    @cache_viewset_action()
+    @etag_viewset_action(tags=["trivia:{id}", "themes"])
+    @cache_viewset_action(tags=["trivia:{id}", "themes"])
     @action(detail=False, methods=["get"])
     def get_trivia(self, request):
         """
@@ -114,9 +158,10 @@ class TriviaViewSet(viewsets.ModelViewSet):
         Cached to improve performance for frequently accessed trivias.
 
         Cache Strategy:
-        - TTL: 15 minutes
-        - Key: Based on trivia_id parameter
-        - Invalidated: On trivia update
+        - TTL: 24 hours (CACHE_TAGGED_TTL)
+        - Key: Based on trivia_id parameter and its tag generations
+        - Invalidated: On trivia, question, answer or theme changes
+        - Validation: Strong ETag, If-None-Match answered with 304
         """
         trivia_id = request.query_params.get("id")
         if not trivia_id:
@@ -134,7 +179,7 @@ class TriviaViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            trivia = Trivia.objects.get(id=trivia_id)
+            trivia = load_trivia_bundle(trivia_id)
             serializer = TriviaSerializer(trivia)
             return Response(serializer.data)
         except Trivia.DoesNotExist:
@@ -164,14 +209,190 @@ class TriviaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
+    @etag_viewset_action(tags=["availability", "themes"])
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        """
+        Get the theme × difficulty availability matrix.
+
+        GET /api/trivias/availability/
+
+        Only themes with at least one public trivia are listed, and each
+        lists only its non-empty difficulties, so clients can offer valid
+        combinations up front.
+
+        Cache Strategy:
+        - Store: Redis hash maintained per cell on trivia changes
+        - Validation: Strong ETag, If-None-Match answered with 304
+
+        Returns:
+            Response: [{"id", "name", "difficulties": {"1": count, ...}}]
+        """
+        matrix = get_availability()
+        themes = Theme.objects.filter(id__in=list(matrix)).order_by("name")
+        return Response(
+            [
+                {
+                    "id": str(theme.id),
+                    "name": theme.name,
+                    "difficulties": {
+                        str(difficulty): count
+                        for difficulty, count in sorted(matrix[str(theme.id)].items())
+                    },
+                }
+                for theme in themes
+            ]
+        )
+
+    @action(detail=False, methods=["get"], url_path="random", url_name="random")
+    def random_trivia(self, request):
+        """
+        Quick play: a random public trivia with its questions.
+
+        GET /api/trivias/random/?theme=<uuid>&difficulty=2&exclude=<id>,<id>
+
+        Theme and difficulty are optional. With measured=1 the difficulty
+        is the level measured from recorded answers instead of the one
+        picked by the author. Excluded ids (e.g. recently played
+        trivias) are never returned. The questions come from the
+        pre-encoded bundle store, so the whole game loads in one round trip.
+
+        Returns:
+            HttpResponse: {"id", "title", "difficulty", "measured_difficulty",
+                "theme", "url", "questions": [...]}
+            Response: 404 if no eligible trivia is left
+            Response: 400 if parameters invalid
+        """
+        theme = request.query_params.get("theme") or None
+        difficulty = request.query_params.get("difficulty") or None
+        measured = request.query_params.get("measured") in ("1", "true")
+        pick = pick_measured_trivia if measured else pick_random_trivia
+
+        try:
+            if theme is not None:
+                uuid.UUID(theme)
+            if difficulty is not None:
+                difficulty = int(difficulty)
+            # Canonical form, as stored in the pools
+            exclude = [
+                str(uuid.UUID(trivia_id))
+                for value in request.query_params.getlist("exclude")
+                for trivia_id in value.split(",")
+                if trivia_id
+            ]
+        except ValueError:
+            return Response(
+                {"error": "Invalid 'theme', 'difficulty' or 'exclude' parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(exclude) > RANDOM_MAX_EXCLUDE:
+            return Response(
+                {"error": f"At most {RANDOM_MAX_EXCLUDE} excluded trivias"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Pools may briefly lag behind a deleted or hidden trivia
+        for _ in range(RANDOM_PICK_ATTEMPTS):
+            trivia_id = pick(theme, difficulty, exclude)
+            if trivia_id is None:
+                break
+
+            trivia = (
+                Trivia.objects.filter(id=trivia_id, is_public=True)
+                .values(
+                    "title", "difficulty", "measured_difficulty", "url", "theme__name"
+                )
+                .first()
+            )
+            bundle = get_or_build_bundle(trivia_id) if trivia else None
+            if bundle is None:
+                exclude.append(trivia_id)
+                continue
+
+            fields = {
+                "id": trivia_id,
+                "title": trivia["title"],
+                "difficulty": trivia["difficulty"],
+                "measured_difficulty": trivia["measured_difficulty"],
+                "theme": trivia["theme__name"],
+                "url": trivia["url"],
+            }
+            logger.info(f"Quick play: picked {trivia_id}")
+            return HttpResponse(
+                embed_bundle(fields, bundle), content_type="application/json"
+            )
+
+        return Response(
+            {"error": "No trivias available for this combination"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    @action(detail=False, methods=["get"])
+    def quiz(self, request):
+        """
+        Build a quiz of questions mixed from all trivias of a cell.
+
+        GET /api/trivias/quiz/?theme=<uuid>&difficulty=2&count=10
+
+        Questions are drawn uniformly from the active questions of every
+        public trivia with the given theme and difficulty.
+
+        Returns:
+            Response: {"theme", "difficulty", "questions": [...]}, each
+                question with its answers and source trivia
+            Response: 404 if the combination has no questions
+            Response: 400 if parameters invalid
+        """
+        theme = request.query_params.get("theme")
+        difficulty = request.query_params.get("difficulty")
+        if not theme or not difficulty:
+            return Response(
+                {"error": "The parameters 'theme' and 'difficulty' are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            uuid.UUID(theme)
+            difficulty = int(difficulty)
+            count = int(request.query_params.get("count", QUIZ_DEFAULT_QUESTIONS))
+        except ValueError:
+            return Response(
+                {"error": "Invalid 'theme', 'difficulty' or 'count' parameter"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        count = max(1, min(count, QUIZ_MAX_QUESTIONS))
+
+        questions = sample_questions(theme, difficulty, count)
+        if not questions:
+            return Response(
+                {"error": "No questions available for this combination"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        logger.info(
+            f"Quiz built: theme={theme}, difficulty={difficulty}, "
+            f"questions={len(questions)}"
+        )
+        return Response(
+            {
+                "theme": theme,
+                "difficulty": difficulty,
+                "questions": QuizQuestionSerializer(questions, many=True).data,
+            }
+        )
+
     def list(self, request, *args, **kwargs):
         """
         List trivias with optional username filter.
 
         GET /api/trivias/?username=discord_user
+        GET /api/trivias/?limit=50&cursor=<next_cursor>
+
+        Passing limit or cursor returns one page ordered by creation,
+        wrapped as {"results": [...], "next_cursor": ...}.
 
         Returns:
-            Response: List of trivias
+            Response: List (or page) of trivias
         """
         username = request.query_params.get("username")
 
@@ -184,10 +405,19 @@ class TriviaViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_404_NOT_FOUND,
                     )
 
-                trivias = Trivia.objects.filter(created_by_id=user_id)
+                trivias = Trivia.objects.filter(created_by_id=user_id).select_related(
+                    "theme", "created_by"
+                )
+                page = self.paginate_queryset(trivias)
+                if page is not None:
+                    serializer = TriviaListSerializer(page, many=True)
+                    return self.get_paginated_response(serializer.data)
+
                 serializer = TriviaListSerializer(trivias, many=True)
                 return Response(serializer.data)
 
+            except APIException:
+                raise
             except Exception as e:
                 logger.error(f"Error getting trivias by user: {str(e)}")
                 return Response(
@@ -197,18 +427,77 @@ class TriviaViewSet(viewsets.ModelViewSet):
 
         return super().list(request, *args, **kwargs)
 
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search over trivia titles, questions and answers.
+
+        GET /api/trivias/search/?q=capital cities&lang=en&limit=20
+
+        Only trivias visible to the caller are returned, best match first.
+
+        Returns:
+            Response: Ranked list of id, title, difficulty, theme and score
+            Response: Error message if parameters invalid
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "The 'q' parameter is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            return Response(
+                {"error": "The 'limit' parameter must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+
+        results = search_trivias(
+            query,
+            queryset=self.get_visible_queryset(),
+            language=request.query_params.get("lang"),
+            limit=limit,
+        )
+        logger.info(f"Trivia search: q={query!r}, results={len(results)}")
+        return Response(results)
+
+    @etag_viewset_action(tags=["trivia:{pk}", "themes"], vary_on_user=True)
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get a trivia with its questions and answers.
+
+        Validation: Strong ETag per user (visibility depends on the
+        caller), If-None-Match answered with 304 before any query.
+        """
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"], url_path="filter")
     def filter_trivias(self, request):
         """
         Filter trivias by theme and difficulty.
 
+        GET /api/trivias/filter/?theme=<uuid>&difficulty=2&order=measured
+
+        order=measured sorts by the difficulty measured from recorded
+        answers, easiest first, and adds it to each entry.
+
         Returns:
             Response: Filtered trivia list
             Response: Error message if parameters invalid
         """
         theme = request.query_params.get("theme")
         difficulty = request.query_params.get("difficulty")
+        order = request.query_params.get("order", "title")
 
+        if order not in ("title", "measured"):
+            return Response(
+                {"error": "The 'order' parameter must be 'title' or 'measured'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         if not theme or not difficulty:
             logger.warning(
                 f"Filtering attempt without required parameters: "
@@ -223,24 +512,23 @@ class TriviaViewSet(viewsets.ModelViewSet):
             difficulty = int(difficulty)
             uuid.UUID(theme)
 
-            if not Theme.objects.filter(id=theme).exists():
+            filtered_trivias = filter_public_trivias(
+                theme, difficulty, by_measured=order == "measured"
+            )
+            if filtered_trivias is None:
                 logger.warning(f"Filtering attempt with non-existent theme: {theme}")
                 return Response(
                     {"error": "Theme not found"},
                     status=status.HTTP_404_NOT_FOUND,
                 )
 
-            query = models.Q(theme=theme, difficulty=difficulty, is_public=True)
-            filtered_trivias = Trivia.objects.filter(query).values("id", "title")
-
             logger.info(
                 f"Successful filtering: theme={theme}, difficulty={difficulty}, "
                 f"results={len(filtered_trivias)}"
             )
 
             simplified_response = [
-                {"id": str(trivia["id"]), "title": trivia["title"]}
-                for trivia in filtered_trivias
+                {**trivia, "id": str(trivia["id"])} for trivia in filtered_trivias
             ]
 
             return Response(simplified_response)
@@ -275,43 +563,33 @@ class TriviaViewSet(viewsets.ModelViewSet):
 
         PATCH /api/trivias/{trivia_id}/update_questions/
 
+        Entries with an id are updated, entries without one are created.
+        All ids are checked before writing and the changes are applied
+        atomically, so a single bad id or value rejects the whole request.
+
         Returns:
-            Response: Success message if updated
-            Response: Error message if update fails
+            Response: Success message with update counts
+            Response: 404 if a question or answer id does not belong here
+            Response: 400 on invalid fields or values
         """
         try:
             trivia = self.get_object()
             questions_data = request.data.get("questions", [])
+            if not isinstance(questions_data, list):
+                return Response(
+                    {"error": "questions must be a list"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-            for question_data in questions_data:
-                question_id = question_data.get("id")
-                if question_id:
-                    question = Question.objects.get(id=question_id, trivia=trivia)
-                    for key, value in question_data.items():
-                        if key != "answers":
-                            setattr(question, key, value)
-                    question.save()
-
-                    if "answers" in question_data:
-                        for answer_data in question_data["answers"]:
-                            answer_id = answer_data.get("id")
-                            if answer_id:
-                                answer = Answer.objects.get(
-                                    id=answer_id, question=question
-                                )
-                                for key, value in answer_data.items():
-                                    setattr(answer, key, value)
-                                answer.save()
-
-            return Response({"status": "questions updated"})
-        except Question.DoesNotExist:
-            return Response(
-                {"error": "Question not found"},
-                status=status.HTTP_404_NOT_FOUND,
-            )
-        except Answer.DoesNotExist:
+            result = apply_question_updates(trivia, questions_data)
+            return Response({"status": "questions updated", **result})
+        except Question.DoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Answer.DoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except ValidationError as e:
             return Response(
-                {"error": "Answer not found"}, status=status.HTTP_404_NOT_FOUND
+                {"error": " ".join(e.messages)}, status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
             logger.error(f"Error updating questions: {e}")
@@ -338,6 +616,77 @@ class TriviaViewSet(viewsets.ModelViewSet):
             logger.error(f"Update failed: {str(e)}")
             raise
 
+    @action(detail=False, methods=["post"], url_path="answers", url_name="answers")
+    def record_answers(self, request):
+        """
+        Record how players answered questions.
+
+        POST /api/trivias/answers/
+        {"answers": [{"question": 12, "answer": 40}, {"question": 13, "answer": null}]}
+
+        A null answer records an attempt nobody answered. Questions and
+        answers are checked in two queries, then only Redis counters are
+        touched; they reach the statistics tables on the next flush.
+
+        Returns:
+            Response: 202 with the number of recorded responses
+            Response: 400 if the payload is invalid, an id is unknown or
+                an answer does not belong to its question
+        """
+        answers = (
+            request.data.get("answers") if isinstance(request.data, dict) else None
+        )
+        if not isinstance(answers, list) or not answers:
+            return Response(
+                {"error": "answers must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(answers) > ANSWERS_MAX_RECORDS:
+            return Response(
+                {"error": f"At most {ANSWERS_MAX_RECORDS} answers per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            responses = [
+                (
+                    int(item["question"]),
+                    None if item.get("answer") is None else int(item["answer"]),
+                )
+                for item in answers
+            ]
+        except (KeyError, TypeError, ValueError):
+            return Response(
+                {"error": "Each answer needs an integer 'question' and 'answer'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            check_responses(responses)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        record_answers(responses)
+        return Response({"recorded": len(responses)}, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Get the answer statistics of the questions of a trivia.
+
+        GET /api/trivias/{id}/stats/
+
+        Served from the aggregate tables, which lag the games by at most
+        one flush interval.
+
+        Returns:
+            Response: {"id", "questions": [{"id", "question_title",
+                "attempts", "corrects", "correct_rate", "answers": [...]}]}
+        """
+        trivia = self.get_object()
+        return Response(
+            {"id": str(trivia.id), "questions": get_trivia_stats(trivia.id)}
+        )
+
     @action(detail=True, methods=["get"])
     def questions(self, request, pk=None):
         """Obtiene las preguntas y respuestas de una trivia específica"""
@@ -356,6 +705,16 @@ class ThemeViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Theme.objects.all()
     serializer_class = ThemeSerializer
 
-    @cache_viewset_action()
+    @etag_viewset_action(tags=["themes"])
+    @cache_viewset_action(tags=["themes"])
     def list(self, request, *args, **kwargs):
+        """
+        List all themes.
+
+        Cache Strategy:
+        - TTL: 24 hours (CACHE_TAGGED_TTL)
+        - Key: Global for all users
+        - Invalidated: When a theme is saved or deleted
+        - Validation: Strong ETag, If-None-Match answered with 304
+        """
         return super().list(request, *args, **kwargs)
@@ -3,14 +3,21 @@ ASGI config for trivia bot project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Requests are resolved with settings.ASGI_URLCONF, which serves the hot
+read endpoints from async views (see api.asgi_urls).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.1/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.django.base")
+
+django.setup(set_prefix=False)
 
-os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+from api.utils.asgi_utils import AsyncRoutesASGIHandler  # noqa: E402
 
-application = get_asgi_application()
+application = AsyncRoutesASGIHandler()
@@ -0,0 +1,38 @@
+"""
+ASGI URL Configuration Module
+
+This module defines the URL routing of the ASGI application
+(settings.ASGI_URLCONF). The read hot path is served by async views:
+- Question retrieval
+- Catalog filtering
+- Theme listing
+- Leaderboard top scores
+
+Every other route is taken as is from api.urls, so the same API is
+available under WSGI and ASGI.
+"""
+
+from django.urls import re_path
+
+from .apps.score.async_views import leaderboards
+from .apps.trivia.async_views import filter_trivias, get_questions, list_themes
+from .apps.trivia.views import GetQuestionsBatch
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    # Matched before the async questions route, which would take "batch"
+    re_path(
+        r"^api/questions/batch/?$",
+        GetQuestionsBatch.as_view(),
+        name="get-questions-batch",
+    ),
+    re_path(
+        r"^api/questions/(?P<trivia_id>[^/.]+)/?$",
+        get_questions,
+        name="get-questions",
+    ),
+    re_path(r"^api/trivias/filter/?$", filter_trivias, name="trivia-filter-trivias"),
+    re_path(r"^api/themes/?$", list_themes, name="theme-list"),
+    re_path(r"^api/leaderboards/?$", leaderboards, name="leaderboard-list"),
+    *sync_urlpatterns,
+]
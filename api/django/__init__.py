@@ -28,9 +28,17 @@ TRIVIA_URL = f"{BASE_URL}/api/trivias/"  # Base trivia endpoint (list & detail)
 THEME_URL = f"{BASE_URL}/api/themes/"  # Theme management endpoint
 DIFFICULTY_URL = f"{TRIVIA_URL}difficulty/"  # Difficulty settings endpoint
 FILTER_URL = f"{TRIVIA_URL}filter/"  # Trivia filtering endpoint
+SEARCH_URL = f"{TRIVIA_URL}search/"  # Trivia full-text search endpoint
+AVAILABILITY_URL = f"{TRIVIA_URL}availability/"  # Theme × difficulty matrix
+RANDOM_URL = f"{TRIVIA_URL}random/"  # Quick play random trivia endpoint
+QUIZ_URL = f"{TRIVIA_URL}quiz/"  # Mixed question quiz endpoint
+ANSWERS_URL = f"{TRIVIA_URL}answers/"  # Answer statistics recording endpoint
 QUESTIONS_URL = f"{BASE_URL}/api/questions/"  # Questions endpoint
+QUESTIONS_BATCH_URL = f"{QUESTIONS_URL}batch/"  # Questions of several trivias
 LEADERBOARD_URL = f"{BASE_URL}/api/leaderboards/"  # Leaderboard endpoint
+LEADERBOARD_RANK_URL = f"{LEADERBOARD_URL}rank/"  # Player rank lookup
 SCORES_URL = f"{BASE_URL}/api/score/"  # Score management endpoint
+SCORES_BATCH_URL = f"{SCORES_URL}batch/"  # Batched score submissions
 
 # Export all URL configurations
 __all__ = [
@@ -39,7 +47,15 @@ __all__ = [
     "THEME_URL",
     "DIFFICULTY_URL",
     "FILTER_URL",
+    "SEARCH_URL",
+    "AVAILABILITY_URL",
+    "RANDOM_URL",
+    "QUIZ_URL",
+    "ANSWERS_URL",
     "QUESTIONS_URL",
+    "QUESTIONS_BATCH_URL",
     "LEADERBOARD_URL",
+    "LEADERBOARD_RANK_URL",
     "SCORES_URL",
+    "SCORES_BATCH_URL",
 ]
@@ -101,6 +101,8 @@ INSTALLED_APPS = [
 # Middleware configuration for request/response processing
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # Compression of large responses, above monitoring which reads plain bodies
+    "api.utils.compression.CompressionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
@@ -111,8 +113,8 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Monitoring middleware
     "api.apps.monitoring.middleware.MonitoringMiddleware",
-    # WhiteNoise for static file serving
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    # WhiteNoise for static file serving, async capable for ASGI
+    "api.utils.asgi_utils.AsyncWhiteNoiseMiddleware",
 ]
 
 # Database configuration
@@ -153,6 +155,29 @@ CACHE_TTL = env("CACHE_TTL", default=60 * 15)
 # Cache key prefix to avoid collisions
 CACHE_KEY_PREFIX = env("CACHE_KEY_PREFIX", default="trivia_api")
 
+# Pre-rendered trivia bundles are refreshed on change, so they can live long
+TRIVIA_BUNDLE_TTL = env.int("TRIVIA_BUNDLE_TTL", default=60 * 60 * 24 * 7)
+
+# Tagged responses are invalidated on write, so they can outlive CACHE_TTL
+CACHE_TAGGED_TTL = env.int("CACHE_TAGGED_TTL", default=60 * 60 * 24)
+
+# The availability matrix is maintained on change; the TTL only bounds
+# drift after a missed update (e.g. Redis unavailable during a refresh)
+TRIVIA_AVAILABILITY_TTL = env.int("TRIVIA_AVAILABILITY_TTL", default=60 * 60 * 24)
+
+# Analyzer used for trivias without a language (see api.apps.trivia.search)
+TRIVIA_SEARCH_LANGUAGE = env("TRIVIA_SEARCH_LANGUAGE", default="en")
+
+# Shingle similarity from which questions count as near-duplicates
+# (see api.apps.trivia.duplicates)
+TRIVIA_DUPLICATE_THRESHOLD = env.float("TRIVIA_DUPLICATE_THRESHOLD", default=0.7)
+
+# Pseudo-responses at the global success rate added to every question
+# when measuring difficulty (see api.apps.trivia.calibration)
+TRIVIA_CALIBRATION_PRIOR_WEIGHT = env.float(
+    "TRIVIA_CALIBRATION_PRIOR_WEIGHT", default=20.0
+)
+
 # JWT Authentication settings
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
@@ -173,6 +198,10 @@ SIMPLE_JWT = {
 # Root URL configuration
 ROOT_URLCONF = "api.urls"
 
+# URL configuration of the ASGI application: async views for the hot
+# read endpoints in front of ROOT_URLCONF (see api.utils.asgi_utils)
+ASGI_URLCONF = "api.asgi_urls"
+
 # Template configuration
 TEMPLATES = [
     {
@@ -190,8 +219,9 @@ TEMPLATES = [
     },
 ]
 
-# WSGI application path
+# WSGI and ASGI application paths
 WSGI_APPLICATION = "api.wsgi.application"
+ASGI_APPLICATION = "api.asgi.application"
 
 # Password validation settings
 AUTH_PASSWORD_VALIDATORS = [
@@ -251,10 +281,10 @@ REST_FRAMEWORK = {
     ),
     "DEFAULT_PERMISSION_CLASSES": [],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.utils.json_utils.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        "api.utils.json_utils.FastJSONParser",
     ],
     "EXCEPTION_HANDLER": "rest_framework.views.exception_handler",
     "DEFAULT_THROTTLE_CLASSES": [
@@ -267,6 +297,16 @@ REST_FRAMEWORK = {
     },
 }
 
+# Response compression: bodies smaller than this are sent as is
+COMPRESSION_MIN_SIZE = env.int("COMPRESSION_MIN_SIZE", default=1024)
+# Levels balancing ratio and CPU (the web container has half a core)
+COMPRESSION_GZIP_LEVEL = env.int("COMPRESSION_GZIP_LEVEL", default=6)
+COMPRESSION_BROTLI_QUALITY = env.int("COMPRESSION_BROTLI_QUALITY", default=5)
+
+# JSON codec of the API renderer/parser and the monitoring middleware:
+# "orjson" (the json module is used if it is not installed) or "json"
+JSON_CODEC = env("JSON_CODEC", default="orjson")
+
 AUTH_USER_MODEL = "users.CustomUser"
 
 # Monitoring settings
@@ -279,6 +319,13 @@ if DEBUG:
     MONITORING["REQUEST_LOG_RETENTION_DAYS"] = 7
     MONITORING["ERROR_LOG_RETENTION_DAYS"] = 30
 
+# Score history retention (see api.apps.score.windows)
+SCORE_HISTORY = {
+    "EVENT_RETENTION_DAYS": 90,
+    "DAY_BUCKET_RETENTION_DAYS": 35,
+    "WEEK_BUCKET_RETENTION_WEEKS": 26,
+}
+
 # CSRF Configuration
 CSRF_COOKIE_NAME = "csrftoken"
 CSRF_HEADER_NAME = "HTTP_X_CSRFTOKEN"
@@ -342,3 +389,21 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
+CELERY_BEAT_SCHEDULE = {
+    "flush-answer-stats": {
+        "task": "flush_answer_stats_task",
+        "schedule": timedelta(minutes=5),
+    },
+    "calibrate-difficulty": {
+        "task": "calibrate_difficulty_task",
+        "schedule": timedelta(hours=1),
+    },
+    "flush-leaderboard-scores": {
+        "task": "flush_leaderboard_scores_task",
+        "schedule": timedelta(minutes=1),
+    },
+    "compact-score-events": {
+        "task": "compact_score_events_task",
+        "schedule": timedelta(days=1),
+    },
+}
@@ -6,6 +6,10 @@ in the Trivia API application.
 
 Current Tasks:
 - cleanup_logs_task: Automated log file maintenance
+- flush_answer_stats_task: Answer statistics write-behind flush
+- calibrate_difficulty_task: Measured difficulty from answer statistics
+- flush_leaderboard_scores_task: Leaderboard scores write-behind flush
+- compact_score_events_task: Score event and bucket retention
 
 Note:
     Celery must be running to execute these tasks.
@@ -41,3 +45,63 @@ def cleanup_logs_task():
     """
     call_command("cleanup_logs")
     return True
+
+
+@shared_task(name="flush_answer_stats_task")
+def flush_answer_stats_task():
+    """
+    Flush the answer statistics counters recorded in Redis.
+
+    Scheduled every few minutes by CELERY_BEAT_SCHEDULE; counters keep
+    accumulating in Redis while it does not run.
+
+    Returns:
+        bool: True if the flush completed successfully
+    """
+    call_command("flush_answer_stats")
+    return True
+
+
+@shared_task(name="calibrate_difficulty_task")
+def calibrate_difficulty_task():
+    """
+    Recompute the measured difficulty of questions with new answers.
+
+    Only statistics changed since the previous run are read, so the
+    hourly schedule stays cheap as the outcome tables grow.
+
+    Returns:
+        bool: True if the calibration completed successfully
+    """
+    call_command("calibrate_difficulty")
+    return True
+
+
+@shared_task(name="flush_leaderboard_scores_task")
+def flush_leaderboard_scores_task():
+    """
+    Flush the score changes recorded in the Redis leaderboards.
+
+    Scheduled every minute by CELERY_BEAT_SCHEDULE; leaderboards are
+    served from Redis meanwhile, so only the Score table lags behind.
+
+    Returns:
+        bool: True if the flush completed successfully
+    """
+    call_command("flush_leaderboard_scores")
+    return True
+
+
+@shared_task(name="compact_score_events_task")
+def compact_score_events_task():
+    """
+    Delete score events and day/week buckets past their retention.
+
+    Scheduled daily by CELERY_BEAT_SCHEDULE, with retention periods
+    defined in Django settings (SCORE_HISTORY configuration).
+
+    Returns:
+        bool: True if the compaction completed successfully
+    """
+    call_command("compact_score_events")
+    return True
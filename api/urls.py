@@ -23,7 +23,7 @@ from rest_framework.routers import DefaultRouter
 
 from .apps.monitoring.views import health_check
 from .apps.score.viewsets import LeaderBoardViewSet, ScoreViewSet, TriviaWinnerViewSet
-from .apps.trivia.views import GetQuestions
+from .apps.trivia.views import GetQuestions, GetQuestionsBatch
 from .apps.trivia.viewsets import ThemeViewSet, TriviaViewSet
 from .apps.users.views import (
     CreateUserView,
@@ -90,6 +90,11 @@ urlpatterns = [
     # Agregar esta línea
     re_path(r"^api/csrf/?$", CSRFView.as_view(), name="csrf"),
     # Agregar la ruta para questions
+    re_path(
+        r"^api/questions/batch/?$",
+        GetQuestionsBatch.as_view(),
+        name="get-questions-batch",
+    ),
     re_path(
         r"^api/questions/(?P<trivia_id>[^/.]+)/?$",
         GetQuestions.as_view(),
@@ -0,0 +1,74 @@
+"""
+ASGI Utilities Module
+
+This module provides what the async views need to be served over ASGI.
+Includes:
+- An ASGI handler resolving URLs with settings.ASGI_URLCONF
+- An async capable WhiteNoise middleware
+- JSON responses encoded like the DRF views (api.utils.json_utils)
+
+The ASGI URLconf (api.asgi_urls) sends the hot read endpoints to async
+views and everything else to the regular URLconf, so the WSGI
+application keeps serving the sync DRF views unchanged.
+"""
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .json_utils import dumps
+
+
+class AsyncRoutesASGIHandler(ASGIHandler):
+    """ASGI handler routing requests through settings.ASGI_URLCONF"""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = settings.ASGI_URLCONF
+        return request, error_response
+
+
+class AsyncWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise middleware usable in the async request path.
+
+    WhiteNoise is sync only, and a single sync middleware makes Django
+    run the rest of the chain, views included, through a thread. This
+    subclass passes non static requests straight to the next async
+    handler and only serves static files from a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
+
+
+def json_response(data, status=200) -> HttpResponse:
+    """
+    Encode data into a JSON response with the API codec.
+
+    Async views return plain Django responses; encoding with the codec
+    of the DRF renderer keeps their bodies identical to the DRF views.
+    """
+    return HttpResponse(dumps(data), status=status, content_type="application/json")
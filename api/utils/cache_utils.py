@@ -1,49 +1,353 @@
-from functools import wraps
+import hashlib
+import time
+from collections import defaultdict
+from functools import partial, wraps
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified
 from django.utils.decorators import method_decorator
+from django.utils.http import parse_etags
+from django.views import View
 from django.views.decorators.cache import cache_page
+from django_redis.exceptions import ConnectionInterrupted
 
+from .logging_utils import logger
+from .redis_utils import RedisError, get_async_redis, redis_key
 
-def cache_response(timeout=None):
+TAG_KEY_PREFIX = "cache_tag"
+
+
+def _initial_tag_version():
+    """
+    Starting value for a tag generation counter.
+
+    Counters start from the current time instead of 1 so a counter that
+    was evicted never repeats a generation that is still cached.
+    """
+    return time.time_ns() // 1000
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}:{tag}"
+
+
+def get_tag_versions(tags) -> str:
+    """
+    Get the combined generation of a list of tags.
+
+    Usage:
+    get_tag_versions(["trivia:<id>", "themes"])  # '1735689600000000.1735...'
+    """
+    if not tags:
+        return ""
+
+    keys = [_tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, _initial_tag_version(), timeout=None)
+        versions.update(cache.get_many(missing))
+    return ".".join(str(versions.get(key, 0)) for key in keys)
+
+
+async def aget_tag_versions(tags) -> str:
+    """
+    Async get_tag_versions for async views.
+
+    Generations are read with one MGET on the asyncio client; a missing
+    counter or an unavailable server falls back to the sync version,
+    which also creates the counter.
+    """
+    if not tags:
+        return ""
+
+    keys = [cache.make_key(_tag_key(tag)) for tag in tags]
+    try:
+        values = await get_async_redis().mget(keys)
+        return ".".join(str(int(value)) for value in values)
+    except (RedisError, TypeError, ValueError):
+        return await sync_to_async(get_tag_versions)(tags)
+
+
+def invalidate_tags(*tags):
+    """
+    Bump the generation of the given tags.
+
+    Every cached entry that declared one of these tags is ignored from
+    now on and simply expires later. Errors of the cache server are
+    logged rather than raised, so model saves do not fail with it.
+
+    Usage:
+    invalidate_tags("trivia:<id>", "themes")
+    """
+    for tag in tags:
+        key = _tag_key(tag)
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _initial_tag_version(), timeout=None)
+        except (ConnectionInterrupted, RedisError) as e:
+            logger.warning(f"Cache unavailable invalidating tag {tag}: {e}")
+
+
+def on_commit_once(callback_id: str, func, *args):
+    """
+    Run func(*args) when the current transaction commits, at most once.
+
+    Repeated calls with the same callback_id inside one transaction are
+    ignored. Outside a transaction func runs immediately.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        func(*args)
+        return
+
+    # Ids scheduled in the current transaction. Django replaces
+    # run_on_commit on commit and rollback, which resets them.
+    pending = getattr(connection, "_on_commit_once", None)
+    if pending is None or pending[0] is not connection.run_on_commit:
+        scheduled = {
+            getattr(callback, "callback_id", None)
+            for _, callback, _ in connection.run_on_commit
+        }
+        pending = (connection.run_on_commit, scheduled)
+        connection._on_commit_once = pending
+    if callback_id in pending[1]:
+        return
+
+    callback = partial(func, *args)
+    callback.callback_id = callback_id  # type: ignore[attr-defined]
+    transaction.on_commit(callback)
+    pending[1].add(callback_id)
+
+
+def invalidate_tags_on_commit(*tags):
+    """
+    Bump tag generations now and again once the transaction commits.
+
+    The second bump drops anything a concurrent request cached from
+    data read before the commit became visible.
+    """
+    invalidate_tags(*tags)
+    for tag in tags:
+        on_commit_once(f"cache_tag:{tag}", invalidate_tags, tag)
+
+
+def resolve_tags(tags, request, *args, **kwargs):
+    """
+    Resolve declared tags for a request.
+
+    Tags are either strings formatted with the view kwargs and query
+    parameters (e.g. "trivia:{id}") or callables receiving the request
+    and view arguments and returning a tag.
+    """
+    params = defaultdict(str, request.GET.items())
+    params.update(kwargs)
+
+    resolved = []
+    for tag in tags:
+        if callable(tag):
+            resolved.append(tag(request, *args, **kwargs))
+        else:
+            resolved.append(tag.format_map(params))
+    return resolved
+
+
+def cache_response(timeout=None, tags=()):
     """
     Custom cache decorator for both function and method views
 
+    Tagged responses are keyed on the current generation of their tags,
+    so bumping a tag (see invalidate_tags) makes them stale right away
+    and they default to the longer CACHE_TAGGED_TTL.
+
     Usage:
     @cache_response()  # Uses default CACHE_TTL
     @cache_response(timeout=300)  # Custom timeout in seconds
+    @cache_response(tags=["trivia:{id}"])  # Invalidated with the trivia
     """
 
     def decorator(view_func):
-        if timeout is None:
-            cache_timeout = settings.CACHE_TTL
-        else:
+        if timeout is not None:
             cache_timeout = timeout
+        elif tags:
+            cache_timeout = settings.CACHE_TAGGED_TTL
+        else:
+            cache_timeout = settings.CACHE_TTL
 
         @wraps(view_func)
         def _wrapped_view(*args, **kwargs):
-            return cache_page(cache_timeout)(view_func)(*args, **kwargs)
+            # Class based views receive the view instance before the request
+            is_method = bool(args) and isinstance(args[0], View)
+            request = args[1] if is_method else args[0]
+
+            view_args = args[2:] if is_method else args[1:]
+
+            key_prefix = None
+            if tags:
+                resolved = resolve_tags(tags, request, *view_args, **kwargs)
+                key_prefix = f"tagged:{get_tag_versions(resolved)}"
+
+            decorator = cache_page(cache_timeout, key_prefix=key_prefix)
+            if is_method:
+                decorator = method_decorator(decorator)
+            return decorator(view_func)(*args, **kwargs)
 
         return _wrapped_view
 
     return decorator
 
 
-def cache_viewset_action():
+def tag_etag(tags, *extra) -> str:
+    """
+    Build a strong ETag from the current generation of a list of tags.
+
+    The ETag changes whenever one of the tags is invalidated, so it
+    validates any response whose content is fully covered by the tags.
+
+    Usage:
+    tag_etag(["trivia:<id>", "themes"])  # '"3f1c..."'
+    tag_etag(["trivia:<id>"], user_id)  # Distinct per user
+    """
+    return _versions_etag(tags, get_tag_versions(tags), extra)
+
+
+async def atag_etag(tags, *extra) -> str:
+    """Async tag_etag for async views, equal to the sync ETag"""
+    return _versions_etag(tags, await aget_tag_versions(tags), extra)
+
+
+def _versions_etag(tags, versions: str, extra) -> str:
+    parts = [*tags, versions, *(str(value) for value in extra)]
+    digest = hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+async def acache_body(name: str, tags, build, timeout=None) -> bytes:
+    """
+    Get an encoded response body cached for async views.
+
+    The body is stored in Redis under the current generation of its
+    tags, so invalidate_tags makes it stale like cache_response entries.
+
+    Args:
+        name: Identifies the response (e.g. "themes" or a channel)
+        tags: Cache tags covering the response content
+        build: Coroutine function returning the encoded body on a miss
+        timeout: Seconds to keep the body (defaults to CACHE_TAGGED_TTL)
+
+    Returns:
+        bytes: Encoded body
+    """
+    versions = await aget_tag_versions(tags)
+    digest = hashlib.sha256(f"{name}|{versions}".encode()).hexdigest()[:32]
+    key = redis_key("async_body", digest)
+    client = get_async_redis()
+    try:
+        body = await client.get(key)
+    except RedisError:
+        return await build()
+    if body is None:
+        body = await build()
+        try:
+            await client.set(key, body, ex=timeout or settings.CACHE_TAGGED_TTL)
+        except RedisError:
+            pass
+    return body
+
+
+def etag_matches(request, etag: str) -> bool:
+    """
+    Check If-None-Match against an ETag with weak comparison.
+
+    Compressed responses carry the weak form of the ETag (W/"..."),
+    which still validates the uncompressed representation.
+    """
+    candidates = parse_etags(request.headers.get("If-None-Match", ""))
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate == "*" or candidate.removeprefix("W/") == opaque
+        for candidate in candidates
+    )
+
+
+def etag_response(tags, vary_on_user=False):
+    """
+    Conditional GET decorator for views covered by cache tags
+
+    The ETag is computed from tag generations before the view runs, so
+    a matching If-None-Match is answered with 304 without touching the
+    database or the serializers. Only successful responses carry the
+    ETag. Computing it first means a change racing the view can only
+    produce a stale ETag, which the next request simply misses.
+
+    Usage:
+    @etag_response(tags=["themes"])
+    @etag_response(tags=["trivia:{pk}"], vary_on_user=True)  # Visibility
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def _wrapped_view(*args, **kwargs):
+            is_method = bool(args) and isinstance(args[0], View)
+            request = args[1] if is_method else args[0]
+            if request.method not in ("GET", "HEAD"):
+                return view_func(*args, **kwargs)
+
+            view_args = args[2:] if is_method else args[1:]
+            resolved = resolve_tags(tags, request, *view_args, **kwargs)
+            extra = [request.user.pk] if vary_on_user else []
+            etag = tag_etag(resolved, *extra)
+
+            # Client already has this version
+            if etag_matches(request, etag):
+                response = HttpResponseNotModified()
+                response["ETag"] = etag
+                return response
+
+            response = view_func(*args, **kwargs)
+            if response.status_code == 200:
+                response["ETag"] = etag
+            return response
+
+        return _wrapped_view
+
+    return decorator
+
+
+def etag_viewset_action(tags, vary_on_user=False):
     """
     Decorator specifically for ViewSet methods
+
+    Usage:
+    @etag_viewset_action(tags=["themes"])
     """
-    return method_decorator(cache_page(settings.CACHE_TTL))
+    return method_decorator(etag_response(tags=tags, vary_on_user=vary_on_user))
 
 
-def cache_query_result(cache_key: str, timeout=None):
+def cache_viewset_action(timeout=None, tags=()):
+    """
+    Decorator specifically for ViewSet methods
+
+    Usage:
+    @cache_viewset_action()
+    @cache_viewset_action(tags=["themes"])
+    """
+    return method_decorator(cache_response(timeout=timeout, tags=tags))
+
+
+def cache_query_result(cache_key: str, timeout=None, tags=()):
     """
     Decorator for caching expensive model queries
 
     Usage:
     @classmethod
-    @cache_query_result('all_questions')
+    @cache_query_result('all_questions', tags=['themes'])
     def get_all_questions(cls):
         return cls.objects.all()
     """
@@ -51,10 +355,17 @@ def cache_query_result(cache_key: str, timeout=None):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            data = cache.get(cache_key)
+            key = cache_key
+            if tags:
+                key = f"{cache_key}:{get_tag_versions(tags)}"
+                default_timeout = settings.CACHE_TAGGED_TTL
+            else:
+                default_timeout = settings.CACHE_TTL
+
+            data = cache.get(key)
             if data is None:
                 data = func(*args, **kwargs)
-                cache.set(cache_key, data, timeout or settings.CACHE_TTL)
+                cache.set(key, data, timeout or default_timeout)
             return data
 
         return wrapper
@@ -0,0 +1,158 @@
+"""
+Compression Utilities Module
+
+This module provides response compression for API payloads.
+
+Features:
+- gzip or brotli negotiated from Accept-Encoding (brotli preferred,
+  used only when the brotli package is installed)
+- Only text payloads of at least settings.COMPRESSION_MIN_SIZE bytes
+  are compressed; smaller ones cost more CPU than they save
+- Pre-compressed variants attached by views (e.g. from the bundle
+  store) are served as is instead of compressing again
+- Strong ETags made weak on compressed responses, as Django's
+  GZipMiddleware does
+- Middleware usable in both the sync and the async request path
+"""
+
+import gzip
+from typing import Dict, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Preferred first
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def accepted_encoding(request) -> Optional[str]:
+    """
+    Choose the response encoding from the Accept-Encoding header.
+
+    Args:
+        request: HTTP request
+
+    Returns:
+        str: "br" or "gzip", the best supported encoding the client accepts
+        None: If the client accepts none of them
+    """
+    header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+    if not header:
+        return None
+
+    qualities = {}
+    for item in header.lower().split(","):
+        coding, _, params = item.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip()] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in ENCODINGS:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a body with the given encoding.
+
+    gzip output has no timestamp, so equal bodies compress to equal bytes.
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    """
+    Compress a body with every supported encoding, for stored payloads.
+
+    Returns:
+        dict: Compressed bytes by encoding; empty below the size threshold
+    """
+    if len(body) < settings.COMPRESSION_MIN_SIZE:
+        return {}
+    return {encoding: compress(body, encoding) for encoding in ENCODINGS}
+
+
+def is_compressible(response) -> bool:
+    content_type = response.get("Content-Type", "").lower()
+    return (
+        not response.streaming
+        and not response.has_header("Content-Encoding")
+        and len(response.content) >= settings.COMPRESSION_MIN_SIZE
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    """
+    Middleware compressing large text responses with gzip or brotli.
+
+    Views may set response.compressed to a dict of pre-compressed bodies
+    by encoding; a matching variant is used without compressing.
+
+    Placed above the monitoring middleware, which reads plain bodies.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if not is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = accepted_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = getattr(response, "compressed", None) or {}
+        body = compressed.get(encoding) or compress(response.content, encoding)
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = f"W/{etag}"
+        return response
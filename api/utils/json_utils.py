@@ -0,0 +1,148 @@
+"""
+JSON Utilities Module
+
+This module provides the JSON codec used for API bodies, with a DRF
+renderer and parser built on it.
+
+The codec is selected with settings.JSON_CODEC:
+- "orjson": orjson, falling back to the standard library if it is
+  not installed
+- "json": the standard library, encoding exactly like DRF's JSONRenderer
+
+Features:
+- Native UUID, datetime, date and time encoding (datetimes in UTC end in
+  "Z" as with DRF)
+- Other values (Decimal, lazy strings, querysets...) encoded by DRF's
+  encoder
+- U+2028 and U+2029 escaped so bodies stay a JavaScript subset
+- Values orjson rejects (non string keys, integers over 64 bits) are
+  encoded by the standard library instead of failing
+"""
+
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json as drf_json
+from rest_framework.utils.encoders import JSONEncoder
+
+from .logging_utils import logger
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_ORJSON = False
+
+__all__ = [
+    "CODEC",
+    "FastJSONParser",
+    "FastJSONRenderer",
+    "JSONDecodeError",
+    "dumps",
+    "loads",
+]
+
+# orjson.JSONDecodeError is a subclass, so this catches both codecs
+JSONDecodeError = json.JSONDecodeError
+
+_encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+
+def _select_codec() -> str:
+    codec = getattr(settings, "JSON_CODEC", "orjson")
+    if codec == "orjson" and not HAS_ORJSON:
+        logger.warning("orjson is not installed, using the json module")
+        return "json"
+    return codec
+
+
+CODEC = _select_codec()
+
+
+def _escape_separators(body: bytes) -> bytes:
+    """Escape U+2028 and U+2029 as DRF's JSONRenderer does"""
+    if b"\xe2\x80\xa8" in body or b"\xe2\x80\xa9" in body:
+        body = body.replace(b"\xe2\x80\xa8", b"\\u2028")
+        body = body.replace(b"\xe2\x80\xa9", b"\\u2029")
+    return body
+
+
+def _json_dumps(data) -> bytes:
+    return _encoder.encode(data).encode()
+
+
+if CODEC == "orjson":
+
+    def dumps(data) -> bytes:
+        """
+        Encode data into compact UTF-8 JSON.
+
+        Args:
+            data: Value to encode
+
+        Returns:
+            bytes: Encoded JSON
+        """
+        try:
+            body = orjson.dumps(data, default=_encoder.default, option=orjson.OPT_UTC_Z)
+        except orjson.JSONEncodeError:
+            return _escape_separators(_json_dumps(data))
+        return _escape_separators(body)
+
+    loads = orjson.loads
+
+else:
+
+    def dumps(data) -> bytes:
+        """
+        Encode data into compact UTF-8 JSON.
+
+        Args:
+            data: Value to encode
+
+        Returns:
+            bytes: Encoded JSON
+        """
+        return _escape_separators(_json_dumps(data))
+
+    # Rejects NaN and Infinity like orjson and DRF's parser
+    loads = drf_json.loads
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with the configured codec.
+
+    Indented output (e.g. "application/json; indent=4") is left to DRF.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser decoding with the configured codec"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        data = stream.read()
+        try:
+            if codecs.lookup(encoding).name != "utf-8":
+                data = data.decode(encoding)
+            return loads(data)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
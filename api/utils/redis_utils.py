@@ -0,0 +1,70 @@
+"""
+Redis Utilities Module
+
+This module provides direct access to the Redis server behind the
+default cache for data structures the Django cache API does not cover
+(hashes, sets, sorted sets).
+
+Keys are namespaced with settings.CACHE_KEY_PREFIX so they never collide
+with cache_page entries or other applications sharing the server.
+
+Async views get an asyncio client on the same server (get_async_redis).
+"""
+
+import asyncio
+from weakref import WeakKeyDictionary
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+__all__ = ["RedisError", "get_async_redis", "get_redis", "redis_key"]
+
+# asyncio connections are bound to the loop that opened them
+_async_clients: "WeakKeyDictionary" = WeakKeyDictionary()
+
+
+def get_redis():
+    """
+    Get the raw Redis client used by the default cache.
+
+    Returns:
+        redis.Redis: Client bound to the default cache connection pool
+    """
+    return get_redis_connection("default")
+
+
+def get_async_redis():
+    """
+    Get an asyncio Redis client for the running event loop.
+
+    The client connects to the server of the default cache with its own
+    connection pool, created once per event loop.
+
+    Returns:
+        redis.asyncio.Redis: Client bound to the running loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        config = settings.CACHES["default"]
+        options = config.get("OPTIONS", {})
+        client = aioredis.from_url(
+            config["LOCATION"],
+            max_connections=options.get("MAX_CONNECTIONS"),
+            socket_timeout=options.get("SOCKET_TIMEOUT"),
+            socket_connect_timeout=options.get("SOCKET_CONNECT_TIMEOUT"),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def redis_key(*parts) -> str:
+    """
+    Build a namespaced Redis key.
+
+    Usage:
+    redis_key("trivia", "bundle", trivia_id)  # trivia_api:trivia:bundle:<id>
+    """
+    return ":".join([settings.CACHE_KEY_PREFIX, *(str(part) for part in parts)])
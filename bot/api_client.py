@@ -1,16 +1,27 @@
 import asyncio
+import copy
 import time
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import aiohttp
+from aiohttp.compression_utils import HAS_BROTLI
 from typing_extensions import Self
 
 from api.django import (
+    ANSWERS_URL,
+    AVAILABILITY_URL,
     BASE_URL,
     FILTER_URL,
+    LEADERBOARD_RANK_URL,
     LEADERBOARD_URL,
+    QUESTIONS_BATCH_URL,
     QUESTIONS_URL,
+    QUIZ_URL,
+    RANDOM_URL,
+    SCORES_BATCH_URL,
     SCORES_URL,
+    SEARCH_URL,
     TRIVIA_URL,
 )
 
@@ -21,6 +32,21 @@ from .utils.rate_limits import (
     handle_rate_limit_retry,
 )
 
+# Trivias requested per listing page
+TRIVIA_PAGE_SIZE = 25
+
+# Responses kept for conditional requests (If-None-Match)
+VALIDATOR_CACHE_SIZE = 256
+
+# Trivias per questions batch request (server maximum)
+QUESTIONS_BATCH_SIZE = 50
+
+# Score changes per batch request (server maximum)
+SCORES_BATCH_SIZE = 500
+
+# Compressed responses the session can decode (aiohttp decompresses them)
+ACCEPT_ENCODING = "br, gzip" if HAS_BROTLI else "gzip"
+
 """
 API Client for Trivia Bot
 
@@ -32,6 +58,8 @@ Features:
 - Leaderboard tracking
 - Theme management
 - Rate limit handling
+- Conditional GET with a local ETag validator cache
+- Compressed responses (gzip, brotli when available)
 """
 
 
@@ -51,6 +79,8 @@ class TriviaAPIClient:
         base_url (str): API base URL
         ssl_verify (bool): Whether to verify SSL certificates
         rate_limits (Dict[str, float]): Rate limit expiry times by endpoint
+        validators (OrderedDict): (ETag, body) of recent GETs, least
+            recently used first
     """
 
     def __init__(self) -> None:
@@ -59,16 +89,18 @@ class TriviaAPIClient:
         self.base_url = BASE_URL
         self.ssl_verify = not BASE_URL.startswith("http://")  # Only verify SSL in HTTPS
         self.rate_limits: Dict[str, float] = {}  # endpoint -> expiry time
+        self.validators: "OrderedDict[str, tuple[str, Any]]" = OrderedDict()
 
     async def __aenter__(self) -> Self:
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
         if self.ssl_verify:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(headers=headers)
         else:
             bot_logger.warning(
                 "SSL verification disabled - Development environment detected"
             )
             self.session = aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(verify_ssl=False)
+                connector=aiohttp.TCPConnector(verify_ssl=False), headers=headers
             )
         return self
 
@@ -90,13 +122,36 @@ class TriviaAPIClient:
             f"Expires in {wait_seconds}s at {time.ctime(expiry)}"
         )
 
+    @staticmethod
+    def _validator_key(url: str, params: Optional[Dict[str, Any]]) -> str:
+        """Key of a GET in the validator cache"""
+        if not params:
+            return url
+        return f"{url}?{sorted((str(k), str(v)) for k, v in params.items())}"
+
+    def _store_validator(self, key: str, etag: Optional[str], data: Any) -> None:
+        """Remember a response body under its ETag, evicting the oldest entry"""
+        if not etag:
+            self.validators.pop(key, None)
+            return
+        # Stored apart from the caller's copy, which it is free to mutate
+        self.validators[key] = (etag, copy.deepcopy(data))
+        self.validators.move_to_end(key)
+        while len(self.validators) > VALIDATOR_CACHE_SIZE:
+            self.validators.popitem(last=False)
+
     async def get(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         retry_count: int = 3,
     ) -> Any:
-        """Enhanced GET with rate limit tracking"""
+        """
+        Enhanced GET with rate limit tracking and conditional requests.
+
+        Responses carrying an ETag are remembered; the next GET of the
+        same URL sends If-None-Match and reuses the stored body on 304.
+        """
         if url in self.rate_limits and time.time() < self.rate_limits[url]:
             wait_time = int(self.rate_limits[url] - time.time())
             bot_logger.info(f"Rate limit active for {url}. Waiting {wait_time}s")
@@ -108,12 +163,25 @@ class TriviaAPIClient:
         if self.session is None:
             raise RuntimeError("Failed to initialize session")
 
+        key = self._validator_key(url, params)
+
         async def _make_request():
-            async with self.session.get(url, params=params) as response:
+            headers = {}
+            cached = self.validators.get(key)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+
+            async with self.session.get(
+                url, params=params, headers=headers
+            ) as response:
+                if response.status == 304 and cached:
+                    self.validators.move_to_end(key)
+                    return copy.deepcopy(cached[1])
                 response_data = await response.json()
                 if response.status == 429:
                     await handle_rate_limit_response(response, response_data)
                 response.raise_for_status()
+                self._store_validator(key, response.headers.get("ETag"), response_data)
                 return response_data
 
         try:
@@ -214,6 +282,107 @@ class TriviaAPIClient:
             bot_logger.error(f"Error getting filtered trivias: {e}")
             raise
 
+    async def search_trivias(
+        self, query: str, language: Optional[str] = None, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Searches trivias by title, question and answer text, best match first"""
+        params = {"q": query, "limit": limit}
+        if language:
+            params["lang"] = language
+        try:
+            bot_logger.info(f"Searching trivias with params: {params}")
+            return await self.get(SEARCH_URL, params=params)
+        except Exception as e:
+            bot_logger.error(f"Error searching trivias: {e}")
+            raise
+
+    async def get_availability(self) -> List[Dict[str, Any]]:
+        """
+        Get the themes and difficulties that have public trivias.
+
+        Returns:
+            List[Dict[str, Any]]: Themes with id, name and difficulties
+                ({"<level>": trivia count}), non-empty combinations only
+        """
+        try:
+            return await self.get(AVAILABILITY_URL)
+        except Exception as e:
+            bot_logger.error(f"Error getting trivia availability: {e}")
+            raise
+
+    async def get_random_trivia(
+        self,
+        theme_id: Optional[str] = None,
+        difficulty: Optional[int] = None,
+        exclude: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get a random public trivia with its questions in one request.
+
+        Args:
+            theme_id: Optional theme to pick from
+            difficulty: Optional difficulty to pick from
+            exclude: Trivia ids that must not be picked (recently played)
+
+        Returns:
+            Dict[str, Any]: Trivia id, title, difficulty, theme, url and
+                questions
+        """
+        params: Dict[str, Any] = {}
+        if theme_id:
+            params["theme"] = theme_id
+        if difficulty:
+            params["difficulty"] = difficulty
+        if exclude:
+            params["exclude"] = ",".join(exclude)
+        try:
+            return await self.get(RANDOM_URL, params=params)
+        except Exception as e:
+            bot_logger.error(f"Error getting random trivia: {e}")
+            raise
+
+    async def get_quiz(
+        self, theme_id: str, difficulty: int, count: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Get a quiz of questions mixed from all trivias of a theme and difficulty.
+
+        Args:
+            theme_id: Theme of the quiz
+            difficulty: Difficulty of the quiz
+            count: Number of questions wanted
+
+        Returns:
+            List[Dict[str, Any]]: Questions with answers and source trivia
+        """
+        params = {"theme": theme_id, "difficulty": difficulty, "count": count}
+        try:
+            response = await self.get(QUIZ_URL, params=params)
+            return response["questions"]
+        except Exception as e:
+            bot_logger.error(f"Error getting quiz: {e}")
+            raise
+
+    async def record_answers(self, responses: List[Dict[str, Any]]) -> int:
+        """
+        Record the answers given in a game for question statistics.
+
+        Args:
+            responses: {"question": id, "answer": id or None} per player
+                response; None marks a question nobody answered
+
+        Returns:
+            int: Number of recorded responses
+        """
+        try:
+            response = await self.post(
+                ANSWERS_URL, {"answers": responses}, use_csrf=False
+            )
+            return response["recorded"]
+        except Exception as e:
+            bot_logger.error(f"Error recording answers: {e}")
+            raise
+
     async def get_leaderboard(self, discord_channel: str) -> Dict[str, Any]:
         """Gets the score table for a specific discord channel
 
@@ -239,6 +408,30 @@ class TriviaAPIClient:
             )
             raise
 
+    async def get_rank(
+        self, discord_channel: str, name: str, neighbours: int = 2
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a player's rank in a channel with the players around them.
+
+        Args:
+            discord_channel: The discord channel identifier
+            name: Player name
+            neighbours: Players listed on each side of the player
+
+        Returns:
+            Dict[str, Any]: {"name", "points", "rank", "neighbours"}
+            None: If the channel has no leaderboard or the player no score
+        """
+        params = {"channel": discord_channel, "name": name, "neighbours": neighbours}
+        try:
+            return await self.get(LEADERBOARD_RANK_URL, params)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                return None
+            bot_logger.error(f"Error getting rank of {name} in {discord_channel}: {e}")
+            raise
+
     async def update_score(self, name: str, points: int, discord_channel: str):
         """Updates the score using CSRF token"""
         try:
@@ -287,6 +480,46 @@ class TriviaAPIClient:
             bot_logger.error(f"Unexpected error updating score: {e}")
             raise ValueError(f"Unexpected error: {str(e)}")
 
+    async def update_scores(self, scores: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Add the points of several participants in as few requests as possible.
+
+        Each request is applied all or none by the server; no CSRF token
+        is fetched since the endpoint is CSRF exempt.
+
+        Args:
+            scores: {"name", "points", "discord_channel"} per change
+
+        Returns:
+            List[Dict[str, Any]]: {"name", "discord_channel", "points"} with
+            the total of each participant
+
+        Raises:
+            ValueError: If a channel has no leaderboard or a change is invalid
+        """
+        totals: List[Dict[str, Any]] = []
+        try:
+            for start in range(0, len(scores), SCORES_BATCH_SIZE):
+                chunk = scores[start : start + SCORES_BATCH_SIZE]
+                response = await self.post(
+                    SCORES_BATCH_URL, {"scores": chunk}, use_csrf=False
+                )
+                totals.extend(response["data"])
+            bot_logger.info(f"Scores updated successfully - Changes: {len(scores)}")
+            return totals
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                bot_logger.error(f"Channel not found updating scores: {scores}")
+                raise ValueError("Channel not found")
+            elif e.status == 400:
+                bot_logger.error(f"Invalid data sent to server: {scores}")
+                raise ValueError("Invalid data for updating scores")
+            bot_logger.error(f"Server error updating scores: {e}")
+            raise
+        except aiohttp.ClientError as e:
+            bot_logger.error(f"Connection error updating scores: {e}")
+            raise ValueError("Connection error with the server")
+
     async def create_leaderboard(
         self, discord_channel: str, username: str
     ) -> Dict[str, Any]:
@@ -294,9 +527,45 @@ class TriviaAPIClient:
         data = {"discord_channel": discord_channel, "username": username}
         return await self.post(LEADERBOARD_URL, data)
 
+    async def get_trivias_page(
+        self,
+        params: Optional[Dict[str, Any]] = None,
+        cursor: Optional[str] = None,
+        limit: int = TRIVIA_PAGE_SIZE,
+    ) -> Dict[str, Any]:
+        """Gets one page of trivias in creation order
+
+        Args:
+            params (Optional[Dict[str, Any]]): Extra query parameters (e.g. username)
+            cursor (Optional[str]): next_cursor of the previous page
+            limit (int): Page size
+
+        Returns:
+            Dict[str, Any]: {"results": [...], "next_cursor": str or None}
+        """
+        page_params: Dict[str, Any] = {**(params or {}), "limit": limit}
+        if cursor:
+            page_params["cursor"] = cursor
+        return await self.get(TRIVIA_URL, page_params)
+
+    async def iter_trivia_pages(
+        self, params: Optional[Dict[str, Any]] = None, limit: int = TRIVIA_PAGE_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yields pages of trivias until the listing is exhausted"""
+        cursor = None
+        while True:
+            page = await self.get_trivias_page(params, cursor, limit)
+            if page["results"]:
+                yield page["results"]
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
     async def get_user_trivias(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
         """Gets trivias created by a specific user
 
+        Pages through the listing so no single response grows unbounded.
+
         Args:
             params (Dict[str, str]): Query parameters including username
 
@@ -308,9 +577,11 @@ class TriviaAPIClient:
         """
         try:
             bot_logger.info(f"Getting trivias for user with params: {params}")
-            response = await self.get(TRIVIA_URL, params)
-            bot_logger.debug(f"Got trivias response: {response}")
-            return response
+            trivias: List[Dict[str, Any]] = []
+            async for page in self.iter_trivia_pages(params):
+                trivias.extend(page)
+            bot_logger.debug(f"Got {len(trivias)} trivias")
+            return trivias
         except Exception as e:
             bot_logger.error(f"Error getting user trivias: {e}")
             raise
@@ -437,6 +708,33 @@ class TriviaAPIClient:
             bot_logger.error(f"Error getting trivia questions: {e}")
             raise
 
+    async def get_trivia_questions_many(
+        self, trivia_ids: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get the questions of several trivias in as few requests as possible.
+
+        Args:
+            trivia_ids: Trivias to fetch
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Questions by trivia id; trivias
+            that do not exist are left out
+        """
+        ids = [str(trivia_id) for trivia_id in trivia_ids]
+        questions: Dict[str, List[Dict[str, Any]]] = {}
+        try:
+            for start in range(0, len(ids), QUESTIONS_BATCH_SIZE):
+                chunk = ids[start : start + QUESTIONS_BATCH_SIZE]
+                response = await self.post(
+                    QUESTIONS_BATCH_URL, {"ids": chunk}, use_csrf=False
+                )
+                questions.update(response["questions"])
+            return questions
+        except Exception as e:
+            bot_logger.error(f"Error getting questions of several trivias: {e}")
+            raise
+
     async def get_themes(self) -> List[Dict[str, Any]]:
         """Gets all available themes
 
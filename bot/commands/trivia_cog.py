@@ -4,7 +4,7 @@ Discord Cog for handling trivia game commands.
 This cog provides command handlers for all trivia-related functionality including:
 - Starting/stopping games
 - Creating/updating trivias
-- Showing scores and listings
+- Showing scores, ranks and listings
 """
 
 from discord.ext import commands
@@ -37,6 +37,11 @@ class TriviaCog(commands.Cog):
         """Start a new trivia game session."""
         await self.trivia_commands.handle_trivia(ctx.message)
 
+    @commands.command()
+    async def quiz(self, ctx: commands.Context):
+        """Start a game of questions mixed from a theme and difficulty."""
+        await self.trivia_commands.handle_quiz(ctx.message)
+
     @commands.command()
     async def list_trivia(self, ctx: commands.Context):
         """Show available trivias"""
@@ -47,6 +52,11 @@ class TriviaCog(commands.Cog):
         """Show current score"""
         await self.trivia_commands.handle_score(ctx.message)
 
+    @commands.command()
+    async def rank(self, ctx: commands.Context):
+        """Show your rank (or a player's: $rank <name>) and who is around"""
+        await self.trivia_commands.handle_rank(ctx.message)
+
     @commands.command()
     async def stop_game(self, ctx: commands.Context):
         """Stop current game"""
@@ -69,8 +79,10 @@ class TriviaCog(commands.Cog):
             await ctx.send(
                 "❌ Command not found. Available commands:\n"
                 + "`$trivia` - Start a game\n"
+                + "`$quiz` - Start a game mixing questions from a theme\n"
                 + "`$list_trivia` - Show available trivias\n"
                 + "`$score` - Show current score\n"
+                + "`$rank` - Show your rank in this channel\n"
                 + "`$stop_game` - Stop current game\n"
                 + "`$create_trivia` - Create new trivia\n"
                 + "`$update_trivia` - Update existing trivia"
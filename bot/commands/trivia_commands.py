@@ -37,6 +37,10 @@ class TriviaCommands:
         """Route trivia game command to game handler"""
         await self.game_handler.handle_trivia(message)
 
+    async def handle_quiz(self, message: Message) -> None:
+        """Route mixed quiz command to game handler"""
+        await self.game_handler.handle_quiz(message)
+
     async def handle_create_trivia(self, message: Message) -> None:
         """Route trivia creation command to creator"""
         await self.trivia_creator.handle_create_trivia(message)
@@ -45,6 +49,10 @@ class TriviaCommands:
         """Route score command to game handler"""
         await self.game_handler.handle_score(message)
 
+    async def handle_rank(self, message: Message) -> None:
+        """Route rank command to game handler"""
+        await self.game_handler.handle_rank(message)
+
     async def handle_themes(self, message: Message) -> None:
         """Route themes command to game handler"""
         await self.game_handler.handle_themes(message)
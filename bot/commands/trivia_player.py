@@ -1,15 +1,17 @@
 import asyncio
 from asyncio import TimeoutError
+from typing import Any, Dict, List
 
 import discord
 from discord import Client, Message, TextChannel, Thread
 
-from api.django import TRIVIA_URL
-
 from ..game_state import GameState, PlayerGame
 from ..trivia_game import TriviaGame
 from ..utils.logging_bot import command_logger
 
+# Upper bound of trivias listed by $list_trivia to keep the channel readable
+MAX_LISTED_TRIVIAS = 100
+
 """
 Handles active trivia game sessions.
 
@@ -36,7 +38,15 @@ class TriviaPlayer:
         self.game_state = GameState()
         self.client = client
 
-    async def handle_trivia(self, message: Message) -> None:
+    async def handle_trivia(self, message: Message, quiz: bool = False) -> None:
+        """
+        Runs a game: a chosen trivia, or a mixed quiz when quiz is set.
+
+        Args:
+            message (Message): Discord message that triggered the game
+            quiz (bool): Play questions mixed from every trivia of the
+                chosen theme and difficulty instead of a single trivia
+        """
         user_id = message.author.id
         channel_id = message.channel.id
 
@@ -58,8 +68,12 @@ class TriviaPlayer:
                 await self._handle_game_start(message)
                 await self._handle_theme_selection(message)
                 await self._handle_difficulty_selection(message)
-                await self._handle_trivia_selection(message)
-                await self._handle_questions(message)
+                if quiz:
+                    questions = await self._handle_quiz_selection(message)
+                else:
+                    await self._handle_trivia_selection(message)
+                    questions = None
+                await self._handle_questions(message, questions)
 
             except TimeoutError:
                 await message.author.send("Timeout. Try again with $trivia")
@@ -119,6 +133,9 @@ Ready!? 🚀"""
     async def _handle_theme_selection(self, message: Message):
         """Handles the theme selection step"""
         theme_list, _ = await self.trivia_game.get_available_options()
+        if not self.trivia_game.theme_choices:
+            await message.author.send("No trivias available yet. Create one first!")
+            raise ValueError("No trivias available")
 
         await message.author.send(f"Select a theme by number: \n{theme_list}")
 
@@ -147,7 +164,11 @@ Ready!? 🚀"""
 
     async def _handle_difficulty_selection(self, message: Message):
         """Handles the difficulty selection step"""
-        _, difficulty_list = await self.trivia_game.get_available_options()
+        theme_id = self.game_state.user_selections.get(message.author.id, {}).get(
+            "theme"
+        )
+        _, difficulty_list = await self.trivia_game.get_available_options(theme_id)
+        levels = self.trivia_game.difficulty_choices
 
         await message.author.send(f"Select difficulty by number: \n{difficulty_list}")
 
@@ -155,8 +176,7 @@ Ready!? 🚀"""
             def check(m):
                 if not (m.author == message.author and m.content.isdigit()):
                     return False
-                num = int(m.content)
-                return num in [1, 2, 3]
+                return int(m.content) in levels
 
             while True:
                 try:
@@ -185,7 +205,10 @@ Ready!? 🚀"""
         try:
             return await handle_response()
         except ValueError:
-            await message.author.send("Invalid difficulty. Please select 1, 2, or 3.")
+            await message.author.send(
+                "Invalid difficulty. Please select one of: "
+                + ", ".join(str(level) for level in levels)
+            )
             return await handle_response()
 
     async def _handle_trivia_selection(self, message: Message):
@@ -246,8 +269,43 @@ Ready!? 🚀"""
             )
             raise
 
-    async def _handle_questions(self, message: Message):
-        """Handles the questions flow"""
+    async def handle_quiz(self, message: Message) -> None:
+        """Starts a game of questions mixed from a theme and difficulty"""
+        await self.handle_trivia(message, quiz=True)
+
+    async def _handle_quiz_selection(self, message: Message):
+        """Loads the mixed quiz questions for the selected theme and difficulty"""
+        user_selections = self.game_state.user_selections.get(message.author.id, {})
+        theme_id = user_selections.get("theme")
+        difficulty_level = user_selections.get("difficulty")
+        if not theme_id or not difficulty_level:
+            raise ValueError("Theme or difficulty not selected")
+
+        questions = await self.trivia_game.get_quiz(theme_id, difficulty_level)
+        if not questions:
+            await message.author.send("No questions available for this combination")
+            raise ValueError("No questions available")
+
+        theme_name = next(
+            theme["name"]
+            for theme in self.trivia_game.theme_choices.values()
+            if theme["id"] == theme_id
+        )
+        self.game_state.active_games[message.author.id].selected_trivia = (
+            f"a mixed {theme_name} quiz"
+        )
+        await message.channel.send("1 ⏳")
+        return questions
+
+    async def _handle_questions(self, message: Message, questions=None):
+        """
+        Handles the questions flow
+
+        Args:
+            message (Message): Discord message that triggered the game
+            questions: Preloaded questions (mixed quiz), otherwise the
+                questions of the selected trivia are fetched
+        """
         game = self.game_state.active_games[message.author.id]
 
         if not game.selected_trivia:
@@ -274,16 +332,25 @@ Ready!? 🚀"""
             )
 
             # Get questions
-            trivia_id = next(
-                trivia["id"]
-                for trivia in self.trivia_game.current_trivia
-                if trivia["title"] == game.selected_trivia
-            )
-            questions = await self.trivia_game.get_trivia_questions(trivia_id)
+            if questions is None:
+                trivia_id = next(
+                    trivia["id"]
+                    for trivia in self.trivia_game.current_trivia
+                    if trivia["title"] == game.selected_trivia
+                )
+                questions = await self.trivia_game.get_trivia_questions(trivia_id)
             game.total_questions = len(questions)
+            responses: List[Dict[str, Any]] = []
+            # Points won, sent in one batch when the game ends
+            scores: List[Dict[str, Any]] = []
 
             while game.current_question < game.total_questions:
                 players = []
+                question_id = questions[game.current_question].get("id")
+                answer_ids = [
+                    answer.get("id")
+                    for answer in questions[game.current_question].get("answers", [])
+                ]
 
                 (
                     question,
@@ -352,16 +419,24 @@ Ready!? 🚀"""
 
                         if player_info not in players:
                             players.append(player_info)
+                            responses.append(
+                                {
+                                    "question": question_id,
+                                    "answer": answer_ids[int(response.content) - 1],
+                                }
+                            )
                             if int(response.content) == correct_answer:
                                 game.current_score += points
                                 await message.channel.send(
                                     f"Correct! {response.author.name}, "
                                     "you won {points} points \n\n"
                                 )
-                                await self.trivia_game.api_client.update_score(
-                                    name=response.author.name,
-                                    points=points,
-                                    discord_channel=channel_identifier,
+                                scores.append(
+                                    {
+                                        "name": response.author.name,
+                                        "points": points,
+                                        "discord_channel": channel_identifier,
+                                    }
                                 )
                                 break
                             else:
@@ -377,12 +452,18 @@ Ready!? 🚀"""
                     game.current_question += 1
 
                 except TimeoutError:
+                    if not players:
+                        responses.append({"question": question_id, "answer": None})
                     await message.channel.send(
                         "ohhh, it seems no one guessed this 😔. Well, "
                         "let's move on to the next one 💪🏽"
                     )
                     game.current_question += 1
 
+            if scores:
+                await self.trivia_game.api_client.update_scores(scores)
+            await self._record_answers(responses)
+
             # End game messages
             await message.channel.send(
                 "```orange\nEnd of the Game. Thanks for participating 🧡\n```"
@@ -431,6 +512,17 @@ Ready!? 🚀"""
             )
             raise
 
+    async def _record_answers(self, responses: List[Dict[str, Any]]) -> None:
+        """Sends the answers of a finished game for question statistics"""
+        responses = [item for item in responses if item["question"] is not None]
+        if not responses:
+            return
+        try:
+            await self.trivia_game.api_client.record_answers(responses)
+        except Exception as e:
+            # Statistics must never interrupt a game
+            command_logger.warning(f"Could not record answers: {e}")
+
     def _cleanup_game(self, user_id: int):
         """Cleans up the game state when it ends or there's an error"""
         if user_id in self.game_state.active_games:
@@ -470,6 +562,43 @@ Ready!? 🚀"""
             command_logger.error(f"Error in score command: {e}")
             await message.channel.send("Error getting the score table.")
 
+    async def handle_rank(self, message: Message):
+        """
+        Handles the rank command.
+
+        "$rank" shows the author's rank in the channel, "$rank <name>"
+        another player's, with the players ranked around them.
+        """
+        try:
+            channel_identifier = (
+                message.channel.name
+                if isinstance(message.channel, (TextChannel, Thread))
+                else f"{type(message.channel).__name__}-{message.channel.id}"
+            )
+            _, _, name = message.content.partition(" ")
+            name = name.strip() or message.author.name
+
+            ranked = await self.trivia_game.api_client.get_rank(
+                discord_channel=channel_identifier, name=name
+            )
+            if ranked is None:
+                await message.channel.send(f"{name} has no score in this channel yet!")
+                return
+
+            formatted_ranks = "\n".join(
+                f"#{row['rank']} {row['name']}: {row['points']} points"
+                + (" ◀" if row["name"] == name else "")
+                for row in ranked["neighbours"]
+            )
+            await message.channel.send(
+                f"🏅 {name} is #{ranked['rank']} with {ranked['points']} points\n"
+                f"```\n{formatted_ranks}\n```"
+            )
+
+        except Exception as e:
+            command_logger.error(f"Error in rank command: {e}")
+            await message.channel.send("Error getting the rank.")
+
     async def handle_themes(self, message: Message):
         """Handles the themes command"""
         try:
@@ -538,22 +667,26 @@ Ready!? 🚀"""
             )
 
     async def handle_list_trivias(self, message: Message) -> None:
-        """Display available public trivias"""
+        """Display available public trivias, one message per page"""
         try:
-            trivias = await self.trivia_game.api_client.get(TRIVIA_URL)
-
-            if not trivias:
-                await message.channel.send("❌ No trivias available.")
-                return
+            api_client = self.trivia_game.api_client
+            listed = 0
+            async for trivias in api_client.iter_trivia_pages():
+                trivia_list = "\n".join(
+                    f"{listed + i + 1}. {trivia['title']} - "
+                    f"Difficulty: {trivia['difficulty']}"
+                    for i, trivia in enumerate(trivias)
+                )
+                header = "📚 Available Trivias: \n" if not listed else ""
+                await message.channel.send(f"{header}```\n{trivia_list}\n```")
 
-            trivia_list = "\n".join(
-                f"{i+1}. {trivia['title']} - Difficulty: {trivia['difficulty']}"
-                for i, trivia in enumerate(trivias)
-            )
+                listed += len(trivias)
+                if listed >= MAX_LISTED_TRIVIAS:
+                    await message.channel.send(f"Showing the first {listed} trivias.")
+                    break
 
-            await message.channel.send(
-                f"📚 Available Trivias: \n```\n{trivia_list}\n```"
-            )
+            if not listed:
+                await message.channel.send("❌ No trivias available.")
 
         except Exception as e:
             command_logger.error(f"Error listing trivias: {e}")
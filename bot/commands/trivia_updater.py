@@ -54,21 +54,23 @@ class TriviaUpdater:
             )
 
             params: Dict[str, str] = {"username": username}
-            trivias: List[Dict[str, Any]] = await self.api_client.get_user_trivias(
-                params
-            )
+            trivias: List[Dict[str, Any]] = []
+
+            # One DM per page keeps each message under Discord's size limit
+            async for page in self.api_client.iter_trivia_pages(params):
+                trivia_list = "\n".join(
+                    f"{len(trivias) + i + 1}. {trivia['title']} "
+                    f"Difficulty: {trivia['difficulty']} - Theme: {trivia['theme']}"
+                    for i, trivia in enumerate(page)
+                )
+                header = "Your trivias: \n" if not trivias else ""
+                await message.author.send(f"{header}```\n{trivia_list}\n```")
+                trivias.extend(page)
 
             if not trivias:
                 await message.author.send("You don't have any trivias created yet.")
                 return None
 
-            trivia_list = "\n".join(
-                f"{i+1}. {trivia['title']} "
-                f"Difficulty: {trivia['difficulty']} - Theme: {trivia['theme']}"
-                for i, trivia in enumerate(trivias)
-            )
-
-            await message.author.send(f"Your trivias: \n```\n{trivia_list}\n```")
             return trivias
 
         except Exception as e:
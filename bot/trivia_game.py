@@ -19,6 +19,7 @@ from .utils.logging_bot import game_logger
 from .utils.utils import get_difficulty_list, get_theme_list
 
 POINTS_PER_CORRECT_ANSWER = 10
+QUIZ_QUESTIONS = 10
 
 
 class TriviaGame:
@@ -76,10 +77,18 @@ class TriviaGame:
             game_logger.error(f"Failed to initialize trivia game: {e}")
             raise
 
-    async def get_available_options(self) -> Tuple[str, str]:
+    async def get_available_options(
+        self, theme_id: Optional[str] = None
+    ) -> Tuple[str, str]:
         """
         Returns the formatted lists of themes and difficulties available
 
+        Only themes with public trivias are offered. When a theme is
+        given, only its difficulties that have trivias are offered.
+
+        Args:
+            theme_id: Selected theme, if any
+
         Returns:
             Tuple[str, str]: Theme list and difficulty list
 
@@ -88,9 +97,31 @@ class TriviaGame:
             Exception: For other errors
         """
         try:
-            theme_list, theme_dict = await get_theme_list()
-            self.theme_choices = theme_dict
-            difficulty_list, _ = await get_difficulty_list()
+            availability = await self.api_client.get_availability()
+            self.theme_choices = {
+                i + 1: {"id": theme["id"], "name": theme["name"]}
+                for i, theme in enumerate(availability)
+            }
+            theme_list = "\n".join(
+                f"{num}- {theme['name']}" for num, theme in self.theme_choices.items()
+            )
+
+            counts: Dict[str, int] = {}
+            for theme in availability:
+                if theme_id is None or theme["id"] == theme_id:
+                    for level, count in theme["difficulties"].items():
+                        counts[level] = counts.get(level, 0) + count
+
+            _, difficulties = await get_difficulty_list()
+            self.difficulty_choices = {
+                int(level): name
+                for level, name in difficulties.items()
+                if str(level) in counts
+            }
+            difficulty_list = "\n".join(
+                f"{level}- {name} ({counts[str(level)]} trivias)"
+                for level, name in self.difficulty_choices.items()
+            )
             return theme_list, difficulty_list
         except RateLimitExceeded as e:
             error_msg = await self.handle_rate_limit(e)
@@ -162,6 +193,26 @@ class TriviaGame:
             game_logger.error(f"Error getting trivia questions: {e}")
             raise
 
+    async def get_quiz(
+        self, theme_id: str, difficulty_level: int, count: int = QUIZ_QUESTIONS
+    ) -> List[Dict[str, Any]]:
+        """Gets a quiz of questions mixed from every trivia of a theme"""
+        try:
+            questions = await self.api_client.get_quiz(
+                theme_id, difficulty_level, count
+            )
+            game_logger.info(
+                f"Retrieved {len(questions)} quiz questions for theme {theme_id}"
+            )
+            return questions
+        except RateLimitExceeded as e:
+            error_msg = await self.handle_rate_limit(e)
+            game_logger.warning(f"Rate limit getting quiz: {error_msg}")
+            raise RateLimitExceeded(e.wait_seconds, error_msg, e.retry_after)
+        except Exception as e:
+            game_logger.error(f"Error getting quiz: {e}")
+            raise
+
     def get_question(
         self, questions: List[Dict], question_counter: int
     ) -> Tuple[str, int, int, List[str]]:
@@ -9,6 +9,7 @@ import os
 
 import django
 import pytest
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from api.apps.score.models import LeaderBoard, Score
@@ -25,6 +26,7 @@ from api.apps.trivia.tests.factories import (
     UserFactory,
 )
 from api.apps.users.models import CustomUser
+from api.utils.redis_utils import get_redis, redis_key
 
 
 def pytest_configure(config):
@@ -115,6 +117,15 @@ def clean_db():
     CustomUser.objects.exclude(username="admin").delete()
 
 
+@pytest.fixture(autouse=True)
+def reset_throttles():
+    """Start every test with an empty rate limit history"""
+    cache.delete_pattern("throttle_*")
+    client = get_redis()
+    for key in client.scan_iter(match=redis_key("throttle", "*")):
+        client.delete(key)
+
+
 @pytest.fixture
 def test_leaderboard(db, test_user):
     """Create a test leaderboard"""